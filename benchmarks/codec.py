@@ -0,0 +1,144 @@
+"""Benchmark the compiled codec against dataclasses_json on the models.
+
+Decodes each model from a stored document, and encodes it to a dict and to
+JSON, with dataclasses_json and with race_service.models.codec. Needs no
+database:
+
+    % uv run python -m benchmarks.codec --number 20000
+"""
+
+import argparse
+import timeit
+from datetime import datetime
+from typing import Any
+
+from race_service.adapters.documents import to_document
+from race_service.models import (
+    Changelog,
+    IndividualSprintRace,
+    Raceplan,
+    RaceResult,
+    StartEntry,
+    TimeEvent,
+)
+from race_service.models.codec import (
+    decode_individual_sprint_race,
+    decode_race_result,
+    decode_raceplan,
+    decode_start_entry,
+    decode_time_event,
+    to_dict,
+    to_json,
+)
+
+CHANGELOG = [
+    Changelog(
+        timestamp=datetime.fromisoformat("2021-08-31T12:00:01+00:00"),
+        user_id="race_service",
+        comment="Registered",
+    )
+]
+
+MODELS: list[tuple[Any, Any]] = [
+    (
+        TimeEvent(
+            id="time_event_1",
+            bib=14,
+            event_id="event_1",
+            race="G16K1",
+            race_id="race_1",
+            timing_point="Finish",
+            rank=1,
+            registration_time=datetime.fromisoformat("2021-08-31T12:00:00+00:00"),
+            next_race="SA1",
+            next_race_id="race_2",
+            next_race_position=1,
+            status="OK",
+            changelog=CHANGELOG,
+        ),
+        decode_time_event,
+    ),
+    (
+        IndividualSprintRace(
+            id="race_1",
+            raceclass="G16",
+            order=1,
+            start_time=datetime.fromisoformat("2021-08-31T12:00:00"),
+            max_no_of_contestants=10,
+            no_of_contestants=8,
+            event_id="event_1",
+            raceplan_id="raceplan_1",
+            start_entries=[f"start_entry_{i}" for i in range(8)],
+            results={"Finish": "race_result_1"},
+            round="Q",
+            index="A",
+            heat=1,
+            rule={"S": {"A": 4, "C": 0}, "F": {"A": "REST"}},
+        ),
+        decode_individual_sprint_race,
+    ),
+    (
+        StartEntry(
+            id="start_entry_1",
+            startlist_id="startlist_1",
+            race_id="race_1",
+            bib=14,
+            starting_position=1,
+            scheduled_start_time=datetime.fromisoformat("2021-08-31T12:00:00"),
+            name="Ola Nordmann",
+            club="Lyn",
+            changelog=CHANGELOG,
+        ),
+        decode_start_entry,
+    ),
+    (
+        RaceResult(
+            id="race_result_1",
+            race_id="race_1",
+            timing_point="Finish",
+            no_of_contestants=8,
+            ranking_sequence=[f"time_event_{i}" for i in range(8)],
+            status=1,
+        ),
+        decode_race_result,
+    ),
+    (
+        Raceplan(
+            id="raceplan_1",
+            event_id="event_1",
+            races=[f"race_{i}" for i in range(40)],
+        ),
+        decode_raceplan,
+    ),
+]
+
+
+def run(model: Any, decode: Any, number: int) -> dict:
+    """Time decoding and encoding of model, and return microseconds per call."""
+    document = to_document(model)
+    cls = type(model)
+
+    def per_call(statement: Any) -> float:
+        return round(timeit.timeit(statement, number=number) / number * 1e6, 2)
+
+    return {
+        "model": cls.__name__,
+        "from_dict µs": per_call(lambda: cls.from_dict(document)),
+        "decode µs": per_call(lambda: decode(document)),
+        "to_dict µs": per_call(model.to_dict),
+        "codec to_dict µs": per_call(lambda: to_dict(model)),
+        "to_json µs": per_call(model.to_json),
+        "codec to_json µs": per_call(lambda: to_json(model)),
+    }
+
+
+def main(number: int) -> None:
+    """Run the benchmark for each model, and print the results."""
+    for model, decode in MODELS:
+        print(run(model, decode, number))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=10_000)
+    main(parser.parse_args().number)
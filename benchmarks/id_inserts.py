@@ -0,0 +1,83 @@
+"""Benchmark insert throughput and index size of random vs time-ordered ids.
+
+Inserts time-event-like documents into two scratch collections, one with
+uuid4 ids and one with the time-ordered ids of race_service.utils.id_utils,
+each with the unique id index and the (event_id, bib, id) index. Needs a
+MongoDB configured as for the service, and drops the collections after:
+
+    % uv run python -m benchmarks.id_inserts --documents 200000
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from race_service.utils.id_utils import create_id
+
+BATCH_SIZE = 1000
+
+
+async def run(db: Any, name: str, new_id: Callable[[], str], documents: int) -> dict:
+    """Insert documents with ids from new_id, and return throughput and sizes."""
+    collection = db[f"benchmark_{name}"]
+    await collection.drop()
+    await collection.create_index([("id", 1)], unique=True)
+    await collection.create_index([("event_id", 1), ("bib", 1), ("id", 1)])
+    start = time.perf_counter()
+    for offset in range(0, documents, BATCH_SIZE):
+        # Single inserts in small batches, as the time-events arrive:
+        await asyncio.gather(
+            *(
+                collection.insert_one(
+                    {
+                        "id": new_id(),
+                        "event_id": "event_1",
+                        "bib": (offset + i) % 500,
+                        "timing_point": "Finish",
+                    }
+                )
+                for i in range(min(BATCH_SIZE, documents - offset))
+            )
+        )
+    elapsed = time.perf_counter() - start
+    stats = await db.command("collStats", collection.name)
+    await collection.drop()
+    return {
+        "ids": name,
+        "inserts/s": round(documents / elapsed),
+        "id_1 index kB": round(stats["indexSizes"]["id_1"] / 1024),
+        "total index kB": round(stats["totalIndexSize"] / 1024),
+    }
+
+
+async def main(documents: int) -> None:
+    """Run the benchmark for both kinds of ids, and print the results."""
+    load_dotenv()
+    mongo = AsyncIOMotorClient(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", "27017")),
+        username=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+    )
+    db = mongo[os.getenv("DB_NAME", "races")]
+    try:
+        for name, new_id in (
+            ("uuid4", lambda: str(uuid.uuid4())),
+            ("uuid7", create_id),
+        ):
+            print(await run(db, name, new_id, documents))
+    finally:
+        mongo.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=100_000)
+    asyncio.run(main(parser.parse_args().documents))
@@ -0,0 +1,327 @@
+"""Load test the race service with a race-day scenario.
+
+Starts the stand-in of benchmarks.upstream_stub and the race service in
+gunicorn, each in its own process. The service uses the MongoDB configured
+in .env, with the database --db-name, which is dropped after. Then plays a
+race day on a new event:
+
+1. generates the raceplan and the startlist of the event,
+2. posts the finish time events of the first races in a burst, while
+3. displays poll the races, a race and the finish time events,
+
+and reports throughput per phase and p50/p99 latency per endpoint:
+
+    % uv run python -m benchmarks.load --contestants 1000 --latency-ms 20
+
+With --url, the race service running at the url is load tested instead; it
+must be pointed to a running benchmarks.upstream_stub, and keeps its data.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from typing import Any
+
+from aiohttp import ClientError, ClientSession, hdrs
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.planning import FORMATS
+from race_service.utils import db_utils
+
+STARTUP_TIMEOUT = 60
+
+
+class Recorder:
+    """Class sending requests, and recording their latency per endpoint."""
+
+    def __init__(self, session: ClientSession, url: str) -> None:
+        """Initialize the recorder, sending requests to the service at url."""
+        self.session = session
+        self.url = url
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: Counter[str] = Counter()
+
+    async def request(
+        self, method: str, template: str, path: str | None = None, **kwargs: Any
+    ) -> tuple[int, Any, Any]:
+        """Send a request, and return its status, headers and JSON body.
+
+        The latency is recorded on the endpoint of the method and the route
+        template; the path defaults to the template.
+        """
+        start = time.perf_counter()
+        async with self.session.request(
+            method, f"{self.url}{path or template}", **kwargs
+        ) as response:
+            body = await response.read()
+        endpoint = f"{method} {template}"
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status >= HTTPStatus.BAD_REQUEST:
+            self.errors[endpoint] += 1
+        is_json = response.content_type == "application/json"
+        return response.status, response.headers, json.loads(body) if is_json else None
+
+    def requests(self) -> int:
+        """Return the number of requests sent."""
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Return the q-th percentile of the values, by the nearest rank."""
+    ordered = sorted(values)
+    return ordered[max(0, round(q / 100 * len(ordered)) - 1)]
+
+
+def free_port() -> int:
+    """Return a free local port."""
+    with socket.socket() as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+
+@asynccontextmanager
+async def process(
+    args: list[str], env: dict[str, str], ready_url: str
+) -> AsyncIterator[None]:
+    """Run a python module in a process, until left, when it is up at ready_url."""
+    proc = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", *args, env={**os.environ, **env}
+    )
+    try:
+        async with ClientSession() as session:
+            deadline = time.monotonic() + STARTUP_TIMEOUT
+            while True:
+                if proc.returncode is not None or time.monotonic() > deadline:
+                    msg = f"{args[0]} did not start at {ready_url}."
+                    raise RuntimeError(msg)
+                try:
+                    async with session.get(ready_url) as response:
+                        if response.status == HTTPStatus.OK:
+                            break
+                except ClientError:
+                    pass
+                await asyncio.sleep(0.2)
+        yield
+    finally:
+        if proc.returncode is None:
+            proc.terminate()
+        await proc.wait()
+
+
+async def generate(recorder: Recorder, event_id: str) -> None:
+    """Generate the raceplan and the startlist of the event."""
+    for path in (
+        "/raceplans/generate-raceplan-for-event",
+        "/startlists/generate-startlist-for-event",
+    ):
+        status, _, _ = await recorder.request("POST", path, json={"event_id": event_id})
+        if status != HTTPStatus.CREATED:
+            msg = f"POST {path} returned {status}."
+            raise RuntimeError(msg)
+
+
+async def finish_time_events(
+    recorder: Recorder, event_id: str, no_of_races: int
+) -> list[dict]:
+    """Return finish time events of every start entry of the first races."""
+    _, _, races = await recorder.request("GET", "/races", f"/races?eventId={event_id}")
+    first_races = sorted(races, key=lambda race: race["order"])[:no_of_races]
+    registration_time = datetime.now(UTC)
+    time_events = []
+    for race in first_races:
+        _, _, race_with_entries = await recorder.request(
+            "GET", "/races/{raceId}", f"/races/{race['id']}"
+        )
+        for start_entry in race_with_entries["start_entries"]:
+            registration_time += timedelta(milliseconds=300)
+            time_events.append(
+                {
+                    "bib": start_entry["bib"],
+                    "event_id": event_id,
+                    "timing_point": "Finish",
+                    "registration_time": registration_time.isoformat(),
+                    "race_id": race["id"],
+                }
+            )
+    return time_events
+
+
+async def burst(recorder: Recorder, time_events: list[dict], concurrency: int) -> None:
+    """Post the time events, with the given number of requests in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def post(time_event: dict) -> None:
+        async with semaphore:
+            await recorder.request("POST", "/time-events", json=time_event)
+
+    await asyncio.gather(*(post(time_event) for time_event in time_events))
+
+
+async def poll(
+    recorder: Recorder,
+    event_id: str,
+    race_id: str,
+    interval: float,
+    done: asyncio.Event,
+) -> None:
+    """Poll as a display, until done."""
+    while not done.is_set():
+        await recorder.request("GET", "/races", f"/races?eventId={event_id}")
+        await recorder.request("GET", "/races/{raceId}", f"/races/{race_id}")
+        await recorder.request(
+            "GET",
+            "/time-events",
+            f"/time-events?eventId={event_id}&timingPoint=Finish",
+        )
+        await asyncio.sleep(interval)
+
+
+async def race_day(recorder: Recorder, args: argparse.Namespace) -> list[dict]:
+    """Play the race day, and return the duration and throughput per phase."""
+    event_id = f"load-{uuid.uuid4()}"
+    phases = []
+
+    async def phase(name: str, coroutine: Any) -> Any:
+        requests, start = recorder.requests(), time.perf_counter()
+        result = await coroutine
+        seconds = time.perf_counter() - start
+        requests = recorder.requests() - requests
+        phases.append(
+            {
+                "phase": name,
+                "seconds": round(seconds, 2),
+                "requests": requests,
+                "requests/s": round(requests / seconds, 1),
+            }
+        )
+        return result
+
+    await phase("generate", generate(recorder, event_id))
+    time_events = await phase(
+        "fetch races", finish_time_events(recorder, event_id, args.races)
+    )
+
+    async def finish_line() -> None:
+        done = asyncio.Event()
+        displays = [
+            asyncio.create_task(
+                poll(
+                    recorder,
+                    event_id,
+                    time_events[0]["race_id"],
+                    args.poll_interval,
+                    done,
+                )
+            )
+            for _ in range(args.displays)
+        ]
+        await burst(recorder, time_events, args.concurrency)
+        done.set()
+        await asyncio.gather(*displays)
+
+    await phase("finish line", finish_line())
+    return phases
+
+
+def report(recorder: Recorder, phases: list[dict]) -> None:
+    """Print the phases, and the latency per endpoint."""
+    for phase in phases:
+        print(phase)
+    for endpoint, latencies in sorted(recorder.latencies.items()):
+        print(
+            {
+                "endpoint": endpoint,
+                "requests": len(latencies),
+                "errors": recorder.errors[endpoint],
+                "p50 ms": round(percentile(latencies, 50) * 1000, 1),
+                "p99 ms": round(percentile(latencies, 99) * 1000, 1),
+            }
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Start the stand-in and the service unless given a url, and load test."""
+    load_dotenv()
+    async with AsyncExitStack() as stack:
+        url = args.url
+        if url is None:
+            stub_port, service_port = free_port(), free_port()
+            url = f"http://localhost:{service_port}"
+            await stack.enter_async_context(
+                process(
+                    [
+                        "benchmarks.upstream_stub",
+                        f"--port={stub_port}",
+                        f"--format={args.format}",
+                        f"--contestants={args.contestants}",
+                        f"--latency-ms={args.latency_ms}",
+                    ],
+                    {},
+                    f"http://localhost:{stub_port}/competition-formats",
+                )
+            )
+            mongo = AsyncIOMotorClient(
+                host=os.getenv("DB_HOST", "localhost"),
+                port=int(os.getenv("DB_PORT", "27017")),
+                username=os.getenv("DB_USER"),
+                password=os.getenv("DB_PASSWORD"),
+            )
+            stack.callback(mongo.close)
+            stack.push_async_callback(db_utils.drop_db, mongo, args.db_name)
+            await stack.enter_async_context(
+                process(
+                    [
+                        "gunicorn",
+                        "race_service:create_app",
+                        "--config=race_service/gunicorn_config.py",
+                        "--worker-class=aiohttp.GunicornWebWorker",
+                        f"--bind=localhost:{service_port}",
+                        f"--workers={args.workers}",
+                        "--access-logfile=/dev/null",
+                    ],
+                    {
+                        "DB_NAME": args.db_name,
+                        "LOGGING_LEVEL": "WARNING",
+                        **{
+                            f"{service}_HOST_{key}": value
+                            for service in ("EVENTS", "COMPETITION_FORMAT", "USERS")
+                            for key, value in (
+                                ("SERVER", "localhost"),
+                                ("PORT", str(stub_port)),
+                            )
+                        },
+                    },
+                    f"{url}/ready",
+                )
+            )
+        session = await stack.enter_async_context(
+            ClientSession(headers={hdrs.AUTHORIZATION: "Bearer load-test"})
+        )
+        recorder = Recorder(session, url)
+        report(recorder, await race_day(recorder, args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="load test the race service at this url")
+    parser.add_argument("--format", choices=FORMATS, default="individual_sprint")
+    parser.add_argument("--contestants", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--db-name", default="races_load_test")
+    parser.add_argument("--races", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--displays", type=int, default=10)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,131 @@
+"""Benchmark the memory of the models of an event, slotted and not slotted.
+
+Creates the start entries, races and time events of an event with the given
+number of contestants, once with the models and once with not slotted
+copies of them, and prints the memory allocated for each. Needs no database:
+
+    % uv run python -m benchmarks.models_memory --contestants 2000
+"""
+
+import argparse
+import gc
+import resource
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import fields, make_dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from race_service.models import (
+    Changelog,
+    IndividualSprintRace,
+    StartEntry,
+    TimeEvent,
+)
+
+CONTESTANTS_PER_RACE = 8
+TIMING_POINTS = ("Template", "Start", "Finish")
+
+
+def not_slotted(cls: type) -> Callable[..., Any]:
+    """Return a function creating a not slotted copy of an instance of cls."""
+    copy_cls = make_dataclass(
+        f"NotSlotted{cls.__name__}", [f.name for f in fields(cls)]
+    )
+    names = [f.name for f in fields(cls)]
+
+    def copy(obj: Any) -> Any:
+        return copy_cls(*(getattr(obj, name) for name in names))
+
+    return copy
+
+
+def create_event(contestants: int, copy: Callable[[Any], Any]) -> list[Any]:
+    """Create the models of an event, through copy."""
+    start = datetime.fromisoformat("2021-08-31T12:00:00+00:00")
+    models: list[Any] = [
+        copy(
+            IndividualSprintRace(
+                id=f"race_{i}",
+                raceclass="G16",
+                order=i,
+                start_time=start,
+                max_no_of_contestants=CONTESTANTS_PER_RACE,
+                no_of_contestants=CONTESTANTS_PER_RACE,
+                event_id="event_1",
+                raceplan_id="raceplan_1",
+                start_entries=[],
+                results={},
+                round="Q",
+                index="A",
+                heat=i,
+            )
+        )
+        for i in range(0, contestants, CONTESTANTS_PER_RACE)
+    ]
+    for bib in range(1, contestants + 1):
+        changelog = [
+            copy(Changelog(timestamp=start, user_id="race_service", comment="Ok"))
+        ]
+        models.append(
+            copy(
+                StartEntry(
+                    id=f"start_entry_{bib}",
+                    startlist_id="startlist_1",
+                    race_id=f"race_{bib // CONTESTANTS_PER_RACE}",
+                    bib=bib,
+                    starting_position=bib % CONTESTANTS_PER_RACE,
+                    scheduled_start_time=start,
+                    name=f"Contestant {bib}",
+                    club="Lyn",
+                    changelog=changelog,
+                )
+            )
+        )
+        models.extend(
+            copy(
+                TimeEvent(
+                    id=f"time_event_{bib}_{timing_point}",
+                    bib=bib,
+                    event_id="event_1",
+                    timing_point=timing_point,
+                    registration_time=start + timedelta(seconds=bib),
+                    race_id=f"race_{bib // CONTESTANTS_PER_RACE}",
+                    changelog=changelog,
+                )
+            )
+            for timing_point in TIMING_POINTS
+        )
+    return models
+
+
+def run(name: str, contestants: int, copy: Callable[[Any], Any]) -> dict:
+    """Create the models of an event, and return the memory allocated."""
+    gc.collect()
+    tracemalloc.start()
+    models = create_event(contestants, copy)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "models": name,
+        "instances": len(models),
+        "allocated kB": round(current / 1024),
+        "peak kB": round(peak / 1024),
+    }
+
+
+def main(contestants: int) -> None:
+    """Run the benchmark for both kinds of models, and print the results."""
+    copies = {
+        cls: not_slotted(cls)
+        for cls in (Changelog, IndividualSprintRace, StartEntry, TimeEvent)
+    }
+    print(run("slotted", contestants, lambda obj: obj))
+    print(run("not slotted", contestants, lambda obj: copies[type(obj)](obj)))
+    print({"max rss kB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contestants", type=int, default=2000)
+    main(parser.parse_args().contestants)
@@ -0,0 +1,246 @@
+"""Benchmark raceplan and startlist generation on synthetic events.
+
+Generates events of increasing size from the competition formats in
+tests/files, and reports time and peak memory of each stage: calculating
+the raceplan, and generating the start entries. The events are
+reproducible from the seed. Needs no database:
+
+    % uv run python -m benchmarks.planning --save baseline.json
+    % uv run python -m benchmarks.planning --baseline baseline.json
+
+With --baseline, stages slower or using more memory than the baseline by
+more than the tolerance are reported, and the exit code is 1.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from race_service.commands.raceplans_individual_sprint import (
+    calculate_raceplan_individual_sprint,
+)
+from race_service.commands.raceplans_interval_start import (
+    calculate_raceplan_interval_start,
+)
+from race_service.commands.startlists_commands import (
+    generate_start_entries_for_individual_sprint,
+    generate_start_entries_for_interval_start,
+)
+
+FILES = Path(__file__).parent.parent / "tests" / "files"
+
+FORMATS = {
+    "interval_start": (
+        "competition_format_interval_start.json",
+        "event_interval_start.json",
+        calculate_raceplan_interval_start,
+        generate_start_entries_for_interval_start,
+    ),
+    "individual_sprint": (
+        "competition_format_individual_sprint.json",
+        "event_individual_sprint.json",
+        calculate_raceplan_individual_sprint,
+        generate_start_entries_for_individual_sprint,
+    ),
+}
+
+SIZES = (100, 1000, 5000, 20000)
+METRICS = ("raceplan ms", "raceplan peak kB", "startlist ms", "startlist peak kB")
+
+
+def max_raceclass_size(competition_format: dict, class_size: int) -> int:
+    """Return the class size, within what the competition format supports."""
+    configs = competition_format.get("race_config_ranked", []) + competition_format.get(
+        "race_config_non_ranked", []
+    )
+    limits = [competition_format["max_no_of_contestants_in_raceclass"], class_size]
+    if configs:
+        limits.append(
+            min(
+                max(c["max_no_of_contestants"] for c in competition_format[key])
+                for key in ("race_config_ranked", "race_config_non_ranked")
+            )
+        )
+    return min(limits)
+
+
+def synthetic_event(
+    competition_format: dict,
+    contestants: int,
+    groups: int,
+    class_size: int,
+    seed: int,
+) -> tuple[list[dict], list[dict]]:
+    """Return raceclasses and contestants of an event of the given size.
+
+    The contestants are split on as few raceclasses as the class size
+    allows, with sizes varying by up to a quarter. The raceclasses are put
+    in groups in turn. The raceclasses in the last group are not ranked, as
+    ranked and not ranked raceclasses are planned in different groups.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    size = max_raceclass_size(competition_format, class_size)
+    no_of_raceclasses = math.ceil(contestants / size)
+    weights = [rng.uniform(0.75, 1.0) for _ in range(no_of_raceclasses)]
+    sizes = [max(1, int(contestants * w / sum(weights))) for w in weights]
+    sizes[-1] += contestants - sum(sizes)
+    while sizes[-1] > size:  # move the excess of the last class to the others
+        i = rng.randrange(no_of_raceclasses - 1)
+        if sizes[i] < size:
+            sizes[i] += 1
+            sizes[-1] -= 1
+
+    raceclasses = [
+        {
+            "id": f"raceclass_{i}",
+            "name": f"K{i}",
+            "ageclasses": [f"K {i} år"],
+            "event_id": "event_1",
+            "no_of_contestants": no_of_contestants,
+            "group": i % groups + 1,
+            "order": i // groups + 1,
+            "ranking": groups == 1 or i % groups + 1 < groups,
+        }
+        for i, no_of_contestants in enumerate(sizes)
+    ]
+    event_contestants = [
+        {
+            "bib": 0,
+            "first_name": f"First{i}",
+            "last_name": f"Last{j}",
+            "club": f"Club {rng.randrange(200)}",
+            "ageclass": raceclass["ageclasses"][0],
+            "event_id": "event_1",
+        }
+        for i, raceclass in enumerate(raceclasses)
+        for j in range(raceclass["no_of_contestants"])
+    ]
+    rng.shuffle(event_contestants)  # the draw
+    for bib, contestant in enumerate(event_contestants, start=1):
+        contestant["bib"] = bib
+    return raceclasses, event_contestants
+
+
+async def measure(
+    stage: Callable[[], Awaitable[Any]], repeat: int
+) -> tuple[Any, float, float]:
+    """Run the stage, and return its result, best time in ms and peak kB."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = await stage()
+        times.append(time.perf_counter() - start)
+    # Memory is measured in a separate run, as tracing slows the stage down:
+    tracemalloc.start()
+    await stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, round(min(times) * 1000, 2), round(peak / 1024)
+
+
+async def run(name: str, contestants: int, args: argparse.Namespace) -> dict:
+    """Generate the raceplan and startlist of an event, and return the metrics."""
+    format_file, event_file, calculate_raceplan, generate_start_entries = FORMATS[name]
+    competition_format = json.loads((FILES / format_file).read_text())
+    event = {"id": "event_1", **json.loads((FILES / event_file).read_text())}
+    raceclasses, event_contestants = synthetic_event(
+        competition_format, contestants, args.groups, args.class_size, args.seed
+    )
+
+    (_, races), raceplan_ms, raceplan_kb = await measure(
+        lambda: calculate_raceplan(event, competition_format, raceclasses),
+        args.repeat,
+    )
+    start_entries, startlist_ms, startlist_kb = await measure(
+        lambda: generate_start_entries(
+            competition_format, raceclasses, races, event_contestants
+        ),
+        args.repeat,
+    )
+    return {
+        "format": name,
+        "contestants": contestants,
+        "raceclasses": len(raceclasses),
+        "races": len(races),
+        "start_entries": len(start_entries),
+        "raceplan ms": raceplan_ms,
+        "raceplan peak kB": raceplan_kb,
+        "startlist ms": startlist_ms,
+        "startlist peak kB": startlist_kb,
+    }
+
+
+def regressions(results: list[dict], baseline: dict, tolerance: float) -> list[str]:
+    """Return the metrics worse than in the baseline by more than tolerance."""
+    baseline_results = {
+        (result["format"], result["contestants"]): result
+        for result in baseline["results"]
+    }
+    found = []
+    for result in results:
+        expected = baseline_results.get((result["format"], result["contestants"]))
+        if expected is None:
+            continue
+        found.extend(
+            f"{result['format']} {result['contestants']}: {metric} "
+            f"{result[metric]} > {expected[metric]} * {tolerance}"
+            for metric in METRICS
+            if result[metric] > expected[metric] * tolerance
+        )
+    return found
+
+
+async def run_all(args: argparse.Namespace) -> list[dict]:
+    """Run the benchmark for every format and size, and print the results."""
+    results = []
+    for name in args.formats:
+        for contestants in args.sizes:
+            result = await run(name, contestants, args)
+            print(result)
+            results.append(result)
+    return results
+
+
+def main(args: argparse.Namespace) -> int:
+    """Run the benchmark, and save or compare the results."""
+    results = asyncio.run(run_all(args))
+
+    if args.save:
+        baseline = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "results": results,
+        }
+        Path(args.save).write_text(json.dumps(baseline, indent=2) + "\n")
+    if args.baseline:
+        found = regressions(
+            results, json.loads(Path(args.baseline).read_text()), args.tolerance
+        )
+        for regression in found:
+            print(f"Regression: {regression}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(SIZES))
+    parser.add_argument("--groups", type=int, default=3)
+    parser.add_argument("--class-size", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="save the results as baseline to this file")
+    parser.add_argument("--baseline", help="compare the results to this baseline")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    sys.exit(main(parser.parse_args()))
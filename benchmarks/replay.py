@@ -0,0 +1,112 @@
+"""Replay recorded requests against a local race service.
+
+Plays a file recorded with RECORD_REQUESTS_FILE at the pace of the
+recording, sped up by --speed, and compares the status and latency of the
+responses per route with the recording. The exit code is 1 if any status
+differs from the recording:
+
+    % uv run python -m benchmarks.replay requests.jsonl --speed 5
+
+Restore a copy of the database as at the start of the recording first, so
+that the ids in the paths exist. The service should use a stand-in for the
+upstream services, as benchmarks.upstream_stub. Requests are sent with the
+token --token, as the tokens are not recorded.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from aiohttp import ClientSession, hdrs
+
+from benchmarks.load import percentile
+
+
+async def send(session: ClientSession, url: str, recorded: dict) -> tuple[int, float]:
+    """Send the recorded request, and return the status and latency in ms."""
+    start = time.perf_counter()
+    async with session.request(
+        recorded["method"],
+        f"{url}{recorded['path']}",
+        params=[tuple(pair) for pair in recorded["query"]],
+        json=recorded["body"],
+    ) as response:
+        await response.read()
+    return response.status, (time.perf_counter() - start) * 1000
+
+
+async def replay(
+    recording: list[dict], url: str, speed: float, token: str
+) -> list[tuple[int, float]]:
+    """Send the requests at the pace of the recording, and return the results."""
+    recording = sorted(recording, key=lambda recorded: recorded["ts"])
+    async with ClientSession(headers={hdrs.AUTHORIZATION: f"Bearer {token}"}) as s:
+        start = time.monotonic()
+        tasks = []
+        for recorded in recording:
+            due = start + (recorded["ts"] - recording[0]["ts"]) / speed
+            await asyncio.sleep(max(0, due - time.monotonic()))
+            tasks.append(asyncio.create_task(send(s, url, recorded)))
+        return await asyncio.gather(*tasks)
+
+
+def compare(recording: list[dict], results: list[tuple[int, float]]) -> list[dict]:
+    """Return the recorded and replayed statuses and latencies per route."""
+    routes: dict[str, list[tuple[dict, int, float]]] = defaultdict(list)
+    recording = sorted(recording, key=lambda recorded: recorded["ts"])
+    for recorded, (status, ms) in zip(recording, results, strict=True):
+        routes[f"{recorded['method']} {recorded['route']}"].append(
+            (recorded, status, ms)
+        )
+    comparison = []
+    for route, replayed in sorted(routes.items()):
+        recorded_ms = [recorded["ms"] for recorded, _, _ in replayed]
+        replayed_ms = [ms for _, _, ms in replayed]
+        comparison.append(
+            {
+                "route": route,
+                "requests": len(replayed),
+                "status mismatches": sum(
+                    recorded["status"] != status for recorded, status, _ in replayed
+                ),
+                "recorded p50 ms": round(percentile(recorded_ms, 50), 1),
+                "replayed p50 ms": round(percentile(replayed_ms, 50), 1),
+                "recorded p99 ms": round(percentile(recorded_ms, 99), 1),
+                "replayed p99 ms": round(percentile(replayed_ms, 99), 1),
+            }
+        )
+    return comparison
+
+
+def main(args: argparse.Namespace) -> int:
+    """Replay the recording, and print the comparison per route."""
+    recording = [
+        json.loads(line) for line in Path(args.recording).read_text().splitlines()
+    ]
+    start = time.perf_counter()
+    results = asyncio.run(replay(recording, args.url, args.speed, args.token))
+    seconds = time.perf_counter() - start
+    print(
+        {
+            "requests": len(results),
+            "seconds": round(seconds, 2),
+            "requests/s": round(len(results) / seconds, 1),
+        }
+    )
+    comparison = compare(recording, results)
+    for route in comparison:
+        print(route)
+    return 1 if any(route["status mismatches"] for route in comparison) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording", help="file recorded by the service")
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--speed", type=float, default=1.0, help="e.g. 1, 5 or 20")
+    parser.add_argument("--token", default="replay")
+    sys.exit(main(parser.parse_args()))
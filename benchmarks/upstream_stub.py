@@ -0,0 +1,114 @@
+"""Local stand-in for the upstream services of the race service.
+
+Serves what the race service gets from the event, competition-format and
+user services: any event id is an event from tests/files, with the
+competition format from tests/files and a synthetic set of raceclasses and
+contestants as in benchmarks.planning. /authorize lets every token in.
+Every response is delayed by the given latency, as over the network:
+
+    % uv run python -m benchmarks.upstream_stub --port 8081 --latency-ms 20
+
+Point the race service to it with EVENTS_HOST_SERVER/EVENTS_HOST_PORT,
+COMPETITION_FORMAT_HOST_SERVER/COMPETITION_FORMAT_HOST_PORT and
+USERS_HOST_SERVER/USERS_HOST_PORT, or run benchmarks.load, which does.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from aiohttp import web
+from aiohttp.typedefs import Handler
+
+from benchmarks.planning import FILES, FORMATS, synthetic_event
+
+
+def create_stub_app(  # noqa: PLR0913
+    competition_format_name: str,
+    contestants: int,
+    latency_ms: float = 0,
+    groups: int = 3,
+    class_size: int = 60,
+    seed: int = 1,
+) -> web.Application:
+    """Create the stand-in, serving an event of the given format and size."""
+    format_file, event_file, _, _ = FORMATS[competition_format_name]
+    competition_format = json.loads((FILES / format_file).read_text())
+    event = json.loads((FILES / event_file).read_text())
+    raceclasses, event_contestants = synthetic_event(
+        competition_format, contestants, groups, class_size, seed
+    )
+
+    @web.middleware
+    async def latency(request: web.Request, handler: Handler) -> web.StreamResponse:
+        await asyncio.sleep(latency_ms / 1000)
+        return await handler(request)
+
+    def with_event_id(items: list[dict], event_id: str) -> list[dict]:
+        return [{**item, "event_id": event_id} for item in items]
+
+    async def get_event(request: web.Request) -> web.Response:
+        return web.json_response({**event, "id": request.match_info["eventId"]})
+
+    async def get_format(request: web.Request) -> web.Response:
+        del request  # every event has the same format
+        return web.json_response(competition_format)
+
+    async def get_competition_formats(request: web.Request) -> web.Response:
+        del request  # there is only one format
+        return web.json_response([competition_format])
+
+    async def get_raceclasses(request: web.Request) -> web.Response:
+        return web.json_response(
+            with_event_id(raceclasses, request.match_info["eventId"])
+        )
+
+    async def get_contestants(request: web.Request) -> web.Response:
+        return web.json_response(
+            with_event_id(event_contestants, request.match_info["eventId"])
+        )
+
+    async def authorize(request: web.Request) -> web.Response:
+        del request  # every token is authorized
+        return web.Response(status=204)
+
+    app = web.Application(middlewares=[latency])
+    app.add_routes(
+        [
+            web.get("/events/{eventId}", get_event),
+            web.get("/events/{eventId}/format", get_format),
+            web.get("/events/{eventId}/raceclasses", get_raceclasses),
+            web.get("/events/{eventId}/contestants", get_contestants),
+            web.get("/competition-formats", get_competition_formats),
+            web.post("/authorize", authorize),
+        ]
+    )
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--format", choices=FORMATS, default="individual_sprint")
+    parser.add_argument("--contestants", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--groups", type=int, default=3)
+    parser.add_argument("--class-size", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+    web.run_app(
+        create_stub_app(
+            args.format,
+            args.contestants,
+            args.latency_ms,
+            args.groups,
+            args.class_size,
+            args.seed,
+        ),
+        host=args.host,
+        port=args.port,
+        access_log=None,
+    )
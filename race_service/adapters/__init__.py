@@ -1,5 +1,10 @@
 """Package for all adapters."""
 
+from .command_monitoring import (
+    CommandMonitor,
+    start_counting_commands,
+    stop_counting_commands,
+)
 from .events_adapter import (
     CompetitionFormatNotFoundError,
     ContestantsNotFoundError,
@@ -7,24 +12,52 @@ from .events_adapter import (
     EventsAdapter,
     RaceclassesNotFoundError,
 )
+from .instrumentation import start_counting_calls, stop_counting_calls
+from .pagination import Page
 from .race_results_adapter import RaceResultNotFoundError, RaceResultsAdapter
-from .raceplans_adapter import RaceplanNotFoundError, RaceplansAdapter
+from .raceplans_adapter import (
+    DuplicateRaceplanError,
+    RaceplanNotFoundError,
+    RaceplansAdapter,
+)
 from .races_adapter import (
     NotSupportedRaceDatatypeError,
     RaceNotFoundError,
     RacesAdapter,
 )
-from .start_entries_adapter import StartEntriesAdapter, StartEntryNotFoundError
-from .startlists_adapter import StartlistNotFoundError, StartlistsAdapter
+from .start_entries_adapter import (
+    DuplicateStartEntryError,
+    StartEntriesAdapter,
+    StartEntryNotFoundError,
+)
+from .start_entry_moves_adapter import RaceIsFullError, StartEntryMovesAdapter
+from .startlists_adapter import (
+    DuplicateStartlistError,
+    StartlistNotFoundError,
+    StartlistsAdapter,
+)
 from .time_events_adapter import TimeEventNotFoundError, TimeEventsAdapter
+from .unit_of_work import (
+    UnitOfWork,
+    get_unit_of_work,
+    reset_unit_of_work,
+    set_unit_of_work,
+)
 from .users_adapter import UsersAdapter
+from .versioning import VersionConflictError
 
 __all__ = [
+    "CommandMonitor",
     "CompetitionFormatNotFoundError",
     "ContestantsNotFoundError",
+    "DuplicateRaceplanError",
+    "DuplicateStartEntryError",
+    "DuplicateStartlistError",
     "EventNotFoundError",
     "EventsAdapter",
     "NotSupportedRaceDatatypeError",
+    "Page",
+    "RaceIsFullError",
     "RaceNotFoundError",
     "RaceResultNotFoundError",
     "RaceResultsAdapter",
@@ -33,10 +66,20 @@ __all__ = [
     "RaceplansAdapter",
     "RacesAdapter",
     "StartEntriesAdapter",
+    "StartEntryMovesAdapter",
     "StartEntryNotFoundError",
     "StartlistNotFoundError",
     "StartlistsAdapter",
     "TimeEventNotFoundError",
     "TimeEventsAdapter",
+    "UnitOfWork",
     "UsersAdapter",
+    "VersionConflictError",
+    "get_unit_of_work",
+    "reset_unit_of_work",
+    "set_unit_of_work",
+    "start_counting_calls",
+    "start_counting_commands",
+    "stop_counting_calls",
+    "stop_counting_commands",
 ]
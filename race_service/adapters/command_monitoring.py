@@ -0,0 +1,163 @@
+"""Module for monitoring the commands sent to the database.
+
+The command monitor is registered as an event listener of the client. It
+records the duration of every command per collection and command, logs
+commands slower than a threshold with the shape of their filter, and
+counts the commands of the current request.
+
+Motor runs pymongo in threads, with a copy of the context of the calling
+task, so the listener sees the command count of the request that sent the
+command.
+"""
+
+import logging
+import threading
+from contextvars import ContextVar, Token
+from typing import Any
+
+from pymongo import monitoring
+
+from race_service.utils.metrics_utils import REGISTRY, Histogram
+
+COMMAND_SECONDS = REGISTRY.register(
+    Histogram(
+        "mongo_command_duration_seconds",
+        "Duration of database commands per collection and command.",
+        ("collection", "command", "outcome"),
+    )
+)
+
+# The key of the filter of the commands, or of their statements:
+FILTER_KEYS = {
+    "aggregate": "pipeline",
+    "count": "query",
+    "delete": "q",
+    "distinct": "query",
+    "find": "filter",
+    "findAndModify": "query",
+    "update": "q",
+}
+STATEMENT_KEYS = {"delete": "deletes", "update": "updates"}
+
+
+class _CommandCount:
+    """Class representing the number of commands of a request."""
+
+    def __init__(self) -> None:
+        """Initialize the count to zero."""
+        self._lock = threading.Lock()
+        self.value = 0
+
+    def increment(self) -> None:
+        """Increment the count, from any thread."""
+        with self._lock:
+            self.value += 1
+
+
+_request_commands: ContextVar[_CommandCount | None] = ContextVar(
+    "request_commands", default=None
+)
+
+
+def start_counting_commands() -> Token:
+    """Start counting the commands of the current request."""
+    return _request_commands.set(_CommandCount())
+
+
+def stop_counting_commands(token: Token) -> int:
+    """Stop counting the commands, and return the number of commands."""
+    count = _request_commands.get()
+    _request_commands.reset(token)
+    return 0 if count is None else count.value
+
+
+def redact(value: Any) -> Any:
+    """Return the shape of a filter, with the values replaced by "?".
+
+    Field names and operators are kept. Lists of documents, as in $and and
+    $or, keep their documents; any other list is a value.
+    """
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+        return [redact(item) for item in value]
+    return "?"
+
+
+def command_collection(command_name: str, command: Any) -> str:
+    """Return the collection of the command, "none" if not on a collection."""
+    if command_name == "getMore":
+        return str(command.get("collection", "none"))
+    collection = command.get(command_name)
+    return collection if isinstance(collection, str) else "none"
+
+
+def filter_shape(command_name: str, command: Any) -> Any | None:
+    """Return the redacted filter of the command, None if it has no filter."""
+    key = FILTER_KEYS.get(command_name)
+    if key is None:
+        return None
+    if command_name in STATEMENT_KEYS:
+        statements = command.get(STATEMENT_KEYS[command_name]) or [{}]
+        return redact(statements[0].get(key, {}))
+    return redact(command.get(key, {}))
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """Class representing a listener recording the commands to the database."""
+
+    logger = logging.getLogger(
+        "race_service.adapters.command_monitoring.CommandMonitor"
+    )
+
+    def __init__(self, slow_command_ms: float) -> None:
+        """Initialize the monitor, logging commands slower than slow_command_ms."""
+        self.slow_command_ms = slow_command_ms
+        self._started: dict[tuple[Any, int], tuple[str, Any]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        """Remember the collection and filter of the command, and count it."""
+        key = (event.connection_id, event.request_id)
+        self._started[key] = (
+            command_collection(event.command_name, event.command),
+            filter_shape(event.command_name, event.command),
+        )
+        count = _request_commands.get()
+        if count is not None:
+            count.increment()
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        """Record the command."""
+        self._record(event, "succeeded")
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        """Record the command."""
+        self._record(event, "failed")
+
+    def _record(
+        self,
+        event: monitoring.CommandSucceededEvent | monitoring.CommandFailedEvent,
+        outcome: str,
+    ) -> None:
+        """Record the duration, and log the command if slow."""
+        collection, shape = self._started.pop(
+            (event.connection_id, event.request_id), ("none", None)
+        )
+        COMMAND_SECONDS.observe(
+            event.duration_micros / 1_000_000,
+            collection=collection,
+            command=event.command_name,
+            outcome=outcome,
+        )
+        duration_ms = event.duration_micros / 1000
+        if duration_ms >= self.slow_command_ms:
+            self.logger.warning(
+                f"Slow {event.command_name} on {collection}: {duration_ms:.1f} ms",
+                extra={
+                    "collection": collection,
+                    "command": event.command_name,
+                    "duration_ms": duration_ms,
+                    "filter_shape": shape,
+                    "outcome": outcome,
+                },
+            )
@@ -0,0 +1,37 @@
+"""Module for mapping objects to the documents stored in the database."""
+
+from dataclasses import fields, is_dataclass
+from datetime import datetime
+from typing import Any
+
+from race_service.models.codec import to_dict
+from race_service.models.datetimes import to_utc
+
+
+def _replace_datetimes(obj: Any, document: dict) -> None:
+    """Replace the encoded datetimes of obj in document with BSON datetimes."""
+    for field in fields(obj):
+        value = getattr(obj, field.name)
+        if isinstance(value, datetime):
+            document[field.name] = to_utc(value)
+        elif isinstance(value, list):
+            for item, item_document in zip(value, document[field.name], strict=True):
+                if is_dataclass(item):
+                    _replace_datetimes(item, item_document)
+
+
+def to_document(obj: Any) -> dict:
+    """Return the document to store for the object.
+
+    This is the dict of the model, except that datetimes are stored as native
+    BSON datetimes in UTC instead of strings, so they can be ordered and
+    queried by range. The models decode both forms.
+    """
+    document = to_dict(obj)
+    _replace_datetimes(obj, document)
+    return document
+
+
+def projection(fields: list[str]) -> dict:
+    """Return the projection of the given fields, without the _id of the document."""
+    return {"_id": 0, **dict.fromkeys(fields, 1)}
@@ -10,6 +10,10 @@ from aiohttp.web import (
 )
 from dotenv import load_dotenv
 
+from race_service.utils.tracing import trace_headers
+
+from .instrumentation import instrument_adapter
+
 load_dotenv()
 
 EVENTS_HOST_SERVER = os.getenv("EVENTS_HOST_SERVER", "events.example.com")
@@ -51,6 +55,7 @@ class ContestantsNotFoundError(Exception):
         super().__init__(message)
 
 
+@instrument_adapter
 class EventsAdapter:
     """Class representing an adapter for events."""
 
@@ -62,7 +67,10 @@ class EventsAdapter:
         del token  # for now we do not use token
         url = f"http://{EVENTS_HOST_SERVER}:{EVENTS_HOST_PORT}/events/{event_id}"
 
-        async with ClientSession() as session, session.get(url) as response:
+        async with (
+            ClientSession(headers=trace_headers()) as session,
+            session.get(url) as response,
+        ):
             if response.status == HTTPStatus.OK:
                 return await response.json()
             if response.status == HTTPStatus.NOT_FOUND:
@@ -80,7 +88,7 @@ class EventsAdapter:
         competition_format_name: str | None = None,
     ) -> dict:  # pragma: no cover
         """Get competition_format from event-service."""
-        async with ClientSession() as session:
+        async with ClientSession(headers=trace_headers()) as session:
             # First we try to get the competition-format from the event:
             url = (
                 f"http://{EVENTS_HOST_SERVER}:{EVENTS_HOST_PORT}"
@@ -130,7 +138,10 @@ class EventsAdapter:
         del token  # for now we do not use token
         url = f"http://{EVENTS_HOST_SERVER}:{EVENTS_HOST_PORT}/events/{event_id}/raceclasses"
 
-        async with ClientSession() as session, session.get(url) as response:
+        async with (
+            ClientSession(headers=trace_headers()) as session,
+            session.get(url) as response,
+        ):
             if response.status == HTTPStatus.OK:
                 raceclasses = await response.json()
                 if len(raceclasses) == 0:
@@ -153,7 +164,10 @@ class EventsAdapter:
         del token  # for now we do not use token
         url = f"http://{EVENTS_HOST_SERVER}:{EVENTS_HOST_PORT}/events/{event_id}/contestants"
 
-        async with ClientSession() as session, session.get(url) as response:
+        async with (
+            ClientSession(headers=trace_headers()) as session,
+            session.get(url) as response,
+        ):
             if response.status == HTTPStatus.OK:
                 contestants = await response.json()
                 if len(contestants) == 0:
@@ -0,0 +1,96 @@
+"""Module for recording the calls of adapters in metrics.
+
+Every coroutine and async generator classmethod of an instrumented adapter
+records its duration per adapter and method. Within a request, the calls
+are also counted, so that the number of database and upstream calls per
+request can be recorded per route.
+"""
+
+import functools
+import inspect
+import time
+from collections.abc import AsyncIterator, Callable
+from contextvars import ContextVar, Token
+from typing import Any
+
+from race_service.utils.metrics_utils import REGISTRY, Histogram
+from race_service.utils.tracing import trace_function
+
+ADAPTER_CALL_SECONDS = REGISTRY.register(
+    Histogram(
+        "adapter_call_duration_seconds",
+        "Duration of adapter calls to the database or upstream services.",
+        ("adapter", "method"),
+    )
+)
+
+_request_calls: ContextVar[list[int] | None] = ContextVar("request_calls", default=None)
+
+
+def start_counting_calls() -> Token:
+    """Start counting the adapter calls of the current request."""
+    return _request_calls.set([0])
+
+
+def stop_counting_calls(token: Token) -> int:
+    """Stop counting the adapter calls, and return the number of calls."""
+    calls = _request_calls.get()
+    _request_calls.reset(token)
+    return 0 if calls is None else calls[0]
+
+
+def _record(adapter: str, method: str, start: float) -> None:
+    """Record the duration of a call, and count it in the current request."""
+    ADAPTER_CALL_SECONDS.observe(
+        time.perf_counter() - start, adapter=adapter, method=method
+    )
+    calls = _request_calls.get()
+    if calls is not None:
+        calls[0] += 1
+
+
+def _instrument(adapter: str, method: str, func: Callable) -> Callable | None:
+    """Return func wrapped to record its calls, None if not async."""
+    if inspect.isasyncgenfunction(func):
+
+        @functools.wraps(func)
+        async def generator(*args: Any, **kwargs: Any) -> AsyncIterator:
+            start = time.perf_counter()
+            try:
+                async for item in func(*args, **kwargs):
+                    yield item
+            finally:
+                _record(adapter, method, start)
+
+        return generator
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def coroutine(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _record(adapter, method, start)
+
+        return coroutine
+
+    return None
+
+
+def instrument_adapter[T: type](cls: T) -> T:
+    """Wrap the async classmethods of an adapter class to record their calls.
+
+    The calls are also traced in spans, within traced requests.
+    """
+    for name, value in list(vars(cls).items()):
+        if isinstance(value, classmethod):
+            wrapped = _instrument(
+                cls.__name__,
+                name,
+                trace_function(value.__func__, f"{cls.__name__}.{name}", "adapter"),
+            )
+            if wrapped is not None:
+                setattr(cls, name, classmethod(wrapped))
+    return cls
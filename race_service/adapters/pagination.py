@@ -0,0 +1,83 @@
+"""Module for keyset pagination of adapter queries.
+
+A page is fetched by filtering on the sort keys of the last document of the
+previous page, instead of skipping documents, so every page is read through
+the index on the sort keys. The sort keys are ascending, and end with the
+unique id, so the order is total.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class Page:
+    """A page of at most limit documents, after the given sort key values.
+
+    The adapter sets next_after to the sort key values of the last document,
+    if there are more documents after the page.
+    """
+
+    limit: int
+    after: dict | None = None
+    next_after: dict | None = field(default=None, init=False)
+
+
+def page_sort(sort: list[tuple[str, int]]) -> list[tuple[str, int]]:
+    """Return the sort, with id added as the last key if not present."""
+    if any(key == "id" for key, _ in sort):
+        return sort
+    return [*sort, ("id", 1)]
+
+
+def keyset_filter(sort: list[tuple[str, int]], after: dict) -> dict:
+    """Return the filter for documents sorting after the given key values.
+
+    Null sorts before any other value, so after null is any value not null.
+    A key missing in after is taken to be null.
+    """
+    conditions = []
+    for i, (key, _) in enumerate(sort):
+        condition = {previous: after.get(previous) for previous, _ in sort[:i]}
+        value = after.get(key)
+        condition[key] = {"$ne": None} if value is None else {"$gt": value}
+        conditions.append(condition)
+    return {"$or": conditions}
+
+
+async def find_page(
+    collection: Any,
+    query: dict,
+    sort: list[tuple[str, int]],
+    page: Page | None,
+    projection: dict | None = None,
+) -> list[dict]:
+    """Find the documents matching query, sorted, within the page if given.
+
+    Without a page all documents are returned, in the given sort if any.
+    With a projection only the projected fields are returned. The sort keys
+    are read as well, for the cursor, and removed if not projected.
+    """
+    if page is None:
+        cursor = collection.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return await cursor.to_list(None)
+
+    sort = page_sort(sort)
+    extra_keys = []
+    if projection is not None:
+        extra_keys = [key for key, _ in sort if key not in projection]
+        projection = {**projection, **dict.fromkeys(extra_keys, 1)}
+    if page.after is not None:
+        query = {"$and": [query, keyset_filter(sort, page.after)]}
+    # One more than the limit, to know if there is a next page:
+    cursor = collection.find(query, projection).sort(sort).limit(page.limit + 1)
+    documents = await cursor.to_list(page.limit + 1)
+    if len(documents) > page.limit:
+        documents = documents[: page.limit]
+        page.next_after = {key: documents[-1].get(key) for key, _ in sort}
+    for document in documents:
+        for key in extra_keys:
+            document.pop(key, None)
+    return documents
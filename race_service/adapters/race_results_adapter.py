@@ -3,6 +3,19 @@
 from typing import Any
 
 from race_service.models import RaceResult
+from race_service.models.codec import decode_race_result
+
+from .documents import to_document
+from .instrumentation import instrument_adapter
+from .unit_of_work import (
+    get_from_identity_map,
+    load_from_document,
+    put_in_identity_map,
+    remove_from_identity_map,
+)
+from .versioning import VersionConflictError, next_version_document, version_filter
+
+COLLECTION = "race_results_collection"
 
 
 class RaceResultNotFoundError(Exception):
@@ -14,6 +27,7 @@ class RaceResultNotFoundError(Exception):
         super().__init__(message)
 
 
+@instrument_adapter
 class RaceResultsAdapter:
     """Class representing an adapter for race_results."""
 
@@ -24,7 +38,7 @@ class RaceResultsAdapter:
         """Get all race_results function."""
         cursor = db.race_results_collection.find()
         return [
-            RaceResult.from_dict(race_result)
+            decode_race_result(race_result)
             for race_result in await cursor.to_list(None)
         ]
 
@@ -35,7 +49,7 @@ class RaceResultsAdapter:
         """Get race_result by race_id function."""
         cursor = db.race_results_collection.find({"race_id": race_id})
         return [
-            RaceResult.from_dict(race_result)
+            decode_race_result(race_result)
             for race_result in await cursor.to_list(None)
         ]
 
@@ -48,7 +62,7 @@ class RaceResultsAdapter:
             {"$and": [{"race_id": race_id}, {"timing_point": timing_point}]}
         )
         return [
-            RaceResult.from_dict(race_result)
+            decode_race_result(race_result)
             for race_result in await cursor.to_list(None)
         ]
 
@@ -57,31 +71,85 @@ class RaceResultsAdapter:
         cls: Any, db: Any, race_result: RaceResult
     ) -> str:  # pragma: no cover
         """Create race_result function."""
-        return await db.race_results_collection.insert_one(race_result.to_dict())
+        result = await db.race_results_collection.insert_one(to_document(race_result))
+        put_in_identity_map(COLLECTION, race_result.id, race_result)
+        return result
 
     @classmethod
     async def get_race_result_by_id(
         cls: Any, db: Any, id_: str
     ) -> RaceResult:  # pragma: no cover
         """Get race_result function."""
+        mapped_race_result = get_from_identity_map(COLLECTION, id_)
+        if mapped_race_result is not None:
+            return mapped_race_result
         race_result = await db.race_results_collection.find_one({"id": id_})
         if race_result is None:
             msg = f"RaceResult with id {id_} not found"
             raise RaceResultNotFoundError(msg)
-        return RaceResult.from_dict(race_result)
+        return load_from_document(COLLECTION, race_result, decode_race_result)
+
+    @classmethod
+    async def get_race_results_by_ids(
+        cls: Any, db: Any, ids: list[str]
+    ) -> list[RaceResult]:  # pragma: no cover
+        """Get race_results by list of ids function, in the order of the ids.
+
+        Race results already loaded in the request are not read again, and
+        the others are read in one query.
+
+        Raises:
+            RaceResultNotFoundError: if a race_result is not found
+        """
+        race_results = {id_: get_from_identity_map(COLLECTION, id_) for id_ in ids}
+        missing = [id_ for id_, result in race_results.items() if result is None]
+        if missing:
+            cursor = db.race_results_collection.find({"id": {"$in": missing}})
+            for race_result in await cursor.to_list(None):
+                race_results[race_result["id"]] = load_from_document(
+                    COLLECTION, race_result, decode_race_result
+                )
+        for id_, race_result in race_results.items():
+            if race_result is None:
+                msg = f"RaceResult with id {id_} not found"
+                raise RaceResultNotFoundError(msg)
+        return [race_results[id_] for id_ in ids]
 
     @classmethod
     async def update_race_result(
         cls: Any, db: Any, id_: str, race_result: RaceResult
     ) -> str | None:  # pragma: no cover
-        """Get race_result function."""
-        return await db.race_results_collection.replace_one(
-            {"id": id_}, race_result.to_dict()
+        """Update race_result function.
+
+        Raises:
+            RaceResultNotFoundError: if no race_result with the given id is found
+            VersionConflictError: if the race_result has been changed since it was read
+        """
+        result = await db.race_results_collection.replace_one(
+            version_filter(id_, race_result.version), next_version_document(race_result)
         )
+        if result.matched_count == 0:
+            # The object may be stale, so it is not kept in the identity map:
+            remove_from_identity_map(COLLECTION, id_)
+            found = await db.race_results_collection.count_documents(
+                {"id": id_}, limit=1
+            )
+            if not found:
+                msg = f"RaceResult with id {id_} not found"
+                raise RaceResultNotFoundError(msg)
+            msg = (
+                f"RaceResult with id {id_} has been changed "
+                f"since version {race_result.version}."
+            )
+            raise VersionConflictError(msg)
+        race_result.version += 1
+        put_in_identity_map(COLLECTION, id_, race_result)
+        return result
 
     @classmethod
     async def delete_race_result(
         cls: Any, db: Any, id_: str
     ) -> str | None:  # pragma: no cover
         """Get race_result function."""
+        remove_from_identity_map(COLLECTION, id_)
         return await db.race_results_collection.delete_one({"id": id_})
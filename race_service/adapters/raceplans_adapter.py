@@ -2,7 +2,22 @@
 
 from typing import Any
 
+from pymongo.errors import DuplicateKeyError
+
 from race_service.models import Raceplan
+from race_service.models.codec import decode_raceplan
+
+from .documents import to_document
+from .instrumentation import instrument_adapter
+from .pagination import Page, find_page
+from .unit_of_work import (
+    get_from_identity_map,
+    load_from_document,
+    put_in_identity_map,
+    remove_from_identity_map,
+)
+
+COLLECTION = "raceplans_collection"
 
 
 class RaceplanNotFoundError(Exception):
@@ -14,34 +29,61 @@ class RaceplanNotFoundError(Exception):
         super().__init__(message)
 
 
+class DuplicateRaceplanError(Exception):
+    """Class representing custom exception for create method."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        # Call the base class constructor with the parameters it needs
+        super().__init__(message)
+
+
+@instrument_adapter
 class RaceplansAdapter:
     """Class representing an adapter for raceplans."""
 
     @classmethod
     async def get_all_raceplans(
-        cls: Any, db: Any
+        cls: Any, db: Any, page: Page | None = None
     ) -> list[Raceplan]:  # pragma: no cover
         """Get all raceplans function."""
-        cursor = db.raceplans_collection.find()
-        return [Raceplan.from_dict(raceplan) for raceplan in await cursor.to_list(None)]
+        documents = await find_page(db.raceplans_collection, {}, [], page)
+        return [decode_raceplan(raceplan) for raceplan in documents]
 
     @classmethod
     async def create_raceplan(
         cls: Any, db: Any, raceplan: Raceplan
     ) -> str:  # pragma: no cover
-        """Create raceplan function."""
-        return await db.raceplans_collection.insert_one(raceplan.to_dict())
+        """Create raceplan function.
+
+        Raises:
+            DuplicateRaceplanError: if the event already has a raceplan
+        """
+        try:
+            result = await db.raceplans_collection.insert_one(to_document(raceplan))
+        except DuplicateKeyError as e:
+            key_pattern = (e.details or {}).get("keyPattern", {})
+            if "event_id" in key_pattern:
+                msg = f'Event "{raceplan.event_id!r}" already has a raceplan.'
+            else:
+                msg = f"Raceplan with id {raceplan.id} already exists."
+            raise DuplicateRaceplanError(msg) from e
+        put_in_identity_map(COLLECTION, raceplan.id, raceplan)  # type: ignore [reportArgumentType]
+        return result
 
     @classmethod
     async def get_raceplan_by_id(
         cls: Any, db: Any, id_: str
     ) -> Raceplan:  # pragma: no cover
         """Get raceplan function."""
+        mapped_raceplan = get_from_identity_map(COLLECTION, id_)
+        if mapped_raceplan is not None:
+            return mapped_raceplan
         result = await db.raceplans_collection.find_one({"id": id_})
         if not result:
             msg = f"Raceplan with id {id_} not found."
             raise RaceplanNotFoundError(msg)
-        return Raceplan.from_dict(result)
+        return load_from_document(COLLECTION, result, decode_raceplan)
 
     @classmethod
     async def get_raceplans_by_event_id(
@@ -51,16 +93,35 @@ class RaceplansAdapter:
         raceplans: list[Raceplan] = []
         result = await db.raceplans_collection.find_one({"event_id": event_id})
         if result:
-            raceplans.append(Raceplan.from_dict(result))
+            raceplans.append(decode_raceplan(result))
         return raceplans
 
     @classmethod
     async def update_raceplan(
         cls: Any, db: Any, id_: str, raceplan: Raceplan
     ) -> str | None:  # pragma: no cover
-        """Get raceplan function."""
-        return await db.raceplans_collection.replace_one(
-            {"id": id_}, raceplan.to_dict()
+        """Update raceplan function.
+
+        Raises:
+            RaceplanNotFoundError: if no raceplan with the given id is found
+        """
+        result = await db.raceplans_collection.replace_one(
+            {"id": id_}, to_document(raceplan)
+        )
+        if result.matched_count == 0:
+            msg = f"Raceplan with id {id_} not found."
+            raise RaceplanNotFoundError(msg)
+        put_in_identity_map(COLLECTION, id_, raceplan)
+        return result
+
+    @classmethod
+    async def add_to_no_of_contestants(
+        cls: Any, db: Any, id_: str, no_of_contestants: int
+    ) -> None:  # pragma: no cover
+        """Add to the raceplan's no_of_contestants in one update."""
+        remove_from_identity_map(COLLECTION, id_)
+        await db.raceplans_collection.update_one(
+            {"id": id_}, {"$inc": {"no_of_contestants": no_of_contestants}}
         )
 
     @classmethod
@@ -68,4 +129,5 @@ class RaceplansAdapter:
         cls: Any, db: Any, id_: str
     ) -> str | None:  # pragma: no cover
         """Get raceplan function."""
+        remove_from_identity_map(COLLECTION, id_)
         return await db.raceplans_collection.delete_one({"id": id_})
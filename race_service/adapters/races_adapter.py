@@ -2,7 +2,26 @@
 
 from typing import Any
 
+from pymongo import ReturnDocument
+
 from race_service.models import IndividualSprintRace, IntervalStartRace, Race
+from race_service.models.codec import (
+    decode_individual_sprint_race,
+    decode_interval_start_race,
+)
+
+from .documents import projection, to_document
+from .instrumentation import instrument_adapter
+from .pagination import Page, find_page
+from .unit_of_work import (
+    get_from_identity_map,
+    load_from_document,
+    put_in_identity_map,
+    remove_from_identity_map,
+)
+from .versioning import VersionConflictError, next_version_document, version_filter
+
+COLLECTION = "races_collection"
 
 
 class RaceNotFoundError(Exception):
@@ -23,101 +42,117 @@ class NotSupportedRaceDatatypeError(Exception):
         super().__init__(message)
 
 
+def race_from_dict(
+    race: dict,
+) -> IndividualSprintRace | IntervalStartRace:  # pragma: no cover
+    """Create race of the correct datatype from dict."""
+    if race["datatype"] == "interval_start":
+        return decode_interval_start_race(race)
+    if race["datatype"] == "individual_sprint":
+        return decode_individual_sprint_race(race)
+    msg = f"Datatype {race['datatype']} not supported."
+    raise NotSupportedRaceDatatypeError(msg)
+
+
+@instrument_adapter
 class RacesAdapter:
     """Class representing an adapter for races."""
 
     @classmethod
     async def get_all_races(
-        cls: Any, db: Any
+        cls: Any, db: Any, page: Page | None = None
     ) -> list[IndividualSprintRace | IntervalStartRace]:  # pragma: no cover
         """Get all races function."""
         races: list[IndividualSprintRace | IntervalStartRace] = []
 
-        cursor = db.races_collection.find()
+        documents = await find_page(db.races_collection, {}, [], page)
 
-        for race in await cursor.to_list(None):
-            if race["datatype"] == "interval_start":
-                races.append(IntervalStartRace.from_dict(race))
-            elif race["datatype"] == "individual_sprint":
-                races.append(IndividualSprintRace.from_dict(race))
-            else:
-                msg = f"Datatype {race['datatype']} not supported."
-                raise NotSupportedRaceDatatypeError(msg)
+        races.extend(race_from_dict(race) for race in documents)
 
         return races
 
+    @classmethod
+    async def get_race_documents(
+        cls: Any,
+        db: Any,
+        fields: list[str],
+        event_id: str | None = None,
+        raceclass: str | None = None,
+        page: Page | None = None,
+    ) -> list[dict]:  # pragma: no cover
+        """Get the given fields of races, optionally of an event and raceclass.
+
+        The documents are returned as stored, without creating races.
+        """
+        query: dict = {}
+        if event_id is not None:
+            query["event_id"] = event_id
+            if raceclass is not None:
+                query["raceclass"] = raceclass
+        sort = [("order", 1)] if event_id is not None else []
+        return await find_page(
+            db.races_collection, query, sort, page, projection(fields)
+        )
+
     @classmethod
     async def create_race(cls: Any, db: Any, race: Race) -> str:  # pragma: no cover
         """Create race function."""
-        return await db.races_collection.insert_one(race.to_dict())
+        result = await db.races_collection.insert_one(to_document(race))
+        put_in_identity_map(COLLECTION, race.id, race)
+        return result
 
     @classmethod
     async def get_race_by_id(
         cls: Any, db: Any, id_: str
     ) -> IndividualSprintRace | IntervalStartRace:  # pragma: no cover
         """Get race function."""
+        mapped_race = get_from_identity_map(COLLECTION, id_)
+        if mapped_race is not None:
+            return mapped_race
         _race = await db.races_collection.find_one({"id": id_})
         if not _race:
             msg = f"Race with id {id_} not found."
             raise RaceNotFoundError(msg)
 
-        race: IndividualSprintRace | IntervalStartRace
-        if _race["datatype"] == "interval_start":
-            race = IntervalStartRace.from_dict(_race)
-        elif _race["datatype"] == "individual_sprint":
-            race = IndividualSprintRace.from_dict(_race)
-        else:
-            msg = f"Datatype {_race['datatype']} not supported."
-            raise NotSupportedRaceDatatypeError(msg)
-
-        return race
+        return load_from_document(COLLECTION, _race, race_from_dict)
 
     @classmethod
     async def get_races_by_event_id(
-        cls: Any, db: Any, event_id: str
+        cls: Any, db: Any, event_id: str, page: Page | None = None
     ) -> list[
         IndividualSprintRace | IntervalStartRace
     ]:  # pragma: no cover:  # pragma: no cover
         """Get races by event_id function."""
         races: list[IndividualSprintRace | IntervalStartRace] = []
 
-        cursor = db.races_collection.find({"event_id": event_id}).sort([("order", 1)])
+        documents = await find_page(
+            db.races_collection, {"event_id": event_id}, [("order", 1)], page
+        )
 
-        for race in await cursor.to_list(None):
-            if race["datatype"] == "interval_start":
-                races.append(IntervalStartRace.from_dict(race))
-            elif race["datatype"] == "individual_sprint":
-                races.append(IndividualSprintRace.from_dict(race))
-            else:
-                msg = f"Datatype {race['datatype']} not supported."
-                raise NotSupportedRaceDatatypeError(msg)
+        races.extend(race_from_dict(race) for race in documents)
 
         return races
 
     @classmethod
     async def get_races_by_event_id_and_raceclass(
-        cls: Any, db: Any, event_id: str, raceclass: str
+        cls: Any, db: Any, event_id: str, raceclass: str, page: Page | None = None
     ) -> list[IndividualSprintRace | IntervalStartRace]:  # pragma: no cover
         """Get races by event_id and raceclass function."""
         races: list[IndividualSprintRace | IntervalStartRace] = []
 
-        cursor = db.races_collection.find(
+        documents = await find_page(
+            db.races_collection,
             {
                 "$and": [
                     {"event_id": event_id},
                     {"raceclass": raceclass},
                 ]
-            }
-        ).sort([("order", 1)])
-
-        for race in await cursor.to_list(None):
-            if race["datatype"] == "interval_start":
-                races.append(IntervalStartRace.from_dict(race))
-            elif race["datatype"] == "individual_sprint":
-                races.append(IndividualSprintRace.from_dict(race))
-            else:
-                msg = f"Datatype {race['datatype']} not supported."
-                raise NotSupportedRaceDatatypeError(msg)
+            },
+            [("order", 1)],
+            page,
+        )
+
+        races.extend(race_from_dict(race) for race in documents)
 
         return races
 
@@ -132,14 +167,7 @@ class RacesAdapter:
             [("order", 1)]
         )
 
-        for race in await cursor.to_list(None):
-            if race["datatype"] == "interval_start":
-                races.append(IntervalStartRace.from_dict(race))
-            elif race["datatype"] == "individual_sprint":
-                races.append(IndividualSprintRace.from_dict(race))
-            else:
-                msg = f"Datatype {race['datatype']} not supported."
-                raise NotSupportedRaceDatatypeError(msg)
+        races.extend(race_from_dict(race) for race in await cursor.to_list(None))
 
         return races
 
@@ -147,12 +175,110 @@ class RacesAdapter:
     async def update_race(
         cls: Any, db: Any, id_: str, race: Race
     ) -> str | None:  # pragma: no cover
-        """Get race function."""
-        return await db.races_collection.replace_one({"id": id_}, race.to_dict())
+        """Update race function.
+
+        Raises:
+            RaceNotFoundError: if no race with the given id is found
+            VersionConflictError: if the race has been changed since it was read
+        """
+        result = await db.races_collection.replace_one(
+            version_filter(id_, race.version), next_version_document(race)
+        )
+        if result.matched_count == 0:
+            # The object may be stale, so it is not kept in the identity map:
+            remove_from_identity_map(COLLECTION, id_)
+            found = await db.races_collection.count_documents({"id": id_}, limit=1)
+            if not found:
+                msg = f"Race with id {id_} not found."
+                raise RaceNotFoundError(msg)
+            msg = f"Race with id {id_} has been changed since version {race.version}."
+            raise VersionConflictError(msg)
+        race.version += 1
+        put_in_identity_map(COLLECTION, id_, race)
+        return result
+
+    @classmethod
+    async def add_start_entry_if_not_full(
+        cls: Any, db: Any, id_: str, start_entry_id: str
+    ) -> Race | None:  # pragma: no cover
+        """Add start-entry to the race in one conditional update, if not full.
+
+        Returns:
+            The updated race, or None if the race is not found or is full.
+        """
+        race = await db.races_collection.find_one_and_update(
+            {
+                "id": id_,
+                "start_entries": {"$ne": start_entry_id},
+                "$expr": {
+                    "$lt": [{"$size": "$start_entries"}, "$max_no_of_contestants"]
+                },
+            },
+            {
+                "$push": {"start_entries": start_entry_id},
+                "$inc": {"no_of_contestants": 1, "version": 1},
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        if race is None:
+            return None
+        remove_from_identity_map(COLLECTION, id_)
+        return load_from_document(COLLECTION, race, race_from_dict)
+
+    @classmethod
+    async def add_start_entries(
+        cls: Any, db: Any, id_: str, start_entry_ids: list[str]
+    ) -> None:  # pragma: no cover
+        """Add start-entries to the race in one update.
+
+        The ids are appended whatever the version of the race, so the update
+        does not conflict with other writes to the race.
+
+        Raises:
+            RaceNotFoundError: if no race with the given id is found
+        """
+        remove_from_identity_map(COLLECTION, id_)
+        result = await db.races_collection.update_one(
+            {"id": id_},
+            {
+                "$push": {"start_entries": {"$each": start_entry_ids}},
+                "$inc": {"version": 1},
+            },
+        )
+        if result.matched_count == 0:
+            msg = f"Race with id {id_} not found."
+            raise RaceNotFoundError(msg)
+
+    @classmethod
+    async def remove_all_start_entries(
+        cls: Any, db: Any, ids: list[str]
+    ) -> None:  # pragma: no cover
+        """Remove all start-entries from the races with the given ids in one update."""
+        for id_ in ids:
+            remove_from_identity_map(COLLECTION, id_)
+        await db.races_collection.update_many(
+            {"id": {"$in": ids}},
+            {"$set": {"start_entries": []}, "$inc": {"version": 1}},
+        )
+
+    @classmethod
+    async def remove_start_entry(
+        cls: Any, db: Any, id_: str, start_entry_id: str
+    ) -> None:  # pragma: no cover
+        """Remove start-entry from the race in one update."""
+        remove_from_identity_map(COLLECTION, id_)
+        await db.races_collection.update_one(
+            {"id": id_, "start_entries": start_entry_id},
+            {
+                "$pull": {"start_entries": start_entry_id},
+                "$inc": {"no_of_contestants": -1, "version": 1},
+            },
+        )
 
     @classmethod
     async def delete_race(
         cls: Any, db: Any, id_: str
     ) -> str | None:  # pragma: no cover
         """Get race function."""
+        remove_from_identity_map(COLLECTION, id_)
         return await db.races_collection.delete_one({"id": id_})
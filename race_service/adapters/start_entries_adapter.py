@@ -2,7 +2,21 @@
 
 from typing import Any
 
+from pymongo.errors import DuplicateKeyError
+
 from race_service.models import StartEntry
+from race_service.models.codec import decode_start_entry
+
+from .documents import to_document
+from .instrumentation import instrument_adapter
+from .unit_of_work import (
+    get_from_identity_map,
+    load_from_document,
+    put_in_identity_map,
+    remove_from_identity_map,
+)
+
+COLLECTION = "start_entries_collection"
 
 
 class StartEntryNotFoundError(Exception):
@@ -14,6 +28,16 @@ class StartEntryNotFoundError(Exception):
         super().__init__(message)
 
 
+class DuplicateStartEntryError(Exception):
+    """Class representing custom exception for create method."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        # Call the base class constructor with the parameters it needs
+        super().__init__(message)
+
+
+@instrument_adapter
 class StartEntriesAdapter:
     """Class representing an adapter for start_entries."""
 
@@ -26,7 +50,7 @@ class StartEntriesAdapter:
             [("starting_position", 1)]
         )
         return [
-            StartEntry.from_dict(start_entry)
+            decode_start_entry(start_entry)
             for start_entry in await cursor.to_list(None)
         ]
 
@@ -44,7 +68,7 @@ class StartEntriesAdapter:
             }
         ).sort([("starting_position", 1)])
         return [
-            StartEntry.from_dict(start_entry)
+            decode_start_entry(start_entry)
             for start_entry in await cursor.to_list(None)
         ]
 
@@ -52,32 +76,89 @@ class StartEntriesAdapter:
     async def create_start_entry(
         cls: Any, db: Any, start_entry: StartEntry
     ) -> str:  # pragma: no cover
-        """Create start_entry function."""
-        return await db.start_entries_collection.insert_one(start_entry.to_dict())
+        """Create start_entry function.
+
+        Raises:
+            DuplicateStartEntryError: if the bib or starting position is taken
+        """
+        try:
+            result = await db.start_entries_collection.insert_one(
+                to_document(start_entry)
+            )
+        except DuplicateKeyError as e:
+            key_pattern = (e.details or {}).get("keyPattern", {})
+            if "bib" in key_pattern:
+                msg = f"Bib {start_entry.bib} is already in the race."
+            elif "starting_position" in key_pattern:
+                msg = f"Starting_position {start_entry.starting_position} is taken."
+            else:
+                msg = f"StartEntry with id {start_entry.id} already exists."
+            raise DuplicateStartEntryError(msg) from e
+        put_in_identity_map(COLLECTION, start_entry.id, start_entry)  # type: ignore [reportArgumentType]
+        return result
 
     @classmethod
     async def get_start_entry_by_id(
         cls: Any, db: Any, id_: str
     ) -> StartEntry:  # pragma: no cover
         """Get start_entry function."""
+        mapped_start_entry = get_from_identity_map(COLLECTION, id_)
+        if mapped_start_entry is not None:
+            return mapped_start_entry
         start_entry = await db.start_entries_collection.find_one({"id": id_})
         if not start_entry:
             msg = f"StartEntry with id {id_} not found"
             raise StartEntryNotFoundError(msg)
-        return StartEntry.from_dict(start_entry)
+        return load_from_document(COLLECTION, start_entry, decode_start_entry)
+
+    @classmethod
+    async def get_start_entries_by_ids(
+        cls: Any, db: Any, ids: list[str]
+    ) -> list[StartEntry]:  # pragma: no cover
+        """Get start_entries by list of ids function, in the order of the ids.
+
+        Start entries already loaded in the request are not read again, and
+        the others are read in one query.
+
+        Raises:
+            StartEntryNotFoundError: if a start_entry is not found
+        """
+        start_entries = {id_: get_from_identity_map(COLLECTION, id_) for id_ in ids}
+        missing = [id_ for id_, entry in start_entries.items() if entry is None]
+        if missing:
+            cursor = db.start_entries_collection.find({"id": {"$in": missing}})
+            for start_entry in await cursor.to_list(None):
+                start_entries[start_entry["id"]] = load_from_document(
+                    COLLECTION, start_entry, decode_start_entry
+                )
+        for id_, start_entry in start_entries.items():
+            if start_entry is None:
+                msg = f"StartEntry with id {id_} not found"
+                raise StartEntryNotFoundError(msg)
+        return [start_entries[id_] for id_ in ids]
 
     @classmethod
     async def update_start_entry(
         cls: Any, db: Any, id_: str, start_entry: StartEntry
     ) -> str | None:  # pragma: no cover
-        """Get start_entry function."""
-        return await db.start_entries_collection.replace_one(
-            {"id": id_}, start_entry.to_dict()
+        """Update start_entry function.
+
+        Raises:
+            StartEntryNotFoundError: if no start_entry with the given id is found
+        """
+        result = await db.start_entries_collection.replace_one(
+            {"id": id_}, to_document(start_entry)
         )
+        if result.matched_count == 0:
+            msg = f"StartEntry with id {id_} not found"
+            raise StartEntryNotFoundError(msg)
+        put_in_identity_map(COLLECTION, id_, start_entry)
+        return result
 
     @classmethod
     async def delete_start_entry(
         cls: Any, db: Any, id_: str
     ) -> str | None:  # pragma: no cover
         """Get start_entry function."""
+        remove_from_identity_map(COLLECTION, id_)
         return await db.start_entries_collection.delete_one({"id": id_})
@@ -0,0 +1,200 @@
+"""Module for start_entry moves adapter."""
+
+from typing import Any
+
+from pymongo.errors import DuplicateKeyError
+
+from race_service.models import StartEntry
+
+from .documents import to_document
+from .instrumentation import instrument_adapter
+from .races_adapter import COLLECTION as RACES_COLLECTION
+from .start_entries_adapter import COLLECTION, DuplicateStartEntryError
+from .transactions import transaction
+from .unit_of_work import put_in_identity_map, remove_from_identity_map
+
+
+class RaceIsFullError(Exception):
+    """Class representing custom exception for move method."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        # Call the base class constructor with the parameters it needs
+        super().__init__(message)
+
+
+def _duplicate_message(
+    e: DuplicateKeyError, start_entry: StartEntry
+) -> str:  # pragma: no cover
+    """Return the message of the unique index the start_entry violates."""
+    key_pattern = (e.details or {}).get("keyPattern", {})
+    if "bib" in key_pattern:
+        return f"Bib {start_entry.bib} is already in race {start_entry.race_id}."
+    return (
+        f"Starting_position {start_entry.starting_position} "
+        f"is taken in race {start_entry.race_id}."
+    )
+
+
+def _placement(start_entry: StartEntry) -> dict:  # pragma: no cover
+    """Return the fields placing the start_entry in a race."""
+    document = to_document(start_entry)
+    return {
+        "race_id": document["race_id"],
+        "starting_position": document["starting_position"],
+        "scheduled_start_time": document["scheduled_start_time"],
+    }
+
+
+@instrument_adapter
+class StartEntryMovesAdapter:
+    """Class representing an adapter for moving start_entries between races.
+
+    The writes to start_entries and races are done in one transaction where
+    the server supports it. Otherwise they are done in order, so that a
+    failing write leaves nothing to undo, or undoes the writes before it.
+    """
+
+    @classmethod
+    async def move_start_entry(
+        cls: Any, db: Any, start_entry: StartEntry, from_race_id: str
+    ) -> None:  # pragma: no cover
+        """Move start_entry from race with from_race_id to its race_id.
+
+        The start_entry must have its new race_id, starting_position and
+        scheduled_start_time set.
+
+        Raises:
+            RaceIsFullError: if the race it is moved to is full
+            DuplicateStartEntryError: if the bib or starting position is taken
+        """
+        to_race_id = start_entry.race_id
+        moved = to_race_id != from_race_id
+        remove_from_identity_map(RACES_COLLECTION, from_race_id)
+        remove_from_identity_map(RACES_COLLECTION, to_race_id)
+        remove_from_identity_map(COLLECTION, start_entry.id)  # type: ignore [reportArgumentType]
+        async with transaction(db) as session:
+            # Reserve the slot in the race it is moved to:
+            if moved:
+                result = await db.races_collection.update_one(
+                    {
+                        "id": to_race_id,
+                        "start_entries": {"$ne": start_entry.id},
+                        "$expr": {
+                            "$lt": [
+                                {"$size": "$start_entries"},
+                                "$max_no_of_contestants",
+                            ]
+                        },
+                    },
+                    {
+                        "$push": {"start_entries": start_entry.id},
+                        "$inc": {"no_of_contestants": 1, "version": 1},
+                    },
+                    session=session,
+                )
+                if result.matched_count == 0:
+                    msg = f"Race {to_race_id} is full."
+                    raise RaceIsFullError(msg)
+            # Place the start_entry, where the unique indexes reject taken values:
+            try:
+                await db.start_entries_collection.update_one(
+                    {"id": start_entry.id},
+                    {"$set": _placement(start_entry)},
+                    session=session,
+                )
+            except DuplicateKeyError as e:
+                if moved and session is None:
+                    await db.races_collection.update_one(
+                        {"id": to_race_id, "start_entries": start_entry.id},
+                        {
+                            "$pull": {"start_entries": start_entry.id},
+                            "$inc": {"no_of_contestants": -1, "version": 1},
+                        },
+                    )
+                raise DuplicateStartEntryError(
+                    _duplicate_message(e, start_entry)
+                ) from e
+            # Release the slot in the race it is moved from:
+            if moved:
+                await db.races_collection.update_one(
+                    {"id": from_race_id, "start_entries": start_entry.id},
+                    {
+                        "$pull": {"start_entries": start_entry.id},
+                        "$inc": {"no_of_contestants": -1, "version": 1},
+                    },
+                    session=session,
+                )
+        put_in_identity_map(COLLECTION, start_entry.id, start_entry)  # type: ignore [reportArgumentType]
+
+    @classmethod
+    async def swap_start_entries(
+        cls: Any, db: Any, first: StartEntry, second: StartEntry
+    ) -> None:  # pragma: no cover
+        """Swap the races and starting positions of two start_entries.
+
+        As race_id and starting_position is unique, the first start_entry is
+        parked on a negative starting_position while the second takes its
+        place.
+
+        Raises:
+            DuplicateStartEntryError: if a bib would be twice in a race
+        """
+        first_placement = _placement(first)
+        second_placement = _placement(second)
+        for start_entry in (first, second):
+            remove_from_identity_map(RACES_COLLECTION, start_entry.race_id)
+            remove_from_identity_map(COLLECTION, start_entry.id)  # type: ignore [reportArgumentType]
+        async with transaction(db) as session:
+            try:
+                await db.start_entries_collection.update_one(
+                    {"id": first.id},
+                    {"$set": {"starting_position": -1 - first.starting_position}},
+                    session=session,
+                )
+                await db.start_entries_collection.update_one(
+                    {"id": second.id}, {"$set": first_placement}, session=session
+                )
+                await db.start_entries_collection.update_one(
+                    {"id": first.id}, {"$set": second_placement}, session=session
+                )
+            except DuplicateKeyError as e:
+                if session is None:
+                    await db.start_entries_collection.update_one(
+                        {"id": second.id}, {"$set": second_placement}
+                    )
+                    await db.start_entries_collection.update_one(
+                        {"id": first.id}, {"$set": first_placement}
+                    )
+                msg = (
+                    f"Cannot swap bibs {first.bib} and {second.bib}: "
+                    "a bib would be twice in the same race."
+                )
+                raise DuplicateStartEntryError(msg) from e
+            # Swap the ids in the races' start_entries:
+            if first.race_id == second.race_id:
+                await db.races_collection.update_one(
+                    {"id": first.race_id},
+                    {
+                        "$set": {
+                            "start_entries.$[first]": second.id,
+                            "start_entries.$[second]": first.id,
+                        },
+                        "$inc": {"version": 1},
+                    },
+                    array_filters=[{"first": first.id}, {"second": second.id}],
+                    session=session,
+                )
+            else:
+                for race_id, old_id, new_id in (
+                    (first.race_id, first.id, second.id),
+                    (second.race_id, second.id, first.id),
+                ):
+                    await db.races_collection.update_one(
+                        {"id": race_id, "start_entries": old_id},
+                        {
+                            "$set": {"start_entries.$": new_id},
+                            "$inc": {"version": 1},
+                        },
+                        session=session,
+                    )
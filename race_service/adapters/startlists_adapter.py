@@ -2,7 +2,23 @@
 
 from typing import Any
 
+from pymongo.errors import DuplicateKeyError
+
 from race_service.models import Startlist
+from race_service.models.codec import decode_startlist
+
+from .documents import projection, to_document
+from .instrumentation import instrument_adapter
+from .pagination import Page, find_page
+from .unit_of_work import (
+    get_from_identity_map,
+    load_from_document,
+    put_in_identity_map,
+    remove_from_identity_map,
+)
+from .versioning import VersionConflictError, next_version_document, version_filter
+
+COLLECTION = "startlists_collection"
 
 
 class StartlistNotFoundError(Exception):
@@ -14,36 +30,78 @@ class StartlistNotFoundError(Exception):
         super().__init__(message)
 
 
+class DuplicateStartlistError(Exception):
+    """Class representing custom exception for create method."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        # Call the base class constructor with the parameters it needs
+        super().__init__(message)
+
+
+@instrument_adapter
 class StartlistsAdapter:
     """Class representing an adapter for startlists."""
 
     @classmethod
     async def get_all_startlists(
-        cls: Any, db: Any
+        cls: Any, db: Any, page: Page | None = None
     ) -> list[Startlist]:  # pragma: no cover
         """Get all startlists function."""
-        cursor = db.startlists_collection.find()
-        return [
-            Startlist.from_dict(startlist) for startlist in await cursor.to_list(None)
-        ]
+        documents = await find_page(db.startlists_collection, {}, [], page)
+        return [decode_startlist(startlist) for startlist in documents]
+
+    @classmethod
+    async def get_startlist_documents(
+        cls: Any,
+        db: Any,
+        fields: list[str],
+        event_id: str | None = None,
+        page: Page | None = None,
+    ) -> list[dict]:  # pragma: no cover
+        """Get the given fields of startlists, optionally of an event.
+
+        The documents are returned as stored, without creating startlists.
+        """
+        query = {} if event_id is None else {"event_id": event_id}
+        return await find_page(
+            db.startlists_collection, query, [], page, projection(fields)
+        )
 
     @classmethod
     async def create_startlist(
         cls: Any, db: Any, startlist: Startlist
     ) -> str:  # pragma: no cover
-        """Create startlist function."""
-        return await db.startlists_collection.insert_one(startlist.to_dict())
+        """Create startlist function.
+
+        Raises:
+            DuplicateStartlistError: if the event already has a startlist
+        """
+        try:
+            result = await db.startlists_collection.insert_one(to_document(startlist))
+        except DuplicateKeyError as e:
+            key_pattern = (e.details or {}).get("keyPattern", {})
+            if "event_id" in key_pattern:
+                msg = f'Event "{startlist.event_id!r}" already has a startlist.'
+            else:
+                msg = f"Startlist with id {startlist.id} already exists."
+            raise DuplicateStartlistError(msg) from e
+        put_in_identity_map(COLLECTION, startlist.id, startlist)  # type: ignore [reportArgumentType]
+        return result
 
     @classmethod
     async def get_startlist_by_id(
         cls: Any, db: Any, id_: str
     ) -> Startlist:  # pragma: no cover
         """Get startlist function."""
+        mapped_startlist = get_from_identity_map(COLLECTION, id_)
+        if mapped_startlist is not None:
+            return mapped_startlist
         startlist = await db.startlists_collection.find_one({"id": id_})
         if startlist is None:
             msg = f"Startlist with id {id_} not found."
             raise StartlistNotFoundError(msg)
-        return Startlist.from_dict(startlist)
+        return load_from_document(COLLECTION, startlist, decode_startlist)
 
     @classmethod
     async def get_startlists_by_event_id(
@@ -51,22 +109,62 @@ class StartlistsAdapter:
     ) -> list[Startlist]:  # pragma: no cover
         """Get startlists by event_id function."""
         cursor = db.startlists_collection.find({"event_id": event_id})
-        return [
-            Startlist.from_dict(startlist) for startlist in await cursor.to_list(None)
-        ]
+        return [decode_startlist(startlist) for startlist in await cursor.to_list(None)]
 
     @classmethod
     async def update_startlist(
         cls: Any, db: Any, id_: str, startlist: Startlist
     ) -> str | None:  # pragma: no cover
-        """Get startlist function."""
-        return await db.startlists_collection.replace_one(
-            {"id": id_}, startlist.to_dict()
+        """Update startlist function.
+
+        Raises:
+            StartlistNotFoundError: if no startlist with the given id is found
+            VersionConflictError: if the startlist has been changed since it was read
+        """
+        result = await db.startlists_collection.replace_one(
+            version_filter(id_, startlist.version), next_version_document(startlist)
         )
+        if result.matched_count == 0:
+            # The object may be stale, so it is not kept in the identity map:
+            remove_from_identity_map(COLLECTION, id_)
+            found = await db.startlists_collection.count_documents({"id": id_}, limit=1)
+            if not found:
+                msg = f"Startlist with id {id_} not found."
+                raise StartlistNotFoundError(msg)
+            msg = (
+                f"Startlist with id {id_} has been changed "
+                f"since version {startlist.version}."
+            )
+            raise VersionConflictError(msg)
+        startlist.version += 1
+        put_in_identity_map(COLLECTION, id_, startlist)
+        return result
+
+    @classmethod
+    async def add_start_entry(
+        cls: Any, db: Any, id_: str, start_entry_id: str
+    ) -> None:  # pragma: no cover
+        """Add start-entry to the startlist in one update.
+
+        Raises:
+            StartlistNotFoundError: if no startlist with the given id is found
+        """
+        remove_from_identity_map(COLLECTION, id_)
+        result = await db.startlists_collection.update_one(
+            {"id": id_},
+            {
+                "$push": {"start_entries": start_entry_id},
+                "$inc": {"no_of_contestants": 1, "version": 1},
+            },
+        )
+        if result.matched_count == 0:
+            msg = f"Startlist with id {id_} not found."
+            raise StartlistNotFoundError(msg)
 
     @classmethod
     async def delete_startlist(
         cls: Any, db: Any, id_: str
     ) -> str | None:  # pragma: no cover
         """Get startlist function."""
+        remove_from_identity_map(COLLECTION, id_)
         return await db.startlists_collection.delete_one({"id": id_})
@@ -0,0 +1,22 @@
+"""Module for reading query results in batches."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+DEFAULT_BATCH_SIZE = 500
+
+
+async def find_in_batches(
+    collection: Any,
+    query: dict,
+    sort: list[tuple[str, int]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[list[dict]]:
+    """Yield the documents matching query, sorted, in lists of batch_size.
+
+    The cursor fetches one batch from the server at a time, so only one
+    batch is held in memory.
+    """
+    cursor = collection.find(query).sort(sort).batch_size(batch_size)
+    while documents := await cursor.to_list(batch_size):
+        yield documents
@@ -1,8 +1,25 @@
 """Module for time_event adapter."""
 
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Any
 
 from race_service.models import TimeEvent
+from race_service.models.codec import decode_time_event
+from race_service.models.datetimes import to_utc
+
+from .documents import projection, to_document
+from .instrumentation import instrument_adapter
+from .pagination import Page, find_page
+from .streaming import DEFAULT_BATCH_SIZE, find_in_batches
+from .unit_of_work import (
+    get_from_identity_map,
+    load_from_document,
+    put_in_identity_map,
+    remove_from_identity_map,
+)
+
+COLLECTION = "time_events_collection"
 
 
 class TimeEventNotFoundError(Exception):
@@ -14,93 +31,222 @@ class TimeEventNotFoundError(Exception):
         super().__init__(message)
 
 
+@instrument_adapter
 class TimeEventsAdapter:
     """Class representing an adapter for time_events."""
 
     @classmethod
     async def get_all_time_events(
-        cls: Any, db: Any
+        cls: Any, db: Any, page: Page | None = None
     ) -> list[TimeEvent]:  # pragma: no cover
         """Get all time_events function."""
-        cursor = db.time_events_collection.find()
-        return [
-            TimeEvent.from_dict(time_event) for time_event in await cursor.to_list(None)
-        ]
+        documents = await find_page(db.time_events_collection, {}, [], page)
+        return [decode_time_event(time_event) for time_event in documents]
+
+    @classmethod
+    async def get_time_event_documents(  # noqa: PLR0913
+        cls: Any,
+        db: Any,
+        fields: list[str],
+        event_id: str | None = None,
+        timing_point: str | None = None,
+        bib: int | None = None,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        race_id: str | None = None,
+        page: Page | None = None,
+    ) -> list[dict]:  # pragma: no cover
+        """Get the given fields of time_events matching the given criteria.
+
+        The documents are returned as stored, without creating time_events.
+        They are sorted as by the get_time_events methods with the same
+        criteria.
+        """
+        query: dict = {}
+        sort: list[tuple[str, int]] = []
+        if event_id is not None:
+            query["event_id"] = event_id
+        if timing_point is not None:
+            query["timing_point"] = timing_point
+            sort = [("rank", 1)]
+        if bib is not None:
+            query["bib"] = bib
+            sort = [("id", 1)]
+        if from_ is not None or to is not None:
+            query["registration_time"] = {}
+            if from_ is not None:
+                query["registration_time"]["$gte"] = to_utc(from_)
+            if to is not None:
+                query["registration_time"]["$lt"] = to_utc(to)
+            sort = [("registration_time", 1)]
+        if race_id is not None:
+            query["race_id"] = race_id
+        return await find_page(
+            db.time_events_collection, query, sort, page, projection(fields)
+        )
 
     @classmethod
     async def create_time_event(
         cls: Any, db: Any, time_event: TimeEvent
     ) -> str:  # pragma: no cover
         """Create time_event function."""
-        return await db.time_events_collection.insert_one(time_event.to_dict())
+        result = await db.time_events_collection.insert_one(to_document(time_event))
+        put_in_identity_map(COLLECTION, time_event.id, time_event)  # type: ignore [reportArgumentType]
+        return result
 
     @classmethod
     async def get_time_event_by_id(
         cls: Any, db: Any, id_: str
     ) -> TimeEvent:  # pragma: no cover
         """Get time_event function."""
+        mapped_time_event = get_from_identity_map(COLLECTION, id_)
+        if mapped_time_event is not None:
+            return mapped_time_event
         time_event = await db.time_events_collection.find_one({"id": id_})
         if time_event is None:
             msg = f"TimeEvent with id {id_} not found in database."
             raise TimeEventNotFoundError(msg)
-        return TimeEvent.from_dict(time_event)
+        return load_from_document(COLLECTION, time_event, decode_time_event)
+
+    @classmethod
+    async def get_time_events_by_ids(
+        cls: Any, db: Any, ids: list[str]
+    ) -> list[TimeEvent]:  # pragma: no cover
+        """Get time_events by list of ids function, in the order of the ids.
+
+        Raises:
+            TimeEventNotFoundError: if a time_event is not found
+        """
+        if not ids:
+            return []
+        cursor = db.time_events_collection.find({"id": {"$in": ids}})
+        time_events = {
+            time_event["id"]: load_from_document(
+                COLLECTION, time_event, decode_time_event
+            )
+            for time_event in await cursor.to_list(None)
+        }
+        missing = [id_ for id_ in ids if id_ not in time_events]
+        if missing:
+            msg = f"TimeEvents with ids {missing} not found in database."
+            raise TimeEventNotFoundError(msg)
+        return [time_events[id_] for id_ in ids]
 
     @classmethod
     async def get_time_events_by_event_id(
-        cls: Any, db: Any, event_id: str
+        cls: Any, db: Any, event_id: str, page: Page | None = None
     ) -> list[TimeEvent]:  # pragma: no cover
         """Get time_events by event_id function."""
-        cursor = db.time_events_collection.find({"event_id": event_id})
-        return [
-            TimeEvent.from_dict(time_event) for time_event in await cursor.to_list(None)
-        ]
+        documents = await find_page(
+            db.time_events_collection, {"event_id": event_id}, [], page
+        )
+        return [decode_time_event(time_event) for time_event in documents]
 
     @classmethod
     async def get_time_events_by_event_id_and_timing_point(
-        cls: Any, db: Any, event_id: str, timing_point: str
+        cls: Any,
+        db: Any,
+        event_id: str,
+        timing_point: str,
+        page: Page | None = None,
     ) -> list[TimeEvent]:  # pragma: no cover
         """Get time_events by event_id function."""
-        cursor = db.time_events_collection.find(
-            {"$and": [{"event_id": event_id, "timing_point": timing_point}]}
-        ).sort([("rank", 1)])
-        return [
-            TimeEvent.from_dict(time_event) for time_event in await cursor.to_list(None)
-        ]
+        documents = await find_page(
+            db.time_events_collection,
+            {"$and": [{"event_id": event_id, "timing_point": timing_point}]},
+            [("rank", 1)],
+            page,
+        )
+        return [decode_time_event(time_event) for time_event in documents]
 
     @classmethod
     async def get_time_events_by_event_id_and_bib(
-        cls: Any, db: Any, event_id: str, bib: int
+        cls: Any, db: Any, event_id: str, bib: int, page: Page | None = None
     ) -> list[TimeEvent]:  # pragma: no cover
         """Get time_events by event_id function."""
-        cursor = db.time_events_collection.find(
-            {"$and": [{"event_id": event_id, "bib": bib}]}
-        ).sort([("id", 1)])
-        return [
-            TimeEvent.from_dict(time_event) for time_event in await cursor.to_list(None)
-        ]
+        documents = await find_page(
+            db.time_events_collection,
+            {"$and": [{"event_id": event_id, "bib": bib}]},
+            [("id", 1)],
+            page,
+        )
+        return [decode_time_event(time_event) for time_event in documents]
+
+    @classmethod
+    async def get_time_events_by_event_id_and_registration_time(
+        cls: Any,
+        db: Any,
+        event_id: str,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        page: Page | None = None,
+    ) -> list[TimeEvent]:  # pragma: no cover
+        """Get time_events registered from (inclusive) to (exclusive) the given times.
+
+        The time_events are sorted on registration_time.
+        """
+        registration_time: dict = {}
+        if from_ is not None:
+            registration_time["$gte"] = to_utc(from_)
+        if to is not None:
+            registration_time["$lt"] = to_utc(to)
+        query: dict = {"event_id": event_id}
+        if registration_time:
+            query["registration_time"] = registration_time
+        documents = await find_page(
+            db.time_events_collection, query, [("registration_time", 1)], page
+        )
+        return [decode_time_event(time_event) for time_event in documents]
+
+    @classmethod
+    async def stream_time_events_by_event_id(
+        cls: Any, db: Any, event_id: str, batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> AsyncIterator[list[TimeEvent]]:  # pragma: no cover
+        """Yield the time_events of the event in batches, sorted on registration_time.
+
+        The time_events are not put in the identity map, so that only one
+        batch is held in memory.
+        """
+        async for documents in find_in_batches(
+            db.time_events_collection,
+            {"event_id": event_id},
+            [("registration_time", 1), ("id", 1)],
+            batch_size,
+        ):
+            yield [decode_time_event(document) for document in documents]
 
     @classmethod
     async def get_time_events_by_race_id(
-        cls: Any, db: Any, race_id: str
+        cls: Any, db: Any, race_id: str, page: Page | None = None
     ) -> list[TimeEvent]:  # pragma: no cover
         """Get time_events by race_id function."""
-        cursor = db.time_events_collection.find({"race_id": race_id})
-        return [
-            TimeEvent.from_dict(time_event) for time_event in await cursor.to_list(None)
-        ]
+        documents = await find_page(
+            db.time_events_collection, {"race_id": race_id}, [], page
+        )
+        return [decode_time_event(time_event) for time_event in documents]
 
     @classmethod
     async def update_time_event(
         cls: Any, db: Any, id_: str, time_event: TimeEvent
     ) -> str | None:  # pragma: no cover
-        """Get time_event function."""
-        return await db.time_events_collection.replace_one(
-            {"id": id_}, time_event.to_dict()
+        """Update time_event function.
+
+        Raises:
+            TimeEventNotFoundError: if no time_event with the given id is found
+        """
+        result = await db.time_events_collection.replace_one(
+            {"id": id_}, to_document(time_event)
         )
+        if result.matched_count == 0:
+            msg = f"TimeEvent with id {id_} not found in database."
+            raise TimeEventNotFoundError(msg)
+        put_in_identity_map(COLLECTION, id_, time_event)
+        return result
 
     @classmethod
     async def delete_time_event(
         cls: Any, db: Any, id_: str
     ) -> str | None:  # pragma: no cover
         """Get time_event function."""
+        remove_from_identity_map(COLLECTION, id_)
         return await db.time_events_collection.delete_one({"id": id_})
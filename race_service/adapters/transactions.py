@@ -0,0 +1,36 @@
+"""Module for multi-document transactions."""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
+# Topologies where the server supports multi-document transactions:
+TRANSACTIONAL_TOPOLOGIES = ("ReplicaSetWithPrimary", "Sharded", "LoadBalanced")
+
+
+def supports_transactions(db: Any) -> bool:  # pragma: no cover
+    """Return True if the deployment of db supports transactions."""
+    client = getattr(db, "client", None)
+    if client is None:
+        return False
+    topology_type = client.topology_description.topology_type_name
+    return topology_type in TRANSACTIONAL_TOPOLOGIES
+
+
+@asynccontextmanager
+async def transaction(db: Any) -> AsyncIterator[Any | None]:  # pragma: no cover
+    """Run the writes in the block in one transaction, if supported.
+
+    Yields the session the writes must be done in. On a standalone server,
+    which does not support transactions, None is yielded and the writes are
+    done one by one in the order given. It is then up to the caller to undo
+    the writes already done if a later write fails.
+    """
+    if not supports_transactions(db):
+        yield None
+        return
+    async with (
+        await db.client.start_session() as session,
+        session.start_transaction(),
+    ):
+        yield session
@@ -0,0 +1,91 @@
+"""Module for request-scoped identity map."""
+
+import copy
+from collections.abc import Callable
+from contextvars import ContextVar, Token
+from typing import Any
+
+
+class UnitOfWork:
+    """Class representing a request-scoped identity map.
+
+    Objects read by id by the adapters are kept in an identity map keyed on
+    collection and id, so that repeated reads of the same document within a
+    request are served from memory. Every read gets a copy of its own, so a
+    caller changing its object, as the views do when expanding references,
+    does not change what later reads get. Lists of objects, as read by
+    queries, are neither served from nor kept in the map.
+
+    The adapters write at once, and keep what they wrote in the map.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty identity map."""
+        self._identity_map: dict[tuple[str, str], Any] = {}
+
+    def get(self, collection: str, id_: str) -> Any | None:
+        """Get a copy of the object in the identity map, None if not loaded."""
+        obj = self._identity_map.get((collection, id_))
+        return None if obj is None else copy.deepcopy(obj)
+
+    def put(self, collection: str, id_: str, obj: Any) -> None:
+        """Put a copy of object in the identity map, replacing any loaded object."""
+        self._identity_map[(collection, id_)] = copy.deepcopy(obj)
+
+    def remove(self, collection: str, id_: str) -> None:
+        """Remove object from the identity map."""
+        self._identity_map.pop((collection, id_), None)
+
+
+_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar("unit_of_work", default=None)
+
+
+def get_unit_of_work() -> UnitOfWork | None:
+    """Get the unit of work of the current request, None outside of requests."""
+    return _unit_of_work.get()
+
+
+def set_unit_of_work(unit_of_work: UnitOfWork | None) -> Token:
+    """Set the unit of work of the current request."""
+    return _unit_of_work.set(unit_of_work)
+
+
+def reset_unit_of_work(token: Token) -> None:
+    """Reset the unit of work to what it was before it was set."""
+    _unit_of_work.reset(token)
+
+
+def get_from_identity_map(collection: str, id_: str) -> Any | None:
+    """Get object from the identity map of the current request, if any."""
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is None:
+        return None
+    return unit_of_work.get(collection, id_)
+
+
+def load_from_document(
+    collection: str, document: dict, from_dict: Callable[[dict], Any]
+) -> Any:
+    """Return the mapped object for the document read by id, mapping it if not."""
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is None or document.get("id") is None:
+        return from_dict(document)
+    obj = unit_of_work.get(collection, document["id"])
+    if obj is None:
+        obj = from_dict(document)
+        unit_of_work.put(collection, document["id"], obj)
+    return obj
+
+
+def put_in_identity_map(collection: str, id_: str, obj: Any) -> None:
+    """Put object in the identity map of the current request, if any."""
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None:
+        unit_of_work.put(collection, id_, obj)
+
+
+def remove_from_identity_map(collection: str, id_: str) -> None:
+    """Remove object from the identity map of the current request, if any."""
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is not None:
+        unit_of_work.remove(collection, id_)
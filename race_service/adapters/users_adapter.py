@@ -12,12 +12,17 @@ from aiohttp.web import (
 )
 from dotenv import load_dotenv
 
+from race_service.utils.tracing import trace_headers
+
+from .instrumentation import instrument_adapter
+
 load_dotenv()
 
 USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER", "users.example.com")
 USERS_HOST_PORT = int(os.getenv("USERS_HOST_PORT", "8000"))
 
 
+@instrument_adapter
 class UsersAdapter:
     """Class representing an adapter for users."""
 
@@ -29,7 +34,10 @@ class UsersAdapter:
         url = f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize"
         body = {"token": token, "target_roles": roles}
 
-        async with ClientSession() as session, session.post(url, json=body) as response:
+        async with (
+            ClientSession(headers=trace_headers()) as session,
+            session.post(url, json=body) as response,
+        ):
             if response.status == HTTPStatus.NO_CONTENT:
                 pass
             elif response.status == HTTPStatus.UNAUTHORIZED:
@@ -0,0 +1,32 @@
+"""Module for optimistic concurrency on versioned documents."""
+
+from typing import Any
+
+from .documents import to_document
+
+
+class VersionConflictError(Exception):
+    """Class representing custom exception for conditional writes."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        # Call the base class constructor with the parameters it needs
+        super().__init__(message)
+
+
+def version_filter(id_: str, version: int) -> dict:
+    """Return filter matching the document with the given id and version.
+
+    Documents written before they were versioned have no version field,
+    and are matched as version 0.
+    """
+    if version == 0:
+        return {"id": id_, "version": {"$in": [0, None]}}
+    return {"id": id_, "version": version}
+
+
+def next_version_document(obj: Any) -> dict:
+    """Return the document to write, with the version incremented."""
+    document = to_document(obj)
+    document["version"] = obj.version + 1
+    return document
@@ -1,8 +1,12 @@
 """Module for admin of races."""
 
+import asyncio
 import logging
 import os
+import socket
 from collections.abc import AsyncGenerator
+from datetime import UTC
+from pathlib import Path
 
 import motor.motor_asyncio
 from aiohttp import web
@@ -11,11 +15,25 @@ from aiohttp_middlewares.cors import cors_middleware
 from aiohttp_middlewares.error import error_middleware
 from dotenv import load_dotenv
 
+from .adapters import CommandMonitor
+from .middlewares import (
+    metrics_middleware,
+    profiling_middleware,
+    recording_middleware,
+    tracing_middleware,
+    unit_of_work_middleware,
+)
 from .utils import db_utils
+from .utils.jsonlines_utils import JsonLinesWriter
+from .utils.loop_monitor import LoopMonitor
+from .utils.tracing import JsonLinesExporter
 from .views import (
     GenerateRaceplanForEventView,
     GenerateStartlistForEventView,
+    Metrics,
+    MoveStartEntryView,
     Ping,
+    ProfilesView,
     RaceplansView,
     RaceplanView,
     RaceResultsView,
@@ -27,6 +45,8 @@ from .views import (
     StartEntryView,
     StartlistsView,
     StartlistView,
+    SwapStartEntriesView,
+    TimeEventsExportView,
     TimeEventsView,
     TimeEventView,
     ValidateRaceplanView,
@@ -41,16 +61,43 @@ DB_PORT = int(os.getenv("DB_PORT", "27017"))
 DB_NAME = os.getenv("DB_NAME", "races")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
+SLOW_COMMAND_MS = float(os.getenv("SLOW_COMMAND_MS", "100"))
+LOOP_BLOCKED_MS = float(os.getenv("LOOP_BLOCKED_MS", "250"))
+RECORD_REQUESTS_FILE = os.getenv("RECORD_REQUESTS_FILE")
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+TRACE_FILE = os.getenv("TRACE_FILE")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+
+def opt_in_middlewares(writers: list[JsonLinesWriter]) -> list:
+    """Return the middlewares opted in to, adding the writers they append by."""
+    middlewares = []
+    if RECORD_REQUESTS_FILE:
+        # Opt-in, recording the requests as responded to, for replay:
+        writers.append(JsonLinesWriter(RECORD_REQUESTS_FILE, "recording"))
+        middlewares.append(recording_middleware(writers[-1]))
+    if PROFILE_DIR:
+        # Opt-in, so that requests are not even sampled when disabled:
+        middlewares.append(profiling_middleware(PROFILE_DIR, PROFILE_SAMPLE_RATE))
+    if TRACE_FILE:
+        # Opt-in, tracing requests in spans per view, service and adapter:
+        exporter = JsonLinesExporter(TRACE_FILE)
+        writers.append(exporter.writer)
+        middlewares.append(tracing_middleware(exporter))
+    return middlewares
 
 
 async def create_app() -> web.Application:
     """Create an web application."""
-    app = web.Application(
-        middlewares=[
-            cors_middleware(allow_all=True),
-            error_middleware(),  # default error handler for whole application
-        ]
-    )
+    writers: list[JsonLinesWriter] = []
+    middlewares = [
+        metrics_middleware,
+        *opt_in_middlewares(writers),
+        cors_middleware(allow_all=True),
+        error_middleware(),  # default error handler for whole application
+        unit_of_work_middleware,
+    ]
+    app = web.Application(middlewares=middlewares)
 
     # Set up logging:
     # logging configurataion:
@@ -68,6 +115,7 @@ async def create_app() -> web.Application:
         [
             web.view("/ping", Ping),
             web.view("/ready", Ready),
+            web.view("/metrics", Metrics),
             web.view("/raceplans", RaceplansView),
             web.view(
                 "/raceplans/generate-raceplan-for-event", GenerateRaceplanForEventView
@@ -79,6 +127,8 @@ async def create_app() -> web.Application:
             web.view("/races/{raceId}/race-results", RaceResultsView),
             web.view("/races/{raceId}/race-results/{raceResultId}", RaceResultView),
             web.view("/races/{raceId}/start-entries", StartEntriesView),
+            web.view("/races/{raceId}/start-entries/move", MoveStartEntryView),
+            web.view("/races/{raceId}/start-entries/swap", SwapStartEntriesView),
             web.view("/races/{raceId}/start-entries/{startEntryId}", StartEntryView),
             web.view("/startlists", StartlistsView),
             web.view(
@@ -87,30 +137,63 @@ async def create_app() -> web.Application:
             ),
             web.view("/startlists/{startlistId}", StartlistView),
             web.view("/time-events", TimeEventsView),
+            web.view("/time-events/export", TimeEventsExportView),
             web.view("/time-events/{time_eventId}", TimeEventView),
         ]
     )
 
+    if PROFILE_DIR:
+        app["profile_dir"] = Path(PROFILE_DIR)
+        app.add_routes([web.view("/profiles", ProfilesView)])
+
     async def mongo_context(app: Application) -> AsyncGenerator[None]:
         # Set up database connection:
         logger.debug(f"Connecting to db at {DB_HOST}:{DB_PORT}")
         mongo = motor.motor_asyncio.AsyncIOMotorClient(
-            host=DB_HOST, port=DB_PORT, username=DB_USER, password=DB_PASSWORD
+            host=DB_HOST,
+            port=DB_PORT,
+            username=DB_USER,
+            password=DB_PASSWORD,
+            # Datetimes are stored in UTC, and read as aware datetimes in UTC:
+            tz_aware=True,
+            tzinfo=UTC,
+            event_listeners=[CommandMonitor(SLOW_COMMAND_MS)],
         )
         db = mongo[f"{DB_NAME}"]
         app["db"] = db
 
-        if CONFIG == "production":  # pragma: no cover
-            # Create indexes:
-            try:
-                await db_utils.create_indexes(db)
-
-            except Exception:
-                logger.exception("Could not create index on race_collection.")
+        if CONFIG != "test":  # pragma: no cover
+            # Create indexes in the background, once for all workers.
+            # The ready route reports not ready until it is done:
+            app["index_task"] = asyncio.create_task(
+                db_utils.ensure_indexes(
+                    db, owner=f"{socket.gethostname()}:{os.getpid()}"
+                )
+            )
         yield
 
+        index_task = app.get("index_task")
+        if index_task is not None:  # pragma: no cover
+            index_task.cancel()
         mongo.close()
 
     app.cleanup_ctx.append(mongo_context)
 
+    async def loop_monitor_context(_app: Application) -> AsyncGenerator[None]:
+        # Monitor the lag of the event loop, and log what blocks it:
+        monitor = LoopMonitor(LOOP_BLOCKED_MS)
+        monitor.start()
+        yield
+        await monitor.stop()
+
+    app.cleanup_ctx.append(loop_monitor_context)
+
+    async def writers_context(_app: Application) -> AsyncGenerator[None]:
+        yield
+        # Append what is left in the queues of the writers, off the loop:
+        for writer in writers:
+            await asyncio.to_thread(writer.close)
+
+    app.cleanup_ctx.append(writers_context)
+
     return app
@@ -9,15 +9,15 @@ from race_service.adapters import (
     EventNotFoundError,
     EventsAdapter,
     RaceclassesNotFoundError,
-    RaceplansAdapter,
     RacesAdapter,
 )
 from race_service.models import IndividualSprintRace, IntervalStartRace, Raceplan
+from race_service.models.datetimes import localize_datetimes
 from race_service.services import (
-    RaceplanAllreadyExistError,
     RaceplansService,
     RacesService,
 )
+from race_service.utils.tracing import trace_class
 
 from .exceptions import (
     CompetitionFormatNotSupportedError,
@@ -32,6 +32,7 @@ from .raceplans_individual_sprint import calculate_raceplan_individual_sprint
 from .raceplans_interval_start import calculate_raceplan_interval_start
 
 
+@trace_class("command")
 class RaceplansCommands:
     """Class representing a commands on events."""
 
@@ -39,12 +40,11 @@ class RaceplansCommands:
     async def generate_raceplan_for_event(
         cls: Any, db: Any, token: str, event_id: str
     ) -> str:
-        """Generate raceplan for event function."""
-        # First we check if event already has a plan:
-        try:
-            await get_raceplan(db, token, event_id)
-        except RaceplanAllreadyExistError as e:
-            raise e from e
+        """Generate raceplan for event function.
+
+        An event can have only one raceplan. This is checked when the raceplan
+        is created, before any race is created.
+        """
         # First we get the event from the event-service:
         try:
             event = await get_event(token, event_id)
@@ -81,6 +81,8 @@ class RaceplansCommands:
         if raceplan_id:
             for race in races:
                 race.raceplan_id = raceplan_id
+                # The start times are calculated on the wall-clock of the event:
+                localize_datetimes(race, event["timezone"])
                 race_id = await RacesService.create_race(db, race)
                 if race_id:
                     raceplan.races.append(race_id)
@@ -184,15 +186,6 @@ class RaceplansCommands:
 
 
 # helpers
-async def get_raceplan(db: Any, token: str, event_id: str) -> None:
-    """Check if the event already has a raceplan."""
-    del token  # for now we do not use the token
-    existing_rp = await RaceplansAdapter.get_raceplans_by_event_id(db, event_id)
-    if existing_rp:
-        msg = f'Event "{event_id!r}" already has a raceplan.'
-        raise RaceplanAllreadyExistError(msg)
-
-
 async def get_event(token: str, event_id: str) -> dict:
     """Get the event and validate."""
     try:
@@ -11,7 +11,6 @@ from race_service.adapters import (
     RaceclassesNotFoundError,
     RaceplansAdapter,
     RacesAdapter,
-    StartlistsAdapter,
 )
 from race_service.models import (
     IndividualSprintRace,
@@ -21,11 +20,10 @@ from race_service.models import (
     Startlist,
 )
 from race_service.services import (
-    RacesService,
     StartEntriesService,
-    StartlistAllreadyExistError,
     StartlistsService,
 )
+from race_service.utils.tracing import traced
 
 from .exceptions import (
     CompetitionFormatNotSupportedError,
@@ -39,16 +37,14 @@ from .exceptions import (
 )
 
 
-async def generate_startlist_for_event(  # noqa: C901
-    db: Any, token: str, event_id: str
-) -> str:
-    """Generate startlist for event function."""
-    # First we check if event already has a startlist:
-    try:
-        await get_startlist(db, token, event_id)
-    except StartlistAllreadyExistError as e:
-        raise e from e
-    # Then we get the event from the event-service:
+@traced("command")
+async def generate_startlist_for_event(db: Any, token: str, event_id: str) -> str:
+    """Generate startlist for event function.
+
+    An event can have only one startlist. This is checked when the startlist
+    is created, before any start-entry is created.
+    """
+    # First we get the event from the event-service:
     try:
         event = await get_event(token, event_id)
     except EventNotFoundError as e:
@@ -121,19 +117,32 @@ async def generate_startlist_for_event(  # noqa: C901
         msg = f'Competition-format "{event["competition_format"]!r}" not supported.'
         raise CompetitionFormatNotSupportedError(msg)
 
-    # We create each start_entry and add it to the startlist:
+    # We create each start_entry and add it to the startlist and its race:
+    await create_start_entries(db, startlist_id, startlist, start_entries)
+    await StartlistsService.update_startlist(db, startlist_id, startlist)
+
+    return startlist_id
+
+
+async def create_start_entries(
+    db: Any, startlist_id: str, startlist: Startlist, start_entries: list[StartEntry]
+) -> None:
+    """Create the start_entries, and add them to the startlist and their races.
+
+    The start-entries are added to each race in one update, which does not
+    check the version of the race, so it cannot conflict with other writes
+    after the start-entries are created.
+    """
+    start_entry_ids_by_race: dict[str, list[str]] = {}
     for start_entry in start_entries:
         start_entry.startlist_id = startlist_id
         start_entry_id = await StartEntriesService.create_start_entry(db, start_entry)
         startlist.start_entries.append(start_entry_id)
-
-        # We add the start-entry to the respective race:
-        race = await RacesAdapter.get_race_by_id(db, start_entry.race_id)
-        race.start_entries.append(start_entry_id)
-        await RacesService.update_race(db, race.id, race)
-    await StartlistsService.update_startlist(db, startlist_id, startlist)
-
-    return startlist_id
+        start_entry_ids_by_race.setdefault(start_entry.race_id, []).append(
+            start_entry_id
+        )
+    for race_id, start_entry_ids in start_entry_ids_by_race.items():
+        await RacesAdapter.add_start_entries(db, race_id, start_entry_ids)
 
 
 async def generate_start_entries_for_individual_sprint(  # noqa: PLR0912, C901
@@ -339,15 +348,6 @@ async def generate_start_entries_for_interval_start(
 
 
 # helpers
-async def get_startlist(db: Any, token: str, event_id: str) -> None:
-    """Check if the event already has a startlist."""
-    del token  # for now we do not use token
-    _startlist = await StartlistsAdapter.get_startlists_by_event_id(db, event_id)
-    if _startlist:
-        msg = f'Event "{event_id!r}" already has a startlist.'
-        raise StartlistAllreadyExistError(msg)
-
-
 async def get_raceplan(db: Any, token: str, event_id: str) -> Raceplan:
     """Check if the event has a raceplan."""
     del token  # for now we do not use token
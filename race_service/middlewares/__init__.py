@@ -0,0 +1,15 @@
+"""Package for all middlewares."""
+
+from .metrics import metrics_middleware
+from .profiling import profiling_middleware
+from .recording import recording_middleware
+from .tracing import tracing_middleware
+from .unit_of_work import unit_of_work_middleware
+
+__all__ = [
+    "metrics_middleware",
+    "profiling_middleware",
+    "recording_middleware",
+    "tracing_middleware",
+    "unit_of_work_middleware",
+]
@@ -0,0 +1,141 @@
+"""Module for the metrics middleware."""
+
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+from race_service.adapters import (
+    start_counting_calls,
+    start_counting_commands,
+    stop_counting_calls,
+    stop_counting_commands,
+)
+from race_service.utils.loop_monitor import handler_running
+from race_service.utils.metrics_utils import REGISTRY, Counter, Gauge, Histogram
+
+load_dotenv()
+
+COUNT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256)
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "50"))
+
+# The routes of the probes and of the scrape, not measured, recorded nor traced:
+NOT_OBSERVED_ROUTES = {"/metrics", "/ping", "/ready"}
+
+logger = logging.getLogger("race_service.middlewares.metrics")
+
+REQUEST_SECONDS = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Duration of requests per route.",
+        ("method", "route"),
+    )
+)
+REQUESTS = REGISTRY.register(
+    Counter(
+        "http_requests_total",
+        "Number of requests per route and status.",
+        ("method", "route", "status"),
+    )
+)
+REQUESTS_IN_PROGRESS = REGISTRY.register(
+    Gauge(
+        "http_requests_in_progress",
+        "Number of requests being handled per route.",
+        ("method", "route"),
+    )
+)
+REQUEST_ADAPTER_CALLS = REGISTRY.register(
+    Histogram(
+        "http_request_adapter_calls",
+        "Number of adapter calls per request per route.",
+        ("method", "route"),
+        buckets=COUNT_BUCKETS,
+    )
+)
+REQUEST_COMMANDS = REGISTRY.register(
+    Histogram(
+        "http_request_mongo_commands",
+        "Number of database commands per request per route.",
+        ("method", "route"),
+        buckets=COUNT_BUCKETS,
+    )
+)
+
+
+def route_template(request: web.Request) -> str:
+    """Return the template of the route matched, as /races/{raceId}."""
+    resource = request.match_info.route.resource
+    return "unmatched" if resource is None else resource.canonical
+
+
+async def handle_with_status(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    done: Callable[[int], None],
+) -> web.StreamResponse:
+    """Return the response of the handler, and call done with its status.
+
+    The status of an HTTPException raised is its own, and of any other
+    exception 500. The exception is raised after done is called.
+    """
+    status = 500
+    try:
+        response = await handler(request)
+        status = response.status
+    except web.HTTPException as e:
+        status = e.status
+        raise
+    finally:
+        done(status)
+    return response
+
+
+@web.middleware
+async def metrics_middleware(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> web.StreamResponse:
+    """Record the duration, status, adapter calls and commands per route.
+
+    The route is the template of the route, so that the number of labels is
+    bounded. Requests not matching any route share the route unmatched.
+    Requests sending more database commands than the query budget are logged.
+    The probes and the scrape are not measured, so they do not skew the
+    metrics of the routes served.
+    """
+    route = route_template(request)
+    if route in NOT_OBSERVED_ROUTES:
+        return await handler(request)
+    labels = {"method": request.method, "route": route}
+    REQUESTS_IN_PROGRESS.inc(**labels)
+    token = start_counting_calls()
+    commands_token = start_counting_commands()
+    start = time.perf_counter()
+
+    def done(status: int) -> None:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, **labels)
+        REQUEST_ADAPTER_CALLS.observe(stop_counting_calls(token), **labels)
+        commands = stop_counting_commands(commands_token)
+        REQUEST_COMMANDS.observe(commands, **labels)
+        if commands > QUERY_BUDGET:
+            logger.warning(
+                f"{request.method} {request.path} sent {commands} database "
+                f"commands, over the query budget of {QUERY_BUDGET}.",
+                extra={
+                    "query_budget_exceeded": True,
+                    **labels,
+                    "path": request.path,
+                    "status": status,
+                    "commands": commands,
+                    "query_budget": QUERY_BUDGET,
+                },
+            )
+        REQUESTS.inc(**labels, status=str(status))
+        REQUESTS_IN_PROGRESS.dec(**labels)
+
+    with handler_running(**labels):
+        return await handle_with_status(request, handler, done)
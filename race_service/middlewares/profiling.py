@@ -0,0 +1,112 @@
+"""Module for the profiling middleware.
+
+Profiles a sampled fraction of the requests, and requests by admins with
+the header X-Profile, with cProfile. The profiles are written per route to
+a directory, as <method>_<route>/<time>.prof, to be read by the profiles
+resource or by pstats.
+
+Whether a token is an admin's is cached for a while, so that the header
+does not cost a call to the users service per request.
+
+Only one request is profiled at a time, as a profiler can only be active
+once per thread. A profile covers what the event loop runs while the
+request is handled, mostly the request itself.
+"""
+
+import asyncio
+import cProfile
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+from aiohttp import hdrs, web
+
+from race_service.adapters import UsersAdapter
+from race_service.utils.profiling_utils import profile_key
+
+from .metrics import route_template
+
+PROFILE_HEADER = "X-Profile"
+ADMIN_CACHE_SECONDS = 60
+ADMIN_CACHE_MAXSIZE = 1000
+
+logger = logging.getLogger("race_service.middlewares.profiling")
+
+
+async def _is_requested_by_admin(
+    request: web.Request, admin_tokens: dict[str, tuple[bool, float]]
+) -> bool:
+    """Return true if an admin requested the request to be profiled.
+
+    Args:
+        request (web.Request): the request
+        admin_tokens (dict[str, tuple[bool, float]]): per bearer token, if it
+            is an admin's and when that expires, in monotonic seconds
+    """
+    if PROFILE_HEADER not in request.headers:
+        return False
+    authorization = request.headers.get(hdrs.AUTHORIZATION, "")
+    if not authorization.startswith("Bearer "):
+        return False
+    token = authorization.removeprefix("Bearer ")
+    now = time.monotonic()
+    cached = admin_tokens.get(token)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    try:
+        await UsersAdapter.authorize(token, roles=["admin"])
+    except web.HTTPException:
+        is_admin = False
+    else:
+        is_admin = True
+    admin_tokens.pop(token, None)
+    if len(admin_tokens) >= ADMIN_CACHE_MAXSIZE:  # evict the oldest
+        del admin_tokens[next(iter(admin_tokens))]
+    admin_tokens[token] = (is_admin, now + ADMIN_CACHE_SECONDS)
+    return is_admin
+
+
+def _dump(profile: cProfile.Profile, path: Path) -> None:
+    """Write the profile to the file at path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profile.dump_stats(path)
+
+
+def profiling_middleware(
+    directory: str, sample_rate: float
+) -> Callable[
+    [web.Request, Callable[[web.Request], Awaitable[web.StreamResponse]]],
+    Awaitable[web.StreamResponse],
+]:
+    """Return a middleware profiling requests to the directory."""
+    admin_tokens: dict[str, tuple[bool, float]] = {}
+
+    @web.middleware
+    async def middleware(
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Profile the request, if sampled or requested by an admin."""
+        sampled = random.random() < sample_rate  # noqa: S311
+        if not sampled and not await _is_requested_by_admin(request, admin_tokens):
+            return await handler(request)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:  # another request is being profiled
+            return await handler(request)
+        try:
+            return await handler(request)
+        finally:
+            profile.disable()
+            path = (
+                Path(directory)
+                / profile_key(request.method, route_template(request))
+                / f"{time.time_ns()}.prof"
+            )
+            await asyncio.to_thread(_dump, profile, path)
+            logger.debug(f"Wrote profile of {request.method} {request.path} to {path}")
+
+    return middleware
@@ -0,0 +1,97 @@
+"""Module for the recording middleware.
+
+Records the requests to an append-only file of JSON lines, to be replayed
+by benchmarks.replay. Every line holds the start time, method, path, query,
+route template, JSON body, status and duration of a request. Headers are
+not recorded, and values of credentials in query and body are redacted.
+So are the names and clubs of contestants, as personal data. The names of
+races and other resources are not told apart from them, and are redacted
+as well. The lines are appended by a JsonLinesWriter, off the event loop.
+"""
+
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiohttp import web
+
+from race_service.utils.jsonlines_utils import JsonLinesWriter
+
+from .metrics import NOT_OBSERVED_ROUTES, handle_with_status, route_template
+
+SENSITIVE_KEYS = {
+    "access_token",
+    "authorization",
+    "club",
+    "jwt",
+    "name",
+    "password",
+    "token",
+}
+REDACTED = "***"
+
+
+def sanitize(value: Any) -> Any:
+    """Return the value with the values of sensitive keys redacted."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key.lower() in SENSITIVE_KEYS else sanitize(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [sanitize(item) for item in value]
+    return value
+
+
+async def _json_body(request: web.Request) -> Any | None:
+    """Return the JSON body of the request, None if it has none."""
+    if not request.can_read_body or request.content_type != "application/json":
+        return None
+    try:
+        return json.loads(await request.read())
+    except ValueError:
+        return None
+
+
+def recording_middleware(
+    writer: JsonLinesWriter,
+) -> Callable[
+    [web.Request, Callable[[web.Request], Awaitable[web.StreamResponse]]],
+    Awaitable[web.StreamResponse],
+]:
+    """Return a middleware recording the requests, appended by the writer."""
+
+    @web.middleware
+    async def middleware(
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Record the request, its status and duration."""
+        route = route_template(request)
+        if route in NOT_OBSERVED_ROUTES:
+            return await handler(request)
+        body = await _json_body(request)  # read before the handler, and cached
+        ts = time.time()
+        start = time.perf_counter()
+
+        def done(status: int) -> None:
+            writer.write(
+                {
+                    "ts": round(ts, 3),
+                    "method": request.method,
+                    "path": request.path,
+                    "query": [
+                        [key, REDACTED if key.lower() in SENSITIVE_KEYS else value]
+                        for key, value in request.query.items()
+                    ],
+                    "route": route,
+                    "body": sanitize(body),
+                    "status": status,
+                    "ms": round((time.perf_counter() - start) * 1000, 1),
+                }
+            )
+
+        return await handle_with_status(request, handler, done)
+
+    return middleware
@@ -0,0 +1,46 @@
+"""Module for the tracing middleware."""
+
+from collections.abc import Awaitable, Callable
+
+from aiohttp import web
+
+from race_service.utils.tracing import JsonLinesExporter, start_trace
+
+from .metrics import NOT_OBSERVED_ROUTES, handle_with_status, route_template
+
+
+def tracing_middleware(
+    exporter: JsonLinesExporter,
+) -> Callable[
+    [web.Request, Callable[[web.Request], Awaitable[web.StreamResponse]]],
+    Awaitable[web.StreamResponse],
+]:
+    """Return a middleware tracing the requests, exported by the exporter."""
+
+    @web.middleware
+    async def middleware(
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Trace the request in the span of its view."""
+        route = route_template(request)
+        if route in NOT_OBSERVED_ROUTES:
+            return await handler(request)
+        with start_trace(
+            exporter, f"{request.method} {route}", request.headers.get("traceparent")
+        ) as span:
+            span.attributes.update(
+                {
+                    "http.method": request.method,
+                    "http.route": route,
+                    "url.path": request.path,
+                }
+            )
+
+            def done(status: int) -> None:
+                span.attributes["http.status_code"] = status
+                span.error = status >= web.HTTPInternalServerError.status_code
+
+            return await handle_with_status(request, handler, done)
+
+    return middleware
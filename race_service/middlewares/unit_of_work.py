@@ -0,0 +1,24 @@
+"""Module for the unit of work middleware."""
+
+from collections.abc import Awaitable, Callable
+
+from aiohttp import web
+
+from race_service.adapters import (
+    UnitOfWork,
+    reset_unit_of_work,
+    set_unit_of_work,
+)
+
+
+@web.middleware
+async def unit_of_work_middleware(
+    request: web.Request,
+    handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+) -> web.StreamResponse:
+    """Attach a unit of work, with its identity map, to the request."""
+    token = set_unit_of_work(UnitOfWork())
+    try:
+        return await handler(request)
+    finally:
+        reset_unit_of_work(token)
@@ -3,18 +3,21 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from dataclasses_json import DataClassJsonMixin, config
+from dataclasses_json import config
 from marshmallow.fields import DateTime
 
+from .datetimes import decode_datetime
+from .json_mixin import JsonMixin
 
-@dataclass
-class Changelog(DataClassJsonMixin):
+
+@dataclass(slots=True)
+class Changelog(JsonMixin):
     """Data class with representing a changelog."""
 
     timestamp: datetime = field(
         metadata=config(
             encoder=datetime.isoformat,
-            decoder=datetime.fromisoformat,
+            decoder=decode_datetime,
             mm_field=DateTime(format="iso"),
         )
     )
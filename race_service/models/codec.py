@@ -0,0 +1,184 @@
+"""Codec module for converting models to and from dicts and JSON.
+
+The dataclasses_json methods of the models find the fields, their types and
+their encoders by reflection on every call. The encoders and decoders here
+are compiled once per model, from the same dataclass fields, into plain
+functions that read and write each field directly. Their output is equal
+to to_dict(), and their JSON byte-identical to to_json(), of the models.
+"""
+
+import json
+import typing
+from collections.abc import Callable
+from dataclasses import MISSING, Field, fields, is_dataclass
+from datetime import UTC, datetime
+from types import UnionType
+from typing import Any
+
+from .changelog import Changelog
+from .datetimes import decode_datetime, to_utc
+from .race_model import IndividualSprintRace, IntervalStartRace, RaceResult
+from .raceplan_model import Raceplan
+from .startlist_model import StartEntry, Startlist
+from .time_event_model import TimeEvent
+
+MODELS: tuple[type, ...] = (
+    Changelog,
+    IndividualSprintRace,
+    IntervalStartRace,
+    RaceResult,
+    Raceplan,
+    StartEntry,
+    Startlist,
+    TimeEvent,
+)
+
+_ENCODERS: dict[type, Callable[[Any], dict]] = {}
+_DECODERS: dict[type, Callable[[dict], Any]] = {}
+
+
+def _copy(value: Any) -> Any:
+    """Copy lists and dicts, as dataclasses_json does, and encode dataclasses."""
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if is_dataclass(value):
+        return _ENCODERS[type(value)](value)
+    return value
+
+
+def _decode_datetime(value: Any) -> datetime | None:
+    """Decode a datetime, which may be stored as a datetime or a string.
+
+    BSON datetimes are in UTC, also when read without tzinfo.
+    """
+    if isinstance(value, datetime):
+        return to_utc(value if value.tzinfo else value.replace(tzinfo=UTC))
+    return None if value is None else decode_datetime(value)
+
+
+def _decode_changelog(value: list | None) -> list[Changelog] | None:
+    """Decode a list of changelog entries."""
+    if value is None:
+        return None
+    return [
+        item if isinstance(item, Changelog) else _DECODERS[Changelog](item)
+        for item in value
+    ]
+
+
+def _decode_copy(value: Any) -> Any:
+    """Copy a list or dict when decoding, and leave anything else as it is."""
+    return _copy(value) if isinstance(value, list | dict) else value
+
+
+def _field_type(field: Field, cls: type) -> Any:
+    """Return the type of the field, without None if it is optional."""
+    field_type = typing.get_type_hints(cls)[field.name]
+    if isinstance(field_type, UnionType):
+        field_type = next(arg for arg in field_type.__args__ if arg is not type(None))
+    return field_type
+
+
+def _value_decoder(field: Field, cls: type) -> str | None:
+    """Return the name of the function decoding the value of field, if any."""
+    field_type = _field_type(field, cls)
+    if field_type is datetime:
+        return "_decode_datetime"
+    if typing.get_origin(field_type) is list and typing.get_args(field_type) == (
+        Changelog,
+    ):
+        return "_decode_changelog"
+    if typing.get_origin(field_type) in (list, dict):
+        return "_decode_copy"
+    return None
+
+
+def _value_encoder(field: Field, cls: type) -> str | None:
+    """Return the name of the function encoding the value of field, if any."""
+    field_type = _field_type(field, cls)
+    if field_type is datetime:
+        return "_encode_datetime"
+    if typing.get_origin(field_type) in (list, dict):
+        return "_copy"
+    return None
+
+
+def _compile(source: str, name: str, namespace: dict) -> Callable:
+    """Compile the source of a function, and return the function."""
+    exec(compile(source, f"<codec {name}>", "exec"), namespace)  # noqa: S102
+    return namespace[name]
+
+
+def compile_encoder(cls: type) -> Callable[[Any], dict]:
+    """Compile the function returning the dict of an instance of cls."""
+    namespace: dict[str, Any] = {
+        "_copy": _copy,
+        "_encode_datetime": datetime.isoformat,
+    }
+    items = []
+    for field in fields(cls):
+        value = f"obj.{field.name}"
+        encoder = _value_encoder(field, cls)
+        if encoder is not None:
+            value = f"{encoder}({value})"
+        items.append(f"        {field.name!r}: {value},")
+    source = "\n".join(["def encode(obj):", "    return {", *items, "    }"])
+    return _compile(source, "encode", namespace)
+
+
+def compile_decoder(cls: type) -> Callable[[dict], Any]:
+    """Compile the function creating an instance of cls from a dict.
+
+    As with from_dict(), a missing field without default raises KeyError, and
+    keys that are not fields are ignored.
+    """
+    namespace: dict[str, Any] = {
+        "cls": cls,
+        "_decode_changelog": _decode_changelog,
+        "_decode_copy": _decode_copy,
+        "_decode_datetime": _decode_datetime,
+    }
+    arguments = []
+    for field in fields(cls):
+        name = field.name
+        if field.default is not MISSING:
+            namespace[f"_default_{name}"] = field.default
+            value = f"data.get({name!r}, _default_{name})"
+        elif field.default_factory is not MISSING:
+            namespace[f"_factory_{name}"] = field.default_factory
+            value = f"data[{name!r}] if {name!r} in data else _factory_{name}()"
+        else:
+            value = f"data[{name!r}]"
+        decoder = _value_decoder(field, cls)
+        if decoder is not None:
+            value = f"{decoder}({value})"
+        arguments.append(f"        {name}={value},")
+    source = "\n".join(["def decode(data):", "    return cls(", *arguments, "    )"])
+    return _compile(source, "decode", namespace)
+
+
+for _model in MODELS:
+    _ENCODERS[_model] = compile_encoder(_model)
+    _DECODERS[_model] = compile_decoder(_model)
+
+decode_changelog_entry = _DECODERS[Changelog]
+decode_individual_sprint_race = _DECODERS[IndividualSprintRace]
+decode_interval_start_race = _DECODERS[IntervalStartRace]
+decode_race_result = _DECODERS[RaceResult]
+decode_raceplan = _DECODERS[Raceplan]
+decode_start_entry = _DECODERS[StartEntry]
+decode_startlist = _DECODERS[Startlist]
+decode_time_event = _DECODERS[TimeEvent]
+
+
+def to_dict(obj: Any) -> dict:
+    """Return the dict of a model, equal to the dict of dataclasses_json."""
+    encoder = _ENCODERS.get(type(obj))
+    return obj.to_dict() if encoder is None else encoder(obj)
+
+
+def to_json(obj: Any) -> str:
+    """Return the JSON of a model, byte-identical to that of dataclasses_json."""
+    return json.dumps(to_dict(obj))
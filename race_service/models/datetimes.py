@@ -0,0 +1,69 @@
+"""Module for the datetimes of the models.
+
+Datetimes are kept in UTC, with the millisecond precision of the BSON
+datetimes they are stored as. A datetime without an offset is a wall-clock
+time in the timezone of its event, as the start times of a raceplan are,
+and is localized in that timezone before it is stored.
+"""
+
+from collections.abc import Iterator
+from dataclasses import fields, is_dataclass
+from datetime import UTC, datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+
+def _truncate(value: datetime) -> datetime:
+    """Return the datetime truncated to milliseconds."""
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def to_utc(value: datetime) -> datetime:
+    """Return the datetime in UTC, truncated to milliseconds.
+
+    Raises:
+        ValueError: if the datetime has no offset, as it must be localized
+    """
+    if value.tzinfo is None:
+        msg = f"Datetime {value.isoformat()} has no offset, and is not localized."
+        raise ValueError(msg)
+    return _truncate(value.astimezone(UTC))
+
+
+def localize(value: datetime, timezone: str) -> datetime:
+    """Return the datetime in UTC, taking a datetime without offset in timezone."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=ZoneInfo(timezone))
+    return to_utc(value)
+
+
+def decode_datetime(value: str) -> datetime:
+    """Decode a datetime in ISO 8601 format, to UTC if it has an offset.
+
+    A datetime without offset is left without, to be localized.
+    """
+    decoded = datetime.fromisoformat(value)
+    return _truncate(decoded) if decoded.tzinfo is None else to_utc(decoded)
+
+
+def _datetime_fields(obj: Any) -> Iterator[tuple[Any, str, datetime]]:
+    """Yield the datetimes of obj, and of the dataclasses in its lists."""
+    for field in fields(obj):
+        value = getattr(obj, field.name)
+        if isinstance(value, datetime):
+            yield obj, field.name, value
+        elif isinstance(value, list):
+            for item in value:
+                if is_dataclass(item):
+                    yield from _datetime_fields(item)
+
+
+def has_naive_datetimes(obj: Any) -> bool:
+    """Return True if obj has a datetime without offset."""
+    return any(value.tzinfo is None for _, _, value in _datetime_fields(obj))
+
+
+def localize_datetimes(obj: Any, timezone: str) -> None:
+    """Localize the datetimes of obj without offset in timezone, all to UTC."""
+    for holder, name, value in list(_datetime_fields(obj)):
+        setattr(holder, name, localize(value, timezone))
@@ -0,0 +1,29 @@
+"""Slotted JSON mixin module."""
+
+from typing import TYPE_CHECKING
+
+from dataclasses_json import DataClassJsonMixin
+
+if TYPE_CHECKING:
+    JsonMixin = DataClassJsonMixin
+else:
+
+    class JsonMixin:
+        """DataClassJsonMixin, with empty slots.
+
+        DataClassJsonMixin has no __slots__, so the instances of its
+        subclasses have a __dict__ even if they are slotted dataclasses.
+        This class has the same methods, and is registered as a virtual
+        subclass of DataClassJsonMixin, as the dataclass_json decorator does.
+        """
+
+        __slots__ = ()
+
+        dataclass_json_config = None
+        to_json = DataClassJsonMixin.to_json
+        from_json = DataClassJsonMixin.__dict__["from_json"]
+        from_dict = DataClassJsonMixin.__dict__["from_dict"]
+        to_dict = DataClassJsonMixin.to_dict
+        schema = DataClassJsonMixin.__dict__["schema"]
+
+    DataClassJsonMixin.register(JsonMixin)
@@ -4,9 +4,12 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import IntEnum
 
-from dataclasses_json import DataClassJsonMixin, config
+from dataclasses_json import config
 from marshmallow.fields import Constant, DateTime
 
+from .datetimes import decode_datetime
+from .json_mixin import JsonMixin
+
 
 class RaceResultStatus(IntEnum):
     """Valid values for a raceresult status."""
@@ -16,8 +19,8 @@ class RaceResultStatus(IntEnum):
     OFFICIAL = 2
 
 
-@dataclass
-class RaceResult(DataClassJsonMixin):
+@dataclass(slots=True)
+class RaceResult(JsonMixin):
     """Data class with details about a race-result."""
 
     id: str
@@ -26,10 +29,11 @@ class RaceResult(DataClassJsonMixin):
     no_of_contestants: int
     ranking_sequence: list[str]  # list of references to TimeEvent
     status: int  # int with reference to RaceResultStatus
+    version: int = 0  # incremented on every write
 
 
-@dataclass
-class Race(DataClassJsonMixin):
+@dataclass(slots=True)
+class Race(JsonMixin):
     """Data class with details about a race."""
 
     id: str
@@ -38,7 +42,7 @@ class Race(DataClassJsonMixin):
     start_time: datetime = field(
         metadata=config(
             encoder=datetime.isoformat,
-            decoder=datetime.fromisoformat,
+            decoder=decode_datetime,
             mm_field=DateTime(format="iso"),
         )
     )
@@ -48,10 +52,11 @@ class Race(DataClassJsonMixin):
     raceplan_id: str
     start_entries: list[str]  # list of references to StartEntry
     results: dict[str, str]  # dict with reference to RaceResult pr timing point
+    version: int = 0  # incremented on every write
 
 
-@dataclass
-class IntervalStartRace(Race, DataClassJsonMixin):
+@dataclass(slots=True)
+class IntervalStartRace(Race):
     """Data class with details about a race."""
 
     datatype: str = field(
@@ -60,8 +65,8 @@ class IntervalStartRace(Race, DataClassJsonMixin):
     )
 
 
-@dataclass
-class IndividualSprintRace(Race, DataClassJsonMixin):
+@dataclass(slots=True)
+class IndividualSprintRace(Race):
     """Data class with details about a race."""
 
     round: str = ""
@@ -2,11 +2,11 @@
 
 from dataclasses import dataclass, field
 
-from dataclasses_json import DataClassJsonMixin
+from .json_mixin import JsonMixin
 
 
-@dataclass
-class Raceplan(DataClassJsonMixin):
+@dataclass(slots=True)
+class Raceplan(JsonMixin):
     """Data class with details about a raceplan."""
 
     event_id: str
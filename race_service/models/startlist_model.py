@@ -3,14 +3,16 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from dataclasses_json import DataClassJsonMixin, config
+from dataclasses_json import config
 from marshmallow.fields import DateTime
 
 from .changelog import Changelog
+from .datetimes import decode_datetime
+from .json_mixin import JsonMixin
 
 
-@dataclass
-class StartEntry(DataClassJsonMixin):
+@dataclass(slots=True)
+class StartEntry(JsonMixin):
     """Data class with details about a starlist."""
 
     startlist_id: str
@@ -20,7 +22,7 @@ class StartEntry(DataClassJsonMixin):
     scheduled_start_time: datetime = field(
         metadata=config(
             encoder=datetime.isoformat,
-            decoder=datetime.fromisoformat,
+            decoder=decode_datetime,
             mm_field=DateTime(format="iso"),
         )
     )
@@ -31,11 +33,12 @@ class StartEntry(DataClassJsonMixin):
     id: str | None = field(default=None)
 
 
-@dataclass
-class Startlist(DataClassJsonMixin):
+@dataclass(slots=True)
+class Startlist(JsonMixin):
     """Data class with details about a starlist."""
 
     event_id: str
     no_of_contestants: int
     start_entries: list[str]
     id: str | None = field(default=None)
+    version: int = 0  # incremented on every write
@@ -3,14 +3,16 @@
 from dataclasses import dataclass, field
 from datetime import datetime
 
-from dataclasses_json import DataClassJsonMixin, config
+from dataclasses_json import config
 from marshmallow.fields import DateTime
 
 from .changelog import Changelog
+from .datetimes import decode_datetime
+from .json_mixin import JsonMixin
 
 
-@dataclass
-class TimeEvent(DataClassJsonMixin):
+@dataclass(slots=True)
+class TimeEvent(JsonMixin):
     """Data class with details about a time_event."""
 
     bib: int
@@ -19,7 +21,7 @@ class TimeEvent(DataClassJsonMixin):
     registration_time: datetime = field(
         metadata=config(
             encoder=datetime.isoformat,
-            decoder=datetime.fromisoformat,
+            decoder=decode_datetime,
             mm_field=DateTime(format="iso"),
         )
     )
@@ -34,3 +36,18 @@ class TimeEvent(DataClassJsonMixin):
     status: str | None = field(default=None)
     changelog: list[Changelog] | None = field(default=None)
     id: str | None = field(default=None)
+
+
+def sorted_on_rank(time_events: list[TimeEvent]) -> list[TimeEvent]:
+    """Return the time_events sorted on rank, those without rank first.
+
+    The sort is stable, so time_events of equal rank keep their order.
+    """
+    return sorted(
+        time_events,
+        key=lambda k: (
+            k.rank is not None,
+            k.rank != "",
+            k.rank,
+        ),
+    )
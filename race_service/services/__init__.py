@@ -17,6 +17,7 @@ from .races_service import (
 )
 from .start_entries_service import (
     CouldNotCreateStartEntryError,
+    CouldNotMoveStartEntryError,
     StartEntriesService,
 )
 from .startlists_service import (
@@ -36,6 +37,7 @@ __all__ = [
     "CouldNotCreateStartEntryError",
     "CouldNotCreateStartlistError",
     "CouldNotCreateTimeEventError",
+    "CouldNotMoveStartEntryError",
     "IllegalValueError",
     "RaceNotFoundError",
     "RaceResultsService",
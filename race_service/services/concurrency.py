@@ -0,0 +1,45 @@
+"""Module for retrying read-modify-write operations on version conflicts."""
+
+import logging
+from collections.abc import Awaitable, Callable
+
+from race_service.adapters import VersionConflictError
+
+MAX_ATTEMPTS_ON_CONFLICT = 5
+
+logger = logging.getLogger("race_service.services.concurrency")
+
+
+async def retry_on_version_conflict[T](
+    update: Callable[[T], Awaitable[None]],
+    obj: T,
+    reload: Callable[[], Awaitable[T]],
+) -> T:
+    """Apply the update to the object, and reapply it if there is a conflict.
+
+    The first attempt updates the object as it was read by the caller. If it
+    has been changed since, it is reloaded and the update applied again.
+
+    Args:
+        update (Callable[[T], Awaitable[None]]): changes and writes the object
+        obj (T): the object as read by the caller
+        reload (Callable[[], Awaitable[T]]): reads the object again
+
+    Returns:
+        T: The updated object.
+
+    Raises:
+        VersionConflictError: if the last attempt also hit a version conflict
+    """
+    attempt = 1
+    while True:
+        try:
+            await update(obj)
+        except VersionConflictError as e:
+            if attempt >= MAX_ATTEMPTS_ON_CONFLICT:
+                raise
+            logger.debug(f"Attempt {attempt} hit a version conflict, retrying: {e}")
+            obj = await reload()
+            attempt += 1
+        else:
+            return obj
@@ -1,7 +1,7 @@
 """Module for race-results service."""
 
 import logging
-import uuid
+from functools import partial
 from typing import Any
 
 from race_service.adapters import (
@@ -17,15 +17,13 @@ from race_service.models import (
     StartEntry,
     TimeEvent,
 )
+from race_service.utils.id_utils import create_id
+from race_service.utils.tracing import trace_class
 
+from .concurrency import retry_on_version_conflict
 from .races_service import IllegalValueError, RacesService
 
 
-def create_id() -> str:  # pragma: no cover
-    """Creates an uuid."""
-    return str(uuid.uuid4())
-
-
 class TimeEventIsNotIdentifiableError(Exception):
     """Class representing custom exception for fetch method."""
 
@@ -53,6 +51,7 @@ class ContestantNotInStartEntriesError(Exception):
         super().__init__(message)
 
 
+@trace_class("service")
 class RaceResultsService:
     """Class representing a service for race_results."""
 
@@ -62,19 +61,35 @@ class RaceResultsService:
 
     @classmethod
     async def update_race_result(
-        cls: Any, db: Any, id_: str, race_result: RaceResult
+        cls: Any,
+        db: Any,
+        id_: str,
+        race_result: RaceResult,
+        *,
+        check_version: bool = True,
     ) -> str | None:
-        """Update race-result function."""
-        # get old document
-        try:
-            old_race_result = await RaceResultsAdapter.get_race_result_by_id(db, id_)
-        except RaceResultNotFoundError as e:
-            raise e from e
-        # update the race_result if found:
-        if race_result.id != old_race_result.id:
+        """Update race-result function.
+
+        The race-result is written only if it is still race_result.version,
+        unless check_version is False.
+        """
+        # the id can not be changed:
+        if race_result.id != id_:
             msg = "Cannot change id for race_result."
             raise IllegalValueError(msg)
-        return await RaceResultsAdapter.update_race_result(db, id_, race_result)
+        # update the race_result, the adapter reports if it is not found:
+        if check_version:
+            return await RaceResultsAdapter.update_race_result(db, id_, race_result)
+        result = None
+
+        async def replace(current: RaceResult) -> None:
+            nonlocal result
+            race_result.version = current.version
+            result = await RaceResultsAdapter.update_race_result(db, id_, race_result)
+
+        read = partial(RaceResultsAdapter.get_race_result_by_id, db, id_)
+        await retry_on_version_conflict(replace, await read(), read)
+        return result
 
     @classmethod
     async def delete_race_result(cls: Any, db: Any, id_: str) -> str | None:
@@ -87,6 +102,72 @@ class RaceResultsService:
         # delete the document if found:
         return await RaceResultsAdapter.delete_race_result(db, id_)
 
+    @classmethod
+    async def add_time_event_to_ranking_sequence(
+        cls: Any, db: Any, race_result: RaceResult, time_event_id: str
+    ) -> RaceResult:
+        """Add time-event to the ranking-sequence, retrying on concurrent changes.
+
+        Args:
+            db (Any): the db
+            race_result (RaceResult): the race-result, as read by the caller
+            time_event_id (str): the id of the time-event to be added
+
+        Returns:
+            RaceResult: The updated race-result.
+
+        Raises:
+            RaceResultNotFoundError: race-result not found
+            VersionConflictError: the race-result kept being changed concurrently
+        """
+
+        async def add(race_result: RaceResult) -> None:
+            if time_event_id not in race_result.ranking_sequence:
+                race_result.ranking_sequence.append(time_event_id)
+                race_result.no_of_contestants += 1
+                await RaceResultsAdapter.update_race_result(
+                    db, race_result.id, race_result
+                )
+
+        return await retry_on_version_conflict(
+            add,
+            race_result,
+            partial(RaceResultsAdapter.get_race_result_by_id, db, race_result.id),
+        )
+
+    @classmethod
+    async def remove_time_event_from_ranking_sequence(
+        cls: Any, db: Any, race_result: RaceResult, time_event_id: str
+    ) -> RaceResult:
+        """Remove time-event from the ranking-sequence, retrying on concurrent changes.
+
+        Args:
+            db (Any): the db
+            race_result (RaceResult): the race-result, as read by the caller
+            time_event_id (str): the id of the time-event to be removed
+
+        Returns:
+            RaceResult: The updated race-result.
+
+        Raises:
+            RaceResultNotFoundError: race-result not found
+            VersionConflictError: the race-result kept being changed concurrently
+        """
+
+        async def remove(race_result: RaceResult) -> None:
+            if time_event_id in race_result.ranking_sequence:
+                race_result.ranking_sequence.remove(time_event_id)
+                race_result.no_of_contestants -= 1
+                await RaceResultsAdapter.update_race_result(
+                    db, race_result.id, race_result
+                )
+
+        return await retry_on_version_conflict(
+            remove,
+            race_result,
+            partial(RaceResultsAdapter.get_race_result_by_id, db, race_result.id),
+        )
+
     @classmethod
     async def add_time_event_to_race_result(
         cls: Any, db: Any, time_event: TimeEvent
@@ -138,16 +219,12 @@ class RaceResultsService:
             else:
                 race_result = race_results[0]
             # Add the time-event to the race-result's ranking-sequence:
-            if time_event.id not in race_result.ranking_sequence:
-                race_result.ranking_sequence.append(time_event.id)
-                race_result.no_of_contestants += 1
-                await RaceResultsAdapter.update_race_result(
-                    db, race_result.id, race_result
-                )
+            await cls.add_time_event_to_ranking_sequence(db, race_result, time_event.id)
             # Add the race_result_id to the race's results if it is not there already:
             if time_event.timing_point not in race.results:
-                race.results[time_event.timing_point] = race_result.id
-                await RacesService.update_race(db, race.id, race)
+                await RacesService.set_race_result_of_race(
+                    db, race, time_event.timing_point, race_result.id
+                )
 
             return race_result.id
         msg = f"Time-event {time_event.id} does not have race reference."
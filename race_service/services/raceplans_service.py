@@ -1,20 +1,20 @@
 """Module for raceplans service."""
 
 import logging
-import uuid
 from typing import Any
 
-from race_service.adapters import RaceplanNotFoundError, RaceplansAdapter
+from race_service.adapters import (
+    DuplicateRaceplanError,
+    RaceplanNotFoundError,
+    RaceplansAdapter,
+)
 from race_service.models import Raceplan
+from race_service.utils.id_utils import create_id
+from race_service.utils.tracing import trace_class
 
 from .exceptions import IllegalValueError
 
 
-def create_id() -> str:  # pragma: no cover
-    """Creates an uuid."""
-    return str(uuid.uuid4())
-
-
 class RaceplanAllreadyExistError(Exception):
     """Class representing custom exception for fetch method."""
 
@@ -24,6 +24,7 @@ class RaceplanAllreadyExistError(Exception):
         super().__init__(message)
 
 
+@trace_class("service")
 class RaceplansService:
     """Class representing a service for raceplans."""
 
@@ -45,15 +46,6 @@ class RaceplansService:
             RaceplanAllreadyExistError: event can have zero or one plan
         """
         cls.logger.debug(f"trying to insert raceplan: {raceplan}")
-        # Event can have one, and only, one raceplan:
-        existing_rps: list[Raceplan] = []
-        existing_rps = await RaceplansAdapter.get_raceplans_by_event_id(
-            db, raceplan.event_id
-        )
-        cls.logger.debug(f"existing_rps: {existing_rps}")
-        if len(existing_rps) > 0:
-            msg = f'Event "{raceplan.event_id}!r" already has a raceplan.'
-            raise RaceplanAllreadyExistError(msg)
         if raceplan.id:
             msg = "Cannot create raceplan with input id."
             raise IllegalValueError(msg)
@@ -62,7 +54,11 @@ class RaceplansService:
         raceplan.id = id_
         # insert new raceplan
         cls.logger.debug(f"new_raceplan: {raceplan}")
-        result = await RaceplansAdapter.create_raceplan(db, raceplan)
+        # Event can have one, and only, one raceplan, as event_id is unique:
+        try:
+            result = await RaceplansAdapter.create_raceplan(db, raceplan)
+        except DuplicateRaceplanError as e:
+            raise RaceplanAllreadyExistError(str(e)) from e
         cls.logger.debug(f"inserted raceplan with id: {id_}")
         if result:
             return id_
@@ -73,16 +69,11 @@ class RaceplansService:
         cls: Any, db: Any, id_: str, raceplan: Raceplan
     ) -> str | None:
         """Update raceplan function."""
-        # get old document
-        try:
-            old_raceplan = await RaceplansAdapter.get_raceplan_by_id(db, id_)
-        except RaceplanNotFoundError as e:
-            raise e from e
-        # update the raceplan if found:
-        if raceplan.id != old_raceplan.id:
+        # the id can not be changed:
+        if raceplan.id != id_:
             msg = "Cannot change id for raceplan."
             raise IllegalValueError(msg)
-
+        # update the raceplan, the adapter reports if it is not found:
         return await RaceplansAdapter.update_raceplan(db, id_, raceplan)
 
     @classmethod
@@ -1,22 +1,21 @@
 """Module for races service."""
 
 import logging
-import uuid
+from functools import partial
 from typing import Any
 
 from race_service.adapters import RaceNotFoundError, RacesAdapter
 from race_service.models import (
     Race,
 )
+from race_service.utils.id_utils import create_id
+from race_service.utils.tracing import trace_class
 
+from .concurrency import retry_on_version_conflict
 from .exceptions import IllegalValueError
 
 
-def create_id() -> str:  # pragma: no cover
-    """Creates an uuid."""
-    return str(uuid.uuid4())
-
-
+@trace_class("service")
 class RacesService:
     """Class representing a service for races."""
 
@@ -54,19 +53,135 @@ class RacesService:
         return None
 
     @classmethod
-    async def update_race(cls: Any, db: Any, id_: str, race: Race) -> str | None:
-        """Update race function."""
-        # get old document
-        try:
-            old_race = await RacesAdapter.get_race_by_id(db, id_)
-        except RaceNotFoundError as e:
-            raise e from e
-        # update the race if found:
-        if race.id != old_race.id:
+    async def update_race(
+        cls: Any, db: Any, id_: str, race: Race, *, check_version: bool = True
+    ) -> str | None:
+        """Update race function.
+
+        Args:
+            db (Any): the db
+            id_ (str): the id of the race to be updated
+            race (Race): the updated race
+            check_version (bool): write only if the race is still race.version,
+                else write on whatever version is stored
+
+        Returns:
+            Optional[str]: The result of the update.
+
+        Raises:
+            IllegalValueError: input object has illegal values
+            RaceNotFoundError: race with id_ not found
+            VersionConflictError: the race has been changed since race.version
+        """
+        # the id can not be changed:
+        if race.id != id_:
             msg = "Cannot change id for race."
             raise IllegalValueError(msg)
         cls.logger.debug(f"Updating race with following values:\n {race}")
-        return await RacesAdapter.update_race(db, id_, race)
+        # update the race, the adapter reports if it is not found:
+        if check_version:
+            return await RacesAdapter.update_race(db, id_, race)
+        result = None
+
+        async def replace(current: Race) -> None:
+            nonlocal result
+            race.version = current.version
+            result = await RacesAdapter.update_race(db, id_, race)
+
+        read = partial(RacesAdapter.get_race_by_id, db, id_)
+        await retry_on_version_conflict(replace, await read(), read)
+        return result
+
+    @classmethod
+    async def add_start_entry_to_race(
+        cls: Any, db: Any, race: Race, start_entry_id: str
+    ) -> Race:
+        """Add start-entry to the race, retrying if the race is changed concurrently.
+
+        Args:
+            db (Any): the db
+            race (Race): the race, as read by the caller
+            start_entry_id (str): the id of the start-entry to be added
+
+        Returns:
+            Race: The updated race.
+
+        Raises:
+            RaceNotFoundError: race not found
+            VersionConflictError: the race kept being changed concurrently
+        """
+
+        async def add(race: Race) -> None:
+            if start_entry_id not in race.start_entries:
+                race.start_entries.append(start_entry_id)
+                race.no_of_contestants = len(race.start_entries)
+                await RacesAdapter.update_race(db, race.id, race)
+
+        return await retry_on_version_conflict(
+            add, race, partial(RacesAdapter.get_race_by_id, db, race.id)
+        )
+
+    @classmethod
+    async def remove_start_entry_from_race(
+        cls: Any, db: Any, race: Race, start_entry_id: str
+    ) -> Race:
+        """Remove start-entry from the race, retrying on concurrent changes.
+
+        Args:
+            db (Any): the db
+            race (Race): the race, as read by the caller
+            start_entry_id (str): the id of the start-entry to be removed
+
+        Returns:
+            Race: The updated race.
+
+        Raises:
+            RaceNotFoundError: race not found
+            VersionConflictError: the race kept being changed concurrently
+        """
+
+        async def remove(race: Race) -> None:
+            race.start_entries = [
+                id_ for id_ in race.start_entries if id_ != start_entry_id
+            ]
+            race.no_of_contestants = len(race.start_entries)
+            await RacesAdapter.update_race(db, race.id, race)
+
+        return await retry_on_version_conflict(
+            remove, race, partial(RacesAdapter.get_race_by_id, db, race.id)
+        )
+
+    @classmethod
+    async def set_race_result_of_race(
+        cls: Any, db: Any, race: Race, timing_point: str, race_result_id: str | None
+    ) -> Race:
+        """Set or remove the race's race-result for a timing-point.
+
+        Args:
+            db (Any): the db
+            race (Race): the race, as read by the caller
+            timing_point (str): the timing-point of the race-result
+            race_result_id (str | None): the id of the race-result, None to remove
+
+        Returns:
+            Race: The updated race.
+
+        Raises:
+            RaceNotFoundError: race not found
+            VersionConflictError: the race kept being changed concurrently
+        """
+
+        async def set_race_result(race: Race) -> None:
+            if race.results.get(timing_point) != race_result_id:
+                if race_result_id is None:
+                    del race.results[timing_point]
+                else:
+                    race.results[timing_point] = race_result_id
+                await RacesAdapter.update_race(db, race.id, race)
+
+        return await retry_on_version_conflict(
+            set_race_result, race, partial(RacesAdapter.get_race_by_id, db, race.id)
+        )
 
     @classmethod
     async def delete_race(cls: Any, db: Any, id_: str) -> str | None:
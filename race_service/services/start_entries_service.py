@@ -1,20 +1,26 @@
 """Module for start_entries service."""
 
 import logging
-import uuid
+from datetime import datetime
 from typing import Any
 
-from race_service.adapters import StartEntriesAdapter, StartEntryNotFoundError
-from race_service.models import StartEntry
+from race_service.adapters import (
+    DuplicateStartEntryError,
+    RaceIsFullError,
+    RacesAdapter,
+    StartEntriesAdapter,
+    StartEntryMovesAdapter,
+    StartEntryNotFoundError,
+    StartlistNotFoundError,
+    StartlistsAdapter,
+)
+from race_service.models import IndividualSprintRace, Race, StartEntry
+from race_service.utils.id_utils import create_id
+from race_service.utils.tracing import trace_class
 
 from .exceptions import IllegalValueError
 
 
-def create_id() -> str:  # pragma: no cover
-    """Creates an uuid."""
-    return str(uuid.uuid4())
-
-
 class CouldNotCreateStartEntryError(Exception):
     """Class representing custom exception for fetch method."""
 
@@ -24,6 +30,16 @@ class CouldNotCreateStartEntryError(Exception):
         super().__init__(message)
 
 
+class CouldNotMoveStartEntryError(Exception):
+    """Class representing custom exception for move and swap methods."""
+
+    def __init__(self, message: str) -> None:
+        """Initialize the error."""
+        # Call the base class constructor with the parameters it needs
+        super().__init__(message)
+
+
+@trace_class("service")
 class StartEntriesService:
     """Class representing a service for start_entries."""
 
@@ -62,22 +78,183 @@ class StartEntriesService:
         msg = "Creation of start-entry failed."
         raise CouldNotCreateStartEntryError(msg) from None
 
+    @classmethod
+    async def add_start_entry(cls: Any, db: Any, start_entry: StartEntry) -> Race:
+        """Add a new start_entry to its race and startlist.
+
+        The slot in the race is reserved first, in one conditional update that
+        fails if the race is full. Then the start_entry is inserted, where the
+        unique indexes on bib and starting_position in the race reject taken
+        values. Finally it is added to the startlist. If a step fails, the
+        previous steps are undone.
+
+        Args:
+            db (Any): the db
+            start_entry (StartEntry): a start_entry instanse to be created
+
+        Returns:
+            Race: The race with the start_entry added.
+
+        Raises:
+            IllegalValueError: input object has illegal values
+            RaceNotFoundError: the race of the start_entry is not found
+            StartlistNotFoundError: the startlist of the start_entry is not found
+            CouldNotCreateStartEntryError: the race is full, or bib or
+                starting_position is taken
+        """
+        cls.logger.debug(f"trying to add start_entry: {start_entry}")
+        # Validation:
+        await validate_start_entry(db, start_entry)
+        if start_entry.id:
+            msg = "Cannot create start_entry with input id."
+            raise IllegalValueError(msg)
+        start_entry.id = create_id()
+
+        # Reserve the slot in the race:
+        race = await RacesAdapter.add_start_entry_if_not_full(
+            db, start_entry.race_id, start_entry.id
+        )
+        if race is None:
+            # Raises RaceNotFoundError if it is not found, otherwise it is full:
+            await RacesAdapter.get_race_by_id(db, start_entry.race_id)
+            msg = "Cannot add start-entry: race is full."
+            raise CouldNotCreateStartEntryError(msg)
+
+        # Insert the start_entry, and add it to the startlist:
+        try:
+            result = await StartEntriesAdapter.create_start_entry(db, start_entry)
+        except DuplicateStartEntryError as e:
+            await RacesAdapter.remove_start_entry(db, race.id, start_entry.id)
+            msg = f"Cannot add start-entry: {e}"
+            raise CouldNotCreateStartEntryError(msg) from e
+        if not result:
+            await RacesAdapter.remove_start_entry(db, race.id, start_entry.id)
+            msg = "Creation of start-entry failed."
+            raise CouldNotCreateStartEntryError(msg) from None
+        try:
+            await StartlistsAdapter.add_start_entry(
+                db, start_entry.startlist_id, start_entry.id
+            )
+        except StartlistNotFoundError as e:
+            await StartEntriesAdapter.delete_start_entry(db, start_entry.id)
+            await RacesAdapter.remove_start_entry(db, race.id, start_entry.id)
+            raise e from e
+        cls.logger.debug(f"added start_entry with id: {start_entry.id}")
+        return race
+
     @classmethod
     async def update_start_entry(
         cls: Any, db: Any, id_: str, start_entry: StartEntry
     ) -> str | None:
         """Update start_entry function."""
-        # get old document
-        try:
-            old_start_entry = await StartEntriesAdapter.get_start_entry_by_id(db, id_)
-        except StartEntryNotFoundError as e:
-            raise e from e
-        # update the start_entry if found:
-        if start_entry.id != old_start_entry.id:
+        # the id can not be changed:
+        if start_entry.id != id_:
             msg = "Cannot change id for start_entry."
             raise IllegalValueError(msg)
+        # update the start_entry, the adapter reports if it is not found:
         return await StartEntriesAdapter.update_start_entry(db, id_, start_entry)
 
+    @classmethod
+    async def move_start_entry(  # noqa: PLR0913
+        cls: Any,
+        db: Any,
+        race_id: str,
+        start_entry_id: str,
+        to_race_id: str,
+        starting_position: int,
+        scheduled_start_time: datetime | None = None,
+    ) -> StartEntry:
+        """Move start_entry to a starting_position in the same or another race.
+
+        The race it is moved to must be a heat of the same round, so the
+        startlist and raceplan are not affected.
+
+        Args:
+            db (Any): the db
+            race_id (str): the id of the race the start_entry is in
+            start_entry_id (str): the id of the start_entry to move
+            to_race_id (str): the id of the race to move it to
+            starting_position (int): the starting_position to move it to
+            scheduled_start_time (datetime | None): the new scheduled start time.
+                Defaults to the start time of an individual sprint race it is
+                moved to, otherwise it is kept.
+
+        Returns:
+            StartEntry: The moved start_entry.
+
+        Raises:
+            IllegalValueError: input has illegal values
+            StartEntryNotFoundError: the start_entry is not found
+            RaceNotFoundError: a race is not found
+            CouldNotMoveStartEntryError: the race is full, or bib or
+                starting_position is taken
+        """
+        if starting_position < 1:
+            msg = f"Illegal starting_position {starting_position}."
+            raise IllegalValueError(msg)
+        start_entry = await _get_start_entry_in_race(db, race_id, start_entry_id)
+        from_race = await RacesAdapter.get_race_by_id(db, race_id)
+        to_race = (
+            from_race
+            if to_race_id == race_id
+            else await RacesAdapter.get_race_by_id(db, to_race_id)
+        )
+        validate_races_of_move(from_race, to_race)
+
+        start_entry.race_id = to_race.id
+        start_entry.starting_position = starting_position
+        if scheduled_start_time:
+            start_entry.scheduled_start_time = scheduled_start_time
+        elif isinstance(to_race, IndividualSprintRace) and to_race.id != race_id:
+            start_entry.scheduled_start_time = to_race.start_time
+        try:
+            await StartEntryMovesAdapter.move_start_entry(db, start_entry, race_id)
+        except (RaceIsFullError, DuplicateStartEntryError) as e:
+            msg = f"Cannot move start-entry: {e}"
+            raise CouldNotMoveStartEntryError(msg) from e
+        cls.logger.debug(f"moved start_entry {start_entry_id} to race {to_race_id}")
+        return start_entry
+
+    @classmethod
+    async def swap_start_entries(
+        cls: Any, db: Any, race_id: str, start_entry_id: str, other_start_entry_id: str
+    ) -> None:
+        """Swap the races and starting_positions of two start_entries.
+
+        Args:
+            db (Any): the db
+            race_id (str): the id of the race the first start_entry is in
+            start_entry_id (str): the id of the first start_entry
+            other_start_entry_id (str): the id of the start_entry to swap with,
+                in the same race or a heat of the same round
+
+        Raises:
+            IllegalValueError: input has illegal values
+            StartEntryNotFoundError: a start_entry is not found
+            RaceNotFoundError: a race is not found
+            CouldNotMoveStartEntryError: a bib would be twice in a race
+        """
+        if start_entry_id == other_start_entry_id:
+            msg = "Cannot swap a start-entry with itself."
+            raise IllegalValueError(msg)
+        first = await _get_start_entry_in_race(db, race_id, start_entry_id)
+        second = await StartEntriesAdapter.get_start_entry_by_id(
+            db, other_start_entry_id
+        )
+        if second.race_id != first.race_id:
+            validate_races_of_move(
+                await RacesAdapter.get_race_by_id(db, first.race_id),
+                await RacesAdapter.get_race_by_id(db, second.race_id),
+            )
+        try:
+            await StartEntryMovesAdapter.swap_start_entries(db, first, second)
+        except DuplicateStartEntryError as e:
+            msg = f"Cannot swap start-entries: {e}"
+            raise CouldNotMoveStartEntryError(msg) from e
+        cls.logger.debug(
+            f"swapped start_entries {start_entry_id} and {other_start_entry_id}"
+        )
+
     @classmethod
     async def delete_start_entry(cls: Any, db: Any, id_: str) -> str | None:
         """Delete start_entry function."""
@@ -90,7 +267,36 @@ class StartEntriesService:
         return await StartEntriesAdapter.delete_start_entry(db, id_)
 
 
+async def _get_start_entry_in_race(
+    db: Any, race_id: str, start_entry_id: str
+) -> StartEntry:
+    """Get start_entry, and check that it is in the race."""
+    start_entry = await StartEntriesAdapter.get_start_entry_by_id(db, start_entry_id)
+    if start_entry.race_id != race_id:
+        msg = f"StartEntry with id {start_entry_id} is not in race {race_id}."
+        raise IllegalValueError(msg)
+    return start_entry
+
+
 #   Validation:
+def validate_races_of_move(from_race: Race, to_race: Race) -> None:
+    """Validate that start_entries can be moved between the races."""
+    if (
+        from_race.raceplan_id != to_race.raceplan_id
+        or from_race.raceclass != to_race.raceclass
+        or type(from_race) is not type(to_race)
+        or (
+            isinstance(from_race, IndividualSprintRace)
+            and from_race.round != to_race.round  # type: ignore [reportAttributeAccessIssue]
+        )
+    ):
+        msg = (
+            f"Cannot move start-entries between race {from_race.id} and "
+            f"race {to_race.id}: not heats of the same round in the same raceclass."
+        )
+        raise IllegalValueError(msg)
+
+
 async def validate_start_entry(db: Any, start_entry: StartEntry) -> None:
     """Validate the start_entry."""
     # Validate start_entries:
@@ -1,20 +1,22 @@
 """Module for startlists service."""
 
 import logging
-import uuid
+from functools import partial
 from typing import Any
 
-from race_service.adapters import StartlistNotFoundError, StartlistsAdapter
+from race_service.adapters import (
+    DuplicateStartlistError,
+    StartlistNotFoundError,
+    StartlistsAdapter,
+)
 from race_service.models import Startlist
+from race_service.utils.id_utils import create_id
+from race_service.utils.tracing import trace_class
 
+from .concurrency import retry_on_version_conflict
 from .exceptions import IllegalValueError
 
 
-def create_id() -> str:  # pragma: no cover
-    """Creates an uuid."""
-    return str(uuid.uuid4())
-
-
 class CouldNotCreateStartlistError(Exception):
     """Class representing custom exception for command."""
 
@@ -33,6 +35,7 @@ class StartlistAllreadyExistError(Exception):
         super().__init__(message)
 
 
+@trace_class("service")
 class StartlistsService:
     """Class representing a service for startlists."""
 
@@ -57,13 +60,6 @@ class StartlistsService:
             CouldNotCreateStartlistError: creation failed
         """
         cls.logger.debug(f"trying to insert startlist: {startlist}")
-        # Event can have one, and only, one startlist:
-        existing_sl = await StartlistsAdapter.get_startlists_by_event_id(
-            db, startlist.event_id
-        )
-        if existing_sl and len(existing_sl) > 0:
-            msg = f'Event "{startlist.event_id!r}" already has a startlist.'
-            raise StartlistAllreadyExistError(msg)
         # Validation:
         await validate_startlist(startlist)
         if startlist.id:
@@ -74,7 +70,11 @@ class StartlistsService:
         startlist.id = id_
         # insert new startlist
         cls.logger.debug(f"new startlist: {startlist}")
-        result = await StartlistsAdapter.create_startlist(db, startlist)
+        # Event can have one, and only, one startlist, as event_id is unique:
+        try:
+            result = await StartlistsAdapter.create_startlist(db, startlist)
+        except DuplicateStartlistError as e:
+            raise StartlistAllreadyExistError(str(e)) from e
         cls.logger.debug(f"inserted startlist with id: {id_}")
         if result:
             return id_
@@ -86,17 +86,47 @@ class StartlistsService:
         cls: Any, db: Any, id_: str, startlist: Startlist
     ) -> str | None:
         """Get startlist function."""
-        # get old document
-        try:
-            old_startlist = await StartlistsAdapter.get_startlist_by_id(db, id_)
-        except StartlistNotFoundError as e:
-            raise e from e
-        # update the startlist if found:
-        if startlist.id != old_startlist.id:
+        # the id can not be changed:
+        if startlist.id != id_:
             msg = "Cannot change id for startlist."
             raise IllegalValueError(msg)
+        # update the startlist, the adapter reports if it is not found:
         return await StartlistsAdapter.update_startlist(db, id_, startlist)
 
+    @classmethod
+    async def remove_start_entry_from_startlist(
+        cls: Any, db: Any, startlist: Startlist, start_entry_id: str
+    ) -> Startlist:
+        """Remove start-entry from the startlist, retrying on concurrent changes.
+
+        Args:
+            db (Any): the db
+            startlist (Startlist): the startlist, as read by the caller
+            start_entry_id (str): the id of the start-entry to be removed
+
+        Returns:
+            Startlist: The updated startlist.
+
+        Raises:
+            StartlistNotFoundError: startlist not found
+            VersionConflictError: the startlist kept being changed concurrently
+        """
+
+        async def remove(startlist: Startlist) -> None:
+            if start_entry_id not in startlist.start_entries:
+                return
+            startlist.start_entries = [
+                id_ for id_ in startlist.start_entries if id_ != start_entry_id
+            ]
+            startlist.no_of_contestants += -1
+            await StartlistsAdapter.update_startlist(db, startlist.id, startlist)  # type: ignore [reportArgumentType]
+
+        return await retry_on_version_conflict(
+            remove,
+            startlist,
+            partial(StartlistsAdapter.get_startlist_by_id, db, startlist.id),
+        )
+
     @classmethod
     async def delete_startlist(cls: Any, db: Any, id_: str) -> str | None:
         """Get startlist function."""
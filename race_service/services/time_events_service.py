@@ -1,7 +1,6 @@
 """Module for time_events service."""
 
 import logging
-import uuid
 from typing import Any
 
 from race_service.adapters import (
@@ -10,11 +9,8 @@ from race_service.adapters import (
 )
 from race_service.models import TimeEvent
 from race_service.services import IllegalValueError
-
-
-def create_id() -> str:  # pragma: no cover
-    """Creates an uuid."""
-    return str(uuid.uuid4())
+from race_service.utils.id_utils import create_id
+from race_service.utils.tracing import trace_class
 
 
 class CouldNotCreateTimeEventError(Exception):
@@ -35,6 +31,7 @@ class TimeEventAllreadyExistError(Exception):
         super().__init__(message)
 
 
+@trace_class("service")
 class TimeEventsService:
     """Class representing a service for time_events."""
 
@@ -97,17 +94,16 @@ class TimeEventsService:
         cls: Any, db: Any, id_: str, time_event: TimeEvent
     ) -> str | None:
         """Get time_event function."""
-        # get old document
+        # the id can not be changed:
+        if time_event.id != id_:
+            msg = "Cannot change id for time_event."
+            raise IllegalValueError(msg)
+        # update the time_event, the adapter reports if it is not found:
         try:
-            old_time_event = await TimeEventsAdapter.get_time_event_by_id(db, id_)
+            return await TimeEventsAdapter.update_time_event(db, id_, time_event)
         except TimeEventNotFoundError as e:
             msg = f"TimeEvent with id {id_} not found."
             raise TimeEventNotFoundError(msg) from e
-        # update the time_event if found:
-        if time_event.id != old_time_event.id:
-            msg = "Cannot change id for time_event."
-            raise IllegalValueError(msg)
-        return await TimeEventsAdapter.update_time_event(db, id_, time_event)
 
     @classmethod
     async def delete_time_event(cls: Any, db: Any, id_: str) -> str | None:
@@ -0,0 +1,34 @@
+"""Module for localizing datetimes without offset in the timezone of their event."""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from race_service.adapters import EventsAdapter, RacesAdapter
+from race_service.models.datetimes import has_naive_datetimes, localize_datetimes
+
+
+async def event_timezone(token: str, event_id: str) -> str:
+    """Return the timezone of the event."""
+    event = await EventsAdapter.get_event_by_id(token, event_id)
+    return event["timezone"]
+
+
+async def race_timezone(db: Any, token: str, race_id: str) -> str:
+    """Return the timezone of the event of the race."""
+    race = await RacesAdapter.get_race_by_id(db, race_id)
+    return await event_timezone(token, race.event_id)
+
+
+async def localize_naive_datetimes(
+    obj: Any, timezone: Callable[[], Awaitable[str]]
+) -> None:
+    """Localize the datetimes of obj without offset, all to UTC.
+
+    The timezone is looked up only if there is a datetime to localize.
+
+    Args:
+        obj (Any): the dataclass whose datetimes to localize
+        timezone (Callable[[], Awaitable[str]]): returns the timezone to localize in
+    """
+    if has_naive_datetimes(obj):
+        localize_datetimes(obj, await timezone())
@@ -1,7 +1,267 @@
-"""Drop db and recreate indexes."""
+"""Drop db and recreate indexes.
 
+The indexes of each collection are specified in INDEXES, and the query
+shapes of the adapters in QUERY_SHAPES. To compare the indexes in the
+database with the specification, and flag queries doing collection scans:
+
+    % python -m race_service.utils.db_utils audit
+
+Add --apply to create the missing indexes and drop the obsolete ones.
+
+To create the indexes as a bootstrap step before the service is started:
+
+    % python -m race_service.utils.db_utils create-indexes
+
+A unique index cannot be created on a collection with duplicates. To list
+the documents breaking the unique indexes:
+
+    % python -m race_service.utils.db_utils duplicates
+
+Add --apply to delete them, keeping the first inserted of each duplicate.
+
+Datetimes used to be stored as ISO 8601 strings. To convert the strings in
+existing documents to BSON datetimes in UTC, localizing the strings without
+an offset in the timezone of the events:
+
+    % python -m race_service.utils.db_utils migrate-datetimes --timezone Europe/Oslo
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
 from typing import Any
 
+from pymongo.errors import DuplicateKeyError, OperationFailure, PyMongoError
+
+from .metrics_utils import REGISTRY, Counter
+
+logger = logging.getLogger("race_service.utils.db_utils")
+
+LOCKS_COLLECTION = "locks_collection"
+INDEXES_LOCK_ID = "indexes"
+INDEXES_LOCK_LEASE = timedelta(minutes=10)
+INDEXES_LOCK_POLL_SECONDS = 5.0
+INDEXES_MAX_ATTEMPTS = 5
+
+INDEX_CREATION_FAILURES = REGISTRY.register(
+    Counter(
+        "index_creation_failures_total",
+        "Number of failed attempts to create the indexes.",
+    )
+)
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Specification of an index on a collection."""
+
+    keys: tuple[tuple[str, int], ...]
+    unique: bool = False
+
+    @property
+    def name(self) -> str:
+        """The name the server gives the index by default."""
+        return "_".join(f"{key}_{direction}" for key, direction in self.keys)
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """Shape of a query done by an adapter, with placeholder values."""
+
+    filter: dict
+    sort: list[tuple[str, int]] = field(default_factory=list)
+
+
+INDEXES: dict[str, list[IndexSpec]] = {
+    "races_collection": [
+        IndexSpec((("id", 1),), unique=True),
+        IndexSpec((("event_id", 1), ("order", 1)), unique=True),
+        IndexSpec((("event_id", 1), ("raceclass", 1), ("order", 1)), unique=True),
+        IndexSpec((("raceplan_id", 1), ("order", 1))),
+    ],
+    "race_results_collection": [
+        IndexSpec((("id", 1),), unique=True),
+        IndexSpec((("race_id", 1), ("timing_point", 1))),
+    ],
+    # An event can have one raceplan and one startlist:
+    "raceplans_collection": [
+        IndexSpec((("id", 1),), unique=True),
+        IndexSpec((("event_id", 1),), unique=True),
+    ],
+    "startlists_collection": [
+        IndexSpec((("id", 1),), unique=True),
+        IndexSpec((("event_id", 1),), unique=True),
+    ],
+    "start_entries_collection": [
+        IndexSpec((("id", 1),), unique=True),
+        IndexSpec((("race_id", 1), ("starting_position", 1)), unique=True),
+        IndexSpec((("race_id", 1), ("bib", 1)), unique=True),
+        IndexSpec((("startlist_id", 1),)),
+    ],
+    "time_events_collection": [
+        IndexSpec((("id", 1),), unique=True),
+        # Pages are sorted on id last, see adapters.pagination:
+        IndexSpec((("event_id", 1), ("id", 1))),
+        IndexSpec((("event_id", 1), ("timing_point", 1), ("rank", 1), ("id", 1))),
+        IndexSpec((("event_id", 1), ("bib", 1), ("id", 1))),
+        IndexSpec((("event_id", 1), ("registration_time", 1), ("id", 1))),
+        IndexSpec((("race_id", 1), ("id", 1))),
+    ],
+}
+
+QUERY_SHAPES: dict[str, list[QueryShape]] = {
+    "races_collection": [
+        QueryShape({"id": "x"}),
+        QueryShape({"event_id": "x"}, [("order", 1)]),
+        QueryShape({"$and": [{"event_id": "x"}, {"raceclass": "x"}]}, [("order", 1)]),
+        QueryShape({"raceplan_id": "x"}, [("order", 1)]),
+    ],
+    "race_results_collection": [
+        QueryShape({"id": "x"}),
+        QueryShape({"race_id": "x"}),
+        QueryShape({"$and": [{"race_id": "x"}, {"timing_point": "x"}]}),
+    ],
+    "raceplans_collection": [
+        QueryShape({"id": "x"}),
+        QueryShape({"event_id": "x"}),
+    ],
+    "startlists_collection": [
+        QueryShape({"id": "x"}),
+        QueryShape({"event_id": "x"}),
+    ],
+    "start_entries_collection": [
+        QueryShape({"id": "x"}),
+        QueryShape({"race_id": "x"}, [("starting_position", 1)]),
+        QueryShape(
+            {"$and": [{"race_id": "x"}, {"startlist_id": "x"}]},
+            [("starting_position", 1)],
+        ),
+        QueryShape({"startlist_id": "x"}),
+    ],
+    "time_events_collection": [
+        QueryShape({"id": "x"}),
+        QueryShape({"id": {"$in": ["x"]}}, [("rank", 1), ("registration_time", 1)]),
+        QueryShape({"event_id": "x"}),
+        QueryShape({"event_id": "x", "timing_point": "x"}, [("rank", 1)]),
+        QueryShape({"event_id": "x"}, [("id", 1)]),
+        QueryShape({"race_id": "x"}, [("id", 1)]),
+        QueryShape({"event_id": "x", "bib": 1}, [("id", 1)]),
+        QueryShape(
+            {
+                "event_id": "x",
+                "registration_time": {"$gte": datetime(2021, 8, 31, tzinfo=UTC)},
+            },
+            [("registration_time", 1), ("id", 1)],
+        ),
+        QueryShape({"race_id": "x"}),
+    ],
+}
+
+
+# The datetime fields of each collection, and the list fields of changelogs:
+DATETIME_FIELDS: dict[str, list[str]] = {
+    "races_collection": ["start_time"],
+    "start_entries_collection": ["scheduled_start_time"],
+    "time_events_collection": ["registration_time"],
+}
+CHANGELOG_FIELDS: dict[str, list[str]] = {
+    "start_entries_collection": ["changelog"],
+    "time_events_collection": ["changelog"],
+}
+
+
+# The offset ending a datetime string, which must not be given with a timezone:
+OFFSET_PATTERN = r"T[\d:.]+(Z|[+-]\d{2}(:?\d{2})?)$"
+
+
+def _date_from_string(expression: str, timezone: str) -> dict:
+    """Convert a string to a datetime, and leave anything else as it is.
+
+    Strings without an offset are wall-clock times in timezone, as the
+    service localizes them in the timezone of their event.
+    """
+    from_string = {"dateString": expression, "onError": expression}
+    return {
+        "$switch": {
+            "branches": [
+                {
+                    "case": {"$ne": [{"$type": expression}, "string"]},
+                    "then": expression,
+                },
+                {
+                    "case": {
+                        "$regexMatch": {"input": expression, "regex": OFFSET_PATTERN}
+                    },
+                    "then": {"$dateFromString": from_string},
+                },
+            ],
+            "default": {"$dateFromString": {**from_string, "timezone": timezone}},
+        }
+    }
+
+
+def datetime_migration(collection: str, timezone: str) -> list[dict]:
+    """Return the update pipeline converting the datetime strings of collection."""
+    fields = {
+        name: _date_from_string(f"${name}", timezone)
+        for name in DATETIME_FIELDS[collection]
+    }
+    for name in CHANGELOG_FIELDS.get(collection, []):
+        fields[name] = {
+            "$cond": [
+                {"$isArray": f"${name}"},
+                {
+                    "$map": {
+                        "input": f"${name}",
+                        "as": "entry",
+                        "in": {
+                            "$mergeObjects": [
+                                "$$entry",
+                                {
+                                    "timestamp": _date_from_string(
+                                        "$$entry.timestamp", timezone
+                                    )
+                                },
+                            ]
+                        },
+                    }
+                },
+                f"${name}",
+            ]
+        }
+    return [{"$set": fields}]
+
+
+async def migrate_datetimes(db: Any, timezone: str) -> dict[str, int]:
+    """Convert the datetimes stored as strings to BSON datetimes.
+
+    Only documents with a field of type string are updated, so the migration
+    can be run again. Strings that are not dates are left as they are.
+
+    Args:
+        db (Any): the database
+        timezone (str): the timezone of the events, to localize strings in
+
+    Returns:
+        dict[str, int]: The number of modified documents per collection.
+    """
+    modified: dict[str, int] = {}
+    for collection, datetime_fields in DATETIME_FIELDS.items():
+        names = datetime_fields + [
+            f"{name}.timestamp" for name in CHANGELOG_FIELDS.get(collection, [])
+        ]
+        result = await db[collection].update_many(
+            {"$or": [{name: {"$type": "string"}} for name in names]},
+            datetime_migration(collection, timezone),
+        )
+        modified[collection] = result.modified_count
+        logger.info(f"Migrated {result.modified_count} documents in {collection}")
+    return modified
+
 
 async def drop_db_and_recreate_indexes(mongo: Any, db_name: str) -> None:
     """Drop db and recreate indexes."""
@@ -17,34 +277,326 @@ async def drop_db(mongo: Any, db_name: str) -> None:
 
 
 async def create_indexes(db: Any) -> None:
-    """Create indexes."""
-    # races_collection:
-    await db.races_collection.create_index([("id", 1)], unique=True)
-    await db.races_collection.create_index([("event_id", 1), ("order", 1)], unique=True)
-    await db.races_collection.create_index(
-        [("event_id", 1), ("raceclass", 1), ("order", 1)], unique=True
-    )
-    # race_results_collection:
-    await db.race_results_collection.create_index([("id", 1)], unique=True)
-    await db.race_results_collection.create_index(
-        [("race_id", 1), ("timing_point", 1), ("id", 1)], unique=True
+    """Create indexes.
+
+    An index that conflicts with an existing index of the same name is
+    skipped, as it must be dropped first. The audit command does that.
+
+    The unique indexes enforce constraints the adapters rely on, as one
+    raceplan and startlist per event, and one start entry per bib in a race.
+    So if a unique index could not be created, as when the collection has
+    duplicates, the other indexes are created, and then an error raised.
+
+    Raises:
+        OperationFailure: if a unique index could not be created
+    """
+    failed_unique: list[str] = []
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            try:
+                await db[collection].create_index(list(index.keys), unique=index.unique)
+            except OperationFailure as e:
+                if index.unique:
+                    failed_unique.append(f"{index.name} on {collection}: {e}")
+                else:
+                    logger.warning(
+                        f"Could not create index {index.name} on {collection}, "
+                        "run the db_utils audit command with --apply."
+                    )
+    if failed_unique:
+        msg = (
+            f"Could not create unique indexes: {'; '.join(failed_unique)}. "
+            "Run the db_utils duplicates command to find the duplicates."
+        )
+        raise OperationFailure(msg)
+
+
+def indexes_version() -> str:
+    """Return a digest of INDEXES, which changes when the specification does."""
+    return hashlib.sha256(repr(sorted(INDEXES.items())).encode()).hexdigest()
+
+
+async def _renew_lock(locks: Any, owner: str) -> None:
+    """Renew the lease of the lock held by owner, until cancelled."""
+    while True:
+        await asyncio.sleep(INDEXES_LOCK_LEASE.total_seconds() / 3)
+        try:
+            await locks.update_one(
+                {"_id": INDEXES_LOCK_ID, "owner": owner},
+                {"$set": {"expires_at": datetime.now(UTC) + INDEXES_LOCK_LEASE}},
+            )
+        except PyMongoError:
+            logger.exception("Could not renew the lease of the indexes lock.")
+
+
+async def _release_lock(locks: Any, owner: str) -> None:
+    """Release the lock held by owner, so the next worker need not wait."""
+    try:
+        await locks.update_one(
+            {"_id": INDEXES_LOCK_ID, "owner": owner},
+            {"$set": {"expires_at": datetime.now(UTC)}},
+        )
+    except PyMongoError:
+        logger.exception("Could not release the indexes lock.")
+
+
+async def _create_indexes_holding_lock(db: Any, owner: str, version: str) -> None:
+    """Create the indexes, renewing the lease, and record the version when done."""
+    locks = db[LOCKS_COLLECTION]
+    renewal = asyncio.create_task(_renew_lock(locks, owner))
+    try:
+        await create_indexes(db)
+    finally:
+        renewal.cancel()
+    await locks.update_one(
+        {"_id": INDEXES_LOCK_ID, "owner": owner},
+        {"$set": {"version": version, "expires_at": datetime.now(UTC)}},
     )
-    # start_entries_collection:
-    await db.start_entries_collection.create_index([("id", 1)], unique=True)
-    await db.start_entries_collection.create_index(
-        [("race_id", 1), ("starting_position", 1)], unique=True
+
+
+async def ensure_indexes(db: Any, owner: str) -> None:
+    """Create the indexes once for all workers, guarded by a lock document.
+
+    The worker that takes the lock creates the indexes, and records the
+    version of the specification in the lock document when done. The other
+    workers wait until that version is recorded. The lease of the lock is
+    renewed while the indexes are created. A lock not renewed, as when its
+    owner died, is taken over by the next worker when the lease expires.
+
+    If the indexes could not be created, as when a unique index fails on
+    duplicates, the version is not recorded, and the worker tries again
+    after a while. Failed attempts are counted in a metric, and after
+    INDEXES_MAX_ATTEMPTS the worker gives up and releases the lock.
+
+    Args:
+        db (Any): the db
+        owner (str): identifies the worker taking the lock
+
+    Raises:
+        PyMongoError: if the indexes could not be created in INDEXES_MAX_ATTEMPTS
+    """
+    version = indexes_version()
+    locks = db[LOCKS_COLLECTION]
+    failures = 0
+    while True:
+        try:
+            lock = await locks.find_one({"_id": INDEXES_LOCK_ID})
+            if lock and lock.get("version") == version:
+                return
+            now = datetime.now(UTC)
+            try:
+                # Fails with duplicate key if the lock is held by another worker:
+                await locks.update_one(
+                    {
+                        "_id": INDEXES_LOCK_ID,
+                        "$or": [{"expires_at": {"$lt": now}}, {"owner": owner}],
+                    },
+                    {"$set": {"owner": owner, "expires_at": now + INDEXES_LOCK_LEASE}},
+                    upsert=True,
+                )
+            except DuplicateKeyError:
+                logger.debug("Indexes are being created by another worker.")
+            else:
+                logger.info(f"Creating indexes of version {version}")
+                await _create_indexes_holding_lock(db, owner, version)
+                return
+        except PyMongoError:
+            INDEX_CREATION_FAILURES.inc()
+            failures += 1
+            if failures >= INDEXES_MAX_ATTEMPTS:
+                logger.exception(
+                    f"Could not create indexes in {failures} attempts, giving up."
+                )
+                await _release_lock(locks, owner)
+                raise
+            logger.exception("Could not create indexes, will retry.")
+        await asyncio.sleep(INDEXES_LOCK_POLL_SECONDS)
+
+
+def duplicates_pipeline(index: IndexSpec) -> list[dict]:
+    """Return the pipeline grouping the documents that break the unique index.
+
+    The _ids of each group are in the order the documents were inserted.
+    """
+    return [
+        {"$sort": {"_id": 1}},
+        {
+            "$group": {
+                "_id": {key: f"${key}" for key, _ in index.keys},
+                "ids": {"$push": "$_id"},
+            }
+        },
+        {"$match": {"ids.1": {"$exists": True}}},
+    ]
+
+
+async def find_duplicates(db: Any, apply: bool = False) -> list[str]:  # noqa: FBT001, FBT002
+    """Find the documents that break the unique indexes.
+
+    Args:
+        db (Any): the db
+        apply (bool): delete the duplicates, keeping the first inserted of each
+
+    Returns:
+        list[str]: One line per group of duplicates, empty if none was found.
+    """
+    findings: list[str] = []
+    for collection, indexes in INDEXES.items():
+        for index in indexes:
+            if not index.unique:
+                continue
+            cursor = db[collection].aggregate(duplicates_pipeline(index))
+            for group in await cursor.to_list(None):
+                first, *duplicates = group["ids"]
+                findings.append(
+                    f"{collection}: {len(duplicates)} duplicates of {first} "
+                    f"on {index.name} {group['_id']}: {duplicates}"
+                )
+                if apply:
+                    await db[collection].delete_many({"_id": {"$in": duplicates}})
+    return findings
+
+
+def diff_indexes(
+    specified: list[IndexSpec], existing: list[dict]
+) -> tuple[list[IndexSpec], list[str]]:
+    """Compare the specified indexes with the existing, as listed by the server.
+
+    An existing index with the same name as a specified index, but other keys
+    or uniqueness, is both obsolete and missing.
+
+    Returns:
+        tuple: The missing indexes, and the names of the obsolete indexes.
+    """
+    existing_by_name = {
+        index["name"]: IndexSpec(
+            tuple((key, int(direction)) for key, direction in index["key"].items()),
+            unique=bool(index.get("unique", False)),
+        )
+        for index in existing
+        if index["name"] != "_id_"
+    }
+    missing = [
+        index for index in specified if existing_by_name.get(index.name) != index
+    ]
+    obsolete = [
+        name
+        for name, index in existing_by_name.items()
+        if index not in specified or name != index.name
+    ]
+    return missing, obsolete
+
+
+def find_collection_scans(plan: Any) -> list[str]:
+    """Return the namespaces of collection scans in an explained query plan."""
+    scans: list[str] = []
+    if isinstance(plan, dict):
+        if plan.get("stage") == "COLLSCAN":
+            scans.append(plan.get("namespace", "COLLSCAN"))
+        for key, value in plan.items():
+            if key != "rejectedPlans":
+                scans.extend(find_collection_scans(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            scans.extend(find_collection_scans(value))
+    return scans
+
+
+async def audit_indexes(db: Any, apply: bool = False) -> list[str]:  # noqa: FBT001, FBT002
+    """Compare indexes with the specification, and explain the query shapes.
+
+    Args:
+        db (Any): the db
+        apply (bool): create the missing indexes and drop the obsolete ones
+
+    Returns:
+        list[str]: One line per finding, empty if nothing was found.
+    """
+    findings: list[str] = []
+    for collection, specified in INDEXES.items():
+        existing = await db[collection].list_indexes().to_list(None)
+        missing, obsolete = diff_indexes(specified, existing)
+        for name in obsolete:
+            findings.append(f"{collection}: obsolete index {name}")
+            if apply:
+                await db[collection].drop_index(name)
+        for index in missing:
+            findings.append(f"{collection}: missing index {index.name}")
+            if apply:
+                await db[collection].create_index(list(index.keys), unique=index.unique)
+    for collection, shapes in QUERY_SHAPES.items():
+        for shape in shapes:
+            cursor = db[collection].find(shape.filter)
+            if shape.sort:
+                cursor = cursor.sort(shape.sort)
+            explanation = await cursor.explain()
+            if find_collection_scans(explanation.get("queryPlanner", explanation)):
+                findings.append(
+                    f"{collection}: collection scan on {shape.filter} "
+                    f"sorted by {shape.sort}"
+                )
+    return findings
+
+
+async def _main(command: str, apply: bool, timezone: str | None) -> int:  # noqa: FBT001
+    """Run the command on the database configured in the environment."""
+    from dotenv import load_dotenv  # noqa: PLC0415
+    from motor.motor_asyncio import AsyncIOMotorClient  # noqa: PLC0415
+
+    load_dotenv()
+    mongo = AsyncIOMotorClient(
+        host=os.getenv("DB_HOST", "localhost"),
+        port=int(os.getenv("DB_PORT", "27017")),
+        username=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
     )
-    # time_events_collection:
-    await db.time_events_collection.create_index([("id", 1)], unique=True)
-    await db.time_events_collection.create_index(
-        [("event_id", 1), ("id", 1)], unique=True
+    db = mongo[os.getenv("DB_NAME", "races")]
+    try:
+        if command == "create-indexes":
+            await ensure_indexes(db, owner=f"bootstrap:{os.getpid()}")
+            return 0
+        if command == "duplicates":
+            findings = await find_duplicates(db, apply)
+            for finding in findings:
+                print(finding)
+            return 1 if findings and not apply else 0
+        if command == "migrate-datetimes":
+            migrated = await migrate_datetimes(db, timezone)  # type: ignore [reportArgumentType]
+            for collection, count in migrated.items():
+                print(f"{collection}: {count} documents migrated")
+            return 0
+        findings = await audit_indexes(db, apply)
+    finally:
+        mongo.close()
+    for finding in findings:
+        print(finding)
+    # Applying fixes the indexes, but not the collection scans:
+    if apply:
+        findings = [f for f in findings if "collection scan" in f]
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create or audit the indexes specified in db_utils, "
+        "find the duplicates breaking the unique indexes, "
+        "or migrate the stored datetimes."
     )
-    await db.time_events_collection.create_index(
-        [("event_id", 1), ("bib", 1), ("id", 1)], unique=True
+    parser.add_argument(
+        "command",
+        choices=["audit", "create-indexes", "duplicates", "migrate-datetimes"],
     )
-    await db.time_events_collection.create_index(
-        [("event_id", 1), ("timing_point", 1), ("id", 1)], unique=True
+    parser.add_argument(
+        "--apply",
+        action="store_true",
+        help="audit: create missing indexes and drop obsolete indexes; "
+        "duplicates: delete the duplicates, keeping the first inserted",
     )
-    await db.time_events_collection.create_index(
-        [("race_id", 1), ("id", 1)], unique=True
+    parser.add_argument(
+        "--timezone",
+        help="migrate-datetimes: the timezone of the events, e.g. Europe/Oslo",
     )
+    args = parser.parse_args()
+    if args.command == "migrate-datetimes" and not args.timezone:
+        parser.error("migrate-datetimes requires --timezone")
+    raise SystemExit(asyncio.run(_main(args.command, args.apply, args.timezone)))
@@ -0,0 +1,36 @@
+"""Utilities module for entity tags of versioned resources."""
+
+from aiohttp import hdrs
+from aiohttp.web import HTTPPreconditionFailed, Request
+
+
+def etag_from_version(version: int) -> str:
+    """Create the entity tag of the given document version."""
+    return f'"{version}"'
+
+
+def extract_version_from_if_match(request: Request) -> int | None:
+    """Extract the expected document version from the If-Match header in request.
+
+    Returns None if there is no If-Match header, or it matches any version.
+    If-Match is evaluated with strong comparison, so a weak entity tag never
+    matches (RFC 9110, section 13.1.1).
+
+    Raises:
+        HTTPPreconditionFailed: if the header is not the strong entity tag of
+            a version
+    """
+    if_match = request.headers.getone(hdrs.IF_MATCH, None)
+    if if_match is None or if_match.strip() == "*":
+        return None
+    etag = if_match.strip()
+    if etag.startswith("W/"):
+        raise HTTPPreconditionFailed(
+            reason=f"If-Match {if_match} is a weak entity tag, and never matches."
+        )
+    try:
+        return int(etag.strip('"'))
+    except ValueError as e:
+        raise HTTPPreconditionFailed(
+            reason=f"If-Match {if_match} does not match any version."
+        ) from e
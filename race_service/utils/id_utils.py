@@ -0,0 +1,62 @@
+"""Utilities module for creating document ids.
+
+Ids are UUID version 7 (RFC 9562): a 48 bit unix timestamp in
+milliseconds, followed by a counter and random bits. Ids created later
+sort after ids created earlier, so inserts go to the right-hand end of the
+id indexes instead of to random pages. They are formatted like any other
+UUID, and existing UUID4 ids are still valid ids.
+"""
+
+import secrets
+import threading
+import time
+import uuid
+
+_COUNTER_MAX = 0xFFF  # 12 bits, the rand_a field of UUIDv7
+_VERSION = 0x7
+_VARIANT = 0b10
+
+
+class _TimeOrderedIdGenerator:
+    """Create UUIDv7 ids, monotonic within the process.
+
+    Ids created in the same millisecond get an incrementing counter, that
+    starts at a random value in the lower half of its range. If the counter
+    overflows, the timestamp is advanced by one millisecond.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the generator."""
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._counter = 0
+
+    def __call__(self) -> str:  # pragma: no cover
+        """Create an id."""
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._counter = secrets.randbits(11)
+            else:
+                self._counter += 1
+                if self._counter > _COUNTER_MAX:
+                    self._last_ms += 1
+                    self._counter = 0
+            timestamp_ms, counter = self._last_ms, self._counter
+        value = (
+            (timestamp_ms & 0xFFFFFFFFFFFF) << 80
+            | _VERSION << 76
+            | counter << 64
+            | _VARIANT << 62
+            | secrets.randbits(62)
+        )
+        return str(uuid.UUID(int=value))
+
+
+_generator = _TimeOrderedIdGenerator()
+
+
+def create_id() -> str:  # pragma: no cover
+    """Creates a time-ordered uuid."""
+    return _generator()
@@ -0,0 +1,96 @@
+"""Module for appending JSON lines to files off the event loop.
+
+The files of recorded requests and of traces are appended to by every
+worker. A writer queues the objects to append, and a thread encodes and
+appends them, so that the event loop does not wait for the file. When the
+file cannot keep up, the queue is bounded, and objects that do not fit are
+dropped and counted, rather than the requests waiting.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+from collections.abc import Callable
+from typing import Any
+
+from .metrics_utils import REGISTRY, Counter
+
+DEFAULT_MAXSIZE = 10000
+
+LINES_DROPPED = REGISTRY.register(
+    Counter(
+        "json_lines_dropped_total",
+        "Number of JSON lines dropped as the queue of the writer was full.",
+        ("writer",),
+    )
+)
+
+_STOP = object()
+
+
+def append_line(path: str, line: str) -> None:
+    """Append the line to the file at path, creating it if needed."""
+    # One write of the whole line, so that lines appended by several
+    # workers do not interleave:
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, f"{line}\n".encode())
+    finally:
+        os.close(fd)
+
+
+def _encode(obj: Any) -> str:
+    """Encode the object as a compact line of JSON."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+class JsonLinesWriter:
+    """Class representing a writer appending JSON lines to a file in a thread."""
+
+    logger = logging.getLogger("race_service.utils.jsonlines_utils.JsonLinesWriter")
+
+    def __init__(
+        self,
+        path: str,
+        name: str,
+        encode: Callable[[Any], str] = _encode,
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        """Initialize the writer, and start its thread.
+
+        Args:
+            path (str): the file to append to
+            name (str): the name of the writer in logs and metrics
+            encode (Callable[[Any], str]): encodes an object as a line
+            maxsize (int): the number of objects the queue holds
+        """
+        self.path = path
+        self.name = name
+        self.encode = encode
+        self._queue: queue.Queue = queue.Queue(maxsize)
+        self._thread = threading.Thread(
+            target=self._run, name=f"json-lines-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, obj: Any) -> None:
+        """Queue the object to be appended, dropping it if the queue is full."""
+        try:
+            self._queue.put_nowait(obj)
+        except queue.Full:
+            LINES_DROPPED.inc(writer=self.name)
+
+    def close(self) -> None:
+        """Append the objects queued, and stop the thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Encode and append the objects queued, until stopped."""
+        while (obj := self._queue.get()) is not _STOP:
+            try:
+                append_line(self.path, self.encode(obj))
+            except Exception:
+                self.logger.exception(f"Could not append a line to {self.path}")
@@ -0,0 +1,132 @@
+"""Module for monitoring the lag of the event loop.
+
+A task on the loop sleeps for an interval at a time, and records how much
+later than the interval it wakes up: the lag, the time callbacks wait for
+the loop. A blocked loop cannot report itself, so a watchdog thread checks
+that the task keeps waking up. When it has not for longer than the
+threshold, the watchdog logs the handler running on the loop, with a
+snapshot of the stack of the loop, and counts the block per route.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .metrics_utils import REGISTRY, Counter, Histogram
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+STACK_LIMIT = 30
+
+LOOP_LAG_SECONDS = REGISTRY.register(
+    Histogram(
+        "event_loop_lag_seconds",
+        "Lag of the event loop in running a callback when due.",
+        buckets=LAG_BUCKETS,
+    )
+)
+LOOP_BLOCKED = REGISTRY.register(
+    Counter(
+        "event_loop_blocked_total",
+        "Number of times the event loop was blocked over the threshold, per route.",
+        ("method", "route"),
+    )
+)
+
+# The method and route of the handler run by each task:
+_handlers: dict[asyncio.Task, tuple[str, str]] = {}
+
+
+@contextmanager
+def handler_running(method: str, route: str) -> Iterator[None]:
+    """Mark the current task as running the handler of the method and route."""
+    task = asyncio.current_task()
+    if task is None:  # pragma: no cover
+        yield
+        return
+    _handlers[task] = (method, route)
+    try:
+        yield
+    finally:
+        del _handlers[task]
+
+
+class LoopMonitor:
+    """Class representing a monitor of the lag of the running event loop."""
+
+    logger = logging.getLogger("race_service.utils.loop_monitor.LoopMonitor")
+
+    def __init__(self, threshold_ms: float, interval_ms: float = 100) -> None:
+        """Initialize the monitor, logging blocks longer than threshold_ms."""
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._beat = time.monotonic()
+        self._reported_beat = self._beat
+        self._stopped = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id = 0
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start monitoring the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._sample())
+        self._watchdog = threading.Thread(
+            target=self._watch, name="loop-monitor", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop monitoring."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
+
+    async def _sample(self) -> None:
+        """Record the lag of waking up after each interval."""
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._beat = time.monotonic()
+            LOOP_LAG_SECONDS.observe(max(0.0, self._beat - start - self.interval))
+
+    def _watch(self) -> None:
+        """Report the loop, once per block, when blocked over the threshold."""
+        while not self._stopped.wait(self.interval):
+            beat = self._beat
+            blocked = time.monotonic() - beat - self.interval
+            if blocked >= self.threshold and beat != self._reported_beat:
+                self._reported_beat = beat
+                self._report(blocked)
+
+    def _report(self, blocked: float) -> None:
+        """Log the handler running on the loop, and the stack of the loop."""
+        task = asyncio.current_task(self._loop)
+        method, route = _handlers.get(task, ("none", "none"))  # type: ignore[arg-type]
+        LOOP_BLOCKED.inc(method=method, route=route)
+        frame = sys._current_frames().get(self._loop_thread_id)  # noqa: SLF001
+        stack = (
+            ""
+            if frame is None
+            else "".join(traceback.format_stack(frame, limit=STACK_LIMIT))
+        )
+        self.logger.warning(
+            f"Event loop blocked for {blocked * 1000:.0f} ms or more, "
+            f"running {method} {route}",
+            extra={
+                "loop_blocked": True,
+                "method": method,
+                "route": route,
+                "blocked_ms": round(blocked * 1000),
+                "stack": stack,
+            },
+        )
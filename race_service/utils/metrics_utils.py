@@ -0,0 +1,179 @@
+"""Module for metrics in the Prometheus text exposition format.
+
+The metrics are kept in memory per process. Each gunicorn worker exposes
+its own metrics, so a scrape of /metrics reports the worker that served it.
+The metrics may be updated from other threads than the event loop's, so
+updates are made under a lock, and a metric is rendered from a snapshot
+taken under the same lock.
+"""
+
+import math
+import threading
+from collections.abc import Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    """Format labels as {name="value",...}, with values escaped."""
+    if not labels:
+        return ""
+    items = ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"),
+        )
+        for name, value in labels.items()
+    )
+    return f"{{{items}}}"
+
+
+def _format_value(value: float) -> str:
+    """Format a value as Prometheus does, with +Inf for infinity."""
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Class representing a metric with values per combination of labels."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple = ()) -> None:
+        """Initialize the metric without any values."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        """Return the label values in the order of the label names."""
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def value(self, **labels: str) -> float:
+        """Return the value of the metric with the labels, 0 if not set."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yield name, labels and value of every sample of the metric."""
+        for key, value in self._values.items():
+            yield self.name, dict(zip(self.labelnames, key, strict=True)), value
+
+    def render(self) -> str:
+        """Return the metric in the text exposition format."""
+        with self._lock:
+            samples = list(self.samples())
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        lines.extend(
+            f"{name}{_format_labels(labels)} {_format_value(value)}"
+            for name, labels, value in samples
+        )
+        return "\n".join(lines) + "\n"
+
+
+class Counter(Metric):
+    """Class representing a counter, which only goes up."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increment the counter with the labels by amount."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Class representing a gauge, which goes up and down."""
+
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increment the gauge with the labels by amount."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Decrement the gauge with the labels by amount."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Class representing a histogram of observations in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize the histogram without any observations."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = (*buckets, math.inf)
+        self._counts: dict[tuple[str, ...], list[int]] = {}
+
+    def observe(self, amount: float, **labels: str) -> None:
+        """Observe amount in the histogram with the labels."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for i, bound in enumerate(self.buckets):
+                if amount <= bound:
+                    counts[i] += 1
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def count(self, **labels: str) -> int:
+        """Return the number of observations with the labels."""
+        return self._counts.get(self._key(labels), [0])[-1]
+
+    def samples(self) -> Iterator[tuple[str, dict[str, str], float]]:
+        """Yield the buckets, sum and count of the histogram per labels."""
+        for key, counts in self._counts.items():
+            labels = dict(zip(self.labelnames, key, strict=True))
+            for bound, count in zip(self.buckets, counts, strict=True):
+                le = _format_value(bound)
+                yield f"{self.name}_bucket", {**labels, "le": le}, count
+            yield f"{self.name}_sum", labels, self._values[key]
+            yield f"{self.name}_count", labels, counts[-1]
+
+
+class Registry:
+    """Class representing the metrics of a process."""
+
+    def __init__(self) -> None:
+        """Initialize the registry without metrics."""
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register[M: Metric](self, metric: M) -> M:
+        """Register and return the metric.
+
+        Raises:
+            ValueError: if a metric with the same name is registered
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                msg = f"Metric {metric.name} is already registered."
+                raise ValueError(msg)
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Return all metrics in the text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+
+REGISTRY = Registry()
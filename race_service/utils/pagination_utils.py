@@ -0,0 +1,92 @@
+"""Utilities module for paginated list resources.
+
+A list is paginated if the limit or after query parameter is given, and then
+read in pages of at most limit items. If there are more items, the response
+has a Link header to the next page, with an after query parameter holding an
+opaque cursor: the sort key values of the last item. Without these
+parameters the whole list is returned, as before pagination.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from aiohttp import hdrs
+from aiohttp.web import HTTPBadRequest, Request
+
+from race_service.adapters import Page
+
+MAX_LIMIT = 1000
+DEFAULT_LIMIT = MAX_LIMIT
+
+
+def _encode_value(value: object) -> object:
+    """Encode datetimes, which JSON does not have, as tagged strings."""
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _decode_value(value: object) -> object:
+    """Decode datetimes encoded by _encode_value."""
+    if isinstance(value, dict):
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_cursor(values: dict) -> str:
+    """Encode the sort key values of the last item of a page as a cursor."""
+    data = json.dumps({key: _encode_value(value) for key, value in values.items()})
+    data = data.encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor made by encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is not a cursor
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return {key: _decode_value(value) for key, value in values.items()}
+    except (ValueError, AttributeError, TypeError, KeyError) as e:
+        msg = f"Invalid cursor {cursor}."
+        raise ValueError(msg) from e
+
+
+def extract_page_from_query(request: Request) -> Page | None:
+    """Extract the page from the limit and after query parameters of request.
+
+    Returns None, for the whole list, if neither parameter is given.
+
+    Raises:
+        HTTPBadRequest: if limit is not a number from 1 to MAX_LIMIT, or after
+            is not a cursor
+    """
+    query = request.rel_url.query
+    if "limit" not in query and "after" not in query:
+        return None
+    try:
+        limit = int(query.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_LIMIT:
+        raise HTTPBadRequest(
+            reason=f"Query parameter limit must be a number from 1 to {MAX_LIMIT}."
+        )
+    try:
+        after = decode_cursor(query["after"]) if "after" in query else None
+    except ValueError as e:
+        raise HTTPBadRequest(reason=str(e)) from e
+    return Page(limit=limit, after=after)
+
+
+def link_headers(request: Request, page: Page | None) -> dict[str, str]:
+    """Create the Link header to the next page, if there is one."""
+    if page is None or page.next_after is None:
+        return {}
+    url = request.rel_url.update_query(
+        limit=str(page.limit), after=encode_cursor(page.next_after)
+    )
+    return {hdrs.LINK: f'<{url}>; rel="next"'}
@@ -0,0 +1,56 @@
+"""Module for profiles of requests, kept per route in a directory."""
+
+import pstats
+import re
+from pathlib import Path
+
+SORT_KEYS = ("tottime", "cumtime")
+
+
+def profile_key(method: str, route: str) -> str:
+    """Return the name of the directory of the profiles of a route.
+
+    E.g. POST_time-events for POST /time-events.
+    """
+    return re.sub(r"[^\w.-]+", "_", f"{method}{route}").strip("_")
+
+
+def profiled_routes(directory: Path) -> dict[str, int]:
+    """Return the number of profiles per route."""
+    if not directory.is_dir():
+        return {}
+    return {
+        path.name: len(list(path.glob("*.prof")))
+        for path in sorted(directory.iterdir())
+        if path.is_dir()
+    }
+
+
+def top_functions(directory: Path, n: int, sort: str = "tottime") -> list[dict]:
+    """Return the n functions with most time in the profiles in directory.
+
+    The profiles are added up, and the functions sorted by sort, either the
+    time in the function itself (tottime) or including the functions it
+    called (cumtime).
+    """
+    files = sorted(directory.glob("*.prof"))
+    if not files:
+        return []
+    stats = pstats.Stats(*(str(file) for file in files))
+    rows = [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "tottime": round(tottime, 6),
+            "cumtime": round(cumtime, 6),
+        }
+        for (filename, line, name), (
+            primitive_calls,
+            calls,
+            tottime,
+            cumtime,
+            _,
+        ) in stats.stats.items()  # type: ignore[attr-defined]
+    ]
+    return sorted(rows, key=lambda row: row[sort], reverse=True)[:n]
@@ -0,0 +1,42 @@
+"""Utilities module for field projections of list resources.
+
+With the fields query parameter, e.g. fields=id,bib,rank, only the given
+fields of each item are read and returned. The id is always returned.
+"""
+
+import json
+from dataclasses import fields as dataclass_fields
+from datetime import datetime
+from typing import Any
+
+from aiohttp.web import HTTPBadRequest, Request
+
+
+def extract_fields_from_query(request: Request, *models: Any) -> list[str] | None:
+    """Extract the fields query parameter, if given, as a list of field names.
+
+    The fields must be fields of one of the given models.
+
+    Raises:
+        HTTPBadRequest: if a field is not a field of the models
+    """
+    if "fields" not in request.rel_url.query:
+        return None
+    known = {field.name for model in models for field in dataclass_fields(model)}
+    fields = ["id"]
+    for name in [name.strip() for name in request.rel_url.query["fields"].split(",")]:
+        if name not in known:
+            raise HTTPBadRequest(reason=f"Unknown field {name!r} in query.")
+        if name not in fields:
+            fields.append(name)
+    return fields
+
+
+def _encode_value(value: object) -> str:
+    """Encode datetimes as in the models, and anything else as a string."""
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def documents_to_json(documents: list[dict]) -> str:
+    """Serialize projected documents, with datetimes in ISO 8601."""
+    return json.dumps(documents, default=_encode_value, ensure_ascii=False)
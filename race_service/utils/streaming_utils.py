@@ -0,0 +1,53 @@
+"""Utilities module for streaming large collections as chunked responses.
+
+The items are written as they are read from the database, one batch at a
+time, so the response starts at once and the memory used is proportional to
+the batch size. The body is a JSON array, or newline delimited JSON if the
+client accepts application/x-ndjson.
+"""
+
+import json
+from collections.abc import AsyncIterator
+
+from aiohttp import hdrs
+from aiohttp.web import Request, StreamResponse
+
+NDJSON = "application/x-ndjson"
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Return True if the client accepts newline delimited JSON."""
+    return NDJSON in request.headers.get(hdrs.ACCEPT, "")
+
+
+async def stream_json(
+    request: Request, batches: AsyncIterator[list[dict]]
+) -> StreamResponse:
+    """Write the batches of items as one chunk each, and return the response."""
+    ndjson = accepts_ndjson(request)
+    response = StreamResponse(status=200)
+    response.content_type = NDJSON if ndjson else "application/json"
+    response.charset = "utf-8"
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+
+    separator = "\n" if ndjson else ","
+    first = True
+    if not ndjson:
+        await response.write(b"[")
+    async for batch in batches:
+        if not batch:
+            continue
+        chunk = separator.join(
+            json.dumps(item, default=str, ensure_ascii=False) for item in batch
+        )
+        if ndjson:
+            chunk += "\n"
+        elif not first:
+            chunk = separator + chunk
+        first = False
+        await response.write(chunk.encode())
+    if not ndjson:
+        await response.write(b"]")
+    await response.write_eof()
+    return response
@@ -0,0 +1,324 @@
+"""Module for tracing requests in spans across views, services and adapters.
+
+A traced request has a span for the view, and a child span for every call
+of a command, service or adapter made while handling it, the current span
+kept in a context variable. Calls outside of traced requests are not
+traced. The trace is continued from the W3C traceparent header of the
+request, and propagated to the upstream services in the same header.
+
+When the request is handled, its spans are exported as one line of OTLP
+JSON, as read by the OTLP JSON file receiver of the OpenTelemetry
+collector. The lines are encoded and appended by a JsonLinesWriter, off
+the event loop. The slowest requests in such a file are broken down by the time
+spent in each layer by:
+
+    % uv run python -m race_service.utils.tracing traces.jsonl --slowest 10
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import re
+import secrets
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .jsonlines_utils import DEFAULT_MAXSIZE, JsonLinesWriter
+
+# The OTLP kinds of the spans of the layers:
+LAYERS = {"view": 2, "command": 1, "service": 1, "adapter": 3}
+SCOPE = "race_service.utils.tracing"
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+@dataclass(slots=True)
+class Span:
+    """Data class with details about a span of a trace."""
+
+    name: str
+    layer: str
+    trace_id: str
+    parent_span_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, str | int] = field(default_factory=dict)
+    error: bool = False
+
+
+class JsonLinesExporter:
+    """Class representing an exporter of traces to a file of OTLP JSON lines."""
+
+    def __init__(
+        self,
+        path: str,
+        service_name: str = "race-service",
+        maxsize: int = DEFAULT_MAXSIZE,
+    ) -> None:
+        """Initialize the exporter, appending to the file at path."""
+        self.path = path
+        self.service_name = service_name
+        self.writer = JsonLinesWriter(path, "tracing", self._encode, maxsize)
+
+    def export(self, spans: list[Span]) -> None:
+        """Queue the spans of a trace to be appended to the file, as one line."""
+        self.writer.write(spans)
+
+    def close(self) -> None:
+        """Append the traces queued, and stop exporting."""
+        self.writer.close()
+
+    def _encode(self, spans: list[Span]) -> str:
+        """Encode the spans of a trace as a line of OTLP JSON."""
+        return json.dumps(otlp_json(spans, self.service_name), separators=(",", ":"))
+
+
+@dataclass(slots=True)
+class _Trace:
+    """Data class with the spans of a trace, and its exporter."""
+
+    exporter: JsonLinesExporter
+    spans: list[Span]
+
+
+_current: ContextVar[tuple[_Trace, Span] | None] = ContextVar(
+    "current_span", default=None
+)
+
+
+def otlp_json(spans: list[Span], service_name: str) -> dict:
+    """Return the spans as OTLP JSON traces data."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": [
+                        {"key": "service.name", "value": {"stringValue": service_name}}
+                    ]
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": SCOPE},
+                        "spans": [
+                            {
+                                "traceId": span.trace_id,
+                                "spanId": span.span_id,
+                                "parentSpanId": span.parent_span_id,
+                                "name": span.name,
+                                "kind": LAYERS[span.layer],
+                                "startTimeUnixNano": str(span.start_ns),
+                                "endTimeUnixNano": str(span.end_ns),
+                                "attributes": [
+                                    {"key": key, "value": _otlp_value(value)}
+                                    for key, value in {
+                                        "layer": span.layer,
+                                        **span.attributes,
+                                    }.items()
+                                ],
+                                "status": {"code": 2 if span.error else 1},
+                            }
+                            for span in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def _otlp_value(value: str | int) -> dict:
+    """Return the value as an OTLP JSON attribute value."""
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    return {"stringValue": value}
+
+
+def trace_headers() -> dict[str, str]:
+    """Return the traceparent header of the current span, if any."""
+    current = _current.get()
+    if current is None:
+        return {}
+    _, span = current
+    return {"traceparent": f"00-{span.trace_id}-{span.span_id}-01"}
+
+
+@contextmanager
+def start_trace(
+    exporter: JsonLinesExporter, name: str, traceparent: str | None = None
+) -> Iterator[Span]:
+    """Trace the block in the span of a view, and export the trace after.
+
+    The trace is continued from the traceparent header, if valid.
+    """
+    match = TRACEPARENT.match(traceparent or "")
+    trace_id, parent_span_id = match.groups() if match else (secrets.token_hex(16), "")
+    span = Span(name, "view", trace_id, parent_span_id)
+    trace = _Trace(exporter, [span])
+    token = _current.set((trace, span))
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+        span.end_ns = time.time_ns()
+        exporter.export(trace.spans)
+
+
+def _child_span(name: str, layer: str) -> tuple[_Trace, Span] | None:
+    """Return a new child span of the current span, None if not traced."""
+    current = _current.get()
+    if current is None:
+        return None
+    trace, parent = current
+    span = Span(name, layer, parent.trace_id, parent.span_id)
+    trace.spans.append(span)
+    return trace, span
+
+
+def _end(span: Span, exception: BaseException | None) -> None:
+    """End the span, marking it as failed by the exception, if any."""
+    span.end_ns = time.time_ns()
+    if exception is not None:
+        span.error = True
+        span.attributes["exception.type"] = type(exception).__name__
+
+
+def _trace_generator(func: Callable, name: str, layer: str) -> Callable:
+    """Return the async generator function wrapped to trace its calls."""
+
+    @functools.wraps(func)
+    async def generator(*args: Any, **kwargs: Any) -> AsyncIterator:
+        child = _child_span(name, layer)
+        if child is None:
+            async for item in func(*args, **kwargs):
+                yield item
+            return
+        # Not made the current span, as the caller runs between items:
+        _, span = child
+        exception = None
+        try:
+            async for item in func(*args, **kwargs):
+                yield item
+        except BaseException as e:
+            exception = e
+            raise
+        finally:
+            _end(span, exception)
+
+    return generator
+
+
+def _trace_coroutine(func: Callable, name: str, layer: str) -> Callable:
+    """Return the coroutine function wrapped to trace its calls."""
+
+    @functools.wraps(func)
+    async def coroutine(*args: Any, **kwargs: Any) -> Any:
+        child = _child_span(name, layer)
+        if child is None:
+            return await func(*args, **kwargs)
+        token = _current.set(child)
+        exception = None
+        try:
+            return await func(*args, **kwargs)
+        except BaseException as e:
+            exception = e
+            raise
+        finally:
+            _current.reset(token)
+            _end(child[1], exception)
+
+    return coroutine
+
+
+def trace_function(func: Callable, name: str, layer: str) -> Callable:
+    """Return func wrapped to trace its calls in spans, if async."""
+    if inspect.isasyncgenfunction(func):
+        return _trace_generator(func, name, layer)
+    if inspect.iscoroutinefunction(func):
+        return _trace_coroutine(func, name, layer)
+    return func
+
+
+def traced(layer: str) -> Callable[[Callable], Callable]:
+    """Return a decorator tracing the calls of an async function."""
+
+    def decorator(func: Callable) -> Callable:
+        return trace_function(func, func.__qualname__, layer)
+
+    return decorator
+
+
+def trace_class[T: type](layer: str) -> Callable[[T], T]:
+    """Return a class decorator tracing the calls of its async classmethods."""
+
+    def decorator(cls: T) -> T:
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, classmethod):
+                wrapped = trace_function(
+                    value.__func__, f"{cls.__name__}.{name}", layer
+                )
+                setattr(cls, name, classmethod(wrapped))
+        return cls
+
+    return decorator
+
+
+def _spans(line: str) -> list[dict]:
+    """Return the spans of a line of OTLP JSON."""
+    return [
+        span
+        for resource_spans in json.loads(line)["resourceSpans"]
+        for scope_spans in resource_spans["scopeSpans"]
+        for span in scope_spans["spans"]
+    ]
+
+
+def breakdown(spans: list[dict]) -> dict:
+    """Return the duration of a trace, and the time spent in each layer.
+
+    The time in a layer is the time in its spans, less the time in their
+    child spans.
+    """
+
+    def duration_ms(span: dict) -> float:
+        return (int(span["endTimeUnixNano"]) - int(span["startTimeUnixNano"])) / 1e6
+
+    children: dict[str, float] = defaultdict(float)
+    for span in spans:
+        children[span["parentSpanId"]] += duration_ms(span)
+    layers: dict[str, float] = defaultdict(float)
+    for span in spans:
+        layer = next(
+            a["value"]["stringValue"] for a in span["attributes"] if a["key"] == "layer"
+        )
+        layers[layer] += max(0.0, duration_ms(span) - children[span["spanId"]])
+    root = next(span for span in spans if span["kind"] == LAYERS["view"])
+    return {
+        "trace_id": root["traceId"],
+        "name": root["name"],
+        "ms": round(duration_ms(root), 1),
+        **{f"{layer} ms": round(layers[layer], 1) for layer in LAYERS},
+    }
+
+
+def _main(path: str, slowest: int) -> None:
+    """Print the breakdown of the slowest traces in the file."""
+    traces = [breakdown(_spans(line)) for line in Path(path).read_text().splitlines()]
+    for trace in sorted(traces, key=lambda trace: trace["ms"], reverse=True)[:slowest]:
+        print(trace)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    parser = argparse.ArgumentParser(
+        description="Break down the slowest traces by the time in each layer."
+    )
+    parser.add_argument("path", help="file of OTLP JSON lines")
+    parser.add_argument("--slowest", type=int, default=10)
+    args = parser.parse_args()
+    _main(args.path, args.slowest)
@@ -1,19 +1,25 @@
 """Package for all views."""
 
 from .liveness import Ping, Ready
+from .metrics import Metrics
+from .profiles import ProfilesView
 from .race_results import RaceResultsView, RaceResultView
 from .raceplans import RaceplansView, RaceplanView
 from .raceplans_commands import GenerateRaceplanForEventView, ValidateRaceplanView
 from .races import RacesView, RaceView
 from .start_entries import StartEntriesView, StartEntryView
+from .start_entries_commands import MoveStartEntryView, SwapStartEntriesView
 from .startlists import StartlistsView, StartlistView
 from .startlists_commands import GenerateStartlistForEventView
-from .time_events import TimeEventsView, TimeEventView
+from .time_events import TimeEventsExportView, TimeEventsView, TimeEventView
 
 __all__ = [
     "GenerateRaceplanForEventView",
     "GenerateStartlistForEventView",
+    "Metrics",
+    "MoveStartEntryView",
     "Ping",
+    "ProfilesView",
     "RaceResultView",
     "RaceResultsView",
     "RaceView",
@@ -25,7 +31,9 @@ __all__ = [
     "StartEntryView",
     "StartlistView",
     "StartlistsView",
+    "SwapStartEntriesView",
     "TimeEventView",
+    "TimeEventsExportView",
     "TimeEventsView",
     "ValidateRaceplanView",
 ]
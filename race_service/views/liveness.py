@@ -18,6 +18,18 @@ class Ready(web.View):
 
     async def get(self) -> web.Response:
         """Ready route function."""
+        index_task = self.request.app.get("index_task")
+        if index_task is not None:
+            if not index_task.done():
+                raise web.HTTPServiceUnavailable(reason="Indexes are being created.")
+            # Without the indexes the service is slower, and the unique
+            # constraints are not enforced, but it still serves. So it is
+            # ready, and the failure is logged and counted in the metrics:
+            if index_task.cancelled() or index_task.exception() is not None:
+                self.logger.error(
+                    "Indexes could not be created.",
+                    exc_info=None if index_task.cancelled() else index_task.exception(),
+                )
         if CONFIG in {"test", "dev"}:
             pass
         else:  # pragma: no cover
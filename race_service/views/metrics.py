@@ -0,0 +1,16 @@
+"""Resource module for the metrics resource."""
+
+from aiohttp import hdrs, web
+
+from race_service.utils.metrics_utils import CONTENT_TYPE, REGISTRY
+
+
+class Metrics(web.View):
+    """Class representing metrics resource."""
+
+    @staticmethod
+    async def get() -> web.Response:
+        """Metrics route function."""
+        return web.Response(
+            text=REGISTRY.render(), headers={hdrs.CONTENT_TYPE: CONTENT_TYPE}
+        )
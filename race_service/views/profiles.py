@@ -0,0 +1,62 @@
+"""Resource module for the profiles resource."""
+
+import asyncio
+import json
+import logging
+
+from aiohttp.web import HTTPBadRequest, HTTPNotFound, Response, View
+
+from race_service.adapters import UsersAdapter
+from race_service.utils.jwt_utils import extract_token_from_request
+from race_service.utils.profiling_utils import (
+    SORT_KEYS,
+    profiled_routes,
+    top_functions,
+)
+
+DEFAULT_TOP = 20
+
+
+class ProfilesView(View):
+    """Class representing the profiles of requests, per route."""
+
+    logger = logging.getLogger("race_service.views.profiles.ProfilesView")
+
+    async def get(self) -> Response:
+        """Get route function.
+
+        Without the query parameter route, returns the number of profiles per
+        route. With it, returns the top functions of the profiles of the
+        route, by the query parameters top and sort (tottime or cumtime).
+        """
+        token = extract_token_from_request(self.request)
+        try:
+            await UsersAdapter.authorize(token, roles=["admin"])
+        except Exception as e:
+            raise e from e
+
+        directory = self.request.app["profile_dir"]
+        query = self.request.rel_url.query
+        if "route" not in query:
+            body = await asyncio.to_thread(profiled_routes, directory)
+            return Response(
+                status=200, body=json.dumps(body), content_type="application/json"
+            )
+
+        route = query["route"]
+        sort = query.get("sort", "tottime")
+        try:
+            top = int(query.get("top", DEFAULT_TOP))
+        except ValueError as e:
+            raise HTTPBadRequest(reason=f"Invalid top {query['top']}.") from e
+        if sort not in SORT_KEYS:
+            raise HTTPBadRequest(reason=f"Invalid sort {sort}, not in {SORT_KEYS}.")
+        routes = await asyncio.to_thread(profiled_routes, directory)
+        if route not in routes:
+            raise HTTPNotFound(reason=f"No profiles of route {route}.")
+
+        functions = await asyncio.to_thread(top_functions, directory / route, top, sort)
+        body = {"route": route, "profiles": routes[route], "functions": functions}
+        return Response(
+            status=200, body=json.dumps(body), content_type="application/json"
+        )
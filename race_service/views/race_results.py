@@ -4,13 +4,17 @@ import json
 import logging
 import os
 
+from aiohttp import hdrs
 from aiohttp.web import (
+    HTTPConflict,
     HTTPNotFound,
+    HTTPPreconditionFailed,
     HTTPUnprocessableEntity,
     Response,
     View,
 )
 from dotenv import load_dotenv
+from multidict import MultiDict
 
 from race_service.adapters import (
     RaceNotFoundError,
@@ -19,6 +23,7 @@ from race_service.adapters import (
     RacesAdapter,
     TimeEventsAdapter,
     UsersAdapter,
+    VersionConflictError,
 )
 from race_service.models import (
     IndividualSprintRace,
@@ -26,11 +31,17 @@ from race_service.models import (
     RaceResult,
     TimeEvent,
 )
+from race_service.models.codec import to_dict, to_json
+from race_service.models.time_event_model import sorted_on_rank
 from race_service.services import (
     IllegalValueError,
     RaceResultsService,
     RacesService,
 )
+from race_service.utils.etag_utils import (
+    etag_from_version,
+    extract_version_from_if_match,
+)
 from race_service.utils.jwt_utils import extract_token_from_request
 
 load_dotenv()
@@ -66,27 +77,14 @@ class RaceResultsView(View):
         ids_only = self.request.rel_url.query.get("idsOnly", None)
         if not ids_only:
             for race_result in race_results:
-                time_events = []
-                time_events_sorted = []
-                for time_event_id in race_result.ranking_sequence:
-                    time_event = await TimeEventsAdapter.get_time_event_by_id(
-                        db, time_event_id
+                # The time-events are fetched in one query, and sorted on rank:
+                race_result.ranking_sequence = sorted_on_rank(
+                    await TimeEventsAdapter.get_time_events_by_ids(
+                        db, race_result.ranking_sequence
                     )
-                    time_events.append(time_event)
-                    # We sort the time-events on rank:
-                time_events_sorted = sorted(
-                    time_events,
-                    key=lambda k: (
-                        k.rank is not None,
-                        k.rank != "",
-                        k.rank,
-                    ),
-                    reverse=False,
                 )
 
-                race_result.ranking_sequence = time_events_sorted
-
-        _race_results = [race_result.to_dict() for race_result in race_results]
+        _race_results = [to_dict(race_result) for race_result in race_results]
 
         body = json.dumps(_race_results, default=str, ensure_ascii=False)
         return Response(status=200, body=body, content_type="application/json")
@@ -108,30 +106,22 @@ class RaceResultView(View):
             race_result = await RaceResultsAdapter.get_race_result_by_id(
                 db, race_result_id
             )
-            # We expand references to time-events in race-result's ranking-sequence:
-            time_events: list[TimeEvent] = []
-            for time_event_id in race_result.ranking_sequence:
-                time_event = await TimeEventsAdapter.get_time_event_by_id(
-                    db, time_event_id
-                )
-                time_events.append(time_event)
-                # We sort the time-events on rank:
-            time_events_sorted = sorted(
-                time_events,
-                key=lambda k: (
-                    k.rank is not None,
-                    k.rank != "",
-                    k.rank,
-                ),
-                reverse=False,
+            # We expand references to time-events in race-result's ranking-sequence,
+            # fetched in one query, and sort them on rank:
+            time_events: list[
+                TimeEvent
+            ] = await TimeEventsAdapter.get_time_events_by_ids(
+                db, race_result.ranking_sequence
             )
-
-            race_result.ranking_sequence = time_events_sorted  # type: ignore [reportAttributeAccessIssue]
+            race_result.ranking_sequence = sorted_on_rank(time_events)  # type: ignore [reportAttributeAccessIssue]
         except RaceResultNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
         self.logger.debug(f"Got race_result: {race_result}")
-        body = race_result.to_json()
-        return Response(status=200, body=body, content_type="application/json")
+        body = to_json(race_result)
+        headers = MultiDict([(hdrs.ETAG, etag_from_version(race_result.version))])
+        return Response(
+            status=200, body=body, content_type="application/json", headers=headers
+        )
 
     async def put(self) -> Response:
         """Put route function."""
@@ -158,13 +148,28 @@ class RaceResultView(View):
                 reason=f"Mandatory property {e.args[0]} is missing."
             ) from e
 
+        # The race-result is written only if it is still the version the client read,
+        # as given by If-Match or the body. Without either, any version is replaced:
+        expected_version = extract_version_from_if_match(self.request)
+        if expected_version is not None:
+            race_result.version = expected_version
+        check_version = expected_version is not None or (
+            hdrs.IF_MATCH not in self.request.headers and "version" in body
+        )
         try:
-            await RaceResultsService.update_race_result(db, race_result_id, race_result)
+            await RaceResultsService.update_race_result(
+                db, race_result_id, race_result, check_version=check_version
+            )
         except IllegalValueError as e:
             raise HTTPUnprocessableEntity(reason=str(e)) from e
         except RaceResultNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
-        return Response(status=204)
+        except VersionConflictError as e:
+            if expected_version is not None:
+                raise HTTPPreconditionFailed(reason=str(e)) from e
+            raise HTTPConflict(reason=str(e)) from e
+        headers = MultiDict([(hdrs.ETAG, etag_from_version(race_result.version))])
+        return Response(status=204, headers=headers)
 
     async def delete(self) -> Response:
         """Delete the race-result and all the race_results in it."""
@@ -196,8 +201,9 @@ class RaceResultView(View):
                         f"{race_result.race_id} of race-result with id {race_result.id}"
                     )
                 ) from e
-            del race.results[race_result.timing_point]
-            await RacesService.update_race(db, race.id, race)
+            await RacesService.set_race_result_of_race(
+                db, race, race_result.timing_point, None
+            )
 
             # We can finally delete the race-result:
             await RaceResultsService.delete_race_result(db, race_result_for_deletion_id)
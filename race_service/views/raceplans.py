@@ -20,12 +20,17 @@ from race_service.adapters import (
     UsersAdapter,
 )
 from race_service.models import IndividualSprintRace, IntervalStartRace, Raceplan
+from race_service.models.codec import to_dict, to_json
 from race_service.services import (
     IllegalValueError,
     RaceplansService,
     RacesService,
 )
 from race_service.utils.jwt_utils import extract_token_from_request
+from race_service.utils.pagination_utils import (
+    extract_page_from_query,
+    link_headers,
+)
 
 load_dotenv()
 
@@ -42,17 +47,23 @@ class RaceplansView(View):
     async def get(self) -> Response:
         """Get route function."""
         db = self.request.app["db"]
+        headers: dict[str, str] = {}
 
         if "eventId" in self.request.rel_url.query:
             event_id = self.request.rel_url.query["eventId"]
             raceplans = await RaceplansAdapter.get_raceplans_by_event_id(db, event_id)
         else:
-            raceplans = await RaceplansAdapter.get_all_raceplans(db)
+            # An event has at most one raceplan, so only all raceplans are paginated:
+            page = extract_page_from_query(self.request)
+            raceplans = await RaceplansAdapter.get_all_raceplans(db, page=page)
+            headers = link_headers(self.request, page)
 
-        _raceplans = [raceplan.to_dict() for raceplan in raceplans]
+        _raceplans = [to_dict(raceplan) for raceplan in raceplans]
 
         body = json.dumps(_raceplans, default=str, ensure_ascii=False)
-        return Response(status=200, body=body, content_type="application/json")
+        return Response(
+            status=200, body=body, content_type="application/json", headers=headers
+        )
 
 
 class RaceplanView(View):
@@ -82,7 +93,7 @@ class RaceplanView(View):
         except RaceplanNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
         self.logger.debug(f"Got raceplan: {raceplan}")
-        body = raceplan.to_json()
+        body = to_json(raceplan)
         return Response(status=200, body=body, content_type="application/json")
 
     async def put(self) -> Response:
@@ -5,14 +5,18 @@ import logging
 import os
 from typing import Any
 
+from aiohttp import hdrs
 from aiohttp.web import (
+    HTTPConflict,
     HTTPInternalServerError,
     HTTPNotFound,
+    HTTPPreconditionFailed,
     HTTPUnprocessableEntity,
     Response,
     View,
 )
 from dotenv import load_dotenv
+from multidict import MultiDict
 
 from race_service.adapters import (
     NotSupportedRaceDatatypeError,
@@ -21,22 +25,38 @@ from race_service.adapters import (
     StartEntriesAdapter,
     TimeEventsAdapter,
     UsersAdapter,
+    VersionConflictError,
 )
 from race_service.models import (
     StartEntry,
     TimeEvent,
 )
+from race_service.models.codec import to_dict, to_json
 from race_service.models.race_model import (
     IndividualSprintRace,
     IntervalStartRace,
     RaceResult,
 )
+from race_service.models.time_event_model import sorted_on_rank
 from race_service.services import (
     IllegalValueError,
     RaceNotFoundError,
     RacesService,
 )
+from race_service.services.timezones import event_timezone, localize_naive_datetimes
+from race_service.utils.etag_utils import (
+    etag_from_version,
+    extract_version_from_if_match,
+)
 from race_service.utils.jwt_utils import extract_token_from_request
+from race_service.utils.pagination_utils import (
+    extract_page_from_query,
+    link_headers,
+)
+from race_service.utils.projection_utils import (
+    documents_to_json,
+    extract_fields_from_query,
+)
 
 load_dotenv()
 
@@ -53,13 +73,33 @@ class RacesView(View):
     async def get(self) -> Response:
         """Get route function."""
         db = self.request.app["db"]
+        page = extract_page_from_query(self.request)
+
+        fields = extract_fields_from_query(
+            self.request, IndividualSprintRace, IntervalStartRace
+        )
+        if fields is not None:
+            # The fields as stored, without the start_entries and results expanded:
+            documents = await RacesAdapter.get_race_documents(
+                db,
+                fields,
+                event_id=self.request.rel_url.query.get("eventId"),
+                raceclass=self.request.rel_url.query.get("raceclass"),
+                page=page,
+            )
+            return Response(
+                status=200,
+                body=documents_to_json(documents),
+                content_type="application/json",
+                headers=link_headers(self.request, page),
+            )
 
         if "eventId" in self.request.rel_url.query:
             event_id = self.request.rel_url.query["eventId"]
             if "raceclass" in self.request.rel_url.query:
                 raceclass = self.request.rel_url.query["raceclass"]
                 races = await RacesAdapter.get_races_by_event_id_and_raceclass(
-                    db, event_id, raceclass
+                    db, event_id, raceclass, page=page
                 )
                 if races:
                     for race in races:
@@ -70,12 +110,19 @@ class RacesView(View):
                         # Get the race_results:
                         race.results = await get_race_results(db, race.results)  # type: ignore [reportAttributeAccessIssue]
             else:
-                races = await RacesAdapter.get_races_by_event_id(db, event_id)
+                races = await RacesAdapter.get_races_by_event_id(
+                    db, event_id, page=page
+                )
         else:
-            races = await RacesAdapter.get_all_races(db)
-        _races = [race.to_dict() for race in races]
+            races = await RacesAdapter.get_all_races(db, page=page)
+        _races = [to_dict(race) for race in races]
         body = json.dumps(_races, default=str, ensure_ascii=False)
-        return Response(status=200, body=body, content_type="application/json")
+        return Response(
+            status=200,
+            body=body,
+            content_type="application/json",
+            headers=link_headers(self.request, page),
+        )
 
 
 class RaceView(View):
@@ -101,8 +148,11 @@ class RaceView(View):
         except NotSupportedRaceDatatypeError as e:
             raise HTTPInternalServerError(reason=str(e)) from e
         self.logger.debug(f"Got race: {race}")
-        body = race.to_json()
-        return Response(status=200, body=body, content_type="application/json")
+        body = to_json(race)
+        headers = MultiDict([(hdrs.ETAG, etag_from_version(race.version))])
+        return Response(
+            status=200, body=body, content_type="application/json", headers=headers
+        )
 
     async def put(self) -> Response:
         """Put route function."""
@@ -132,14 +182,32 @@ class RaceView(View):
             raise HTTPUnprocessableEntity(
                 reason=f"Mandatory property {e.args[0]} is missing."
             ) from e
+        await localize_naive_datetimes(
+            race, lambda: event_timezone(token, race.event_id)
+        )
 
+        # The race is written only if it is still the version the client read,
+        # as given by If-Match or the body. Without either, any version is replaced:
+        expected_version = extract_version_from_if_match(self.request)
+        if expected_version is not None:
+            race.version = expected_version
+        check_version = expected_version is not None or (
+            hdrs.IF_MATCH not in self.request.headers and "version" in body
+        )
         try:
-            await RacesService.update_race(db, race_id, race)
+            await RacesService.update_race(
+                db, race_id, race, check_version=check_version
+            )
         except IllegalValueError as e:
             raise HTTPUnprocessableEntity(reason=str(e)) from e
         except RaceNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
-        return Response(status=204)
+        except VersionConflictError as e:
+            if expected_version is not None:
+                raise HTTPPreconditionFailed(reason=str(e)) from e
+            raise HTTPConflict(reason=str(e)) from e
+        headers = MultiDict([(hdrs.ETAG, etag_from_version(race.version))])
+        return Response(status=204, headers=headers)
 
     async def delete(self) -> Response:
         """Delete the race."""
@@ -161,13 +229,10 @@ class RaceView(View):
 
 
 async def get_start_entries(db: Any, start_entry_ids: list) -> list[StartEntry]:
-    """Get the start entries."""
-    start_entries: list[StartEntry] = []
-    for start_entry_id in start_entry_ids:
-        start_entry: StartEntry = await StartEntriesAdapter.get_start_entry_by_id(
-            db, start_entry_id
-        )
-        start_entries.append(start_entry)
+    """Get the start entries, in one query."""
+    start_entries = await StartEntriesAdapter.get_start_entries_by_ids(
+        db, start_entry_ids
+    )
 
     # We sort the start-entries on starting_position:
     start_entries.sort(
@@ -179,29 +244,26 @@ async def get_start_entries(db: Any, start_entry_ids: list) -> list[StartEntry]:
 
 
 async def get_race_results(db: Any, race_results: dict) -> dict[str, RaceResult]:
-    """Get the race results in sorted order."""
-    results: dict[str, RaceResult] = {}
-    for key in race_results:  # noqa: PLC0206
-        if key.lower() != "Template".lower():  # We skip the template
-            race_result: RaceResult = await RaceResultsAdapter().get_race_result_by_id(
-                db, race_results[key]
-            )
-            ranking_sequence: list[TimeEvent] = []
-            for time_event_id in race_result.ranking_sequence:
-                time_event = await TimeEventsAdapter.get_time_event_by_id(
-                    db, time_event_id
-                )
-                ranking_sequence.append(time_event)
-            # We sort the time-events on rank:
-            ranking_sequence_sorted = sorted(
-                ranking_sequence,
-                key=lambda k: (
-                    k.rank is not None,
-                    k.rank != "",
-                    k.rank,
-                ),
-                reverse=False,
-            )
-            race_result.ranking_sequence = ranking_sequence_sorted  # type: ignore [reportAttributeAccessIssue]
-            results[key] = race_result
-    return results
+    """Get the race results in sorted order.
+
+    The race results are fetched in one query, and the time-events of all of
+    them in one more. The time-events of each are sorted on rank.
+    """
+    # We skip the template:
+    timing_points = [key for key in race_results if key.lower() != "template"]
+    if not timing_points:
+        return {}
+    results = await RaceResultsAdapter.get_race_results_by_ids(
+        db, [race_results[key] for key in timing_points]
+    )
+    time_events: list[TimeEvent] = await TimeEventsAdapter.get_time_events_by_ids(
+        db, [id_ for result in results for id_ in result.ranking_sequence]
+    )
+    time_events_by_id = {time_event.id: time_event for time_event in time_events}
+    for race_result in results:
+        race_result.ranking_sequence = sorted_on_rank(  # type: ignore [reportAttributeAccessIssue]
+            [time_events_by_id[id_] for id_ in race_result.ranking_sequence]
+        )
+    # Timing points may share a race result, which is read only once:
+    results_by_id = {race_result.id: race_result for race_result in results}
+    return {key: results_by_id[race_results[key]] for key in timing_points}
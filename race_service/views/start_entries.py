@@ -30,6 +30,7 @@ from race_service.models import (
     StartEntry,
     Startlist,
 )
+from race_service.models.codec import to_dict, to_json
 from race_service.models.race_model import IndividualSprintRace, IntervalStartRace
 from race_service.services import (
     CouldNotCreateStartEntryError,
@@ -39,6 +40,7 @@ from race_service.services import (
     StartEntriesService,
     StartlistsService,
 )
+from race_service.services.timezones import localize_naive_datetimes, race_timezone
 from race_service.utils.jwt_utils import extract_token_from_request
 
 load_dotenv()
@@ -71,7 +73,7 @@ class StartEntriesView(View):
                 db, race_id
             )
 
-        _start_entries = [start_entry.to_dict() for start_entry in start_entries]
+        _start_entries = [to_dict(start_entry) for start_entry in start_entries]
 
         body = json.dumps(_start_entries, default=str, ensure_ascii=False)
         return Response(status=200, body=body, content_type="application/json")
@@ -99,48 +101,14 @@ class StartEntriesView(View):
             ) from e
 
         try:
-            # First we need to get to the startlist the new start-entry is part of:
-            startlist = await StartlistsAdapter.get_startlist_by_id(
-                db, new_start_entry.startlist_id
+            await localize_naive_datetimes(
+                new_start_entry,
+                lambda: race_timezone(db, token, new_start_entry.race_id),
             )
-            # We need to check if the bib is already in the race, and
-            # if the given starting-position is vacant, or
-            # if there open starting-positions:
-            race: (
-                IndividualSprintRace | IntervalStartRace
-            ) = await RacesAdapter.get_race_by_id(db, new_start_entry.race_id)
-            start_entries_in_race = (
-                await StartEntriesAdapter.get_start_entries_by_race_id(db, race.id)
-            )
-            bibs_in_race = [start_entry.bib for start_entry in start_entries_in_race]
-            starting_positions_in_race = [
-                start_entry.starting_position for start_entry in start_entries_in_race
-            ]
-            if not len(race.start_entries) < race.max_no_of_contestants:
-                raise HTTPBadRequest(
-                    reason="Cannot add start-entry: race is full."
-                ) from None
-            if new_start_entry.bib in bibs_in_race:
-                raise HTTPBadRequest(
-                    reason=f"Cannot add start-entry: Bib {new_start_entry.bib} is already in the race."
-                ) from None
-            if new_start_entry.starting_position in starting_positions_in_race:
-                raise HTTPBadRequest(
-                    reason=(
-                        "Cannot add start-entry: Starting_position"
-                        f"{new_start_entry.starting_position} is taken."
-                    )
-                ) from None
-
-            # We can create the start-entry:
-            start_entry_id = await StartEntriesService.create_start_entry(
-                db, new_start_entry
-            )
-
-            # We need to add the start-entry to the race:
-            race.start_entries.append(start_entry_id)
-            race.no_of_contestants = len(race.start_entries)
-            await RacesService.update_race(db, race.id, race)
+            # Reserve the slot in the race, create the start-entry and add it
+            # to the startlist, checking capacity, bib and starting-position:
+            race = await StartEntriesService.add_start_entry(db, new_start_entry)
+            start_entry_id = new_start_entry.id
 
             # If the race is in first round, we need to add to the raceplan's no_of_contestants:
             competition_format = await EventsAdapter.get_competition_format(
@@ -152,18 +120,7 @@ class StartEntriesView(View):
                 competition_format["rounds_non_ranked_classes"][0],
             ]
             if isinstance(race, IndividualSprintRace) and race.round in first_rounds:
-                raceplan = await RaceplansAdapter.get_raceplan_by_id(
-                    db, race.raceplan_id
-                )
-                raceplan.no_of_contestants += 1
-                await RaceplansService.update_raceplan(db, raceplan.id, raceplan)  # type: ignore [reportArgumentType]
-
-            # We also need to add the start-entry to the startlist
-            # and add the start_entry to it's no_of_contestants
-            startlist.no_of_contestants += 1
-            startlist.start_entries.append(start_entry_id)
-            assert startlist.id  # noqa: S101
-            await StartlistsService.update_startlist(db, startlist.id, startlist)
+                await RaceplansAdapter.add_to_no_of_contestants(db, race.raceplan_id, 1)
         except IllegalValueError as e:
             raise HTTPUnprocessableEntity(reason=str(e)) from e
         except (
@@ -205,7 +162,7 @@ class StartEntryView(View):
         except StartEntryNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
         self.logger.debug(f"Got start_entry: {start_entry}")
-        body = start_entry.to_json()
+        body = to_json(start_entry)
         return Response(status=200, body=body, content_type="application/json")
 
     async def put(self) -> Response:
@@ -236,11 +193,16 @@ class StartEntryView(View):
             ) from e
 
         try:
+            await localize_naive_datetimes(
+                start_entry, lambda: race_timezone(db, token, start_entry.race_id)
+            )
             await StartEntriesService.update_start_entry(
                 db, start_entry_id, start_entry
             )
         except IllegalValueError as e:
             raise HTTPUnprocessableEntity(reason=str(e)) from e
+        except RaceNotFoundError as e:
+            raise HTTPBadRequest(reason=str(e)) from e
         except StartEntryNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
         return Response(status=204)
@@ -278,14 +240,9 @@ class StartEntryView(View):
                     )
                 ) from e
             # Remove the start-entry from races start-entries
-            new_start_entries = [
-                start_entry_id
-                for start_entry_id in race.start_entries
-                if start_entry_id != start_entry_for_deletion_id
-            ]
-            race.start_entries = new_start_entries
-            race.no_of_contestants = len(race.start_entries)
-            await RacesService.update_race(db, race.id, race)
+            race = await RacesService.remove_start_entry_from_race(
+                db, race, start_entry_for_deletion_id
+            )
 
             # If the race is in first round, we need to subract from the raceplan's no_of_contestants:
             competition_format = await EventsAdapter.get_competition_format(
@@ -316,14 +273,9 @@ class StartEntryView(View):
                         f"{start_entry.startlist_id} of start-entry with id {start_entry.id}"
                     )
                 ) from e
-            new_start_entries = [
-                start_entry_id
-                for start_entry_id in startlist.start_entries
-                if start_entry_id != start_entry_for_deletion_id
-            ]
-            startlist.start_entries = new_start_entries
-            startlist.no_of_contestants += -1
-            await StartlistsService.update_startlist(db, startlist.id, startlist)  # type: ignore [reportArgumentType]
+            await StartlistsService.remove_start_entry_from_startlist(
+                db, startlist, start_entry_for_deletion_id
+            )
 
             # We can finally delete the start-entry:
             await StartEntriesService.delete_start_entry(
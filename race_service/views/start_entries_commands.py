@@ -0,0 +1,134 @@
+"""Resource module for start_entries command resources."""
+
+import logging
+from json.decoder import JSONDecodeError
+
+from aiohttp.web import (
+    HTTPBadRequest,
+    HTTPNotFound,
+    HTTPUnprocessableEntity,
+    Response,
+    View,
+)
+
+from race_service.adapters import (
+    RaceNotFoundError,
+    StartEntryNotFoundError,
+    UsersAdapter,
+)
+from race_service.models.datetimes import decode_datetime, localize
+from race_service.services import (
+    CouldNotMoveStartEntryError,
+    IllegalValueError,
+    StartEntriesService,
+)
+from race_service.services.timezones import race_timezone
+from race_service.utils.jwt_utils import extract_token_from_request
+
+
+class MoveStartEntryView(View):
+    """Class representing the move start_entry command resource."""
+
+    logger = logging.getLogger(
+        "race_service.views.start_entries_commands.MoveStartEntryView"
+    )
+
+    async def post(self) -> Response:
+        """Move a start-entry to a starting-position in this race or another heat."""
+        db = self.request.app["db"]
+        token = extract_token_from_request(self.request)
+        try:
+            await UsersAdapter.authorize(
+                token, roles=["admin", "event-admin", "race-result", "race-office"]
+            )
+        except Exception as e:
+            raise e from e
+
+        race_id = self.request.match_info["raceId"]
+        try:
+            body = await self.request.json()
+        except JSONDecodeError as e:
+            raise HTTPBadRequest(reason="Invalid request body") from e
+        self.logger.debug(f"Got move request {body} in race {race_id}")
+
+        try:
+            start_entry_id = body["start_entry_id"]
+            starting_position = int(body["starting_position"])
+            scheduled_start_time = (
+                decode_datetime(body["scheduled_start_time"])
+                if body.get("scheduled_start_time")
+                else None
+            )
+        except KeyError as e:
+            raise HTTPUnprocessableEntity(
+                reason=f"Mandatory property {e.args[0]} is missing."
+            ) from e
+        except (TypeError, ValueError) as e:
+            raise HTTPUnprocessableEntity(reason=str(e)) from e
+
+        try:
+            if scheduled_start_time and scheduled_start_time.tzinfo is None:
+                scheduled_start_time = localize(
+                    scheduled_start_time, await race_timezone(db, token, race_id)
+                )
+            await StartEntriesService.move_start_entry(
+                db,
+                race_id,
+                start_entry_id,
+                body.get("to_race_id", race_id),
+                starting_position,
+                scheduled_start_time,
+            )
+        except IllegalValueError as e:
+            raise HTTPUnprocessableEntity(reason=str(e)) from e
+        except (StartEntryNotFoundError, RaceNotFoundError) as e:
+            raise HTTPNotFound(reason=str(e)) from e
+        except CouldNotMoveStartEntryError as e:
+            raise HTTPBadRequest(reason=str(e)) from e
+        return Response(status=204)
+
+
+class SwapStartEntriesView(View):
+    """Class representing the swap start_entries command resource."""
+
+    logger = logging.getLogger(
+        "race_service.views.start_entries_commands.SwapStartEntriesView"
+    )
+
+    async def post(self) -> Response:
+        """Swap the starting-positions of two start-entries, in the same or two heats."""
+        db = self.request.app["db"]
+        token = extract_token_from_request(self.request)
+        try:
+            await UsersAdapter.authorize(
+                token, roles=["admin", "event-admin", "race-result", "race-office"]
+            )
+        except Exception as e:
+            raise e from e
+
+        race_id = self.request.match_info["raceId"]
+        try:
+            body = await self.request.json()
+        except JSONDecodeError as e:
+            raise HTTPBadRequest(reason="Invalid request body") from e
+        self.logger.debug(f"Got swap request {body} in race {race_id}")
+
+        try:
+            start_entry_id = body["start_entry_id"]
+            other_start_entry_id = body["other_start_entry_id"]
+        except KeyError as e:
+            raise HTTPUnprocessableEntity(
+                reason=f"Mandatory property {e.args[0]} is missing."
+            ) from e
+
+        try:
+            await StartEntriesService.swap_start_entries(
+                db, race_id, start_entry_id, other_start_entry_id
+            )
+        except IllegalValueError as e:
+            raise HTTPUnprocessableEntity(reason=str(e)) from e
+        except (StartEntryNotFoundError, RaceNotFoundError) as e:
+            raise HTTPNotFound(reason=str(e)) from e
+        except CouldNotMoveStartEntryError as e:
+            raise HTTPBadRequest(reason=str(e)) from e
+        return Response(status=204)
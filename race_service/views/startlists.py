@@ -5,12 +5,14 @@ import logging
 import os
 from typing import TYPE_CHECKING
 
+from aiohttp import hdrs
 from aiohttp.web import (
     HTTPNotFound,
     Response,
     View,
 )
 from dotenv import load_dotenv
+from multidict import MultiDict
 
 from race_service.adapters import (
     RacesAdapter,
@@ -19,16 +21,25 @@ from race_service.adapters import (
     StartlistsAdapter,
     UsersAdapter,
 )
+from race_service.models import Startlist
+from race_service.models.codec import to_dict, to_json
 from race_service.services import (
-    RacesService,
     StartEntriesService,
     StartlistsService,
 )
+from race_service.utils.etag_utils import etag_from_version
 from race_service.utils.jwt_utils import extract_token_from_request
+from race_service.utils.pagination_utils import (
+    extract_page_from_query,
+    link_headers,
+)
+from race_service.utils.projection_utils import (
+    documents_to_json,
+    extract_fields_from_query,
+)
 
 if TYPE_CHECKING:  # pragma: no cover
-    from race_service.models import StartEntry, Startlist
-    from race_service.models.race_model import IndividualSprintRace, IntervalStartRace
+    from race_service.models import StartEntry
 
 load_dotenv()
 
@@ -43,6 +54,24 @@ class StartlistsView(View):
     async def get(self) -> Response:
         """Get route function."""
         db = self.request.app["db"]
+        headers: dict[str, str] = {}
+
+        fields = extract_fields_from_query(self.request, Startlist)
+        if fields is not None:
+            # The fields as stored, without the start_entries expanded:
+            page = extract_page_from_query(self.request)
+            documents = await StartlistsAdapter.get_startlist_documents(
+                db,
+                fields,
+                event_id=self.request.rel_url.query.get("eventId"),
+                page=page,
+            )
+            return Response(
+                status=200,
+                body=documents_to_json(documents),
+                content_type="application/json",
+                headers=link_headers(self.request, page),
+            )
 
         if "eventId" in self.request.rel_url.query:
             event_id = self.request.rel_url.query["eventId"]
@@ -63,12 +92,17 @@ class StartlistsView(View):
                 startlist.start_entries = start_entries  # type: ignore [reportAttributeAccessIssue]
 
         else:
-            startlists = await StartlistsAdapter.get_all_startlists(db)
+            # An event has at most one startlist, so only all startlists are paginated:
+            page = extract_page_from_query(self.request)
+            startlists = await StartlistsAdapter.get_all_startlists(db, page=page)
+            headers = link_headers(self.request, page)
 
-        _startlists = [startlist.to_dict() for startlist in startlists]
+        _startlists = [to_dict(startlist) for startlist in startlists]
 
         body = json.dumps(_startlists, default=str, ensure_ascii=False)
-        return Response(status=200, body=body, content_type="application/json")
+        return Response(
+            status=200, body=body, content_type="application/json", headers=headers
+        )
 
 
 class StartlistView(View):
@@ -97,8 +131,11 @@ class StartlistView(View):
         except StartlistNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
         self.logger.debug(f"Got startlist: {startlist}")
-        body = startlist.to_json()
-        return Response(status=200, body=body, content_type="application/json")
+        body = to_json(startlist)
+        headers = MultiDict([(hdrs.ETAG, etag_from_version(startlist.version))])
+        return Response(
+            status=200, body=body, content_type="application/json", headers=headers
+        )
 
     async def delete(self) -> Response:
         """Delete startlist, and start-entries in it."""
@@ -125,10 +162,10 @@ class StartlistView(View):
             races = await RacesAdapter.get_races_by_event_id(
                 db, startlist_to_be_deleted.event_id
             )
-            race: IndividualSprintRace | IntervalStartRace
-            for race in races:
-                race.start_entries = []
-                await RacesService.update_race(db, race.id, race)
+            await RacesAdapter.remove_all_start_entries(
+                db,
+                [race.id for race in races],  # type: ignore [reportArgumentType]
+            )
 
             # We can then delete the startlist:
             await StartlistsService.delete_startlist(db, startlist_id)
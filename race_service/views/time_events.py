@@ -3,6 +3,7 @@
 import json
 import logging
 import os
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
@@ -11,13 +12,16 @@ from aiohttp.web import (
     HTTPBadRequest,
     HTTPNotFound,
     HTTPUnprocessableEntity,
+    Request,
     Response,
+    StreamResponse,
     View,
 )
 from dotenv import load_dotenv
 
 from race_service.adapters import (
     EventsAdapter,
+    Page,
     RaceNotFoundError,
     RaceResultsAdapter,
     TimeEventNotFoundError,
@@ -25,6 +29,8 @@ from race_service.adapters import (
     UsersAdapter,
 )
 from race_service.models import Changelog, TimeEvent
+from race_service.models.codec import to_dict, to_json
+from race_service.models.datetimes import decode_datetime, localize
 from race_service.services import (
     ContestantNotInStartEntriesError,
     CouldNotCreateTimeEventError,
@@ -35,7 +41,17 @@ from race_service.services import (
     TimeEventIsNotIdentifiableError,
     TimeEventsService,
 )
+from race_service.services.timezones import event_timezone, localize_naive_datetimes
 from race_service.utils.jwt_utils import extract_token_from_request
+from race_service.utils.pagination_utils import (
+    extract_page_from_query,
+    link_headers,
+)
+from race_service.utils.projection_utils import (
+    documents_to_json,
+    extract_fields_from_query,
+)
+from race_service.utils.streaming_utils import stream_json
 
 if TYPE_CHECKING:
     from race_service.models.race_model import RaceResult  # pragma: no cover
@@ -47,6 +63,32 @@ HOST_PORT = os.getenv("HOST_PORT", "8080")
 BASE_URL = f"http://{HOST_SERVER}:{HOST_PORT}"
 
 
+async def registration_times_from_query(
+    request: Request, event_id: str
+) -> tuple[datetime | None, datetime | None]:
+    """Parse the from and to registration times in the query of request.
+
+    A time without offset is localized in the timezone of the event.
+
+    Raises:
+        HTTPBadRequest: if a time is not in ISO 8601 format
+    """
+    try:
+        times = [
+            decode_datetime(request.rel_url.query[key])
+            if key in request.rel_url.query
+            else None
+            for key in ("from", "to")
+        ]
+    except ValueError as e:
+        raise HTTPBadRequest(reason=f"Invalid registration time in query: {e}") from e
+    if any(time and time.tzinfo is None for time in times):
+        timezone = await event_timezone(extract_token_from_request(request), event_id)
+        times = [time and localize(time, timezone) for time in times]
+    from_, to = times
+    return from_, to
+
+
 class TimeEventsView(View):
     """Class representing time_events resource."""
 
@@ -55,37 +97,78 @@ class TimeEventsView(View):
     async def get(self) -> Response:
         """Get route function."""
         db = self.request.app["db"]
+        page = extract_page_from_query(self.request)
+
+        fields = extract_fields_from_query(self.request, TimeEvent)
+        if fields is not None:
+            documents = await self.get_documents(fields, page)
+            return Response(
+                status=200,
+                body=documents_to_json(documents),
+                content_type="application/json",
+                headers=link_headers(self.request, page),
+            )
 
         if "eventId" in self.request.rel_url.query:
             event_id = self.request.rel_url.query["eventId"]
             if "timingPoint" in self.request.rel_url.query:
                 timing_point = self.request.rel_url.query["timingPoint"]
                 time_events = await TimeEventsAdapter.get_time_events_by_event_id_and_timing_point(
-                    db, event_id, timing_point
+                    db, event_id, timing_point, page=page
+                )
+            elif {"from", "to"} & self.request.rel_url.query.keys():
+                from_, to = await registration_times_from_query(self.request, event_id)
+                time_events = await TimeEventsAdapter.get_time_events_by_event_id_and_registration_time(
+                    db, event_id, from_, to, page=page
                 )
             elif "bib" in self.request.rel_url.query:
                 bib = int(self.request.rel_url.query["bib"])
                 time_events = (
                     await TimeEventsAdapter.get_time_events_by_event_id_and_bib(
-                        db, event_id, bib
+                        db, event_id, bib, page=page
                     )
                 )
             else:
                 time_events = await TimeEventsAdapter.get_time_events_by_event_id(
-                    db, event_id
+                    db, event_id, page=page
                 )
         elif "raceId" in self.request.rel_url.query:
             race_id = self.request.rel_url.query["raceId"]
             time_events = await TimeEventsAdapter.get_time_events_by_race_id(
-                db, race_id
+                db, race_id, page=page
             )
         else:
-            time_events = await TimeEventsAdapter.get_all_time_events(db)
+            time_events = await TimeEventsAdapter.get_all_time_events(db, page=page)
 
-        _time_events = [time_event.to_dict() for time_event in time_events]
+        _time_events = [to_dict(time_event) for time_event in time_events]
 
         body = json.dumps(_time_events, default=str, ensure_ascii=False)
-        return Response(status=200, body=body, content_type="application/json")
+        return Response(
+            status=200,
+            body=body,
+            content_type="application/json",
+            headers=link_headers(self.request, page),
+        )
+
+    async def get_documents(self, fields: list[str], page: Page | None) -> list[dict]:
+        """Get the fields of the time_events, by the same criteria as get."""
+        query = self.request.rel_url.query
+        criteria: dict = {}
+        if "eventId" in query:
+            criteria["event_id"] = query["eventId"]
+            if "timingPoint" in query:
+                criteria["timing_point"] = query["timingPoint"]
+            elif {"from", "to"} & query.keys():
+                criteria["from_"], criteria["to"] = await registration_times_from_query(
+                    self.request, criteria["event_id"]
+                )
+            elif "bib" in query:
+                criteria["bib"] = int(query["bib"])
+        elif "raceId" in query:
+            criteria["race_id"] = query["raceId"]
+        return await TimeEventsAdapter.get_time_event_documents(
+            self.request.app["db"], fields, page=page, **criteria
+        )
 
     async def post(self) -> Response:
         """Post route function."""
@@ -108,6 +191,9 @@ class TimeEventsView(View):
             raise HTTPUnprocessableEntity(
                 reason=f"Mandatory property {e.args[0]} is missing."
             ) from e
+        await localize_naive_datetimes(
+            time_event, lambda: event_timezone(token, time_event.event_id)
+        )
 
         try:
             time_event_id = await TimeEventsService.create_time_event(db, time_event)
@@ -146,10 +232,32 @@ class TimeEventsView(View):
             raise HTTPBadRequest(reason=str(e)) from e
         self.logger.debug(f"inserted document with time_event_id {time_event_id}")
 
-        body = time_event.to_json()
+        body = to_json(time_event)
         return Response(status=200, body=body, content_type="application/json")
 
 
+class TimeEventsExportView(View):
+    """Class representing the export of all time_events of an event."""
+
+    logger = logging.getLogger("race_service.views.time_events.TimeEventsExportView")
+
+    async def get(self) -> StreamResponse:
+        """Stream the time_events of the event, sorted on registration_time."""
+        db = self.request.app["db"]
+        if "eventId" not in self.request.rel_url.query:
+            raise HTTPBadRequest(reason="Query parameter eventId is missing.")
+        event_id = self.request.rel_url.query["eventId"]
+        self.logger.debug(f"Got export request for time_events of event {event_id}")
+
+        async def batches() -> AsyncIterator[list[dict]]:
+            async for time_events in TimeEventsAdapter.stream_time_events_by_event_id(
+                db, event_id
+            ):
+                yield [to_dict(time_event) for time_event in time_events]
+
+        return await stream_json(self.request, batches())
+
+
 class TimeEventView(View):
     """Class representing a single time_event resource."""
 
@@ -167,7 +275,7 @@ class TimeEventView(View):
         except TimeEventNotFoundError as e:
             raise HTTPNotFound(reason=str(e)) from e
         self.logger.debug(f"Got time_event: {time_event}")
-        body = time_event.to_json()
+        body = to_json(time_event)
         return Response(status=200, body=body, content_type="application/json")
 
     async def put(self) -> Response:
@@ -194,6 +302,9 @@ class TimeEventView(View):
             raise HTTPUnprocessableEntity(
                 reason=f"Mandatory property {e.args[0]} is missing."
             ) from e
+        await localize_naive_datetimes(
+            time_event, lambda: event_timezone(token, time_event.event_id)
+        )
 
         try:
             await TimeEventsService.update_time_event(db, time_event_id, time_event)
@@ -229,16 +340,10 @@ class TimeEventView(View):
                     db, time_event.race_id, time_event.timing_point
                 )
                 for race_result in race_results:
-                    # We try to remove time-event and subtract counter:
-                    try:
-                        race_result.ranking_sequence.remove(time_event_id)
-                        race_result.no_of_contestants -= 1
-                        # Update race-result:
-                        await RaceResultsService.update_race_result(
-                            db, race_result.id, race_result
-                        )
-                    except ValueError:  # pragma: no cover
-                        pass  # We do not care if it is not there
+                    # We remove time-event and subtract counter, if it is there:
+                    await RaceResultsService.remove_time_event_from_ranking_sequence(
+                        db, race_result, time_event_id
+                    )
             # We are ready to remove the time-event
             await TimeEventsService.delete_time_event(db, time_event_id)
         except TimeEventNotFoundError as e:
@@ -14,6 +14,8 @@ from requests import exceptions
 
 from race_service import create_app
 
+from .query_counter import QueryCounter
+
 load_dotenv()
 HOST_PORT = int(env.get("HOST_PORT", "8080"))
 
@@ -25,6 +27,12 @@ async def client(aiohttp_client: Any) -> _TestClient:
     return await aiohttp_client(app)
 
 
+@pytest.fixture
+def query_counter() -> type[QueryCounter]:
+    """Count the adapter calls and database commands of requests."""
+    return QueryCounter
+
+
 def is_responsive(url: Any) -> Any:
     """Return true if response from service is 200."""
     url = f"{url}/ready"
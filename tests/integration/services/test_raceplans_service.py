@@ -3,7 +3,7 @@
 import pytest
 from pytest_mock import MockFixture
 
-from race_service.adapters import RaceplanNotFoundError
+from race_service.adapters import DuplicateRaceplanError, RaceplanNotFoundError
 from race_service.models import Raceplan
 from race_service.services import (
     IllegalValueError,
@@ -100,13 +100,9 @@ async def test_create_raceplan_allready_exist(
     raceplan_mock: Raceplan,
 ) -> None:
     """Should raise IllegalValueError."""
-    mocker.patch(
-        "race_service.adapters.raceplans_adapter.RaceplansAdapter.get_raceplans_by_event_id",
-        return_value=[raceplan_mock],
-    )
     mocker.patch(
         "race_service.adapters.raceplans_adapter.RaceplansAdapter.create_raceplan",
-        return_value=True,
+        side_effect=DuplicateRaceplanError("Event already has a raceplan."),
     )
 
     with pytest.raises(RaceplanAllreadyExistError):
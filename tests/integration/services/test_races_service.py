@@ -1,10 +1,12 @@
 """Integration test cases for the race service."""
 
+from copy import deepcopy
 from datetime import datetime
 
 import pytest
 from pytest_mock import MockFixture
 
+from race_service.adapters import VersionConflictError
 from race_service.models import Race
 from race_service.services import (
     IllegalValueError,
@@ -101,3 +103,55 @@ async def test_create_race_adapter_fails(
     result = await RacesService.create_race(db=None, race=new_race)
 
     assert result is None
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_add_start_entry_to_race_retries_on_version_conflict(
+    mocker: MockFixture,
+    race: Race,
+) -> None:
+    """Should reload the race and add the start-entry again."""
+    changed_race = deepcopy(race)
+    changed_race.start_entries.append("99")
+    changed_race.version = 1
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        return_value=changed_race,
+    )
+    update_race = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.update_race",
+        side_effect=[VersionConflictError("Race has been changed."), None],
+    )
+
+    result = await RacesService.add_start_entry_to_race(
+        db=None, race=race, start_entry_id="100"
+    )
+
+    assert result is changed_race
+    assert result.start_entries[-2:] == ["99", "100"]
+    assert result.no_of_contestants == len(result.start_entries)
+    assert update_race.call_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_remove_start_entry_from_race_gives_up_on_version_conflicts(
+    mocker: MockFixture,
+    race: Race,
+) -> None:
+    """Should raise VersionConflictError when every attempt hits a conflict."""
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        side_effect=lambda db, id_: deepcopy(race),  # noqa: ARG005
+    )
+    update_race = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.update_race",
+        side_effect=VersionConflictError("Race has been changed."),
+    )
+
+    with pytest.raises(VersionConflictError):
+        await RacesService.remove_start_entry_from_race(
+            db=None, race=race, start_entry_id="11"
+        )
+    assert update_race.call_count == 5  # noqa: PLR2004
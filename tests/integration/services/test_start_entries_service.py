@@ -178,7 +178,7 @@ async def test_update_start_entry_not_found(
 ) -> None:
     """Should raise StartEntryNotFoundError."""
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.update_start_entry",
         side_effect=StartEntryNotFoundError(f"StartEntry with id {id} not found"),
     )
     updated_start_entry = deepcopy(new_start_entry)
@@ -5,6 +5,7 @@ from copy import deepcopy
 import pytest
 from pytest_mock import MockFixture
 
+from race_service.adapters import DuplicateStartlistError
 from race_service.models import Startlist
 from race_service.services import (
     CouldNotCreateStartlistError,
@@ -76,13 +77,9 @@ async def test_create_startlist_allready_exist(
     startlist_mock: Startlist,
 ) -> None:
     """Should raise IllegalValueError."""
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlists_by_event_id",
-        return_value=[startlist_mock],
-    )
     mocker.patch(
         "race_service.adapters.startlists_adapter.StartlistsAdapter.create_startlist",
-        return_value=True,
+        side_effect=DuplicateStartlistError("Event already has a startlist."),
     )
 
     with pytest.raises(StartlistAllreadyExistError):
@@ -139,23 +136,18 @@ async def test_update_startlist_change_id(
 @pytest.mark.asyncio
 async def test_update_startlist_not_found(
     mocker: MockFixture,
-    startlist: Startlist,
     startlist_mock: Startlist,
 ) -> None:
     """Should raise StartlistNotFoundError."""
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_by_id",
-        side_effect=StartlistNotFoundError(f"Startlist with id {id} not found."),
-    )
     mocker.patch(
         "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
-        return_value=True,
+        side_effect=StartlistNotFoundError(f"Startlist with id {id} not found."),
     )
 
     assert startlist_mock.id
     with pytest.raises(StartlistNotFoundError):
         await StartlistsService.update_startlist(
-            db=None, id_=startlist_mock.id, startlist=startlist
+            db=None, id_=startlist_mock.id, startlist=startlist_mock
         )
 
 
@@ -182,3 +174,29 @@ async def test_delete_startlist_not_found(
             db=None,
             id_=startlist_mock.id,
         )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("start_entry_id", "no_of_contestants"), [("11", 7), ("not_in_startlist", 8)]
+)
+async def test_remove_start_entry_from_startlist(
+    mocker: MockFixture,
+    startlist: Startlist,
+    start_entry_id: str,
+    no_of_contestants: int,
+) -> None:
+    """Should count the start-entry out only if it is in the startlist."""
+    update_startlist = mocker.patch(
+        "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
+        return_value=True,
+    )
+
+    result = await StartlistsService.remove_start_entry_from_startlist(
+        db=None, startlist=deepcopy(startlist), start_entry_id=start_entry_id
+    )
+
+    assert start_entry_id not in result.start_entries
+    assert result.no_of_contestants == no_of_contestants
+    assert update_startlist.called == (no_of_contestants < startlist.no_of_contestants)
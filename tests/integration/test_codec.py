@@ -0,0 +1,218 @@
+"""Integration test cases for the codec of the models."""
+
+from datetime import UTC, datetime
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import pytest
+from dataclasses_json import DataClassJsonMixin
+
+from race_service.adapters.documents import to_document
+from race_service.models import (
+    Changelog,
+    IndividualSprintRace,
+    IntervalStartRace,
+    Raceplan,
+    RaceResult,
+    StartEntry,
+    Startlist,
+    TimeEvent,
+)
+from race_service.models.codec import (
+    decode_individual_sprint_race,
+    decode_interval_start_race,
+    decode_race_result,
+    decode_raceplan,
+    decode_start_entry,
+    decode_startlist,
+    decode_time_event,
+    to_dict,
+    to_json,
+)
+from race_service.models.datetimes import localize, to_utc
+
+CHANGELOG = [
+    Changelog(
+        timestamp=datetime(2021, 8, 31, 12, 0, 1, 123000, tzinfo=ZoneInfo("UTC")),
+        user_id="race_service",
+        comment="Bib ikke i startliste, ærlig talt",
+    )
+]
+
+MODELS: list[Any] = [
+    TimeEvent(
+        bib=14,
+        event_id="event_1",
+        timing_point="Finish",
+        registration_time=datetime.fromisoformat("2021-08-31T12:00:00+02:00"),
+        name="Øystein Ås",
+        rank=1,
+        changelog=CHANGELOG,
+        id="time_event_1",
+    ),
+    TimeEvent(
+        bib=15,
+        event_id="event_1",
+        timing_point="Finish",
+        registration_time=datetime.fromisoformat("2021-08-31T12:00:00+00:00"),
+    ),
+    IndividualSprintRace(
+        id="race_1",
+        raceclass="G16",
+        order=1,
+        start_time=datetime.fromisoformat("2021-08-31T12:00:00+00:00"),
+        max_no_of_contestants=10,
+        no_of_contestants=8,
+        event_id="event_1",
+        raceplan_id="raceplan_1",
+        start_entries=["start_entry_1"],
+        results={"Finish": "race_result_1"},
+        round="Q",
+        index="A",
+        heat=1,
+        rule={"S": {"A": 4, "C": 0}, "F": {"A": "REST"}},
+        version=3,
+    ),
+    IntervalStartRace(
+        id="race_2",
+        raceclass="G16",
+        order=2,
+        start_time=datetime.fromisoformat("2021-08-31T12:30:00+00:00"),
+        max_no_of_contestants=10,
+        no_of_contestants=0,
+        event_id="event_1",
+        raceplan_id="raceplan_1",
+        start_entries=[],
+        results={},
+    ),
+    StartEntry(
+        id="start_entry_1",
+        startlist_id="startlist_1",
+        race_id="race_1",
+        bib=14,
+        starting_position=1,
+        scheduled_start_time=datetime.fromisoformat("2021-08-31T12:00:00+00:00"),
+        name="Øystein Ås",
+        club="Lyn",
+        changelog=CHANGELOG,
+    ),
+    RaceResult(
+        id="race_result_1",
+        race_id="race_1",
+        timing_point="Finish",
+        no_of_contestants=1,
+        ranking_sequence=["time_event_1"],
+        status=1,
+    ),
+    Raceplan(event_id="event_1", races=["race_1", "race_2"], id="raceplan_1"),
+    Startlist(
+        event_id="event_1",
+        no_of_contestants=1,
+        start_entries=["start_entry_1"],
+        id="startlist_1",
+    ),
+]
+
+DECODERS = {
+    TimeEvent: decode_time_event,
+    IndividualSprintRace: decode_individual_sprint_race,
+    IntervalStartRace: decode_interval_start_race,
+    StartEntry: decode_start_entry,
+    RaceResult: decode_race_result,
+    Raceplan: decode_raceplan,
+    Startlist: decode_startlist,
+}
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: type(model).__name__)
+def test_encode_as_dataclasses_json(model: Any) -> None:
+    """Should give the same dict, and byte-identical JSON."""
+    assert to_dict(model) == model.to_dict()
+    assert to_json(model).encode() == model.to_json().encode()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: type(model).__name__)
+def test_decode_as_dataclasses_json(model: Any) -> None:
+    """Should give the same model, from strings as from stored datetimes."""
+    decode = DECODERS[type(model)]
+    data = {"_id": "ignored", **model.to_dict()}
+    assert decode(data) == type(model).from_dict(data)
+    document = to_document(model)
+    assert decode(document) == type(model).from_dict(document)
+    assert decode(document) == decode(data)
+
+
+@pytest.mark.integration
+def test_decode_datetimes_in_utc() -> None:
+    """Should decode datetimes with offset to UTC, and leave those without naive."""
+    data = MODELS[0].to_dict()
+    data["registration_time"] = "2021-08-31T12:00:00.123456+02:00"
+    assert decode_time_event(data).registration_time == datetime(
+        2021, 8, 31, 10, 0, 0, 123000, tzinfo=UTC
+    )
+    assert TimeEvent.from_dict(data) == decode_time_event(data)
+
+    # To be localized in the timezone of the event:
+    data["registration_time"] = "2021-08-31T12:00:00.123456"
+    assert decode_time_event(data).registration_time == datetime(  # noqa: DTZ001
+        2021, 8, 31, 12, 0, 0, 123000
+    )
+    assert TimeEvent.from_dict(data) == decode_time_event(data)
+
+    # BSON datetimes are in UTC, also when read without tzinfo:
+    data["registration_time"] = datetime(2021, 8, 31, 12)  # noqa: DTZ001
+    assert decode_time_event(data).registration_time == datetime(
+        2021, 8, 31, 12, tzinfo=UTC
+    )
+
+
+@pytest.mark.integration
+def test_localize_datetimes_without_offset() -> None:
+    """Should localize naive datetimes in the timezone, and refuse them in UTC."""
+    naive = datetime(2021, 8, 31, 9)  # noqa: DTZ001
+    assert localize(naive, "Europe/Oslo") == datetime(2021, 8, 31, 7, tzinfo=UTC)
+    with pytest.raises(ValueError, match="not localized"):
+        to_utc(naive)
+
+
+@pytest.mark.integration
+def test_decode_copies_lists() -> None:
+    """Should not share lists with the dict decoded."""
+    data = MODELS[2].to_dict()
+    race = decode_individual_sprint_race(data)
+    race.start_entries.append("start_entry_2")
+    race.rule["S"]["A"] = 0
+    assert data["start_entries"] == ["start_entry_1"]
+    assert data["rule"]["S"]["A"] == 4  # noqa: PLR2004
+
+
+@pytest.mark.integration
+def test_decode_changelog_entries() -> None:
+    """Should decode changelog entries, and keep entries already decoded."""
+    data = MODELS[0].to_dict()
+    data["changelog"].append(CHANGELOG[0])
+    time_event = decode_time_event(data)
+    assert time_event.changelog == [CHANGELOG[0], CHANGELOG[0]]
+    assert time_event.changelog[1] is CHANGELOG[0]
+
+
+@pytest.mark.integration
+def test_decode_missing_field() -> None:
+    """Should raise KeyError with the field, as from_dict does."""
+    data = MODELS[0].to_dict()
+    del data["event_id"]
+    with pytest.raises(KeyError, match="event_id"):
+        decode_time_event(data)
+    with pytest.raises(KeyError, match="event_id"):
+        TimeEvent.from_dict(data)
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: type(model).__name__)
+def test_models_are_slotted(model: Any) -> None:
+    """Should have no instance dict, and still be a DataClassJsonMixin."""
+    assert not hasattr(model, "__dict__")
+    assert isinstance(model, DataClassJsonMixin)
+    assert type(model).schema().load(model.to_dict()) == model
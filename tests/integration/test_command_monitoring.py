@@ -0,0 +1,154 @@
+"""Integration test cases for the monitoring of database commands."""
+
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from pytest_mock import MockFixture
+
+from race_service.adapters import (
+    CommandMonitor,
+    start_counting_commands,
+    stop_counting_commands,
+)
+from race_service.adapters.command_monitoring import (
+    COMMAND_SECONDS,
+    filter_shape,
+    redact,
+)
+from race_service.middlewares.metrics import REQUEST_COMMANDS, metrics_middleware
+
+
+def _event(command_name: str, command: dict, request_id: int = 1) -> Any:
+    """Create an event as the command events of pymongo."""
+    return SimpleNamespace(
+        command_name=command_name,
+        command=command,
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        duration_micros=250_000,
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_command_monitor_logs_slow_command(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Should record and count the command, and log its filter shape."""
+    monitor = CommandMonitor(slow_command_ms=100)
+    find = {
+        "find": "time_events_collection",
+        "filter": {"event_id": "event_1", "bib": {"$in": [1, 2]}},
+    }
+    before = COMMAND_SECONDS.count(
+        collection="time_events_collection", command="find", outcome="succeeded"
+    )
+
+    token = start_counting_commands()
+    with caplog.at_level(logging.WARNING):
+        monitor.started(_event("find", find))
+        monitor.succeeded(_event("find", find))
+    assert stop_counting_commands(token) == 1
+
+    assert COMMAND_SECONDS.count(
+        collection="time_events_collection", command="find", outcome="succeeded"
+    ) == (before + 1)
+    record = caplog.records[-1]
+    assert record.getMessage() == "Slow find on time_events_collection: 250.0 ms"
+    assert record.filter_shape == {"event_id": "?", "bib": {"$in": "?"}}  # type: ignore[attr-defined]
+    assert "event_1" not in str(record.__dict__)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_command_monitor_failed_command(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Should record the failed command, and not log it under the threshold."""
+    monitor = CommandMonitor(slow_command_ms=1000)
+    get_more = {"getMore": 12345, "collection": "races_collection"}
+    monitor.started(_event("getMore", get_more, request_id=2))
+    with caplog.at_level(logging.WARNING):
+        monitor.failed(_event("getMore", get_more, request_id=2))
+    assert not caplog.records
+    assert COMMAND_SECONDS.count(
+        collection="races_collection", command="getMore", outcome="failed"
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_command_monitor_not_started() -> None:
+    """Should record a command not seen started on no collection."""
+    before = COMMAND_SECONDS.count(collection="none", command="ping", outcome="failed")
+    CommandMonitor(slow_command_ms=1000).failed(_event("ping", {"ping": 1}, 3))
+    assert COMMAND_SECONDS.count(
+        collection="none", command="ping", outcome="failed"
+    ) == (before + 1)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("command_name", "command", "shape"),
+    [
+        ("insert", {"insert": "races_collection", "documents": [{}]}, None),
+        ("count", {"count": "races_collection"}, {}),
+        (
+            "update",
+            {"update": "races_collection", "updates": [{"q": {"id": "1"}}]},
+            {"id": "?"},
+        ),
+        ("delete", {"delete": "races_collection", "deletes": []}, {}),
+        (
+            "aggregate",
+            {"aggregate": "races_collection", "pipeline": [{"$match": {"id": 1}}]},
+            [{"$match": {"id": "?"}}],
+        ),
+    ],
+)
+async def test_filter_shape(command_name: str, command: dict, shape: Any) -> None:
+    """Should return the redacted filter of each kind of command."""
+    assert filter_shape(command_name, command) == shape
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_redact() -> None:
+    """Should keep names, operators and lists of documents."""
+    assert redact(
+        {"$or": [{"rank": {"$gt": 1}}, {"rank": None}], "tags": [], "id": "x"}
+    ) == {"$or": [{"rank": {"$gt": "?"}}, {"rank": "?"}], "tags": "?", "id": "?"}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_metrics_middleware_over_query_budget(
+    mocker: MockFixture, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Should count the commands of the request, and log it over budget."""
+    mocker.patch("race_service.middlewares.metrics.QUERY_BUDGET", 1)
+    monitor = CommandMonitor(slow_command_ms=1000)
+    request = make_mocked_request("GET", "/races")
+    request.match_info.route.resource = None  # type: ignore[misc]
+
+    async def handler(request: web.Request) -> web.Response:
+        for request_id in (1, 2):
+            monitor.started(_event("find", {"find": "races_collection"}, request_id))
+        return web.Response()
+
+    before = REQUEST_COMMANDS.count(method="GET", route="unmatched")
+    with caplog.at_level(logging.WARNING):
+        await metrics_middleware(request, handler)
+
+    assert REQUEST_COMMANDS.count(method="GET", route="unmatched") == before + 1
+    record = caplog.records[-1]
+    assert record.getMessage() == (
+        "GET /races sent 2 database commands, over the query budget of 1."
+    )
+    assert record.query_budget_exceeded  # type: ignore[attr-defined]
+    assert record.commands == 2  # type: ignore[attr-defined]  # noqa: PLR2004
@@ -16,6 +16,7 @@ from pytest_mock import MockFixture
 
 from race_service.adapters import (
     CompetitionFormatNotFoundError,
+    DuplicateRaceplanError,
     EventNotFoundError,
     RaceclassesNotFoundError,
 )
@@ -50,6 +51,7 @@ async def event() -> dict[str, Any]:
         "competition_format": "Interval Start",
         "date_of_event": "2021-08-31",
         "time_of_event": "09:00:00",
+        "timezone": "Europe/Oslo",
         "organiser": "Lyn Ski",
         "webpage": "https://example.com",
         "information": "Testarr for å teste den nye løysinga.",
@@ -65,6 +67,7 @@ async def event_not_supported_competition_format() -> dict[str, Any]:
         "competition_format": "Not supported competition-format",
         "date_of_event": "2021-08-31",
         "time_of_event": "09:00:00",
+        "timezone": "Europe/Oslo",
         "organiser": "Lyn Ski",
         "webpage": "https://example.com",
         "information": "Testarr for å teste den nye løysinga.",
@@ -79,6 +82,7 @@ async def event_has_no_competition_format() -> dict[str, Any]:
         "name": "Oslo Skagen sprint",
         "date_of_event": "2021-08-31",
         "time_of_event": "09:00:00",
+        "timezone": "Europe/Oslo",
         "organiser": "Lyn Ski",
         "webpage": "https://example.com",
         "information": "Testarr for å teste den nye løysinga.",
@@ -355,11 +359,7 @@ async def test_generate_raceplan_for_event_already_has_raceplan(
     )
     mocker.patch(
         "race_service.adapters.raceplans_adapter.RaceplansAdapter.create_raceplan",
-        return_value=raceplan_id,
-    )
-    mocker.patch(
-        "race_service.adapters.raceplans_adapter.RaceplansAdapter.get_raceplans_by_event_id",
-        return_value={"id": "blabladibla"},
+        side_effect=DuplicateRaceplanError("Event already has a raceplan."),
     )
     mocker.patch(
         "race_service.adapters.events_adapter.EventsAdapter.get_event_by_id",
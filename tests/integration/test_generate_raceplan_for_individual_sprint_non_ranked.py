@@ -45,6 +45,7 @@ async def event() -> dict[str, Any]:
         "competition_format": "Individual Sprint",
         "date_of_event": "2021-08-31",
         "time_of_event": "09:00:00",
+        "timezone": "Europe/Oslo",
         "organiser": "Lyn Ski",
         "webpage": "https://example.com",
         "information": "Testarr for å teste den nye løysinga.",
@@ -4,6 +4,7 @@ import os
 import uuid
 from http import HTTPStatus
 from typing import Any
+from zoneinfo import ZoneInfo
 
 import jwt
 import pytest
@@ -12,7 +13,9 @@ from aiohttp.test_utils import TestClient as _TestClient
 from aioresponses import aioresponses
 from pytest_mock import MockFixture
 
+from race_service.adapters.documents import to_document
 from race_service.models import Raceplan
+from race_service.models.codec import decode_interval_start_race, to_dict
 
 USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
 USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
@@ -42,6 +45,7 @@ async def event() -> dict[str, Any]:
         "competition_format": "Interval Start",
         "date_of_event": "2021-08-31",
         "time_of_event": "09:00:00",
+        "timezone": "Europe/Oslo",
         "organiser": "Lyn Ski",
         "webpage": "https://example.com",
         "information": "Testarr for å teste den nye løysinga.",
@@ -184,6 +188,75 @@ async def test_generate_raceplan_for_event(
         assert f"/raceplans/{raceplan_id}" in resp.headers[hdrs.LOCATION]
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_generate_raceplan_round_trips_start_times(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    event: dict,
+    competition_format: dict,
+    raceclasses: list[dict],
+    request_body: dict,
+) -> None:
+    """Should store the start times on the wall-clock of the event, in UTC."""
+    raceplan_id = "290e70d5-0933-4af0-bb53-1d705ba7eb95"
+    mocker.patch(
+        "race_service.adapters.raceplans_adapter.RaceplansAdapter.create_raceplan",
+        return_value=raceplan_id,
+    )
+    mocker.patch(
+        "race_service.adapters.raceplans_adapter.RaceplansAdapter.get_raceplans_by_event_id",
+        return_value=[],
+    )
+    mocker.patch(
+        "race_service.adapters.raceplans_adapter.RaceplansAdapter.update_raceplan",
+        return_value=True,
+    )
+    create_race = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.create_race",
+        return_value=str(uuid.uuid4()),
+    )
+    mocker.patch(
+        "race_service.adapters.events_adapter.EventsAdapter.get_event_by_id",
+        return_value=event,
+    )
+    mocker.patch(
+        "race_service.adapters.events_adapter.EventsAdapter.get_competition_format",
+        return_value=competition_format,
+    )
+    mocker.patch(
+        "race_service.adapters.events_adapter.EventsAdapter.get_raceclasses",
+        return_value=raceclasses,
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.post(
+            "/raceplans/generate-raceplan-for-event", headers=headers, json=request_body
+        )
+        assert resp.status == HTTPStatus.CREATED
+
+    # The event starts 09:00 in Europe/Oslo, which is 07:00 UTC in summer:
+    stored = [
+        decode_interval_start_race(to_document(call.args[1]))
+        for call in create_race.call_args_list
+    ]
+    assert [to_dict(race)["start_time"] for race in stored[:2]] == [
+        "2021-08-31T07:00:00+00:00",
+        "2021-08-31T07:08:00+00:00",
+    ]
+    assert stored[0].start_time.astimezone(ZoneInfo("Europe/Oslo")).isoformat() == (
+        "2021-08-31T09:00:00+02:00"
+    )
+
+
 races = [
     {
         "id": "",
@@ -16,6 +16,7 @@ from pytest_mock import MockFixture
 from race_service.adapters import (
     CompetitionFormatNotFoundError,
     ContestantsNotFoundError,
+    DuplicateStartlistError,
     EventNotFoundError,
     RaceclassesNotFoundError,
 )
@@ -1277,11 +1278,7 @@ async def test_generate_startlist_for_event_already_has_startlist(
     )
     mocker.patch(
         "race_service.adapters.startlists_adapter.StartlistsAdapter.create_startlist",
-        return_value=raceplan_id,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlists_by_event_id",
-        return_value=[{"id": "blabladibla"}],
+        side_effect=DuplicateStartlistError("Event already has a startlist."),
     )
     mocker.patch(
         "race_service.adapters.events_adapter.EventsAdapter.get_event_by_id",
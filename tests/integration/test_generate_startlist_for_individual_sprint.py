@@ -426,8 +426,8 @@ async def test_generate_startlist_for_event(
         side_effect=get_race_by_id,
     )
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entries",
+        return_value=None,
     )
 
     headers = {
@@ -528,8 +528,8 @@ async def test_generate_startlist_for_event_wrong_no_of_contestants_in_races(
         side_effect=get_race_by_id,
     )
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entries",
+        return_value=None,
     )
 
     headers = {
@@ -371,9 +371,9 @@ async def test_generate_startlist_for_event(
         "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
         side_effect=get_race_by_id,
     )
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
+    add_start_entries = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entries",
+        return_value=None,
     )
 
     headers = {
@@ -391,3 +391,10 @@ async def test_generate_startlist_for_event(
         )
         assert resp.status == HTTPStatus.CREATED
         assert f"/startlists/{startlist_id}" in resp.headers[hdrs.LOCATION]
+
+    # The start-entries are added to each race in one update:
+    race_ids = [call.args[1] for call in add_start_entries.call_args_list]
+    assert len(race_ids) == len(set(race_ids))
+    assert sum(len(call.args[2]) for call in add_start_entries.call_args_list) == (
+        len(contestants)
+    )
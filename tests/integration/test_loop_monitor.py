@@ -0,0 +1,73 @@
+"""Integration test cases for the monitoring of the event loop."""
+
+import asyncio
+import logging
+import time
+from http import HTTPStatus
+
+import pytest
+from aiohttp.test_utils import TestClient as _TestClient
+
+from race_service.utils.loop_monitor import (
+    LOOP_BLOCKED,
+    LOOP_LAG_SECONDS,
+    LoopMonitor,
+    handler_running,
+)
+
+
+def _block_loop() -> None:
+    """Block the event loop, as CPU work in a handler does."""
+    time.sleep(0.3)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_loop_monitor_logs_blocking_handler(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Should record the lag, and log the handler blocking the loop once."""
+    monitor = LoopMonitor(threshold_ms=50, interval_ms=10)
+    labels = {"method": "POST", "route": "/time-events"}
+    before = LOOP_BLOCKED.value(**labels)
+
+    with caplog.at_level(logging.WARNING):
+        monitor.start()
+        await asyncio.sleep(0.05)
+        with handler_running(**labels):
+            _block_loop()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+
+    assert LOOP_BLOCKED.value(**labels) == before + 1
+    assert LOOP_LAG_SECONDS.count() > 0
+    (record,) = caplog.records
+    assert record.getMessage().endswith("running POST /time-events")
+    assert record.loop_blocked  # type: ignore[attr-defined]
+    assert record.blocked_ms >= 50  # type: ignore[attr-defined]  # noqa: PLR2004
+    assert "_block_loop" in record.stack  # type: ignore[attr-defined]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_loop_monitor_no_handler(caplog: pytest.LogCaptureFixture) -> None:
+    """Should count a block outside of handlers on no route."""
+    monitor = LoopMonitor(threshold_ms=50, interval_ms=10)
+    before = LOOP_BLOCKED.value(method="none", route="none")
+
+    monitor.start()
+    _block_loop()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    assert LOOP_BLOCKED.value(method="none", route="none") == before + 1
+    assert caplog.records[-1].route == "none"  # type: ignore[attr-defined]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_loop_monitor_in_app(client: _TestClient) -> None:
+    """Should export the lag of the event loop."""
+    resp = await client.get("/metrics")
+    assert resp.status == HTTPStatus.OK
+    assert "# TYPE event_loop_lag_seconds histogram" in await resp.text()
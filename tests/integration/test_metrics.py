@@ -0,0 +1,209 @@
+"""Integration test cases for the metrics resource and middleware."""
+
+from collections.abc import AsyncIterator
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestClient as _TestClient
+from aiohttp.test_utils import make_mocked_request
+from pytest_mock import MockFixture
+
+from race_service.adapters import (
+    RaceNotFoundError,
+    start_counting_calls,
+    stop_counting_calls,
+)
+from race_service.adapters.instrumentation import (
+    ADAPTER_CALL_SECONDS,
+    instrument_adapter,
+)
+from race_service.middlewares.metrics import (
+    REQUEST_ADAPTER_CALLS,
+    REQUEST_SECONDS,
+    REQUESTS,
+    REQUESTS_IN_PROGRESS,
+    metrics_middleware,
+)
+from race_service.utils.metrics_utils import (
+    CONTENT_TYPE,
+    Counter,
+    Gauge,
+    Histogram,
+    Registry,
+)
+
+
+@instrument_adapter
+class DummyAdapter:
+    """Adapter with classmethods of every kind."""
+
+    @classmethod
+    async def get(cls: Any, *, fail: bool = False) -> str:
+        """Return a value, or fail."""
+        if fail:
+            raise ValueError
+        return "value"
+
+    @classmethod
+    async def stream(cls: Any) -> AsyncIterator[int]:
+        """Yield two values."""
+        yield 1
+        yield 2
+
+    @classmethod
+    def name(cls: Any) -> str:
+        """Return the name, without recording it."""
+        return cls.__name__
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_metrics(client: _TestClient, mocker: MockFixture) -> None:
+    """Should return OK, and the metrics of the route template."""
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        side_effect=RaceNotFoundError("Race race_1 not found."),
+    )
+    labels = {"method": "GET", "route": "/races/{raceId}"}
+    before = REQUESTS.value(**labels, status="404")
+
+    resp = await client.get("/races/race_1")
+    assert resp.status == HTTPStatus.NOT_FOUND
+    resp = await client.get("/metrics")
+    assert resp.status == HTTPStatus.OK
+    assert resp.headers[hdrs.CONTENT_TYPE] == CONTENT_TYPE
+    body = await resp.text()
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_bucket{method="GET",route="/races/{raceId}",le="+Inf"}'
+        in body
+    )
+    assert REQUESTS.value(**labels, status="404") == before + 1
+    assert REQUESTS_IN_PROGRESS.value(**labels) == 0
+    assert REQUEST_ADAPTER_CALLS.count(**labels) >= 1
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_probes_are_not_measured(client: _TestClient) -> None:
+    """Should not measure the probes, nor the scrape."""
+    for route in ("/ping", "/ready", "/metrics"):
+        resp = await client.get(route)
+        assert resp.status == HTTPStatus.OK
+        assert REQUESTS.value(method="GET", route=route, status="200") == 0
+        assert REQUEST_SECONDS.count(method="GET", route=route) == 0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_instrument_adapter() -> None:
+    """Should record the async calls, and count them in the request."""
+    token = start_counting_calls()
+    assert await DummyAdapter.get() == "value"
+    with pytest.raises(ValueError):  # noqa: PT011
+        await DummyAdapter.get(fail=True)
+    assert [item async for item in DummyAdapter.stream()] == [1, 2]
+    assert DummyAdapter.name() == "DummyAdapter"
+    assert stop_counting_calls(token) == 3  # noqa: PLR2004
+
+    assert ADAPTER_CALL_SECONDS.count(adapter="DummyAdapter", method="get") == 2  # noqa: PLR2004
+    assert ADAPTER_CALL_SECONDS.count(adapter="DummyAdapter", method="stream") == 1
+    assert ADAPTER_CALL_SECONDS.count(adapter="DummyAdapter", method="name") == 0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_instrument_adapter_outside_request() -> None:
+    """Should record the call, without counting it."""
+    await DummyAdapter.get()
+    assert stop_counting_calls(start_counting_calls()) == 0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("exception", "status"), [(web.HTTPForbidden(), "403"), (KeyError(), "500")]
+)
+async def test_metrics_middleware_with_exception(
+    exception: Exception, status: str
+) -> None:
+    """Should count the status of the exception, and raise it."""
+    request = make_mocked_request("DELETE", "/unknown")
+    request.match_info.route.resource = None  # type: ignore[misc]
+    handler = MagicMock(side_effect=exception)
+    labels = {"method": "DELETE", "route": "unmatched"}
+    before = REQUESTS.value(**labels, status=status)
+
+    with pytest.raises(type(exception)):
+        await metrics_middleware(request, handler)
+    assert REQUESTS.value(**labels, status=status) == before + 1
+    assert REQUESTS_IN_PROGRESS.value(**labels) == 0
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_registry_render() -> None:
+    """Should render the metrics in the text exposition format."""
+    registry = Registry()
+    counter = registry.register(Counter("c_total", "A counter.", ("name",)))
+    gauge = registry.register(Gauge("g", "A gauge."))
+    histogram = registry.register(Histogram("h", "A histogram.", buckets=(1, 2)))
+    counter.inc(name='say "hi"\\\n')
+    gauge.inc(2.5)
+    gauge.dec()
+    histogram.observe(1.5)
+
+    assert registry.render() == (
+        "# HELP c_total A counter.\n"
+        "# TYPE c_total counter\n"
+        'c_total{name="say \\"hi\\"\\\\\\n"} 1\n'
+        "# HELP g A gauge.\n"
+        "# TYPE g gauge\n"
+        "g 1.5\n"
+        "# HELP h A histogram.\n"
+        "# TYPE h histogram\n"
+        'h_bucket{le="1"} 0\n'
+        'h_bucket{le="2"} 1\n'
+        'h_bucket{le="+Inf"} 1\n'
+        "h_sum 1.5\n"
+        "h_count 1\n"
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_registry_register_twice() -> None:
+    """Should raise ValueError."""
+    registry = Registry()
+    registry.register(Counter("c_total", "A counter."))
+    with pytest.raises(ValueError, match="c_total"):
+        registry.register(Counter("c_total", "A counter."))
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_metrics_updated_from_threads() -> None:
+    """Should count every update, and render while the metrics are updated."""
+    registry = Registry()
+    counter = registry.register(Counter("c_total", "A counter."))
+    histogram = registry.register(Histogram("h", "A histogram.", ("name",)))
+    threads, updates = 4, 1000
+
+    def update(thread: int) -> None:
+        for i in range(updates):
+            counter.inc()
+            histogram.observe(0.1, name=f"{thread}-{i % 10}")
+            if i % 100 == 0:
+                registry.render()
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(update, range(threads)))
+
+    assert counter.value() == threads * updates
+    assert sum(
+        histogram.count(name=f"{t}-{i}") for t in range(threads) for i in range(10)
+    ) == (threads * updates)
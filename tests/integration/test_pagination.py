@@ -0,0 +1,226 @@
+"""Integration test cases for the pagination of list resources."""
+
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from aiohttp import hdrs
+from aiohttp.test_utils import TestClient as _TestClient
+from pytest_mock import MockFixture
+from yarl import URL
+
+from race_service.adapters import Page
+from race_service.adapters.pagination import find_page, keyset_filter
+from race_service.models import IntervalStartRace, TimeEvent
+from race_service.utils.pagination_utils import decode_cursor, encode_cursor
+
+
+def _collection(documents: list[dict]) -> MagicMock:
+    """Mock a collection where find returns a cursor of documents."""
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(return_value=documents)
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    return collection
+
+
+@pytest.fixture
+async def race() -> IntervalStartRace:
+    """Create a race object."""
+    return IntervalStartRace(
+        id="race_1",
+        raceclass="G16",
+        order=1,
+        start_time=datetime.fromisoformat("2021-08-31T12:00:00"),
+        no_of_contestants=0,
+        max_no_of_contestants=10,
+        event_id="event_1",
+        raceplan_id="raceplan_1",
+        start_entries=[],
+        results={},
+        datatype="interval_start",
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_find_page_without_page() -> None:
+    """Should return all documents, in the given sort."""
+    collection = _collection([{"id": "1"}, {"id": "2"}])
+    documents = await find_page(collection, {"event_id": "x"}, [("order", 1)], None)
+    assert len(documents) == 2  # noqa: PLR2004
+    collection.find.assert_called_once_with({"event_id": "x"}, None)
+    collection.find.return_value.sort.assert_called_once_with([("order", 1)])
+    collection.find.return_value.to_list.assert_awaited_once_with(None)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_find_page_after_cursor() -> None:
+    """Should filter on the sort keys, and set the cursor of the next page."""
+    collection = _collection([{"id": "3", "order": 2}, {"id": "4", "order": 2}])
+    page = Page(limit=1, after={"order": 1, "id": "2"})
+    documents = await find_page(collection, {"event_id": "x"}, [("order", 1)], page)
+
+    assert documents == [{"id": "3", "order": 2}]
+    assert page.next_after == {"order": 2, "id": "3"}
+    collection.find.assert_called_once_with(
+        {
+            "$and": [
+                {"event_id": "x"},
+                {"$or": [{"order": {"$gt": 1}}, {"order": 1, "id": {"$gt": "2"}}]},
+            ]
+        },
+        None,
+    )
+    collection.find.return_value.sort.assert_called_once_with([("order", 1), ("id", 1)])
+    collection.find.return_value.limit.assert_called_once_with(2)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_find_page_last_page() -> None:
+    """Should not set the cursor of a next page."""
+    collection = _collection([{"id": "3"}])
+    page = Page(limit=2)
+    documents = await find_page(collection, {}, [("id", 1)], page)
+    assert len(documents) == 1
+    assert page.next_after is None
+    collection.find.return_value.sort.assert_called_once_with([("id", 1)])
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_keyset_filter_after_null() -> None:
+    """Should take any value not null to sort after null."""
+    assert keyset_filter([("rank", 1), ("id", 1)], {"id": "2"}) == {
+        "$or": [{"rank": {"$ne": None}}, {"rank": None, "id": {"$gt": "2"}}]
+    }
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_cursor_round_trip() -> None:
+    """Should decode the values encoded, also datetimes."""
+    values = {"registration_time": datetime(2021, 8, 31, 12), "id": "1"}  # noqa: DTZ001
+    assert decode_cursor(encode_cursor(values)) == values
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_races_with_link_to_next_page(
+    client: _TestClient, mocker: MockFixture, race: IntervalStartRace
+) -> None:
+    """Should return OK, and a Link header to the next page."""
+
+    async def get_races_by_event_id(
+        db: Any, event_id: str, page: Page
+    ) -> list[IntervalStartRace]:
+        page.next_after = {"order": race.order, "id": race.id}
+        return [race]
+
+    mocked = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_races_by_event_id",
+        side_effect=get_races_by_event_id,
+    )
+
+    resp = await client.get("/races?eventId=event_1&limit=1")
+    assert resp.status == HTTPStatus.OK
+    assert len(await resp.json()) == 1
+    assert resp.headers[hdrs.LINK].endswith('>; rel="next"')
+    url = URL(resp.headers[hdrs.LINK].split(";")[0].strip("<>"))
+    assert url.path == "/races"
+    assert url.query["eventId"] == "event_1"
+    assert url.query["limit"] == "1"
+
+    # Follow the link:
+    resp = await client.get(str(url))
+    assert resp.status == HTTPStatus.OK
+    page = mocked.call_args.kwargs["page"]
+    assert page.limit == 1
+    assert page.after == {"order": 1, "id": "race_1"}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_time_events_last_page(
+    client: _TestClient, mocker: MockFixture
+) -> None:
+    """Should return OK, and no Link header."""
+    mocked = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_all_time_events",
+        return_value=[],
+    )
+    resp = await client.get(f"/time-events?after={encode_cursor({'id': '1'})}")
+    assert resp.status == HTTPStatus.OK
+    assert hdrs.LINK not in resp.headers
+    assert mocked.call_args.kwargs["page"] == Page(limit=1000, after={"id": "1"})
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_time_events_without_page(
+    client: _TestClient, mocker: MockFixture
+) -> None:
+    """Should return OK, and all time events, without limit or after."""
+    time_events = [
+        TimeEvent(
+            id=str(i),
+            bib=i,
+            event_id="event_1",
+            name="Name",
+            club="Club",
+            race="race",
+            race_id="race_1",
+            timing_point="Finish",
+            rank=None,
+            registration_time=datetime(2021, 8, 31, 12),  # noqa: DTZ001
+            next_race_id=None,
+            next_race_position=None,
+            status="OK",
+            changelog=None,
+        )
+        for i in range(1500)
+    ]
+    mocked = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_event_id",
+        return_value=time_events,
+    )
+    resp = await client.get("/time-events?eventId=event_1")
+    assert resp.status == HTTPStatus.OK
+    assert len(await resp.json()) == 1500  # noqa: PLR2004
+    assert hdrs.LINK not in resp.headers
+    assert mocked.call_args.kwargs["page"] is None
+
+
+# Bad cases
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query",
+    [
+        "limit=0",
+        "limit=1001",
+        "limit=many",
+        "after=not-a-cursor",
+        f"after={encode_cursor({'id': '1'})[:-2]}",
+        "after=eyJpZCI6IHsidGltZSI6IDF9fQ",  # {"id": {"time": 1}}
+    ],
+)
+async def test_get_list_bad_page(
+    client: _TestClient, mocker: MockFixture, query: str
+) -> None:
+    """Should return 400 Bad request."""
+    mocked = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_all_races",
+        return_value=[],
+    )
+    resp = await client.get(f"/races?{query}")
+    assert resp.status == HTTPStatus.BAD_REQUEST
+    mocked.assert_not_called()
@@ -0,0 +1,196 @@
+"""Integration test cases for the profiling middleware and profiles resource."""
+
+import cProfile
+import os
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock
+
+import pytest
+from aiohttp import hdrs, web
+from aiohttp.test_utils import TestClient as _TestClient
+from aiohttp.test_utils import make_mocked_request
+from aioresponses import aioresponses
+from dotenv import load_dotenv
+from pytest_mock import MockFixture
+
+from race_service import create_app
+from race_service.adapters import RaceNotFoundError
+from race_service.middlewares import profiling_middleware
+from race_service.middlewares.profiling import (
+    ADMIN_CACHE_SECONDS,
+    _is_requested_by_admin,
+)
+from race_service.utils.profiling_utils import (
+    profile_key,
+    profiled_routes,
+    top_functions,
+)
+
+load_dotenv()
+
+USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
+USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
+AUTHORIZE_URL = f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize"
+HEADERS = {hdrs.AUTHORIZATION: "Bearer token"}
+
+
+@pytest.fixture
+async def profiling_client(
+    aiohttp_client: Any, mocker: MockFixture, tmp_path: Path
+) -> _TestClient:
+    """Start the server with profiling enabled, sampling no request."""
+    mocker.patch("race_service.app.PROFILE_DIR", str(tmp_path))
+    mocker.patch("race_service.app.PROFILE_SAMPLE_RATE", 0)
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        side_effect=RaceNotFoundError("Race race_1 not found."),
+    )
+    return await aiohttp_client(await create_app())
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_profile_requested_by_admin(
+    profiling_client: _TestClient, tmp_path: Path
+) -> None:
+    """Should profile requests with the header by admins only."""
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(AUTHORIZE_URL, status=204)
+        m.post(AUTHORIZE_URL, status=403)
+        for token in ("admin", "user"):
+            resp = await profiling_client.get(
+                "/races/race_1",
+                headers={hdrs.AUTHORIZATION: f"Bearer {token}", "X-Profile": "1"},
+            )
+            assert resp.status == HTTPStatus.NOT_FOUND
+    resp = await profiling_client.get("/races/race_1", headers=HEADERS)
+    assert resp.status == HTTPStatus.NOT_FOUND
+
+    assert profiled_routes(tmp_path) == {"GET_races_raceId": 1}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_is_requested_by_admin_cached(mocker: MockFixture) -> None:
+    """Should authorize only bearer tokens, once per token while cached."""
+    mocker.patch("race_service.middlewares.profiling.ADMIN_CACHE_MAXSIZE", 2)
+    monotonic = mocker.patch(
+        "race_service.middlewares.profiling.time.monotonic", return_value=0
+    )
+
+    async def authorize(bearer: str, roles: list[str]) -> None:
+        if bearer != "admin":
+            raise web.HTTPForbidden
+
+    authorize_mock = mocker.patch(
+        "race_service.adapters.users_adapter.UsersAdapter.authorize",
+        side_effect=authorize,
+    )
+    admin_tokens: dict[str, tuple[bool, float]] = {}
+
+    def request(authorization: str) -> web.Request:
+        return make_mocked_request(
+            "GET",
+            "/races/race_1",
+            headers={hdrs.AUTHORIZATION: authorization, "X-Profile": "1"},
+        )
+
+    assert not await _is_requested_by_admin(request("Basic admin"), admin_tokens)
+    assert not await _is_requested_by_admin(
+        make_mocked_request("GET", "/races/race_1", headers={"X-Profile": "1"}),
+        admin_tokens,
+    )
+    authorize_mock.assert_not_called()
+
+    for _ in range(2):
+        assert await _is_requested_by_admin(request("Bearer admin"), admin_tokens)
+        assert not await _is_requested_by_admin(request("Bearer user"), admin_tokens)
+    assert authorize_mock.call_count == 2  # noqa: PLR2004
+
+    # The oldest token is evicted when the cache is full:
+    assert not await _is_requested_by_admin(request("Bearer other"), admin_tokens)
+    assert set(admin_tokens) == {"user", "other"}
+
+    # And a token is authorized again when its entry has expired:
+    monotonic.return_value = ADMIN_CACHE_SECONDS
+    assert not await _is_requested_by_admin(request("Bearer user"), admin_tokens)
+    assert authorize_mock.call_count == 4  # noqa: PLR2004
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_profiles(profiling_client: _TestClient) -> None:
+    """Should return the profiled routes, and the top functions of a route."""
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(AUTHORIZE_URL, status=204, repeat=True)
+        for _ in range(2):
+            await profiling_client.get(
+                "/races/race_1", headers={**HEADERS, "X-Profile": "1"}
+            )
+        resp = await profiling_client.get("/profiles", headers=HEADERS)
+        assert resp.status == HTTPStatus.OK
+        assert (await resp.json())["GET_races_raceId"] == 2  # noqa: PLR2004
+
+        resp = await profiling_client.get(
+            "/profiles?route=GET_races_raceId&top=5&sort=cumtime", headers=HEADERS
+        )
+        assert resp.status == HTTPStatus.OK
+        body = await resp.json()
+        assert body["route"] == "GET_races_raceId"
+        assert body["profiles"] == 2  # noqa: PLR2004
+        assert len(body["functions"]) == 5  # noqa: PLR2004
+        cumtimes = [function["cumtime"] for function in body["functions"]]
+        assert cumtimes == sorted(cumtimes, reverse=True)
+        assert {"function", "calls", "primitive_calls", "tottime"} <= set(
+            body["functions"][0]
+        )
+
+        for query, status in (
+            ("route=GET_races_raceId&top=x", HTTPStatus.BAD_REQUEST),
+            ("route=GET_races_raceId&sort=ncalls", HTTPStatus.BAD_REQUEST),
+            ("route=GET_unknown", HTTPStatus.NOT_FOUND),
+        ):
+            resp = await profiling_client.get(f"/profiles?{query}", headers=HEADERS)
+            assert resp.status == status
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(AUTHORIZE_URL, status=401)
+        resp = await profiling_client.get("/profiles", headers=HEADERS)
+        assert resp.status == HTTPStatus.UNAUTHORIZED
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_profiles_not_routed_when_disabled(client: _TestClient) -> None:
+    """Should return 404 Not found."""
+    resp = await client.get("/profiles")
+    assert resp.status == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_profiling_middleware_while_profiling(tmp_path: Path) -> None:
+    """Should handle the request unprofiled, as a profiler is active."""
+    request = make_mocked_request("GET", "/ping")
+    request.match_info.route.resource = None  # type: ignore[misc]
+    handler = AsyncMock(return_value=web.Response())
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        await profiling_middleware(str(tmp_path), sample_rate=1)(request, handler)
+    finally:
+        profile.disable()
+    handler.assert_awaited_once()
+    assert profiled_routes(tmp_path) == {}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_profiling_utils(tmp_path: Path) -> None:
+    """Should name routes as directories, and handle missing profiles."""
+    assert profile_key("POST", "/time-events") == "POST_time-events"
+    assert profile_key("GET", "/races/{raceId}") == "GET_races_raceId"
+    assert profiled_routes(tmp_path / "missing") == {}
+    assert top_functions(tmp_path, 10) == []
@@ -0,0 +1,131 @@
+"""Integration test cases for field projections of list resources."""
+
+from datetime import datetime
+from http import HTTPStatus
+from typing import Any
+from unittest.mock import ANY, AsyncMock, MagicMock
+
+import pytest
+from aiohttp.test_utils import TestClient as _TestClient
+from pytest_mock import MockFixture
+
+from race_service.adapters import Page
+from race_service.adapters.documents import projection
+from race_service.adapters.pagination import find_page
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_find_page_with_projection() -> None:
+    """Should read the sort keys for the cursor, but not return them."""
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.limit.return_value = cursor
+    cursor.to_list = AsyncMock(
+        return_value=[{"id": "1", "rank": 1, "bib": 1}, {"id": "2", "rank": 2}]
+    )
+    collection = MagicMock()
+    collection.find.return_value = cursor
+    page = Page(limit=1)
+
+    documents = await find_page(
+        collection, {}, [("rank", 1)], page, projection(["id", "bib"])
+    )
+
+    assert documents == [{"id": "1", "bib": 1}]
+    assert page.next_after == {"rank": 1, "id": "1"}
+    collection.find.assert_called_once_with(
+        {}, {"_id": 0, "id": 1, "bib": 1, "rank": 1}
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_races_with_fields(client: _TestClient, mocker: MockFixture) -> None:
+    """Should return OK, and the fields with datetimes in ISO 8601."""
+    get_race_documents = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_documents",
+        return_value=[
+            {"id": "race_1", "start_time": datetime.fromisoformat("2021-08-31T12:00")}
+        ],
+    )
+
+    resp = await client.get("/races?eventId=event_1&raceclass=G16&fields=start_time")
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == [{"id": "race_1", "start_time": "2021-08-31T12:00:00"}]
+    get_race_documents.assert_called_once_with(
+        ANY, ["id", "start_time"], event_id="event_1", raceclass="G16", page=ANY
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_startlists_with_fields(
+    client: _TestClient, mocker: MockFixture
+) -> None:
+    """Should return OK, and the fields."""
+    get_startlist_documents = mocker.patch(
+        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_documents",
+        return_value=[{"id": "startlist_1", "no_of_contestants": 8}],
+    )
+
+    resp = await client.get("/startlists?eventId=event_1&fields=no_of_contestants")
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == [{"id": "startlist_1", "no_of_contestants": 8}]
+    get_startlist_documents.assert_called_once_with(
+        ANY, ["id", "no_of_contestants"], event_id="event_1", page=ANY
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("query", "criteria"),
+    [
+        ("", {}),
+        ("eventId=e", {"event_id": "e"}),
+        ("eventId=e&timingPoint=Finish", {"event_id": "e", "timing_point": "Finish"}),
+        (
+            "eventId=e&from=2021-08-31T12:00:00%2B02:00",
+            {
+                "event_id": "e",
+                "from_": datetime.fromisoformat("2021-08-31T10:00:00+00:00"),
+                "to": None,
+            },
+        ),
+        ("eventId=e&bib=1", {"event_id": "e", "bib": 1}),
+        ("raceId=r", {"race_id": "r"}),
+    ],
+)
+async def test_get_time_events_with_fields(
+    client: _TestClient, mocker: MockFixture, query: str, criteria: dict[str, Any]
+) -> None:
+    """Should return OK, and get the fields by the same criteria as without."""
+    get_time_event_documents = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_documents",
+        return_value=[{"id": "time_event_1", "bib": 1, "rank": 1}],
+    )
+
+    resp = await client.get(f"/time-events?{query}&fields=bib,rank,bib")
+    assert resp.status == HTTPStatus.OK
+    assert await resp.json() == [{"id": "time_event_1", "bib": 1, "rank": 1}]
+    get_time_event_documents.assert_called_once_with(
+        ANY, ["id", "bib", "rank"], page=ANY, **criteria
+    )
+
+
+# Bad cases
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path", ["/races", "/startlists", "/time-events", "/time-events?eventId=e"]
+)
+async def test_get_with_unknown_field(
+    client: _TestClient, mocker: MockFixture, path: str
+) -> None:
+    """Should return 400 Bad request."""
+    separator = "&" if "?" in path else "?"
+    resp = await client.get(f"{path}{separator}fields=bib,password")
+    assert resp.status == HTTPStatus.BAD_REQUEST
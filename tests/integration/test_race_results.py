@@ -14,7 +14,11 @@ from aiohttp.test_utils import TestClient as _TestClient
 from aioresponses import aioresponses
 from pytest_mock import MockFixture
 
-from race_service.adapters import RaceNotFoundError, RaceResultNotFoundError
+from race_service.adapters import (
+    RaceNotFoundError,
+    RaceResultNotFoundError,
+    VersionConflictError,
+)
 from race_service.models import Changelog, IndividualSprintRace, RaceResult, TimeEvent
 
 USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
@@ -152,6 +156,11 @@ def get_time_event_by_id(db: Any, id_: str) -> TimeEvent:
     return next(time_event for time_event in TIME_EVENTS if time_event.id == id_)
 
 
+def get_time_events_by_ids(db: Any, ids: list[str]) -> list[TimeEvent]:
+    """Mock function to look up time-events from list, in the order of ids."""
+    return [get_time_event_by_id(db, id_) for id_ in ids]
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_create_race_result(
@@ -189,9 +198,9 @@ async def test_get_race_result_by_id(
         "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
         return_value=race_result,
     )
-    mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+    get_time_events_by_ids_mock = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -199,7 +208,10 @@ async def test_get_race_result_by_id(
 
         resp = await client.get(f"races/{race.id}/race-results/{race_result_id}")
         assert resp.status == HTTPStatus.OK
+        # The ranking-sequence should be expanded in one batched query:
+        assert get_time_events_by_ids_mock.call_count == 1
         assert "application/json" in resp.headers[hdrs.CONTENT_TYPE]
+        assert resp.headers[hdrs.ETAG] == f'"{race_result.version}"'
         body = await resp.json()
         assert type(body) is dict
         assert body["id"] == race_result_id
@@ -217,6 +229,35 @@ async def test_get_race_result_by_id(
             assert time_event == expected_time_event.to_dict()
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_race_result_by_id_equal_ranks_keep_order(
+    client: _TestClient,
+    mocker: MockFixture,
+    race: IndividualSprintRace,
+    race_result: RaceResult,
+) -> None:
+    """Should return OK, and time-events of equal rank in the ranking order."""
+    race_result.ranking_sequence = ["time_event_3", "time_event_1", "time_event_2"]
+    mocker.patch(
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
+        return_value=race_result,
+    )
+    mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
+    )
+
+    resp = await client.get(f"races/{race.id}/race-results/{race_result.id}")
+    assert resp.status == HTTPStatus.OK
+    body = await resp.json()
+    assert [time_event["id"] for time_event in body["ranking_sequence"]] == [
+        "time_event_1",
+        "time_event_3",
+        "time_event_2",
+    ]
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_update_race_result_by_id(
@@ -253,6 +294,96 @@ async def test_update_race_result_by_id(
             data=request_body,
         )
         assert resp.status == HTTPStatus.NO_CONTENT
+        assert resp.headers[hdrs.ETAG] == f'"{race_result.version}"'
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_update_race_result_by_id_without_version(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race: IndividualSprintRace,
+    race_result: RaceResult,
+) -> None:
+    """Should return No Content, and write on the stored version."""
+    race_result_id = race_result.id
+    stored_race_result = deepcopy(race_result)
+    stored_race_result.version = 4
+    mocker.patch(
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
+        return_value=stored_race_result,
+    )
+    update_race_result = mocker.patch(
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.update_race_result",
+        return_value=race_result_id,
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+
+    body = race_result.to_dict()
+    del body["version"]
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.put(
+            f"races/{race.id}/race-results/{race_result_id}",
+            headers=headers,
+            data=dumps(body, default=str),
+        )
+        assert resp.status == HTTPStatus.NO_CONTENT
+        assert update_race_result.call_args.args[2].version == 4  # noqa: PLR2004
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("if_match", "expected_status"),
+    [
+        (None, HTTPStatus.CONFLICT),
+        ('"1"', HTTPStatus.PRECONDITION_FAILED),
+    ],
+)
+async def test_update_race_result_by_id_version_conflict(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race: IndividualSprintRace,
+    race_result: RaceResult,
+    if_match: str | None,
+    expected_status: HTTPStatus,
+) -> None:
+    """Should return Conflict, or Precondition failed if If-Match is given."""
+    race_result_id = race_result.id
+    mocker.patch(
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.update_race_result",
+        side_effect=VersionConflictError(
+            f"RaceResult with id {race_result_id} has been changed since version 1."
+        ),
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+    if if_match:
+        headers[hdrs.IF_MATCH] = if_match
+
+    request_body = dumps(race_result.to_dict(), indent=4, sort_keys=True, default=str)
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.put(
+            f"races/{race.id}/race-results/{race_result_id}",
+            headers=headers,
+            data=request_body,
+        )
+        assert resp.status == expected_status
 
 
 @pytest.mark.integration
@@ -271,8 +402,8 @@ async def test_get_race_results_by_race_id(
         return_value=[race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -306,8 +437,8 @@ async def test_get_race_results_by_race_id_idsonly(
         return_value=[race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -341,8 +472,8 @@ async def test_get_race_results_by_race_id_and_timing_point(
         return_value=[race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -623,14 +754,10 @@ async def test_update_race_result_not_found(
     race_result: RaceResult,
 ) -> None:
     """Should return 404 Not found."""
-    race_result_id = "does-not-exist"
-    mocker.patch(
-        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
-        side_effect=RaceResultNotFoundError(f"RaceResult with id {id} not found"),
-    )
+    race_result_id = race_result.id
     mocker.patch(
         "race_service.adapters.race_results_adapter.RaceResultsAdapter.update_race_result",
-        return_value=None,
+        side_effect=RaceResultNotFoundError(f"RaceResult with id {id} not found"),
     )
 
     headers = {
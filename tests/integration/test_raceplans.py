@@ -1281,16 +1281,10 @@ async def test_update_raceplan_not_found(
     raceplan_interval_start: Raceplan,
 ) -> None:
     """Should return 404 Not found."""
-    raceplan_id = "does-not-exist"
-    mocker.patch(
-        "race_service.adapters.raceplans_adapter.RaceplansAdapter.get_raceplan_by_id",
-        side_effect=RaceplanNotFoundError(
-            f"Raceplan with id {raceplan_interval_start.id} not found."
-        ),
-    )
+    raceplan_id = raceplan_interval_start.id
     mocker.patch(
         "race_service.adapters.raceplans_adapter.RaceplansAdapter.update_raceplan",
-        return_value=None,
+        side_effect=RaceplanNotFoundError(f"Raceplan with id {raceplan_id} not found."),
     )
     mocker.patch(
         "race_service.adapters.raceplans_adapter.RaceplansAdapter.get_raceplans_by_event_id",
@@ -17,6 +17,7 @@ from pytest_mock import MockFixture
 from race_service.adapters import (
     NotSupportedRaceDatatypeError,
     RaceNotFoundError,
+    VersionConflictError,
 )
 from race_service.models import (
     IndividualSprintRace,
@@ -25,11 +26,21 @@ from race_service.models import (
     StartEntry,
     TimeEvent,
 )
+from tests.query_counter import QueryCounter
 
 USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
 USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
 
 
+@pytest.fixture(autouse=True)
+def mock_event_timezone(mocker: MockFixture) -> None:
+    """Mock the event, in whose timezone the times without offset are."""
+    mocker.patch(
+        "race_service.adapters.events_adapter.EventsAdapter.get_event_by_id",
+        return_value={"id": "event_1", "timezone": "Europe/Oslo"},
+    )
+
+
 @pytest.fixture
 def token() -> str:
     """Create a valid token."""
@@ -290,11 +301,21 @@ def get_start_entry_by_id(db: Any, id_: str) -> StartEntry:
     return next(start_entry for start_entry in START_ENTRIES if start_entry.id == id_)
 
 
+def get_start_entries_by_ids(db: Any, ids: list[str]) -> list[StartEntry]:
+    """Mock function to look up start-entries from list, in the order of ids."""
+    return [get_start_entry_by_id(db, id_) for id_ in ids]
+
+
 def get_time_event_by_id(db: Any, id_: str) -> TimeEvent:
     """Mock function to look up correct time-event from list."""
     return next(time_event for time_event in TIME_EVENTS if time_event.id == id_)
 
 
+def get_time_events_by_ids(db: Any, ids: list[str]) -> list[TimeEvent]:
+    """Mock function to look up time-events from list, in the order of ids."""
+    return [get_time_event_by_id(db, id_) for id_ in ids]
+
+
 @pytest.fixture
 async def new_race_unsupported_datatype() -> dict:
     """Create a race object."""
@@ -359,16 +380,16 @@ async def test_get_race_by_id_interval_start(
         return_value=race_interval_start,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
-        side_effect=get_start_entry_by_id,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        side_effect=get_start_entries_by_ids,
     )
     mocker.patch(
-        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
-        return_value=mock_race_result,
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_results_by_ids",
+        return_value=[mock_race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -377,6 +398,7 @@ async def test_get_race_by_id_interval_start(
         resp = await client.get(f"/races/{race_id}")
         assert resp.status == HTTPStatus.OK
         assert "application/json" in resp.headers[hdrs.CONTENT_TYPE]
+        assert resp.headers[hdrs.ETAG] == f'"{race_interval_start.version}"'
         body = await resp.json()
         assert type(body) is dict
         assert body["id"] == race_id
@@ -420,6 +442,50 @@ async def test_get_race_by_id_interval_start(
                 assert time_event == expected_time_event.to_dict()
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_race_by_id_timing_points_share_race_result(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    mock_race_result: RaceResult,
+    race_interval_start: IntervalStartRace,
+) -> None:
+    """Should return OK, and the shared race result for each timing point."""
+    race_id = race_interval_start.id
+    race_interval_start.results = {
+        "Template": "template_1",
+        "Finish": mock_race_result.id,
+        "Finish line": mock_race_result.id,
+    }
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        return_value=race_interval_start,
+    )
+    mocker.patch(
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        side_effect=get_start_entries_by_ids,
+    )
+    mocker.patch(
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_results_by_ids",
+        return_value=[mock_race_result],
+    )
+    mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
+    )
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.get(f"/races/{race_id}")
+        assert resp.status == HTTPStatus.OK
+        body = await resp.json()
+        assert list(body["results"]) == ["Finish", "Finish line"]
+        assert body["results"]["Finish"] == body["results"]["Finish line"]
+        assert body["results"]["Finish"]["id"] == mock_race_result.id
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_get_race_by_id_individual_sprint(
@@ -436,16 +502,16 @@ async def test_get_race_by_id_individual_sprint(
         return_value=race_individual_sprint,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
-        side_effect=get_start_entry_by_id,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        side_effect=get_start_entries_by_ids,
     )
     mocker.patch(
-        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
-        return_value=mock_race_result,
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_results_by_ids",
+        return_value=[mock_race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -494,6 +560,77 @@ async def test_get_race_by_id_individual_sprint(
                 assert time_event == expected_time_event.to_dict()
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize("no_of_start_entries", [0, 1, len(START_ENTRIES)])
+async def test_get_race_by_id_query_budget(
+    client: _TestClient,
+    mocker: MockFixture,
+    query_counter: type[QueryCounter],
+    mock_race_result: RaceResult,
+    race_interval_start: IntervalStartRace,
+    no_of_start_entries: int,
+) -> None:
+    """Should make at most 4 queries, regardless of the number of entries."""
+    race_interval_start.start_entries = [
+        start_entry.id  # type: ignore [reportAttributeAccessIssue]
+        for start_entry in START_ENTRIES[:no_of_start_entries]
+    ]
+    race_interval_start.results = {"Template": "template_1", "Finish": "race_result_1"}
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        return_value=race_interval_start,
+    )
+    mocker.patch(
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        side_effect=get_start_entries_by_ids,
+    )
+    mocker.patch(
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_results_by_ids",
+        return_value=[mock_race_result],
+    )
+    mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
+    )
+
+    with query_counter(max_queries=4):
+        resp = await client.get(f"/races/{race_interval_start.id}")
+    assert resp.status == HTTPStatus.OK
+    body = await resp.json()
+    assert len(body["start_entries"]) == no_of_start_entries
+    assert list(body["results"]) == ["Finish"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_query_counter_over_budget(
+    client: _TestClient,
+    mocker: MockFixture,
+    query_counter: type[QueryCounter],
+    race_interval_start: IntervalStartRace,
+) -> None:
+    """Should fail when more queries are made than the maximum."""
+    race_interval_start.start_entries = []
+    race_interval_start.results = {}
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        return_value=race_interval_start,
+    )
+    mocker.patch(
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        return_value=[],
+    )
+
+    with (
+        pytest.raises(AssertionError, match="2 adapter calls, more than 1"),
+        query_counter(max_queries=1) as queries,
+    ):
+        await client.get(f"/races/{race_interval_start.id}")
+    assert queries.adapter_calls == 2  # noqa: PLR2004
+    assert queries.commands == 0
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_get_races_by_event_id(
@@ -548,16 +685,16 @@ async def test_get_races_by_event_id_and_raceclass(
         return_value=[race_interval_start],
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
-        side_effect=get_start_entry_by_id,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        side_effect=get_start_entries_by_ids,
     )
     mocker.patch(
-        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
-        return_value=mock_race_result,
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_results_by_ids",
+        return_value=[mock_race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -638,16 +775,16 @@ async def test_get_races_by_event_id_and_raceclass_individual_sprint(
         return_value=[race_individual_sprint],
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
-        side_effect=get_start_entry_by_id,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        side_effect=get_start_entries_by_ids,
     )
     mocker.patch(
-        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
-        return_value=mock_race_result,
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_results_by_ids",
+        return_value=[mock_race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -708,6 +845,166 @@ async def test_update_race_by_id_interval_start(
         assert resp.status == HTTPStatus.NO_CONTENT
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_update_race_by_id_if_match(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race_interval_start: IntervalStartRace,
+) -> None:
+    """Should return No Content, and write on the version in If-Match."""
+    race_id = race_interval_start.id
+    update_race = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.update_race",
+        return_value=race_id,
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+        hdrs.IF_MATCH: '"3"',
+    }
+
+    request_body = dumps(
+        race_interval_start.to_dict(), indent=4, sort_keys=True, default=str
+    )
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.put(f"/races/{race_id}", headers=headers, data=request_body)
+        assert resp.status == HTTPStatus.NO_CONTENT
+        assert resp.headers[hdrs.ETAG] == '"3"'
+        assert update_race.call_args.args[2].version == 3  # noqa: PLR2004
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("if_match", "with_version"), [(None, False), ("*", True), ("*", False)]
+)
+async def test_update_race_by_id_any_version(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race_interval_start: IntervalStartRace,
+    if_match: str | None,
+    with_version: bool,  # noqa: FBT001
+) -> None:
+    """Should return No Content, and write on the stored version."""
+    race_id = race_interval_start.id
+    stored_race = deepcopy(race_interval_start)
+    stored_race.version = 4
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        return_value=stored_race,
+    )
+    update_race = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.update_race",
+        side_effect=[VersionConflictError("Race has been changed."), race_id],
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+    if if_match:
+        headers[hdrs.IF_MATCH] = if_match
+
+    body = race_interval_start.to_dict()
+    if not with_version:
+        del body["version"]
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.put(
+            f"/races/{race_id}", headers=headers, data=dumps(body, default=str)
+        )
+        assert resp.status == HTTPStatus.NO_CONTENT
+        assert resp.headers[hdrs.ETAG] == '"4"'
+        assert update_race.call_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("if_match", "expected_status"),
+    [
+        (None, HTTPStatus.CONFLICT),
+        ('"2"', HTTPStatus.PRECONDITION_FAILED),
+        ('"not-a-version"', HTTPStatus.PRECONDITION_FAILED),
+    ],
+)
+async def test_update_race_by_id_version_conflict(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race_interval_start: IntervalStartRace,
+    if_match: str | None,
+    expected_status: HTTPStatus,
+) -> None:
+    """Should return Conflict, or Precondition failed if If-Match is given."""
+    race_id = race_interval_start.id
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.update_race",
+        side_effect=VersionConflictError(
+            f"Race with id {race_id} has been changed since version 2."
+        ),
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+    if if_match:
+        headers[hdrs.IF_MATCH] = if_match
+
+    request_body = dumps(
+        race_interval_start.to_dict(), indent=4, sort_keys=True, default=str
+    )
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.put(f"/races/{race_id}", headers=headers, data=request_body)
+        assert resp.status == expected_status
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_update_race_by_id_weak_if_match(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race_interval_start: IntervalStartRace,
+) -> None:
+    """Should return Precondition failed, as a weak entity tag never matches."""
+    race_id = race_interval_start.id
+    update_race = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.update_race",
+        return_value=3,
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+        hdrs.IF_MATCH: 'W/"2"',
+    }
+
+    request_body = dumps(
+        race_interval_start.to_dict(), indent=4, sort_keys=True, default=str
+    )
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+
+        resp = await client.put(f"/races/{race_id}", headers=headers, data=request_body)
+        assert resp.status == HTTPStatus.PRECONDITION_FAILED
+        update_race.assert_not_called()
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_update_race_by_id_individual_sprint(
@@ -914,16 +1211,16 @@ async def test_get_race_by_id_unsupported_datatype(
         ),
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
-        side_effect=get_start_entry_by_id,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_ids",
+        side_effect=get_start_entries_by_ids,
     )
     mocker.patch(
-        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_result_by_id",
-        return_value=mock_race_result,
+        "race_service.adapters.race_results_adapter.RaceResultsAdapter.get_race_results_by_ids",
+        return_value=[mock_race_result],
     )
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
-        side_effect=get_time_event_by_id,
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_ids",
+        side_effect=get_time_events_by_ids,
     )
 
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
@@ -1053,16 +1350,10 @@ async def test_update_race_not_found(
     race_interval_start: IntervalStartRace,
 ) -> None:
     """Should return 404 Not found."""
-    race_id = "does-not-exist"
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
-        side_effect=RaceNotFoundError(
-            f"Race with id {race_interval_start.id} not found."
-        ),
-    )
+    race_id = race_interval_start.id
     mocker.patch(
         "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=None,
+        side_effect=RaceNotFoundError(f"Race with id {race_id} not found."),
     )
 
     headers = {
@@ -1,10 +1,15 @@
 """Integration test cases for the ready route."""
 
+import asyncio
+import logging
 from http import HTTPStatus
+from typing import Any
 
 import pytest
 from aiohttp.test_utils import TestClient as _TestClient
 
+from race_service import create_app
+
 
 @pytest.mark.integration
 @pytest.mark.asyncio
@@ -14,3 +19,44 @@ async def test_ready(client: _TestClient) -> None:
     assert resp.status == HTTPStatus.OK
     text = await resp.text()
     assert "OK" in text
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_ready_while_creating_indexes(aiohttp_client: Any) -> None:
+    """Should return 503 Service Unavailable until the indexes are created."""
+    app = await create_app()
+    index_task = asyncio.get_running_loop().create_future()
+    app["index_task"] = index_task
+    client = await aiohttp_client(app)
+
+    resp = await client.get("/ready")
+    assert resp.status == HTTPStatus.SERVICE_UNAVAILABLE
+
+    index_task.set_result(None)
+    resp = await client.get("/ready")
+    assert resp.status == HTTPStatus.OK
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cancelled", [False, True])
+async def test_ready_when_creating_indexes_failed(
+    aiohttp_client: Any,
+    caplog: pytest.LogCaptureFixture,
+    cancelled: bool,  # noqa: FBT001
+) -> None:
+    """Should return OK, and log the error, if the index task failed."""
+    app = await create_app()
+    index_task = asyncio.get_running_loop().create_future()
+    if cancelled:
+        index_task.cancel()
+    else:
+        index_task.set_exception(RuntimeError("Unexpected"))
+    app["index_task"] = index_task
+    client = await aiohttp_client(app)
+
+    with caplog.at_level(logging.ERROR):
+        resp = await client.get("/ready")
+    assert resp.status == HTTPStatus.OK
+    assert "Indexes could not be created." in caplog.text
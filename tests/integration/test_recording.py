@@ -0,0 +1,155 @@
+"""Integration test cases for the recording middleware."""
+
+import json
+import os
+import threading
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import hdrs, web
+from aiohttp.test_utils import make_mocked_request
+from aioresponses import aioresponses
+from dotenv import load_dotenv
+from pytest_mock import MockFixture
+
+from race_service import create_app
+from race_service.adapters import RaceNotFoundError
+from race_service.middlewares import recording_middleware
+from race_service.middlewares.recording import sanitize
+from race_service.utils.jsonlines_utils import LINES_DROPPED, JsonLinesWriter
+
+load_dotenv()
+
+USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
+USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
+
+
+def _recorded(path: Path) -> list[dict]:
+    """Return the requests recorded in the file."""
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_recording_middleware(
+    aiohttp_client: Any, mocker: MockFixture, tmp_path: Path
+) -> None:
+    """Should record the requests, sanitized, but not the probes."""
+    path = tmp_path / "requests.jsonl"
+    mocker.patch("race_service.app.RECORD_REQUESTS_FILE", str(path))
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        side_effect=RaceNotFoundError("Race race_1 not found."),
+    )
+    client = await aiohttp_client(await create_app())
+    headers = {hdrs.AUTHORIZATION: "Bearer secret-token"}
+
+    resp = await client.get("/ping")
+    assert resp.status == HTTPStatus.OK
+    resp = await client.get("/races/race_1?token=abc&fields=id", headers=headers)
+    assert resp.status == HTTPStatus.NOT_FOUND
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=401)
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=401)
+        resp = await client.post(
+            "/raceplans/generate-raceplan-for-event",
+            headers=headers,
+            json={"event_id": "event_1", "users": [{"password": "x"}]},
+        )
+        assert resp.status == HTTPStatus.UNAUTHORIZED
+        resp = await client.post(
+            "/raceplans/generate-raceplan-for-event",
+            headers={**headers, hdrs.CONTENT_TYPE: "application/json"},
+            data="{",
+        )
+        assert resp.status == HTTPStatus.UNAUTHORIZED
+    await client.close()
+
+    get, post, invalid_post = _recorded(path)
+    assert get["method"] == "GET"
+    assert get["path"] == "/races/race_1"
+    assert get["query"] == [["token", "***"], ["fields", "id"]]
+    assert get["route"] == "/races/{raceId}"
+    assert get["body"] is None
+    assert get["status"] == HTTPStatus.NOT_FOUND
+    assert get["ms"] >= 0
+    assert post["body"] == {"event_id": "event_1", "users": [{"password": "***"}]}
+    assert post["status"] == HTTPStatus.UNAUTHORIZED
+    assert invalid_post["body"] is None
+    assert post["ts"] <= invalid_post["ts"]
+    assert "secret-token" not in path.read_text()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("exception", "status"), [(web.HTTPForbidden(), 403), (KeyError(), 500)]
+)
+async def test_recording_middleware_with_exception(
+    tmp_path: Path, exception: Exception, status: int
+) -> None:
+    """Should record the status of the exception, and raise it."""
+    path = tmp_path / "requests.jsonl"
+    request = make_mocked_request("DELETE", "/unknown")
+    request.match_info.route.resource = None  # type: ignore[misc]
+
+    writer = JsonLinesWriter(str(path), "test")
+
+    with pytest.raises(type(exception)):
+        await recording_middleware(writer)(request, MagicMock(side_effect=exception))
+    writer.close()
+    (recorded,) = _recorded(path)
+    assert recorded["route"] == "unmatched"
+    assert recorded["status"] == status
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_sanitize() -> None:
+    """Should redact the values of sensitive keys, in any case."""
+    assert sanitize(
+        {
+            "Password": "x",
+            "bib": 1,
+            "name": "Petter Propell",
+            "club": "Lyn",
+            "changelog": [{"jwt": "y"}],
+        }
+    ) == {
+        "Password": "***",
+        "bib": 1,
+        "name": "***",
+        "club": "***",
+        "changelog": [{"jwt": "***"}],
+    }
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_json_lines_writer(tmp_path: Path) -> None:
+    """Should append the lines in a thread, dropping them when the queue is full."""
+    path = tmp_path / "lines.jsonl"
+    encoding, release = threading.Event(), threading.Event()
+
+    def encode(obj: dict) -> str:
+        encoding.set()
+        release.wait()
+        if obj.get("fail"):
+            msg = "Cannot encode."
+            raise ValueError(msg)
+        return json.dumps(obj)
+
+    writer = JsonLinesWriter(str(path), "test-full", encode, maxsize=2)
+    writer.write({"line": 1})
+    encoding.wait()  # the first line is taken off the queue
+    writer.write({"fail": True})
+    writer.write({"line": 2})
+    writer.write({"line": 3})
+    release.set()
+    writer.close()
+
+    assert _recorded(path) == [{"line": 1}, {"line": 2}]
+    assert LINES_DROPPED.value(writer="test-full") == 1
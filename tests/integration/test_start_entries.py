@@ -6,6 +6,7 @@ from datetime import datetime
 from http import HTTPStatus
 from json import dumps
 from typing import Any
+from unittest.mock import ANY
 
 import jwt
 import pytest
@@ -15,6 +16,7 @@ from aioresponses import aioresponses
 from pytest_mock import MockFixture
 
 from race_service.adapters import (
+    DuplicateStartEntryError,
     RaceNotFoundError,
     StartEntryNotFoundError,
     StartlistNotFoundError,
@@ -25,6 +27,15 @@ USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
 USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
 
 
+@pytest.fixture(autouse=True)
+def mock_race_timezone(mocker: MockFixture) -> None:
+    """Mock the timezone of the race, in which the times without offset are."""
+    mocker.patch(
+        "race_service.views.start_entries.race_timezone",
+        return_value="Europe/Oslo",
+    )
+
+
 @pytest.fixture
 def token() -> str:
     """Create a valid token."""
@@ -167,34 +178,16 @@ async def test_create_start_entry(
         return_value=start_entry_id,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_race_id",
-        return_value=[],
-    )
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entry_if_not_full",
         return_value=race,
     )
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_by_id",
-        return_value=startlist,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
-        return_value=True,
-    )
-    mocker.patch(
-        "race_service.adapters.raceplans_adapter.RaceplansAdapter.get_raceplan_by_id",
-        return_value=Raceplan(
-            id="raceplan_id", event_id=event["id"], races=[], no_of_contestants=0
-        ),
+        "race_service.adapters.startlists_adapter.StartlistsAdapter.add_start_entry",
+        return_value=None,
     )
-    mocker.patch(
-        "race_service.adapters.raceplans_adapter.RaceplansAdapter.update_raceplan",
-        return_value=True,
+    add_to_no_of_contestants = mocker.patch(
+        "race_service.adapters.raceplans_adapter.RaceplansAdapter.add_to_no_of_contestants",
+        return_value=None,
     )
     mocker.patch(
         "race_service.adapters.events_adapter.EventsAdapter.get_competition_format",
@@ -219,6 +212,8 @@ async def test_create_start_entry(
             f"races/{race.id}/start-entries/{start_entry_id}"
             in resp.headers[hdrs.LOCATION]
         )
+        # Race is in first round, so the raceplan's no_of_contestants is updated:
+        add_to_no_of_contestants.assert_called_once_with(ANY, race.raceplan_id, 1)
 
 
 @pytest.mark.integration
@@ -446,25 +441,13 @@ async def test_create_start_entry_race_is_full(
         return_value=start_entry_id,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_race_id",
-        return_value=[],
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entry_if_not_full",
+        return_value=None,
     )
     mocker.patch(
         "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
         return_value=full_race,
     )
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_by_id",
-        return_value=startlist,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
-        return_value=True,
-    )
 
     request_body = dumps(
         new_start_entry.to_dict(), indent=4, sort_keys=True, default=str
@@ -501,28 +484,18 @@ async def test_create_start_entry_race_bib_already_in_race(
         return_value=start_entry_id,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.create_start_entry",
-        return_value=start_entry_id,
-    )
-    mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_race_id",
-        return_value=[start_entry],
-    )
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entry_if_not_full",
         return_value=race,
     )
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_by_id",
-        return_value=startlist,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.create_start_entry",
+        side_effect=DuplicateStartEntryError(
+            f"Bib {start_entry.bib} is already in the race."
+        ),
     )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
-        return_value=True,
+    remove_start_entry = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.remove_start_entry",
+        return_value=None,
     )
 
     request_body = dumps(
@@ -540,6 +513,8 @@ async def test_create_start_entry_race_bib_already_in_race(
             "races/1/start-entries", headers=headers, data=request_body
         )
         assert resp.status == HTTPStatus.BAD_REQUEST
+        # The reserved slot in the race is released:
+        remove_start_entry.assert_called_once_with(ANY, race.id, start_entry_id)
 
 
 @pytest.mark.integration
@@ -555,35 +530,23 @@ async def test_create_start_entry_race_position_is_taken(
 ) -> None:
     """Should return 400 Bad request."""
     start_entry_id = start_entry.id
-    start_entry_different_bib_same_starting_position = deepcopy(start_entry)
-    start_entry_different_bib_same_starting_position.bib = 1000
     mocker.patch(
         "race_service.services.start_entries_service.create_id",
         return_value=start_entry_id,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.create_start_entry",
-        return_value=start_entry_id,
-    )
-    mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_race_id",
-        return_value=[start_entry_different_bib_same_starting_position],
-    )
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entry_if_not_full",
         return_value=race,
     )
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_by_id",
-        return_value=startlist,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.create_start_entry",
+        side_effect=DuplicateStartEntryError(
+            f"Starting_position {start_entry.starting_position} is taken."
+        ),
     )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
-        return_value=True,
+    remove_start_entry = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.remove_start_entry",
+        return_value=None,
     )
 
     request_body = dumps(
@@ -601,6 +564,7 @@ async def test_create_start_entry_race_position_is_taken(
             "races/1/start-entries", headers=headers, data=request_body
         )
         assert resp.status == HTTPStatus.BAD_REQUEST
+        remove_start_entry.assert_called_once_with(ANY, race.id, start_entry_id)
 
 
 @pytest.mark.integration
@@ -624,24 +588,12 @@ async def test_create_start_entry_with_input_id(
         return_value=start_entry_id,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_race_id",
-        return_value=[],
-    )
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entry_if_not_full",
         return_value=race,
     )
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_by_id",
-        return_value=startlist,
-    )
-    mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
-        return_value=True,
+        "race_service.adapters.startlists_adapter.StartlistsAdapter.add_start_entry",
+        return_value=None,
     )
 
     request_body = dumps(start_entry.to_dict(), indent=4, sort_keys=True, default=str)
@@ -681,24 +633,69 @@ async def test_create_start_entry_adapter_fails(
         return_value=None,
     )
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entries_by_race_id",
-        return_value=[],
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entry_if_not_full",
+        return_value=race,
+    )
+    remove_start_entry = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.remove_start_entry",
+        return_value=None,
     )
+
+    request_body = dumps(
+        new_start_entry.to_dict(), indent=4, sort_keys=True, default=str
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+        resp = await client.post(
+            f"races/{race.id}/start-entries", headers=headers, data=request_body
+        )
+        assert resp.status == HTTPStatus.BAD_REQUEST
+        remove_start_entry.assert_called_once_with(ANY, race.id, start_entry_id)
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_create_start_entry_startlist_not_found(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race: IndividualSprintRace,
+    start_entry: StartEntry,
+    new_start_entry: StartEntry,
+) -> None:
+    """Should return 400 HTTPBadRequest, and undo the reservation and insert."""
+    start_entry_id = start_entry.id
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
-        return_value=race,
+        "race_service.services.start_entries_service.create_id",
+        return_value=start_entry_id,
     )
     mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.create_start_entry",
+        return_value=start_entry_id,
     )
     mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.get_startlist_by_id",
-        return_value=startlist,
+        "race_service.adapters.races_adapter.RacesAdapter.add_start_entry_if_not_full",
+        return_value=race,
     )
     mocker.patch(
-        "race_service.adapters.startlists_adapter.StartlistsAdapter.update_startlist",
-        return_value=True,
+        "race_service.adapters.startlists_adapter.StartlistsAdapter.add_start_entry",
+        side_effect=StartlistNotFoundError(
+            f"Startlist with id {new_start_entry.startlist_id} not found."
+        ),
+    )
+    delete_start_entry = mocker.patch(
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.delete_start_entry",
+        return_value=None,
+    )
+    remove_start_entry = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.remove_start_entry",
+        return_value=None,
     )
 
     request_body = dumps(
@@ -716,6 +713,8 @@ async def test_create_start_entry_adapter_fails(
             f"races/{race.id}/start-entries", headers=headers, data=request_body
         )
         assert resp.status == HTTPStatus.BAD_REQUEST
+        delete_start_entry.assert_called_once_with(ANY, start_entry_id)
+        remove_start_entry.assert_called_once_with(ANY, race.id, start_entry_id)
 
 
 @pytest.mark.integration
@@ -1144,14 +1143,45 @@ async def test_update_start_entry_not_found(
     start_entry: StartEntry,
 ) -> None:
     """Should return 404 Not found."""
-    start_entry_id = "does-not-exist"
+    start_entry_id = start_entry.id
     mocker.patch(
-        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.update_start_entry",
         side_effect=StartEntryNotFoundError(f"StartEntry with id {id} not found"),
     )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+
+    request_body = dumps(start_entry.to_dict(), indent=4, sort_keys=True, default=str)
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+        resp = await client.put(
+            f"races/{race.id}/start-entries/{start_entry_id}",
+            headers=headers,
+            data=request_body,
+        )
+        assert resp.status == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_update_start_entry_race_not_found(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    race: IndividualSprintRace,
+    start_entry: StartEntry,
+) -> None:
+    """Should return 400 Bad request, as the race to localize in is not found."""
     mocker.patch(
+        "race_service.views.start_entries.race_timezone",
+        side_effect=RaceNotFoundError(f"Race with id {race.id} not found"),
+    )
+    update_start_entry = mocker.patch(
         "race_service.adapters.start_entries_adapter.StartEntriesAdapter.update_start_entry",
-        return_value=None,
     )
 
     headers = {
@@ -1164,11 +1194,12 @@ async def test_update_start_entry_not_found(
     with aioresponses(passthrough=["http://127.0.0.1"]) as m:
         m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
         resp = await client.put(
-            f"races/{race.id}/start-entries/{start_entry_id}",
+            f"races/{race.id}/start-entries/{start_entry.id}",
             headers=headers,
             data=request_body,
         )
-        assert resp.status == HTTPStatus.NOT_FOUND
+        assert resp.status == HTTPStatus.BAD_REQUEST
+    update_start_entry.assert_not_called()
 
 
 @pytest.mark.integration
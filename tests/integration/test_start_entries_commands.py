@@ -0,0 +1,402 @@
+"""Integration test cases for the start_entries commands route."""
+
+import os
+from datetime import datetime
+from http import HTTPStatus
+from json import dumps
+from typing import Any
+from unittest.mock import ANY
+
+import jwt
+import pytest
+from aiohttp import hdrs
+from aiohttp.test_utils import TestClient as _TestClient
+from aioresponses import aioresponses
+from pytest_mock import MockFixture
+
+from race_service.adapters import (
+    DuplicateStartEntryError,
+    RaceIsFullError,
+    StartEntryNotFoundError,
+)
+from race_service.models import IndividualSprintRace, StartEntry
+
+USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
+USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
+
+
+@pytest.fixture(autouse=True)
+def mock_event_timezone(mocker: MockFixture) -> None:
+    """Mock the event, in whose timezone the times without offset are."""
+    mocker.patch(
+        "race_service.adapters.events_adapter.EventsAdapter.get_event_by_id",
+        return_value={"id": "event_1", "timezone": "Europe/Oslo"},
+    )
+
+
+@pytest.fixture
+def token() -> str:
+    """Create a valid token."""
+    secret = os.getenv("JWT_SECRET")
+    algorithm = "HS256"
+    payload = {"identity": os.getenv("ADMIN_USERNAME"), "roles": ["admin"]}
+    return jwt.encode(payload, secret, algorithm)
+
+
+def _race(id_: str, heat: int, round_: str = "Q") -> IndividualSprintRace:
+    """Create a heat of a round."""
+    return IndividualSprintRace(
+        id=id_,
+        raceclass="G16",
+        order=heat,
+        start_time=datetime.fromisoformat(f"2021-08-31T12:0{heat}:00"),
+        no_of_contestants=1,
+        max_no_of_contestants=10,
+        event_id="event_1",
+        raceplan_id="raceplan_1",
+        start_entries=[f"start_entry_{heat}"],
+        results={},
+        round=round_,
+        index="",
+        heat=heat,
+        rule={},
+        datatype="individual_sprint",
+    )
+
+
+def _start_entry(id_: str, race_id: str, bib: int) -> StartEntry:
+    """Create a start_entry in a race."""
+    return StartEntry(
+        id=id_,
+        race_id=race_id,
+        startlist_id="startlist_1",
+        bib=bib,
+        name="name names",
+        club="the club",
+        scheduled_start_time=datetime.fromisoformat("2021-08-31T12:01:00"),
+        starting_position=1,
+    )
+
+
+@pytest.fixture
+async def races() -> dict[str, IndividualSprintRace]:
+    """Create two heats of the same round, and one of the next round."""
+    return {
+        "race_1": _race("race_1", 1),
+        "race_2": _race("race_2", 2),
+        "race_3": _race("race_3", 3, round_="S"),
+    }
+
+
+@pytest.fixture
+async def start_entries() -> dict[str, StartEntry]:
+    """Create a start_entry in each of the first two heats."""
+    return {
+        "start_entry_1": _start_entry("start_entry_1", "race_1", 1),
+        "start_entry_2": _start_entry("start_entry_2", "race_2", 2),
+    }
+
+
+@pytest.fixture
+def mock_adapters(
+    mocker: MockFixture,
+    races: dict[str, IndividualSprintRace],
+    start_entries: dict[str, StartEntry],
+) -> dict[str, Any]:
+    """Mock the gets, and the adapter doing the moves."""
+
+    async def get_start_entry_by_id(db: Any, id_: str) -> StartEntry:
+        if id_ not in start_entries:
+            msg = f"StartEntry with id {id_} not found"
+            raise StartEntryNotFoundError(msg)
+        return start_entries[id_]
+
+    async def get_race_by_id(db: Any, id_: str) -> IndividualSprintRace:
+        return races[id_]
+
+    mocker.patch(
+        "race_service.adapters.start_entries_adapter.StartEntriesAdapter.get_start_entry_by_id",
+        side_effect=get_start_entry_by_id,
+    )
+    mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
+        side_effect=get_race_by_id,
+    )
+    return {
+        "move": mocker.patch(
+            "race_service.adapters.start_entry_moves_adapter.StartEntryMovesAdapter.move_start_entry",
+            return_value=None,
+        ),
+        "swap": mocker.patch(
+            "race_service.adapters.start_entry_moves_adapter.StartEntryMovesAdapter.swap_start_entries",
+            return_value=None,
+        ),
+    }
+
+
+async def _post(client: _TestClient, token: str, path: str, body: dict | str) -> Any:
+    """Post the command as an authorized user."""
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=204)
+        return await client.post(
+            path,
+            headers=headers,
+            data=body if isinstance(body, str) else dumps(body),
+        )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_move_start_entry_to_other_heat(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+    races: dict[str, IndividualSprintRace],
+) -> None:
+    """Should return No Content, and move to the start time of the other heat."""
+    resp = await _post(
+        client,
+        token,
+        "races/race_1/start-entries/move",
+        {
+            "start_entry_id": "start_entry_1",
+            "to_race_id": "race_2",
+            "starting_position": 2,
+        },
+    )
+    assert resp.status == HTTPStatus.NO_CONTENT
+    mock_adapters["move"].assert_called_once_with(ANY, ANY, "race_1")
+    moved = mock_adapters["move"].call_args.args[1]
+    assert moved.race_id == "race_2"
+    assert moved.starting_position == 2  # noqa: PLR2004
+    assert moved.scheduled_start_time == races["race_2"].start_time
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_move_start_entry_in_race(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+) -> None:
+    """Should return No Content, and set the given scheduled start time."""
+    resp = await _post(
+        client,
+        token,
+        "races/race_1/start-entries/move",
+        {
+            "start_entry_id": "start_entry_1",
+            "starting_position": 3,
+            "scheduled_start_time": "2021-08-31T12:01:30",
+        },
+    )
+    assert resp.status == HTTPStatus.NO_CONTENT
+    moved = mock_adapters["move"].call_args.args[1]
+    assert moved.race_id == "race_1"
+    # The time without offset is localized in the timezone of the event:
+    assert moved.scheduled_start_time == datetime.fromisoformat(
+        "2021-08-31T10:01:30+00:00"
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_swap_start_entries_between_heats(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+    start_entries: dict[str, StartEntry],
+) -> None:
+    """Should return No Content."""
+    resp = await _post(
+        client,
+        token,
+        "races/race_1/start-entries/swap",
+        {"start_entry_id": "start_entry_1", "other_start_entry_id": "start_entry_2"},
+    )
+    assert resp.status == HTTPStatus.NO_CONTENT
+    mock_adapters["swap"].assert_called_once_with(
+        ANY, start_entries["start_entry_1"], start_entries["start_entry_2"]
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_swap_start_entries_in_race(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+    start_entries: dict[str, StartEntry],
+) -> None:
+    """Should return No Content."""
+    start_entries["start_entry_2"].race_id = "race_1"
+    resp = await _post(
+        client,
+        token,
+        "races/race_1/start-entries/swap",
+        {"start_entry_id": "start_entry_1", "other_start_entry_id": "start_entry_2"},
+    )
+    assert resp.status == HTTPStatus.NO_CONTENT
+    mock_adapters["swap"].assert_called_once()
+
+
+# Bad cases
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("body", "expected_status"),
+    [
+        ("not json", HTTPStatus.BAD_REQUEST),
+        ({"start_entry_id": "start_entry_1"}, HTTPStatus.UNPROCESSABLE_ENTITY),
+        (
+            {"start_entry_id": "start_entry_1", "starting_position": "first"},
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+        (
+            {"start_entry_id": "start_entry_1", "starting_position": 0},
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+        (
+            {"start_entry_id": "start_entry_2", "starting_position": 2},
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+        (
+            {
+                "start_entry_id": "start_entry_1",
+                "to_race_id": "race_3",
+                "starting_position": 2,
+            },
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+        (
+            {"start_entry_id": "start_entry_3", "starting_position": 2},
+            HTTPStatus.NOT_FOUND,
+        ),
+    ],
+)
+async def test_move_start_entry_bad_request(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+    body: dict | str,
+    expected_status: HTTPStatus,
+) -> None:
+    """Should return the expected status, and not move anything."""
+    resp = await _post(client, token, "races/race_1/start-entries/move", body)
+    assert resp.status == expected_status
+    mock_adapters["move"].assert_not_called()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        RaceIsFullError("Race race_2 is full."),
+        DuplicateStartEntryError("Starting_position 2 is taken in race race_2."),
+    ],
+)
+async def test_move_start_entry_not_possible(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+    error: Exception,
+) -> None:
+    """Should return 400 Bad request."""
+    mock_adapters["move"].side_effect = error
+    resp = await _post(
+        client,
+        token,
+        "races/race_1/start-entries/move",
+        {
+            "start_entry_id": "start_entry_1",
+            "to_race_id": "race_2",
+            "starting_position": 2,
+        },
+    )
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("body", "expected_status"),
+    [
+        ("not json", HTTPStatus.BAD_REQUEST),
+        ({"start_entry_id": "start_entry_1"}, HTTPStatus.UNPROCESSABLE_ENTITY),
+        (
+            {
+                "start_entry_id": "start_entry_1",
+                "other_start_entry_id": "start_entry_1",
+            },
+            HTTPStatus.UNPROCESSABLE_ENTITY,
+        ),
+        (
+            {
+                "start_entry_id": "start_entry_1",
+                "other_start_entry_id": "start_entry_3",
+            },
+            HTTPStatus.NOT_FOUND,
+        ),
+    ],
+)
+async def test_swap_start_entries_bad_request(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+    body: dict | str,
+    expected_status: HTTPStatus,
+) -> None:
+    """Should return the expected status, and not swap anything."""
+    resp = await _post(client, token, "races/race_1/start-entries/swap", body)
+    assert resp.status == expected_status
+    mock_adapters["swap"].assert_not_called()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_swap_start_entries_bib_twice_in_race(
+    client: _TestClient,
+    token: MockFixture,
+    mock_adapters: dict[str, Any],
+) -> None:
+    """Should return 400 Bad request."""
+    mock_adapters["swap"].side_effect = DuplicateStartEntryError(
+        "Cannot swap bibs 1 and 2: a bib would be twice in the same race."
+    )
+    resp = await _post(
+        client,
+        token,
+        "races/race_1/start-entries/swap",
+        {"start_entry_id": "start_entry_1", "other_start_entry_id": "start_entry_2"},
+    )
+    assert resp.status == HTTPStatus.BAD_REQUEST
+
+
+# Unauthorized cases:
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize("command", ["move", "swap"])
+async def test_start_entries_command_no_authorization(
+    client: _TestClient,
+    mock_adapters: dict[str, Any],
+    command: str,
+) -> None:
+    """Should return 401 Unauthorized."""
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize", status=401)
+        resp = await client.post(
+            f"races/race_1/start-entries/{command}",
+            headers={hdrs.CONTENT_TYPE: "application/json"},
+            data=dumps({}),
+        )
+        assert resp.status == HTTPStatus.UNAUTHORIZED
+    mock_adapters[command].assert_not_called()
@@ -502,9 +502,9 @@ async def test_delete_startlist_by_id(
         "race_service.adapters.races_adapter.RacesAdapter.get_race_by_id",
         side_effect=get_race_by_id,
     )
-    mocker.patch(
-        "race_service.adapters.races_adapter.RacesAdapter.update_race",
-        return_value=True,
+    remove_all_start_entries = mocker.patch(
+        "race_service.adapters.races_adapter.RacesAdapter.remove_all_start_entries",
+        return_value=None,
     )
 
     headers = {hdrs.AUTHORIZATION: f"Bearer {token}"}
@@ -514,6 +514,8 @@ async def test_delete_startlist_by_id(
 
         resp = await client.delete(f"/startlists/{startlist_id}", headers=headers)
         assert resp.status == HTTPStatus.NO_CONTENT
+    remove_all_start_entries.assert_awaited_once()
+    assert remove_all_start_entries.call_args.args[1] == [race.id for race in races]
 
 
 # Bad cases
@@ -0,0 +1,32 @@
+"""Integration test cases for reading query results in batches."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from race_service.adapters.streaming import find_in_batches
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_find_in_batches() -> None:
+    """Should yield the batches until the cursor is exhausted."""
+    cursor = MagicMock()
+    cursor.sort.return_value = cursor
+    cursor.batch_size.return_value = cursor
+    cursor.to_list = AsyncMock(
+        side_effect=[[{"id": "1"}, {"id": "2"}], [{"id": "3"}], []]
+    )
+    collection = MagicMock()
+    collection.find.return_value = cursor
+
+    batches = [
+        batch
+        async for batch in find_in_batches(
+            collection, {"event_id": "x"}, [("id", 1)], batch_size=2
+        )
+    ]
+
+    assert batches == [[{"id": "1"}, {"id": "2"}], [{"id": "3"}]]
+    cursor.batch_size.assert_called_once_with(2)
+    cursor.to_list.assert_awaited_with(2)
@@ -1,11 +1,13 @@
 """Integration test cases for the time_events route."""
 
 import os
+from collections.abc import AsyncIterator
 from copy import deepcopy
-from datetime import datetime
+from datetime import UTC, datetime
 from http import HTTPStatus
-from json import dumps
+from json import dumps, loads
 from typing import Any
+from unittest.mock import ANY
 
 import jwt
 import pytest
@@ -15,6 +17,7 @@ from aioresponses import aioresponses
 from pytest_mock import MockFixture
 
 from race_service.adapters import RaceNotFoundError, TimeEventNotFoundError
+from race_service.adapters.documents import to_document
 from race_service.models import (
     Changelog,
     IndividualSprintRace,
@@ -22,11 +25,21 @@ from race_service.models import (
     StartEntry,
     TimeEvent,
 )
+from race_service.models.codec import decode_time_event
 
 USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
 USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
 
 
+@pytest.fixture(autouse=True)
+def mock_event_timezone(mocker: MockFixture) -> None:
+    """Mock the event, in whose timezone the times without offset are."""
+    mocker.patch(
+        "race_service.adapters.events_adapter.EventsAdapter.get_event_by_id",
+        return_value={"id": "event_1", "timezone": "Europe/Oslo"},
+    )
+
+
 @pytest.fixture
 def token() -> str:
     """Create a valid token."""
@@ -517,6 +530,63 @@ async def test_get_time_events_by_event_id_and_bib(
         assert body[0]["bib"] == time_events[0].bib
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_time_events_by_event_id_and_registration_time(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    time_events: list[TimeEvent],
+) -> None:
+    """Should return OK, and query with the times converted to UTC."""
+    event_id = time_events[0].event_id
+    get_time_events = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_event_id_and_registration_time",
+        return_value=time_events[:1],
+    )
+
+    resp = await client.get(
+        f"/time-events?eventId={event_id}&from=2021-08-31T12:00:00%2B02:00"
+    )
+    assert resp.status == HTTPStatus.OK
+    body = await resp.json()
+    assert len(body) == 1
+    get_time_events.assert_called_once_with(
+        ANY,
+        event_id,
+        datetime.fromisoformat("2021-08-31T12:00:00+02:00"),
+        None,
+        page=ANY,
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_time_events_by_event_id_and_wall_clock_time(
+    client: _TestClient,
+    mocker: MockFixture,
+    time_events: list[TimeEvent],
+) -> None:
+    """Should return OK, and query with times without offset in the event's timezone."""
+    event_id = time_events[0].event_id
+    get_time_events = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_event_id_and_registration_time",
+        return_value=time_events[:1],
+    )
+
+    resp = await client.get(
+        f"/time-events?eventId={event_id}&from=2021-08-31T12:00:00&to=2021-08-31T13:00:00"
+    )
+    assert resp.status == HTTPStatus.OK
+    get_time_events.assert_called_once_with(
+        ANY,
+        event_id,
+        datetime.fromisoformat("2021-08-31T10:00:00+00:00"),
+        datetime.fromisoformat("2021-08-31T11:00:00+00:00"),
+        page=ANY,
+    )
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_get_time_events_by_event_id_and_timing_point(
@@ -611,6 +681,76 @@ async def test_update_time_event_by_id(
         assert resp.status == HTTPStatus.NO_CONTENT
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("registration_time", "hour"),
+    [
+        ("2023-02-11T12:01:02.123456+02:00", 10),
+        # Without offset, in the timezone of the event:
+        ("2023-02-11T12:01:02.123456", 11),
+    ],
+)
+async def test_update_time_event_by_id_round_trips_datetimes_in_utc(
+    client: _TestClient,
+    mocker: MockFixture,
+    token: MockFixture,
+    time_event: TimeEvent,
+    registration_time: str,
+    hour: int,
+) -> None:
+    """Should store the datetimes in UTC, and return them in UTC."""
+    time_event_id = time_event.id
+    mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
+        return_value=time_event,
+    )
+    mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_event_id",
+        return_value=[],
+    )
+    update_time_event = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.update_time_event",
+        return_value=time_event_id,
+    )
+
+    headers = {
+        hdrs.CONTENT_TYPE: "application/json",
+        hdrs.AUTHORIZATION: f"Bearer {token}",
+    }
+
+    request_body = time_event.to_dict()
+    request_body["registration_time"] = registration_time
+
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.post(
+            f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}/authorize",
+            status=204,
+            repeat=True,
+        )
+
+        resp = await client.put(
+            f"/time-events/{time_event_id}",
+            headers=headers,
+            data=dumps(request_body, default=str),
+        )
+        assert resp.status == HTTPStatus.NO_CONTENT
+
+        document = to_document(update_time_event.call_args.args[2])
+        assert document["registration_time"] == datetime(
+            2023, 2, 11, hour, 1, 2, 123000, tzinfo=UTC
+        )
+        mocker.patch(
+            "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
+            return_value=decode_time_event(document),
+        )
+
+        resp = await client.get(f"/time-events/{time_event_id}")
+        assert resp.status == HTTPStatus.OK
+        body = await resp.json()
+        assert body["registration_time"] == f"2023-02-11T{hour}:01:02.123000+00:00"
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_get_all_time_events(
@@ -683,6 +823,46 @@ async def test_delete_time_event_by_id(
         assert resp.status == HTTPStatus.NO_CONTENT
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize("accept", ["application/json", "application/x-ndjson"])
+async def test_export_time_events_by_event_id(
+    client: _TestClient,
+    mocker: MockFixture,
+    time_events: list[TimeEvent],
+    accept: str,
+) -> None:
+    """Should return OK, and a body with the time_events of all batches."""
+    event_id = time_events[0].event_id
+
+    async def stream_time_events_by_event_id(
+        db: Any, event_id: str
+    ) -> AsyncIterator[list[TimeEvent]]:
+        yield time_events
+        yield []
+        yield time_events
+
+    mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.stream_time_events_by_event_id",
+        side_effect=stream_time_events_by_event_id,
+    )
+
+    resp = await client.get(
+        f"/time-events/export?eventId={event_id}", headers={hdrs.ACCEPT: accept}
+    )
+    assert resp.status == HTTPStatus.OK
+    assert resp.content_type == accept
+    text = await resp.text()
+    if accept == "application/json":
+        body = loads(text)
+    else:
+        assert text.endswith("\n")
+        body = [loads(line) for line in text.splitlines()]
+    assert [time_event["id"] for time_event in body] == 2 * [
+        time_event.id for time_event in time_events
+    ]
+
+
 # Bad cases
 
 
@@ -1114,6 +1294,36 @@ async def test_create_time_event_bib_timing_point_exist(
         assert resp.status == HTTPStatus.BAD_REQUEST
 
 
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_get_time_events_by_event_id_and_invalid_registration_time(
+    client: _TestClient, mocker: MockFixture
+) -> None:
+    """Should return 400 Bad request."""
+    get_time_events = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_event_id_and_registration_time",
+        return_value=[],
+    )
+
+    resp = await client.get("/time-events?eventId=event_1&to=yesterday")
+    assert resp.status == HTTPStatus.BAD_REQUEST
+    get_time_events.assert_not_called()
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_export_time_events_without_event_id(
+    client: _TestClient, mocker: MockFixture
+) -> None:
+    """Should return 400 Bad request."""
+    stream = mocker.patch(
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.stream_time_events_by_event_id",
+    )
+    resp = await client.get("/time-events/export")
+    assert resp.status == HTTPStatus.BAD_REQUEST
+    stream.assert_not_called()
+
+
 @pytest.mark.integration
 @pytest.mark.asyncio
 async def test_update_time_event_by_id_missing_mandatory_property(
@@ -1411,17 +1621,13 @@ async def test_update_time_event_not_found(
     client: _TestClient, mocker: MockFixture, token: MockFixture, time_event: TimeEvent
 ) -> None:
     """Should return 404 Not found."""
-    time_event_id = "does-not-exist"
+    time_event_id = time_event.id
     mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_event_by_id",
+        "race_service.adapters.time_events_adapter.TimeEventsAdapter.update_time_event",
         side_effect=TimeEventNotFoundError(
             f"TimeEvent with id {id} not found in database."
         ),
     )
-    mocker.patch(
-        "race_service.adapters.time_events_adapter.TimeEventsAdapter.update_time_event",
-        return_value=None,
-    )
     mocker.patch(
         "race_service.adapters.time_events_adapter.TimeEventsAdapter.get_time_events_by_event_id",
         return_value=[],
@@ -0,0 +1,203 @@
+"""Integration test cases for the tracing of requests."""
+
+import json
+import os
+from collections.abc import AsyncIterator
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp import hdrs, web
+from aiohttp.test_utils import make_mocked_request
+from aioresponses import aioresponses
+from dotenv import load_dotenv
+from pytest_mock import MockFixture
+
+from race_service import create_app
+from race_service.middlewares import tracing_middleware
+from race_service.utils.tracing import (
+    JsonLinesExporter,
+    _main,
+    breakdown,
+    start_trace,
+    trace_class,
+    trace_headers,
+)
+
+load_dotenv()
+
+EVENTS_HOST_SERVER = os.getenv("EVENTS_HOST_SERVER")
+EVENTS_HOST_PORT = os.getenv("EVENTS_HOST_PORT")
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_SPAN_ID = "00f067aa0ba902b7"
+
+
+@trace_class("service")
+class DummyService:
+    """Service with classmethods of every kind."""
+
+    @classmethod
+    async def get(cls: Any) -> str:
+        """Return a value."""
+        return trace_headers()["traceparent"]
+
+    @classmethod
+    async def stream(cls: Any, *, fail: bool = False) -> AsyncIterator[int]:
+        """Yield a value, and fail if asked to."""
+        yield 1
+        if fail:
+            raise ValueError
+
+    @classmethod
+    def name(cls: Any) -> str:
+        """Return the name, untraced."""
+        return cls.__name__
+
+
+def _traces(path: Path) -> list[list[dict]]:
+    """Return the spans of each trace in the file."""
+    return [
+        [
+            span
+            for resource_spans in json.loads(line)["resourceSpans"]
+            for scope_spans in resource_spans["scopeSpans"]
+            for span in scope_spans["spans"]
+        ]
+        for line in path.read_text().splitlines()
+    ]
+
+
+def _attributes(span: dict) -> dict:
+    """Return the attributes of the span as a dict."""
+    return {
+        a["key"]: next(iter(a["value"].values())) for a in span.get("attributes", [])
+    }
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_trace_request(
+    aiohttp_client: Any, aiohttp_server: Any, mocker: MockFixture, tmp_path: Path
+) -> None:
+    """Should continue the trace, with spans per layer, to upstream services."""
+    traceparents = []
+
+    async def authorize(request: web.Request) -> web.Response:
+        traceparents.append(request.headers.get("traceparent"))
+        return web.Response(status=204)
+
+    users = web.Application()
+    users.router.add_post("/authorize", authorize)
+    users_server = await aiohttp_server(users)
+    mocker.patch(
+        "race_service.adapters.users_adapter.USERS_HOST_SERVER", users_server.host
+    )
+    mocker.patch(
+        "race_service.adapters.users_adapter.USERS_HOST_PORT", users_server.port
+    )
+    path = tmp_path / "traces.jsonl"
+    mocker.patch("race_service.app.TRACE_FILE", str(path))
+    client = await aiohttp_client(await create_app())
+
+    await client.get("/ping")
+    with aioresponses(passthrough=["http://127.0.0.1"]) as m:
+        m.get(
+            f"http://{EVENTS_HOST_SERVER}:{EVENTS_HOST_PORT}/events/event_1", status=404
+        )
+        resp = await client.post(
+            "/raceplans/generate-raceplan-for-event",
+            headers={
+                hdrs.AUTHORIZATION: "Bearer token",
+                "traceparent": f"00-{TRACE_ID}-{PARENT_SPAN_ID}-01",
+            },
+            json={"event_id": "event_1"},
+        )
+        assert resp.status == HTTPStatus.NOT_FOUND
+    await client.close()
+
+    (spans,) = _traces(path)
+    view, authorize_span, command, get_event = spans
+    assert {span["traceId"] for span in spans} == {TRACE_ID}
+    assert view["name"] == "POST /raceplans/generate-raceplan-for-event"
+    assert view["parentSpanId"] == PARENT_SPAN_ID
+    assert _attributes(view)["http.status_code"] == "404"
+    assert authorize_span["name"] == "UsersAdapter.authorize"
+    assert _attributes(authorize_span)["layer"] == "adapter"
+    assert traceparents == [f"00-{TRACE_ID}-{authorize_span['spanId']}-01"]
+    assert command["name"] == "RaceplansCommands.generate_raceplan_for_event"
+    assert command["parentSpanId"] == view["spanId"]
+    assert get_event["name"] == "EventsAdapter.get_event_by_id"
+    assert get_event["parentSpanId"] == command["spanId"]
+    assert get_event["status"] == {"code": 2}
+    assert _attributes(get_event)["exception.type"] == "EventNotFoundError"
+
+    breakdown_ = breakdown(spans)
+    assert breakdown_["trace_id"] == TRACE_ID
+    assert breakdown_["ms"] >= breakdown_["adapter ms"]
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("exception", "status"), [(web.HTTPForbidden(), "403"), (KeyError(), "500")]
+)
+async def test_tracing_middleware_with_exception(
+    tmp_path: Path, exception: Exception, status: str
+) -> None:
+    """Should trace the status of the exception, and raise it."""
+    path = tmp_path / "traces.jsonl"
+    request = make_mocked_request("DELETE", "/unknown")
+    request.match_info.route.resource = None  # type: ignore[misc]
+    exporter = JsonLinesExporter(str(path))
+
+    with pytest.raises(type(exception)):
+        await tracing_middleware(exporter)(request, MagicMock(side_effect=exception))
+    exporter.close()
+    ((view,),) = _traces(path)
+    assert view["name"] == "DELETE unmatched"
+    assert _attributes(view)["http.status_code"] == status
+    assert view["status"] == {"code": 2 if status == "500" else 1}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_trace_class(tmp_path: Path) -> None:
+    """Should trace async classmethods in traces only."""
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonLinesExporter(str(path))
+    assert trace_headers() == {}
+    assert [item async for item in DummyService.stream()] == [1]
+    assert DummyService.name() == "DummyService"
+
+    with start_trace(exporter, "GET /dummy", "invalid") as view:
+        traceparent = await DummyService.get()
+        assert [item async for item in DummyService.stream()] == [1]
+        with pytest.raises(ValueError):  # noqa: PT011
+            [item async for item in DummyService.stream(fail=True)]
+    exporter.close()
+
+    ((_, get, stream, failed_stream),) = _traces(path)
+    assert view.parent_span_id == ""
+    assert traceparent == f"00-{view.trace_id}-{get['spanId']}-01"
+    assert stream["name"] == "DummyService.stream"
+    assert stream["parentSpanId"] == view.span_id
+    assert stream["status"] == {"code": 1}
+    assert failed_stream["status"] == {"code": 2}
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_main(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Should print the breakdown of the slowest traces."""
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonLinesExporter(str(path))
+    for name in ("GET /a", "GET /b"):
+        with start_trace(exporter, name):
+            await DummyService.get()
+    exporter.close()
+
+    _main(str(path), slowest=1)
+    (line,) = capsys.readouterr().out.splitlines()
+    assert "'service ms'" in line
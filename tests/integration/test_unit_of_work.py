@@ -0,0 +1,139 @@
+"""Integration test cases for the unit of work and its identity map."""
+
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+import pytest
+from aiohttp.web import Response
+
+from race_service.adapters import (
+    UnitOfWork,
+    get_unit_of_work,
+    reset_unit_of_work,
+    set_unit_of_work,
+)
+from race_service.adapters.unit_of_work import (
+    get_from_identity_map,
+    load_from_document,
+    put_in_identity_map,
+    remove_from_identity_map,
+)
+from race_service.adapters.versioning import next_version_document, version_filter
+from race_service.middlewares import unit_of_work_middleware
+from race_service.models import Changelog, RaceResult, TimeEvent
+
+
+@pytest.fixture
+async def time_event() -> TimeEvent:
+    """Create a time-event object."""
+    return TimeEvent(
+        id="time_event_1",
+        bib=1,
+        event_id="event_1",
+        timing_point="Finish",
+        registration_time=datetime.fromisoformat("2023-02-11T12:01:02+00:00"),
+    )
+
+
+@pytest.fixture
+async def race_result() -> RaceResult:
+    """Create a race-result object."""
+    return RaceResult(
+        id="race_result_1",
+        race_id="race_1",
+        timing_point="Finish",
+        no_of_contestants=0,
+        ranking_sequence=[],
+        status=1,
+        version=2,
+    )
+
+
+@pytest.fixture
+async def unit_of_work() -> UnitOfWork:
+    """Set a unit of work for the test, as the middleware does for a request."""
+    unit_of_work = UnitOfWork()
+    token = set_unit_of_work(unit_of_work)
+    yield unit_of_work
+    reset_unit_of_work(token)
+
+
+@pytest.mark.integration
+async def test_identity_map_without_unit_of_work(time_event: TimeEvent) -> None:
+    """Should fall back to no caching."""
+    assert get_unit_of_work() is None
+    put_in_identity_map("time_events_collection", "time_event_1", time_event)
+    assert get_from_identity_map("time_events_collection", "time_event_1") is None
+    remove_from_identity_map("time_events_collection", "time_event_1")
+
+    loaded = load_from_document(
+        "time_events_collection", time_event.to_dict(), TimeEvent.from_dict
+    )
+    assert loaded == time_event
+    assert loaded is not time_event
+
+
+@pytest.mark.integration
+async def test_identity_map_returns_copies(
+    unit_of_work: UnitOfWork, time_event: TimeEvent
+) -> None:
+    """Should return a copy of the mapped object instead of the document."""
+    assert get_unit_of_work() is unit_of_work
+    put_in_identity_map("time_events_collection", "time_event_1", time_event)
+    mapped = get_from_identity_map("time_events_collection", "time_event_1")
+    assert mapped == time_event
+    assert mapped is not time_event
+
+    from_dict = MagicMock()
+    loaded = load_from_document(
+        "time_events_collection", time_event.to_dict(), from_dict
+    )
+    assert loaded == time_event
+    from_dict.assert_not_called()
+
+    # Changing an object read does not change the mapped object:
+    loaded.changelog = [Changelog(datetime.now(UTC), "race_service", "Changed")]
+    time_event.rank = 1
+    assert get_from_identity_map("time_events_collection", "time_event_1") == mapped
+
+    remove_from_identity_map("time_events_collection", "time_event_1")
+    assert get_from_identity_map("time_events_collection", "time_event_1") is None
+    loaded = load_from_document(
+        "time_events_collection", time_event.to_dict(), TimeEvent.from_dict
+    )
+    assert loaded == time_event
+    loaded.rank = 2
+    assert get_from_identity_map("time_events_collection", "time_event_1") == (
+        time_event
+    )
+
+
+@pytest.mark.integration
+async def test_middleware_sets_unit_of_work_while_handling() -> None:
+    """Should give the handler a unit of work, and reset it when handled."""
+    request = MagicMock()
+    unit_of_works = []
+
+    async def handler(request: MagicMock) -> Response:
+        unit_of_works.append(get_unit_of_work())
+        return Response(status=204)
+
+    response = await unit_of_work_middleware(request, handler)
+    assert response.status == 204  # noqa: PLR2004
+    assert isinstance(unit_of_works[0], UnitOfWork)
+    assert get_unit_of_work() is None
+
+
+@pytest.mark.integration
+async def test_version_filter_matches_unversioned_documents() -> None:
+    """Should match documents without version as version 0."""
+    assert version_filter("id_1", 0) == {"id": "id_1", "version": {"$in": [0, None]}}
+    assert version_filter("id_1", 1) == {"id": "id_1", "version": 1}
+
+
+@pytest.mark.integration
+async def test_next_version_document(race_result: RaceResult) -> None:
+    """Should return the document with the version incremented."""
+    document = next_version_document(race_result)
+    assert document["version"] == 3  # noqa: PLR2004
+    assert race_result.version == 2  # noqa: PLR2004
@@ -0,0 +1,93 @@
+"""Module for counting the adapter calls and database commands of requests.
+
+The integration tests mock the adapter methods, so the calls of the mocks
+are counted as well as the calls of the instrumented adapters:
+
+    with query_counter(max_queries=4) as queries:
+        resp = await client.get(f"/races/{race_id}")
+    assert queries.adapter_calls == 4
+"""
+
+from types import TracebackType
+from typing import Self
+from unittest.mock import NonCallableMock
+
+import race_service.adapters
+from race_service.adapters.command_monitoring import COMMAND_SECONDS
+from race_service.adapters.instrumentation import ADAPTER_CALL_SECONDS
+from race_service.utils.metrics_utils import Histogram
+
+ADAPTERS = [
+    getattr(race_service.adapters, name)
+    for name in race_service.adapters.__all__
+    if name.endswith("Adapter")
+]
+
+
+def _observations(histogram: Histogram) -> int:
+    """Return the number of observations of the histogram, for all labels."""
+    return sum(
+        int(value)
+        for name, _, value in histogram.samples()
+        if name == f"{histogram.name}_count"
+    )
+
+
+def _adapter_mocks() -> list[NonCallableMock]:
+    """Return the mocks patched in place of adapter methods."""
+    return [
+        value
+        for adapter in ADAPTERS
+        for value in vars(adapter).values()
+        if isinstance(value, NonCallableMock)
+    ]
+
+
+class QueryCounter:
+    """Class counting the adapter calls and database commands in a block.
+
+    If max_queries or max_commands is given, exceeding it fails the test
+    when the block is left.
+    """
+
+    def __init__(
+        self, max_queries: int | None = None, max_commands: int | None = None
+    ) -> None:
+        """Initialize the counter with the maximums to assert, if any."""
+        self.max_queries = max_queries
+        self.max_commands = max_commands
+        self.adapter_calls = 0
+        self.commands = 0
+        self._mock_calls: dict[int, int] = {}
+        self._adapter_calls = 0
+        self._commands = 0
+
+    def __enter__(self) -> Self:
+        """Start counting."""
+        self._mock_calls = {id(mock): mock.call_count for mock in _adapter_mocks()}
+        self._adapter_calls = _observations(ADAPTER_CALL_SECONDS)
+        self._commands = _observations(COMMAND_SECONDS)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop counting, and assert the maximums if no exception was raised."""
+        self.adapter_calls = sum(
+            mock.call_count - self._mock_calls.get(id(mock), 0)
+            for mock in _adapter_mocks()
+        ) + (_observations(ADAPTER_CALL_SECONDS) - self._adapter_calls)
+        self.commands = _observations(COMMAND_SECONDS) - self._commands
+        if exc_type is not None:
+            return
+        if self.max_queries is not None:
+            assert self.adapter_calls <= self.max_queries, (
+                f"{self.adapter_calls} adapter calls, more than {self.max_queries}."
+            )
+        if self.max_commands is not None:
+            assert self.commands <= self.max_commands, (
+                f"{self.commands} database commands, more than {self.max_commands}."
+            )
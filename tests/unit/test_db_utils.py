@@ -0,0 +1,307 @@
+"""Unit test cases for the db_utils module."""
+
+import asyncio
+import re
+from datetime import timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from pytest_mock import MockFixture
+
+from race_service.utils.db_utils import (
+    INDEX_CREATION_FAILURES,
+    INDEXES,
+    INDEXES_MAX_ATTEMPTS,
+    OFFSET_PATTERN,
+    IndexSpec,
+    create_indexes,
+    datetime_migration,
+    diff_indexes,
+    ensure_indexes,
+    find_collection_scans,
+    find_duplicates,
+    indexes_version,
+    migrate_datetimes,
+)
+
+
+@pytest.fixture
+def db() -> MagicMock:
+    """Mock a db where every collection is the same mock."""
+    collection = MagicMock()
+    collection.find_one = AsyncMock(return_value=None)
+    collection.update_one = AsyncMock()
+    collection.create_index = AsyncMock()
+    db = MagicMock()
+    db.__getitem__.return_value = collection
+    return db
+
+
+@pytest.mark.unit
+async def test_diff_indexes_finds_missing_and_obsolete() -> None:
+    """Should return missing specified indexes, and obsolete existing indexes."""
+    specified = [
+        IndexSpec((("id", 1),), unique=True),
+        IndexSpec((("event_id", 1), ("bib", 1), ("id", 1))),
+        IndexSpec((("race_id", 1),)),
+    ]
+    existing = [
+        {"name": "_id_", "key": {"_id": 1}},
+        {"name": "id_1", "key": {"id": 1}, "unique": True},
+        {
+            "name": "event_id_1_bib_1_id_1",
+            "key": {"event_id": 1, "bib": 1, "id": 1},
+            "unique": True,
+        },
+        {"name": "event_id_1_id_1", "key": {"event_id": 1, "id": 1}, "unique": True},
+    ]
+
+    missing, obsolete = diff_indexes(specified, existing)
+
+    assert missing == specified[1:]
+    assert obsolete == ["event_id_1_bib_1_id_1", "event_id_1_id_1"]
+
+
+@pytest.mark.unit
+async def test_diff_indexes_in_sync() -> None:
+    """Should find nothing when the indexes are as specified."""
+    for specified in INDEXES.values():
+        existing = [
+            {"name": index.name, "key": dict(index.keys), "unique": index.unique}
+            for index in specified
+        ]
+        assert diff_indexes(specified, existing) == ([], [])
+
+
+@pytest.mark.unit
+async def test_find_collection_scans() -> None:
+    """Should find collection scans in the winning plan only."""
+    plan = {
+        "namespace": "races.races_collection",
+        "winningPlan": {
+            "stage": "SORT",
+            "inputStage": {"stage": "COLLSCAN", "namespace": "races.races_collection"},
+        },
+        "rejectedPlans": [{"stage": "COLLSCAN"}],
+    }
+    assert find_collection_scans(plan) == ["races.races_collection"]
+
+    plan["winningPlan"]["inputStage"] = {"stage": "IXSCAN", "indexName": "id_1"}
+    assert find_collection_scans(plan) == []
+
+
+@pytest.mark.unit
+async def test_ensure_indexes_takes_lock_and_creates_indexes(db: MagicMock) -> None:
+    """Should create the indexes, and record the version in the lock document."""
+    await ensure_indexes(db, owner="worker_1")
+
+    collection = db["locks_collection"]
+    assert collection.create_index.await_count == sum(map(len, INDEXES.values()))
+    released = collection.update_one.call_args_list[-1].args
+    assert released[0] == {"_id": "indexes", "owner": "worker_1"}
+    assert released[1]["$set"]["version"] == indexes_version()
+
+
+@pytest.mark.unit
+async def test_ensure_indexes_already_created(db: MagicMock) -> None:
+    """Should not take the lock if this version of the indexes is created."""
+    collection = db["locks_collection"]
+    collection.find_one.return_value = {"_id": "indexes", "version": indexes_version()}
+
+    await ensure_indexes(db, owner="worker_1")
+
+    collection.update_one.assert_not_awaited()
+    collection.create_index.assert_not_awaited()
+
+
+@pytest.mark.unit
+async def test_ensure_indexes_waits_for_other_worker(
+    db: MagicMock, mocker: MockFixture
+) -> None:
+    """Should wait while another worker holds the lock, and not create indexes."""
+    sleep = mocker.patch("race_service.utils.db_utils.asyncio.sleep")
+    collection = db["locks_collection"]
+    collection.find_one.side_effect = [
+        {"_id": "indexes", "owner": "worker_2"},
+        {"_id": "indexes", "owner": "worker_2", "version": indexes_version()},
+    ]
+    collection.update_one.side_effect = DuplicateKeyError("E11000")
+
+    await ensure_indexes(db, owner="worker_1")
+
+    sleep.assert_awaited_once()
+    collection.create_index.assert_not_awaited()
+
+
+def _failing_create_index(failing_keys: list) -> Any:
+    """Return a create_index failing for the given keys."""
+
+    async def create_index(keys: list, unique: bool) -> None:  # noqa: FBT001
+        if keys == failing_keys:
+            msg = "E11000 duplicate key"
+            raise DuplicateKeyError(msg)
+
+    return create_index
+
+
+@pytest.mark.unit
+async def test_create_indexes_fails_on_unique_index(db: MagicMock) -> None:
+    """Should create the other indexes, and raise if a unique index failed."""
+    collection = db["raceplans_collection"]
+    collection.create_index.side_effect = _failing_create_index([("event_id", 1)])
+
+    with pytest.raises(OperationFailure, match="event_id_1 on raceplans_collection"):
+        await create_indexes(db)
+    assert collection.create_index.await_count == sum(map(len, INDEXES.values()))
+
+
+@pytest.mark.unit
+async def test_create_indexes_skips_failed_index(db: MagicMock) -> None:
+    """Should not raise if an index that is not unique could not be created."""
+    collection = db["races_collection"]
+    collection.create_index.side_effect = _failing_create_index([("startlist_id", 1)])
+
+    await create_indexes(db)
+
+    assert collection.create_index.await_count == sum(map(len, INDEXES.values()))
+
+
+@pytest.mark.unit
+async def test_ensure_indexes_retries_failed_unique_index(
+    db: MagicMock, mocker: MockFixture
+) -> None:
+    """Should not record the version until the unique indexes are created."""
+    sleep = mocker.patch("race_service.utils.db_utils.asyncio.sleep")
+    mocker.patch(
+        "race_service.utils.db_utils.create_indexes",
+        side_effect=[OperationFailure("Could not create unique indexes."), None],
+    )
+    collection = db["locks_collection"]
+
+    await ensure_indexes(db, owner="worker_1")
+
+    sleep.assert_awaited_once()
+    versions = [
+        call.args[1]["$set"].get("version")
+        for call in collection.update_one.call_args_list
+    ]
+    assert versions == [None, None, indexes_version()]
+
+
+@pytest.mark.unit
+async def test_ensure_indexes_gives_up_after_max_attempts(
+    db: MagicMock, mocker: MockFixture
+) -> None:
+    """Should count the failed attempts, release the lock and raise."""
+    sleep = mocker.patch("race_service.utils.db_utils.asyncio.sleep")
+    mocker.patch(
+        "race_service.utils.db_utils.create_indexes",
+        side_effect=OperationFailure("Could not create unique indexes."),
+    )
+    failures = INDEX_CREATION_FAILURES.value()
+    collection = db["locks_collection"]
+
+    with pytest.raises(OperationFailure):
+        await ensure_indexes(db, owner="worker_1")
+
+    assert sleep.await_count == INDEXES_MAX_ATTEMPTS - 1
+    assert INDEX_CREATION_FAILURES.value() == failures + INDEXES_MAX_ATTEMPTS
+    released = collection.update_one.call_args_list[-1].args
+    assert released[0] == {"_id": "indexes", "owner": "worker_1"}
+    assert set(released[1]["$set"]) == {"expires_at"}
+
+
+@pytest.mark.unit
+async def test_ensure_indexes_renews_lease_while_creating(
+    db: MagicMock, mocker: MockFixture
+) -> None:
+    """Should renew the lease of the lock until the indexes are created."""
+    mocker.patch(
+        "race_service.utils.db_utils.INDEXES_LOCK_LEASE", timedelta(milliseconds=30)
+    )
+
+    async def create_indexes(db: Any) -> None:
+        await asyncio.sleep(0.1)
+
+    mocker.patch(
+        "race_service.utils.db_utils.create_indexes", side_effect=create_indexes
+    )
+    collection = db["locks_collection"]
+
+    await ensure_indexes(db, owner="worker_1")
+
+    updates = [call.args for call in collection.update_one.call_args_list]
+    renewals = [update for update in updates[1:-1] if "owner" in update[0]]
+    assert renewals
+    assert all(set(update[1]["$set"]) == {"expires_at"} for update in renewals)
+    assert updates[-1][1]["$set"]["version"] == indexes_version()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("apply", [False, True])
+async def test_find_duplicates(db: MagicMock, apply: bool) -> None:  # noqa: FBT001
+    """Should report the duplicates of each unique index, and delete if applied."""
+    collection = db["races_collection"]
+    collection.aggregate.return_value.to_list = AsyncMock(
+        return_value=[{"_id": {"id": "race_1"}, "ids": ["a", "b", "c"]}]
+    )
+    collection.delete_many = AsyncMock()
+
+    findings = await find_duplicates(db, apply)
+
+    unique = [
+        index for indexes in INDEXES.values() for index in indexes if index.unique
+    ]
+    assert len(findings) == len(unique)
+    assert findings[0] == (
+        "races_collection: 2 duplicates of a on id_1 {'id': 'race_1'}: ['b', 'c']"
+    )
+    if apply:
+        collection.delete_many.assert_awaited_with({"_id": {"$in": ["b", "c"]}})
+    else:
+        collection.delete_many.assert_not_awaited()
+
+
+@pytest.mark.unit
+def test_datetime_migration_converts_changelog_timestamps() -> None:
+    """Should convert the datetime fields, and the timestamp of each changelog."""
+    pipeline = datetime_migration("time_events_collection", "Europe/Oslo")
+    fields = pipeline[0]["$set"]
+    assert set(fields) == {"registration_time", "changelog"}
+    assert "$dateFromString" in str(fields["registration_time"])
+    assert "$$entry.timestamp" in str(fields["changelog"])
+    migration = datetime_migration("start_entries_collection", "Europe/Oslo")
+    assert set(migration[0]["$set"]) == {
+        "scheduled_start_time",
+        "changelog",
+    }
+
+
+@pytest.mark.unit
+def test_datetime_migration_localizes_strings_without_offset() -> None:
+    """Should localize strings without an offset in the timezone of the events."""
+    conversion = datetime_migration("races_collection", "Europe/Oslo")[0]["$set"][
+        "start_time"
+    ]["$switch"]
+    assert conversion["default"]["$dateFromString"]["timezone"] == "Europe/Oslo"
+    with_offset = conversion["branches"][1]["then"]["$dateFromString"]
+    assert "timezone" not in with_offset
+    for value in ("2021-08-31T09:00:00Z", "2021-08-31T09:00:00+02:00"):
+        assert re.search(OFFSET_PATTERN, value)
+    for value in ("2021-08-31T09:00:00", "2021-08-31"):
+        assert not re.search(OFFSET_PATTERN, value)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_migrate_datetimes_only_updates_strings(db: MagicMock) -> None:
+    """Should update the documents with a datetime field of type string."""
+    collection = db.__getitem__.return_value
+    collection.update_many = AsyncMock(return_value=MagicMock(modified_count=2))
+    modified = await migrate_datetimes(db, "Europe/Oslo")
+    assert modified["time_events_collection"] == 2  # noqa: PLR2004
+    query, _ = collection.update_many.call_args_list[-1].args
+    assert {"registration_time": {"$type": "string"}} in query["$or"]
+    assert {"changelog.timestamp": {"$type": "string"}} in query["$or"]
@@ -0,0 +1,36 @@
+"""Unit test cases for the id_utils module."""
+
+import uuid
+
+import pytest
+from pytest_mock import MockFixture
+
+from race_service.utils.id_utils import _TimeOrderedIdGenerator, create_id
+
+NOW_MS = 1_700_000_000_000
+
+
+@pytest.mark.unit
+async def test_create_id_is_uuid_version_7() -> None:
+    """Should return a uuid string of version 7 and RFC 9562 variant."""
+    id_ = uuid.UUID(create_id())
+    assert id_.version == 7  # noqa: PLR2004
+    assert id_.variant == uuid.RFC_4122
+
+
+@pytest.mark.unit
+async def test_create_id_is_time_ordered(mocker: MockFixture) -> None:
+    """Should return increasing ids, also within the same millisecond."""
+    mocker.patch(
+        "race_service.utils.id_utils.time.time_ns",
+        return_value=NOW_MS * 1_000_000,
+    )
+    # A generator of its own, so the generator of create_id is not affected:
+    generator = _TimeOrderedIdGenerator()
+    ids = [generator() for _ in range(10_000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+    # The timestamp is in the first 48 bits:
+    timestamp_ms = uuid.UUID(ids[0]).int >> 80
+    assert timestamp_ms == NOW_MS